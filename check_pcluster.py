@@ -21,16 +21,21 @@ if os.path.realpath(sys.prefix) != os.path.realpath(os.path.join(_repo_root, ".v
 import argparse
 import json
 import subprocess
-
-import boto3
-from botocore.exceptions import ClientError, BotoCoreError
+import time
 
 sys.path.insert(0, _src_dir)
+from pcluster_aws import _aws_client
 from pcluster_core import (
+    _DESCRIBE_BACKENDS,
+    _enumerate_clusters,
+    _try_describe_cluster_native,
     _validate_cluster_name,
-    _read_cluster_record,
+    _read_cluster_records,
     _clamp_int,
+    _ssh_control_options,
+    _ssh_multiplexed,
     _classify_sinfo_nodes,
+    _safe,
 )
 
 _PCLUSTER_BIN = os.path.join(_repo_root, ".venv", "bin", "pcluster")
@@ -38,6 +43,60 @@ _PCLUSTER_BIN = os.path.join(_repo_root, ".venv", "bin", "pcluster")
 _MIN_TIMEOUT = 1
 _MAX_TIMEOUT = 300
 
+# --all: clusters checked at once, and each one's wall-clock allowance. The
+# default covers describe-cluster's 30 s, a probe at the default SSH timeout
+# and the S3 check with room to spare.
+_CHECK_WORKERS = 8
+_DEFAULT_BUDGET = 120
+_MIN_BUDGET = 10
+_MAX_BUDGET = 3600
+_BUDGET_POLL_SECONDS = 1.0
+
+_SINFO_CMD = ["sinfo", "-h", "-o", "%D %T"]
+_POSTINSTALL_MARKER = "/opt/parallelcluster/shared/custom_action_done"
+_POSTINSTALL_CMD = ["test", "-f", _POSTINSTALL_MARKER]
+_GRAFANA_HEALTH_CMD = [
+    "curl", "-sk", "--max-time", "10",
+    "https://localhost:443/grafana/api/health",
+]
+
+# Runs under the head node's python3, read from stdin: no quoting survives
+# ssh's argv-to-shell join intact, and stdin avoids it. Kept to what Python
+# 3.6 offers, the oldest python3 on a supported ParallelCluster AMI.
+_PROBE_SCRIPT = r"""
+import json, subprocess, threading
+
+timeout = __TIMEOUT__
+commands = __COMMANDS__
+results = {"echo": "OK"}
+
+
+def run(name, argv):
+    try:
+        proc = subprocess.Popen(
+            argv, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, universal_newlines=True,
+        )
+    except OSError as e:
+        results[name] = {"rc": 127, "stdout": "", "stderr": str(e)}
+        return
+    try:
+        out, err = proc.communicate(timeout=timeout)
+        results[name] = {"rc": proc.returncode, "stdout": out, "stderr": err}
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        results[name] = {"rc": None, "stdout": "", "stderr": "timed out"}
+
+
+threads = [threading.Thread(target=run, args=item) for item in commands.items()]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+print(json.dumps(results))
+"""
+
 _PASS = "[PASS]"
 _FAIL = "[FAIL]"
 _SKIP = "[SKIP]"
@@ -50,24 +109,45 @@ def _ssh_args(head_ip, ssh_keypair, ec2_user, timeout):
         "-o", f"ConnectTimeout={timeout}",
         "-o", "StrictHostKeyChecking=accept-new",
         "-o", "BatchMode=yes",
+        *_ssh_control_options(),
         f"{ec2_user}@{head_ip}",
     ]
 
 
-def _run_ssh(head_ip, ssh_keypair, ec2_user, timeout, remote_cmd):
+def _run_ssh(head_ip, ssh_keypair, ec2_user, timeout, remote_cmd, *, input=None, run_timeout=None):
     args = _ssh_args(head_ip, ssh_keypair, ec2_user, timeout) + remote_cmd
-    result = subprocess.run(args, capture_output=True, text=True, timeout=timeout + 5)
+    result = subprocess.run(
+        args, capture_output=True, text=True, input=input,
+        timeout=run_timeout or timeout + 5,
+    )
     return result.returncode, result.stdout, result.stderr
 
 
 def check_vars_file(cluster_name):
-    rec = _read_cluster_record(cluster_name, _repo_root)
+    rec = _read_cluster_records([cluster_name], _repo_root)[cluster_name]
     if rec is None:
         return False, "vars file missing or unreadable", None
     return True, None, rec
 
 
-def check_cfn_status(cluster_name, region):
+def _cfn_status_result(data):
+    cs = data.get("clusterStatus", "UNKNOWN")
+    cfs = data.get("cloudFormationStackStatus", "UNKNOWN")
+    head_node = data.get("headNode", {})
+    head_ip = (
+        head_node.get("publicIpAddress") or
+        head_node.get("privateIpAddress") or ""
+    )
+    if cs != "CREATE_COMPLETE":
+        return False, f"clusterStatus={cs} cloudFormationStackStatus={cfs}", head_ip
+    return True, f"clusterStatus={cs}", head_ip
+
+
+def check_cfn_status(cluster_name, region, backend="cli"):
+    if backend == "native":
+        data = _try_describe_cluster_native(cluster_name, region)
+        if data is not None:
+            return _cfn_status_result(data)
     try:
         result = subprocess.run(
             [_PCLUSTER_BIN, "describe-cluster",
@@ -77,17 +157,7 @@ def check_cfn_status(cluster_name, region):
         )
         if result.returncode != 0:
             return False, f"pcluster describe-cluster failed (rc={result.returncode})", None
-        data = json.loads(result.stdout)
-        cs = data.get("clusterStatus", "UNKNOWN")
-        cfs = data.get("cloudFormationStackStatus", "UNKNOWN")
-        head_node = data.get("headNode", {})
-        head_ip = (
-            head_node.get("publicIpAddress") or
-            head_node.get("privateIpAddress") or ""
-        )
-        if cs != "CREATE_COMPLETE":
-            return False, f"clusterStatus={cs} cloudFormationStackStatus={cfs}", head_ip
-        return True, f"clusterStatus={cs}", head_ip
+        return _cfn_status_result(json.loads(result.stdout))
     except subprocess.TimeoutExpired:
         return False, "pcluster describe-cluster timed out", None
     except (json.JSONDecodeError, KeyError) as e:
@@ -112,31 +182,33 @@ def check_ssh(head_ip, ssh_keypair, ec2_user, timeout):
         return False, f"SSH failed: {e}"
 
 
-def check_slurm(head_ip, ssh_keypair, ec2_user, timeout):
+def _slurm_result(rc, stdout, stderr):
     """Report Slurm healthy only if it answers AND has a usable node.
 
     `rc == 0` alone is not health: sinfo exits 0 while reporting every partition
     down or drained, so a cluster whose entire fleet had failed to bootstrap
     passed this check. The stdout was captured and never read.
     """
-    try:
-        rc, stdout, stderr = _run_ssh(
-            head_ip, ssh_keypair, ec2_user, timeout,
-            ["sinfo", "-h", "-o", "%D %T"],
+    if rc is None:
+        return False, "sinfo timed out"
+    if rc != 0:
+        return False, f"sinfo returned rc={rc}: {stderr.strip()[:120]}"
+    if not stdout.strip():
+        return False, "sinfo reported no partitions"
+    usable, unusable = _classify_sinfo_nodes(stdout)
+    if usable == 0:
+        return False, (
+            f"no usable nodes: {unusable} node(s) down/drained/unknown "
+            f"(sinfo -N -l on the head node has the detail)"
         )
-        if rc != 0:
-            return False, f"sinfo returned rc={rc}: {stderr.strip()[:120]}"
-        if not stdout.strip():
-            return False, "sinfo reported no partitions"
-        usable, unusable = _classify_sinfo_nodes(stdout)
-        if usable == 0:
-            return False, (
-                f"no usable nodes: {unusable} node(s) down/drained/unknown "
-                f"(sinfo -N -l on the head node has the detail)"
-            )
-        if unusable:
-            return True, f"{usable} node(s) usable, {unusable} down/drained"
-        return True, None
+    if unusable:
+        return True, f"{usable} node(s) usable, {unusable} down/drained"
+    return True, None
+
+
+def check_slurm(head_ip, ssh_keypair, ec2_user, timeout):
+    try:
+        return _slurm_result(*_run_ssh(head_ip, ssh_keypair, ec2_user, timeout, _SINFO_CMD))
     except subprocess.TimeoutExpired:
         return False, "sinfo timed out"
     except OSError as e:
@@ -144,8 +216,10 @@ def check_slurm(head_ip, ssh_keypair, ec2_user, timeout):
 
 
 def check_s3(s3_bucketname, region):
+    from botocore.exceptions import BotoCoreError, ClientError
+
     try:
-        s3 = boto3.client("s3", region_name=region)
+        s3 = _aws_client("s3", region)
         s3.head_bucket(Bucket=s3_bucketname)
         return True, None
     except (ClientError, BotoCoreError) as e:
@@ -154,140 +228,244 @@ def check_s3(s3_bucketname, region):
         return False, f"S3 check failed: {e}"
 
 
+def _postinstall_result(rc, stdout="", stderr=""):
+    if rc is None:
+        return False, "postinstall check timed out"
+    if rc == 0:
+        return True, None
+    return False, f"marker file absent: {_POSTINSTALL_MARKER}"
+
+
 def check_postinstall(head_ip, ssh_keypair, ec2_user, timeout):
-    marker = "/opt/parallelcluster/shared/custom_action_done"
     try:
-        rc, _, _ = _run_ssh(
-            head_ip, ssh_keypair, ec2_user, timeout, ["test", "-f", marker]
+        return _postinstall_result(
+            *_run_ssh(head_ip, ssh_keypair, ec2_user, timeout, _POSTINSTALL_CMD)
         )
-        if rc == 0:
-            return True, None
-        return False, f"marker file absent: {marker}"
     except subprocess.TimeoutExpired:
         return False, "postinstall check timed out"
     except OSError as e:
         return False, f"postinstall check failed: {e}"
 
 
+def _grafana_result(rc, stdout, stderr=""):
+    if rc is None:
+        return False, "Grafana check timed out"
+    if rc != 0:
+        return False, f"curl returned rc={rc}"
+    if '"database":"ok"' in stdout.replace(" ", ""):
+        return True, None
+    return False, f"unexpected Grafana response: {stdout.strip()[:120]}"
+
+
 def check_grafana(head_ip, ssh_keypair, ec2_user, timeout):
-    cmd = [
-        "curl", "-sk", "--max-time", "10",
-        "https://localhost:443/grafana/api/health",
-    ]
     try:
-        rc, stdout, _ = _run_ssh(head_ip, ssh_keypair, ec2_user, timeout, cmd)
-        if rc != 0:
-            return False, f"curl returned rc={rc}"
-        if '"database":"ok"' in stdout.replace(" ", ""):
-            return True, None
-        return False, f"unexpected Grafana response: {stdout.strip()[:120]}"
+        return _grafana_result(
+            *_run_ssh(head_ip, ssh_keypair, ec2_user, timeout, _GRAFANA_HEALTH_CMD)
+        )
     except subprocess.TimeoutExpired:
         return False, "Grafana check timed out"
     except OSError as e:
         return False, f"Grafana check failed: {e}"
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Health check for a running ParallelCluster stack."
-    )
-    parser.add_argument("-N", "--cluster_name", required=True, help="Cluster name")
-    parser.add_argument(
-        "-T", "--timeout", type=int, default=15,
-        help=f"SSH timeout in seconds (default: 15, min: {_MIN_TIMEOUT}, max: {_MAX_TIMEOUT})"
+def probe_head_node(head_ip, ssh_keypair, ec2_user, timeout, monitoring):
+    """Run every head-node check in one SSH round trip.
+
+    _PROBE_SCRIPT goes to the head node's python3 on stdin, runs sinfo, the
+    postinstall marker test and (when monitoring) the Grafana curl in
+    parallel, and prints one JSON document of {"rc", "stdout", "stderr"} per
+    probe, so the checks cost one round trip plus the slowest probe.
+
+    Returns (probe, ssh_error). probe is None with an ssh_error when the head
+    node is unreachable, and None without one when SSH works but the probe
+    does not (no python3, or output that is not the probe's); the caller then
+    falls back to one round trip per check.
+    """
+    commands = {"sinfo": _SINFO_CMD, "postinstall": _POSTINSTALL_CMD}
+    if monitoring:
+        commands["grafana"] = _GRAFANA_HEALTH_CMD
+    script = (
+        _PROBE_SCRIPT
+        .replace("__TIMEOUT__", str(timeout))
+        .replace("__COMMANDS__", json.dumps(commands))
     )
-    args = parser.parse_args()
+    try:
+        # Connect, then the slowest probe, each bounded by timeout.
+        rc, stdout, _ = _run_ssh(
+            head_ip, ssh_keypair, ec2_user, timeout, ["python3", "-"],
+            input=script, run_timeout=2 * timeout + 5,
+        )
+    except subprocess.TimeoutExpired:
+        return None, "SSH connection timed out"
+    except OSError as e:
+        return None, f"SSH failed: {e}"
+    if rc == 255:
+        return None, f"SSH returned rc={rc}"
+    try:
+        probe = json.loads(stdout)
+    except ValueError:
+        return None, None
+    if not isinstance(probe, dict) or probe.get("echo") != "OK" or not all(
+        isinstance(probe.get(name), dict) for name in commands
+    ):
+        return None, None
+    return probe, None
 
-    cluster_name = args.cluster_name
-    _validate_cluster_name(cluster_name)
-    timeout = _clamp_int(args.timeout, _MIN_TIMEOUT, _MAX_TIMEOUT, "-T/--timeout")
 
-    print(f"Checking cluster: {cluster_name}")
+def _record(results, emit, status, check, detail=None, line=None):
+    """Append one check result and, when emit is given, print it as it lands."""
+    results.append({"result": status[1:-1], "check": check, "detail": detail})
+    if emit:
+        emit(f"  {status} {line or check + (f' — {detail}' if detail else '')}")
 
-    failures = 0
 
-    ok, err, rec = check_vars_file(cluster_name)
-    if ok:
-        print(f"  {_PASS} vars file")
-    else:
-        print(f"  {_FAIL} vars file — {err}")
-        print(f"\n1 check(s) failed.")
-        sys.exit(1)
+def run_checks(cluster_name, rec, timeout, backend, emit=None):
+    """Run every check after the vars file against one cluster; return its results.
 
+    Each result is {"result": "PASS"|"FAIL"|"SKIP", "check", "detail"}. emit,
+    if given, receives each rendered line as soon as its check finishes, so an
+    interactive run streams while a fleet run can collect silently.
+    """
+    results = []
     region            = rec["region"]
     ssh_keypair       = rec["ssh_keypair"]
     ec2_user          = rec["ec2_user"]
     s3_bucketname     = rec["s3_bucketname"]
-    enable_monitoring = rec["enable_monitoring"]
+    monitoring        = rec["enable_monitoring"] == "true"
 
-    ok, msg, head_ip = check_cfn_status(cluster_name, region)
+    ok, msg, head_ip = check_cfn_status(cluster_name, region, backend)
     if ok:
-        print(f"  {_PASS} CloudFormation status: {msg.split('=')[1]}")
+        status = msg.split("=")[1]
+        _record(results, emit, _PASS, "CloudFormation status", status,
+                line=f"CloudFormation status: {status}")
     else:
-        print(f"  {_FAIL} CloudFormation status — {msg}")
-        failures += 1
+        _record(results, emit, _FAIL, "CloudFormation status", msg)
 
     if head_ip is not None:
         ok, msg = check_head_ip(head_ip)
         if ok:
-            print(f"  {_PASS} head node IP: {head_ip}")
+            _record(results, emit, _PASS, "head node IP", head_ip,
+                    line=f"head node IP: {head_ip}")
         else:
-            print(f"  {_FAIL} head node IP — {msg}")
+            _record(results, emit, _FAIL, "head node IP", msg)
             head_ip = None
-            failures += 1
     else:
-        print(f"  {_SKIP} head node IP — CloudFormation check failed")
+        _record(results, emit, _SKIP, "head node IP", "CloudFormation check failed")
 
     ssh_ok = False
+    probe = None
     if head_ip:
-        ok, err = check_ssh(head_ip, ssh_keypair, ec2_user, timeout)
+        probe, ssh_err = probe_head_node(head_ip, ssh_keypair, ec2_user, timeout, monitoring)
+        if probe is not None:
+            ok, err = True, None
+        elif ssh_err:
+            ok, err = False, ssh_err
+        else:
+            # SSH answered but the probe did not: fall back to one round trip
+            # per check.
+            ok, err = check_ssh(head_ip, ssh_keypair, ec2_user, timeout)
         if ok:
-            print(f"  {_PASS} SSH reachability")
+            _record(results, emit, _PASS, "SSH reachability")
             ssh_ok = True
         else:
-            print(f"  {_FAIL} SSH reachability — {err}")
-            failures += 1
+            _record(results, emit, _FAIL, "SSH reachability", err)
     else:
-        print(f"  {_SKIP} SSH reachability — head node IP unavailable")
+        _record(results, emit, _SKIP, "SSH reachability", "head node IP unavailable")
 
     if ssh_ok:
-        ok, err = check_slurm(head_ip, ssh_keypair, ec2_user, timeout)
-        if ok:
-            # err is a partial-degradation note here, not a failure: some nodes
-            # are usable but not all. Printing it is the whole point of reading
-            # sinfo's output rather than only its exit status.
-            print(f"  {_PASS} Slurm" + (f" — {err}" if err else ""))
+        if probe is not None:
+            ok, err = _slurm_result(**probe["sinfo"])
         else:
-            print(f"  {_FAIL} Slurm — {err}")
-            failures += 1
-
-        ok, err = check_postinstall(head_ip, ssh_keypair, ec2_user, timeout)
-        if ok:
-            print(f"  {_PASS} postinstall complete")
+            ok, err = check_slurm(head_ip, ssh_keypair, ec2_user, timeout)
+        # On a pass, err is a partial-degradation note rather than a failure:
+        # some nodes are usable but not all. Printing it is the whole point of
+        # reading sinfo's output rather than only its exit status.
+        _record(results, emit, _PASS if ok else _FAIL, "Slurm", err)
+
+        if probe is not None:
+            ok, err = _postinstall_result(**probe["postinstall"])
         else:
-            print(f"  {_FAIL} postinstall complete — {err}")
-            failures += 1
+            ok, err = check_postinstall(head_ip, ssh_keypair, ec2_user, timeout)
+        _record(results, emit, _PASS if ok else _FAIL, "postinstall complete", err)
 
-        if enable_monitoring == "true":
-            ok, err = check_grafana(head_ip, ssh_keypair, ec2_user, timeout)
-            if ok:
-                print(f"  {_PASS} Grafana health")
+        if monitoring:
+            if probe is not None:
+                ok, err = _grafana_result(**probe["grafana"])
             else:
-                print(f"  {_FAIL} Grafana health — {err}")
-                failures += 1
+                ok, err = check_grafana(head_ip, ssh_keypair, ec2_user, timeout)
+            _record(results, emit, _PASS if ok else _FAIL, "Grafana health", err)
     else:
         skips = ["Slurm (sinfo -s)", "postinstall complete"]
-        if enable_monitoring == "true":
+        if monitoring:
             skips.append("Grafana health")
-        for s in skips:
-            print(f"  {_SKIP} {s} — SSH unreachable")
+        for check in skips:
+            _record(results, emit, _SKIP, check, "SSH unreachable")
 
     ok, err = check_s3(s3_bucketname, region)
+    _record(results, emit, _PASS if ok else _FAIL, f"S3 bucket: {s3_bucketname}", err)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Health check for a running ParallelCluster stack."
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("-N", "--cluster_name", help="Cluster name")
+    target.add_argument(
+        "-A", "--all", action="store_true",
+        help="Check every cluster in active_clusters/ (narrow with --owner/--region)"
+    )
+    parser.add_argument("-O", "--owner", help="With --all: only clusters owned by this user")
+    parser.add_argument("-R", "--region", help="With --all: only clusters in this region")
+    parser.add_argument(
+        "-T", "--timeout", type=int, default=15,
+        help=f"SSH timeout in seconds (default: 15, min: {_MIN_TIMEOUT}, max: {_MAX_TIMEOUT})"
+    )
+    parser.add_argument(
+        "--budget", type=int, default=_DEFAULT_BUDGET,
+        help=f"With --all: seconds one cluster's checks may take before it is "
+             f"reported as timed out (default: {_DEFAULT_BUDGET}, min: "
+             f"{_MIN_BUDGET}, max: {_MAX_BUDGET})"
+    )
+    parser.add_argument(
+        "-J", "--json", action="store_true",
+        help="With --all: emit a JSON array of per-cluster results instead of a table"
+    )
+    parser.add_argument(
+        "--describe_backend", choices=_DESCRIBE_BACKENDS, default="native",
+        help="How to read cluster status: native API calls, falling back to "
+             "the pcluster CLI on error (default), or the CLI only."
+    )
+    args = parser.parse_args()
+    if args.cluster_name and (args.owner or args.region or args.json):
+        parser.error("--owner, --region and --json apply only with --all")
+
+    # Every remote command shares one SSH connection per head node.
+    with _ssh_multiplexed():
+        if args.all:
+            _check_fleet(args)
+        else:
+            _check_cluster(args)
+
+
+def _check_cluster(args):
+    cluster_name = args.cluster_name
+    _validate_cluster_name(cluster_name)
+    timeout = _clamp_int(args.timeout, _MIN_TIMEOUT, _MAX_TIMEOUT, "-T/--timeout")
+
+    print(f"Checking cluster: {cluster_name}")
+
+    ok, err, rec = check_vars_file(cluster_name)
     if ok:
-        print(f"  {_PASS} S3 bucket: {s3_bucketname}")
+        print(f"  {_PASS} vars file")
     else:
-        print(f"  {_FAIL} S3 bucket: {s3_bucketname} — {err}")
-        failures += 1
+        print(f"  {_FAIL} vars file — {err}")
+        print(f"\n1 check(s) failed.")
+        sys.exit(1)
+
+    results = run_checks(cluster_name, rec, timeout, args.describe_backend, emit=print)
+    failures = sum(r["result"] == "FAIL" for r in results)
 
     print("")
     if failures == 0:
@@ -298,5 +476,157 @@ def main():
         sys.exit(1)
 
 
+def _check_one(cluster_name, rec, timeout, backend):
+    """Return one cluster's fleet-mode report: identity, verdict and check results."""
+    started = time.monotonic()
+    report = {
+        "cluster": cluster_name,
+        "owner": rec["cluster_owner"] if rec else "unknown",
+        "region": rec["region"] if rec else "unknown",
+    }
+    if rec is None:
+        checks = [{"result": "FAIL", "check": "vars file",
+                   "detail": "vars file missing or unreadable"}]
+    else:
+        checks = [{"result": "PASS", "check": "vars file", "detail": None}]
+        try:
+            checks += run_checks(cluster_name, rec, timeout, backend)
+        except Exception as e:  # one cluster's surprise must not sink the sweep
+            checks.append({"result": "FAIL", "check": "check run", "detail": str(e)})
+    report.update(
+        healthy=not any(c["result"] == "FAIL" for c in checks),
+        timed_out=False,
+        elapsed_s=round(time.monotonic() - started, 1),
+        checks=checks,
+    )
+    return report
+
+
+def _timed_out_report(name, rec, elapsed):
+    return {
+        "cluster": name,
+        "owner": rec["cluster_owner"] if rec else "unknown",
+        "region": rec["region"] if rec else "unknown",
+        "healthy": False,
+        "timed_out": True,
+        "elapsed_s": round(elapsed, 1),
+        "checks": [],
+    }
+
+
+def _run_fleet_checks(records, timeout, backend, budget):
+    """Check every {cluster_name: rec} on up to _CHECK_WORKERS threads; return reports in name order.
+
+    Each cluster's budget starts when a worker picks it up, not when it is
+    queued. A cluster still running when its budget runs out is reported as
+    timed out and its worker is abandoned, with a fresh worker started in
+    its place. Workers are daemon threads, not a ThreadPoolExecutor, whose
+    threads are joined at interpreter exit: a check stuck on an SSH or
+    describe call must not hold the process past --budget.
+    """
+    import queue
+    import threading
+
+    todo = queue.Queue()
+    for name in records:
+        todo.put(name)
+    finished = queue.Queue()
+    started, abandoned = {}, set()
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            try:
+                name = todo.get_nowait()
+            except queue.Empty:
+                return
+            with lock:
+                started[name] = time.monotonic()
+            finished.put((name, _check_one(name, records[name], timeout, backend)))
+            with lock:
+                if name in abandoned:
+                    return  # its replacement is already working the queue
+
+    def spawn():
+        threading.Thread(target=worker, daemon=True).start()
+
+    for _ in range(min(_CHECK_WORKERS, len(records))):
+        spawn()
+    reports = {}
+    while len(reports) < len(records):
+        try:
+            name, report = finished.get(timeout=_BUDGET_POLL_SECONDS)
+            reports.setdefault(name, report)
+        except queue.Empty:
+            pass
+        now = time.monotonic()
+        with lock:
+            overdue = [
+                name for name, t0 in started.items()
+                if name not in reports and now - t0 > budget
+            ]
+            abandoned.update(overdue)
+        for name in overdue:
+            reports[name] = _timed_out_report(name, records[name], now - started[name])
+            if not todo.empty():
+                spawn()
+    return [reports[name] for name in sorted(reports)]
+
+
+def _print_fleet_table(reports):
+    if not reports:
+        print("No clusters found.")
+        return
+    headers = ("Cluster", "Owner", "Region", "Result", "Failed checks")
+    rows = []
+    for r in reports:
+        failed = [c["check"] for c in r["checks"] if c["result"] == "FAIL"]
+        if r["timed_out"]:
+            verdict = f"TIMEOUT ({r['elapsed_s']:.0f}s)"
+        elif r["healthy"]:
+            verdict = "healthy"
+        else:
+            verdict = f"{len(failed)} failed"
+        rows.append((r["cluster"], _safe(r["owner"]), _safe(r["region"]), verdict,
+                     ", ".join(failed) or "-"))
+    widths = [max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(headers)]
+    sep = "  "
+    print(sep.join(h.ljust(widths[i]) for i, h in enumerate(headers)))
+    print(sep.join("-" * w for w in widths))
+    for row in rows:
+        print(sep.join(c.ljust(widths[i]) for i, c in enumerate(row)))
+
+
+def _check_fleet(args):
+    timeout = _clamp_int(args.timeout, _MIN_TIMEOUT, _MAX_TIMEOUT, "-T/--timeout")
+    budget = _clamp_int(args.budget, _MIN_BUDGET, _MAX_BUDGET, "--budget")
+
+    records = {}
+    for name, rec in _read_cluster_records(_enumerate_clusters(_repo_root), _repo_root).items():
+        # A cluster without a readable record cannot be placed by owner or
+        # region, so it is only reported when nothing is filtering.
+        if rec is None and (args.owner or args.region):
+            continue
+        if args.region and rec["region"] != args.region:
+            continue
+        if args.owner and rec["cluster_owner"] != args.owner:
+            continue
+        records[name] = rec
+
+    reports = _run_fleet_checks(records, timeout, args.describe_backend, budget)
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        _print_fleet_table(reports)
+        unhealthy = sum(not r["healthy"] for r in reports)
+        if reports:
+            print("")
+            if unhealthy:
+                print(f"{unhealthy} of {len(reports)} cluster(s) failed.")
+            else:
+                print(f"All {len(reports)} cluster(s) healthy.")
+    sys.exit(1 if any(not r["healthy"] for r in reports) else 0)
+
+
 if __name__ == "__main__":
     main()
@@ -20,15 +20,36 @@ if os.path.realpath(sys.prefix) != os.path.realpath(os.path.join(_repo_root, ".v
 
 import argparse
 import json
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError
-
 sys.path.insert(0, _src_dir)
-from pcluster_core import _validate_cluster_name, _read_cluster_record, _safe
-
-_ACTIVE_CLUSTERS_DIR = os.path.join(_repo_root, "active_clusters")
+from pcluster_aws import _aws_client
+from pcluster_core import (
+    _cache_dir,
+    _enumerate_clusters,
+    _read_cluster_records,
+    _read_json_cache,
+    _safe,
+    _validate_cluster_name,
+    _write_json_cache,
+)
+
+_COST_CACHE_VERSION = 1  # bump whenever the cache layout changes
+# CE restates recent days for up to 72 hours, so the newest days in the cache
+# are always fetched again rather than trusted.
+_RESTATEMENT_DAYS = 3
+# One more than the --days ceiling; anything older can never be asked for.
+_COST_CACHE_RETENTION_DAYS = 366
+
+# --breakdown cannot group by ClusterID as well as SERVICE and USAGE_TYPE (CE
+# allows two GroupBy keys), so it is one query per cluster. Adaptive retries
+# absorb the odd throttle; pacing keeps a large fleet from provoking them.
+_BREAKDOWN_WORKERS = 4
+_CE_REQUESTS_PER_SECOND = 5.0
+# Usage-type rows shown per cluster by --breakdown; the rest share one row.
+_BREAKDOWN_TOP = 5
 
 
 def _utc_today():
@@ -42,26 +63,11 @@ def _date_range(days):
     return start.isoformat(), end.isoformat()
 
 
-def _enumerate_cluster_names():
-    names = []
-    try:
-        with os.scandir(_ACTIVE_CLUSTERS_DIR) as it:
-            for entry in it:
-                if not entry.is_dir(follow_symlinks=False):
-                    continue
-                try:
-                    _validate_cluster_name(entry.name)
-                    names.append(entry.name)
-                except SystemExit:
-                    pass
-    except OSError:
-        pass
-    return sorted(names)
-
-
 def _check_tag_activated(ce_client):
     """Return True if ClusterID is an active cost allocation tag, False if not,
     None if the check could not be performed (permissions or network error)."""
+    from botocore.exceptions import BotoCoreError, ClientError
+
     try:
         resp = ce_client.list_cost_allocation_tags(
             TagKeys=["ClusterID"], Type="UserDefined", MaxResults=1
@@ -79,23 +85,37 @@ def _check_tag_activated(ce_client):
         return None
 
 
-def _get_cluster_cost(ce_client, cluster_name, start, end):
-    """Query CE for total UnblendedCost tagged ClusterID=cluster_name.
+def _rate_limiter(rate):
+    """Return a thread-safe wait() that spaces callers at most rate per second apart."""
+    lock = threading.Lock()
+    next_slot = [0.0]
 
-    Follows NextPageToken to handle ranges spanning >12 months.
-    Returns (total_usd: float, error: str|None).
+    def wait():
+        with lock:
+            now = time.monotonic()
+            slot = max(now, next_slot[0])
+            next_slot[0] = slot + 1.0 / rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    return wait
+
+
+def _ce_pages(ce_client, *, throttle=None, **kwargs):
+    """Run get_cost_and_usage, following NextPageToken across every page.
+
+    throttle, if given, is called before every request, pages included.
+    Returns (pages: list, error: str|None).
     """
-    total = 0.0
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    pages = []
     next_token = None
     while True:
-        kwargs = dict(
-            TimePeriod={"Start": start, "End": end},
-            Granularity="MONTHLY",
-            Filter={"Tags": {"Key": "ClusterID", "Values": [cluster_name]}},
-            Metrics=["UnblendedCost"],
-        )
         if next_token:
             kwargs["NextPageToken"] = next_token
+        if throttle:
+            throttle()
         try:
             resp = ce_client.get_cost_and_usage(**kwargs)
         except ClientError as e:
@@ -106,24 +126,310 @@ def _get_cluster_cost(ce_client, cluster_name, start, end):
         except BotoCoreError as e:
             return None, f"network/credential error: {e}"
 
-        for period in resp.get("ResultsByTime", []):
-            amount = (
-                period.get("Total", {})
-                .get("UnblendedCost", {})
-                .get("Amount", "0")
-            )
-            try:
-                total += float(amount)
-            except ValueError:
-                pass
-
+        pages.append(resp)
         next_token = resp.get("NextPageToken")
         if not next_token:
-            break
+            return pages, None
+
+
+def _amount(metrics):
+    """Return the UnblendedCost amount in metrics as a float; malformed amounts count as 0."""
+    try:
+        return float(metrics.get("UnblendedCost", {}).get("Amount", "0"))
+    except ValueError:
+        return 0.0
+
 
+def _get_cluster_cost(ce_client, cluster_name, start, end):
+    """Query CE for total UnblendedCost tagged ClusterID=cluster_name.
+
+    Follows NextPageToken to handle ranges spanning >12 months.
+    Returns (total_usd: float, error: str|None).
+    """
+    pages, err = _ce_pages(
+        ce_client,
+        TimePeriod={"Start": start, "End": end},
+        Granularity="MONTHLY",
+        Filter={"Tags": {"Key": "ClusterID", "Values": [cluster_name]}},
+        Metrics=["UnblendedCost"],
+    )
+    if err:
+        return None, err
+
+    total = 0.0
+    for resp in pages:
+        for period in resp.get("ResultsByTime", []):
+            total += _amount(period.get("Total", {}))
     return total, None
 
 
+def _get_fleet_costs(ce_client, cluster_names, start, end):
+    """Query CE once for every cluster, grouped by the ClusterID tag.
+
+    CE bills per request and throttles hard, so a fleet report is one grouped
+    query rather than one filtered query per cluster. Group keys come back as
+    "ClusterID$<value>"; clusters with no spend in the window have no group
+    and are reported as 0.0.
+    Returns ({cluster_name: total_usd}, error: str|None).
+    """
+    pages, err = _ce_pages(
+        ce_client,
+        TimePeriod={"Start": start, "End": end},
+        Granularity="MONTHLY",
+        Filter={"Tags": {"Key": "ClusterID", "Values": list(cluster_names)}},
+        Metrics=["UnblendedCost"],
+        GroupBy=[{"Type": "TAG", "Key": "ClusterID"}],
+    )
+    if err:
+        return None, err
+
+    totals = dict.fromkeys(cluster_names, 0.0)
+    for resp in pages:
+        for period in resp.get("ResultsByTime", []):
+            for group in period.get("Groups", []):
+                keys = group.get("Keys") or [""]
+                name = keys[0].partition("$")[2]
+                # The Tags filter already scopes the query; this also drops
+                # the untagged bucket, whose key is a bare "ClusterID$".
+                if name in totals:
+                    totals[name] += _amount(group.get("Metrics", {}))
+    return totals, None
+
+
+def _get_daily_costs(ce_client, cluster_names, start, end):
+    """Query CE once for DAILY UnblendedCost per cluster, grouped by ClusterID.
+
+    Returns ({cluster_name: {iso_date: usd}}, error: str|None). Days without
+    spend have no group, so they are simply absent.
+    """
+    pages, err = _ce_pages(
+        ce_client,
+        TimePeriod={"Start": start, "End": end},
+        Granularity="DAILY",
+        Filter={"Tags": {"Key": "ClusterID", "Values": list(cluster_names)}},
+        Metrics=["UnblendedCost"],
+        GroupBy=[{"Type": "TAG", "Key": "ClusterID"}],
+    )
+    if err:
+        return None, err
+
+    daily = {name: {} for name in cluster_names}
+    for resp in pages:
+        for period in resp.get("ResultsByTime", []):
+            day = period.get("TimePeriod", {}).get("Start")
+            for group in period.get("Groups", []):
+                keys = group.get("Keys") or [""]
+                name = keys[0].partition("$")[2]
+                if day and name in daily:
+                    daily[name][day] = daily[name].get(day, 0.0) + _amount(
+                        group.get("Metrics", {})
+                    )
+    return daily, None
+
+
+def _cost_cache_path(repo_root):
+    return os.path.join(_cache_dir(repo_root), "cost_daily.json")
+
+
+def _cached_costs(ce_client, cluster_names, start, end, repo_root, *, refresh=False):
+    """Return ({cluster_name: total_usd}, error: str|None) for [start, end), via the daily cache.
+
+    The cache (active_clusters/.cache/cost_daily.json) holds each cluster's
+    DAILY spend and the contiguous span [from, through) it covers. A cluster
+    whose span reaches back to start is only re-queried from its high-water
+    mark less the restatement window; any other cluster, or every cluster
+    when refresh=True, is queried for the whole window. Clusters that share a
+    fetch start share one grouped query, so a warm fleet report is usually a
+    single short DAILY query. Nothing is written if any query fails.
+    """
+    path = _cost_cache_path(repo_root)
+    doc = _read_json_cache(path, float("inf"))
+    data = doc["data"] if doc and isinstance(doc["data"], dict) else {}
+    if data.get("version") != _COST_CACHE_VERSION or not isinstance(data.get("clusters"), dict):
+        data = {"version": _COST_CACHE_VERSION, "clusters": {}}
+    entries = data["clusters"]
+
+    restate_from = (
+        datetime.fromisoformat(end).date() - timedelta(days=_RESTATEMENT_DAYS)
+    ).isoformat()
+    by_fetch_start = {}
+    resumed = set()
+    for name in cluster_names:
+        entry = entries.get(name)
+        covered = (
+            not refresh
+            and isinstance(entry, dict)
+            and isinstance(entry.get("daily"), dict)
+            and entry.get("from", "9999") <= start <= entry.get("through", "")
+        )
+        if covered:
+            resumed.add(name)
+            fetch_start = max(start, min(entry["through"], restate_from))
+        else:
+            fetch_start = start
+        by_fetch_start.setdefault(fetch_start, []).append(name)
+
+    for fetch_start, names in sorted(by_fetch_start.items()):
+        if fetch_start >= end:
+            continue
+        daily, err = _get_daily_costs(ce_client, names, fetch_start, end)
+        if err:
+            return None, err
+        for name in names:
+            # A cluster that was not resumed restarts its span at start, so
+            # a gap between an old high-water mark and start is never
+            # mistaken for coverage.
+            entry = entries[name] if name in resumed else {"from": start, "daily": {}}
+            kept = {d: v for d, v in entry["daily"].items() if d < fetch_start}
+            kept.update(daily[name])
+            entry["daily"] = kept
+            entry["through"] = max(end, entry.get("through", end))
+            entries[name] = entry
+
+    # Prune days no --days window can reach, so the file stays bounded.
+    horizon = (_utc_today() - timedelta(days=_COST_CACHE_RETENTION_DAYS)).isoformat()
+    for name, entry in list(entries.items()):
+        if (
+            not isinstance(entry, dict)
+            or not isinstance(entry.get("daily"), dict)
+            or entry.get("through", "") < horizon
+        ):
+            del entries[name]
+            continue
+        entry["daily"] = {d: v for d, v in entry["daily"].items() if d >= horizon}
+        entry["from"] = max(entry.get("from", horizon), horizon)
+    if any(fetch_start < end for fetch_start in by_fetch_start):
+        _write_json_cache(path, data)
+
+    totals = {}
+    for name in cluster_names:
+        daily = entries.get(name, {}).get("daily", {})
+        totals[name] = sum(v for d, v in daily.items() if start <= d < end)
+    return totals, None
+
+
+def _get_cluster_breakdown(ce_client, cluster_name, start, end, throttle=None):
+    """Query CE for cluster_name's UnblendedCost grouped by SERVICE and USAGE_TYPE.
+
+    Returns ({service: {usage_type: usd}}, error: str|None).
+    """
+    pages, err = _ce_pages(
+        ce_client,
+        throttle=throttle,
+        TimePeriod={"Start": start, "End": end},
+        Granularity="MONTHLY",
+        Filter={"Tags": {"Key": "ClusterID", "Values": [cluster_name]}},
+        Metrics=["UnblendedCost"],
+        GroupBy=[
+            {"Type": "DIMENSION", "Key": "SERVICE"},
+            {"Type": "DIMENSION", "Key": "USAGE_TYPE"},
+        ],
+    )
+    if err:
+        return None, err
+
+    breakdown = {}
+    for resp in pages:
+        for period in resp.get("ResultsByTime", []):
+            for group in period.get("Groups", []):
+                keys = group.get("Keys") or []
+                if len(keys) != 2:
+                    continue
+                usage = breakdown.setdefault(keys[0], {})
+                usage[keys[1]] = usage.get(keys[1], 0.0) + _amount(group.get("Metrics", {}))
+    return breakdown, None
+
+
+def _get_breakdowns(ce_client, cluster_names, start, end):
+    """Return {cluster_name: (breakdown, error)}, querying clusters concurrently under one rate limit."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not cluster_names:
+        return {}
+    throttle = _rate_limiter(_CE_REQUESTS_PER_SECOND)
+    workers = min(_BREAKDOWN_WORKERS, len(cluster_names))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            lambda name: _get_cluster_breakdown(ce_client, name, start, end, throttle),
+            cluster_names,
+        )
+        return dict(zip(cluster_names, results))
+
+
+def _format_breakdown(cluster_names, results, period, top=_BREAKDOWN_TOP):
+    """Print each cluster's top usage types in long format, one block per cluster.
+
+    Clusters are ordered by total spend, each showing its total and its
+    top usage types by cost; the rest are folded into one "other" row.
+    Lines that round to $0.00 are left out, so the table stays a few rows
+    per cluster however large the fleet is.
+    """
+    if not cluster_names:
+        print("No clusters found.")
+        return
+
+    def total(name):
+        breakdown = results[name][0] or {}
+        return sum(sum(usage.values()) for usage in breakdown.values())
+
+    table = []
+    for name in sorted(cluster_names, key=lambda n: (results[n][1] is not None, -total(n))):
+        breakdown, err = results[name]
+        if err:
+            table.append([name, "n/a", "", "", ""])
+            continue
+        lines = sorted(
+            ((usd, service, usage_type)
+             for service, usage in breakdown.items()
+             for usage_type, usd in usage.items()
+             if round(usd, 2) != 0),
+            reverse=True,
+        )
+        if not lines:
+            table.append([name, "$0.00", "", "", ""])
+            continue
+        block = [[service, usage_type, f"${usd:.2f}"] for usd, service, usage_type in lines[:top]]
+        rest = lines[top:]
+        if rest:
+            block.append([f"other ({len(rest)} usage types)", "", f"${sum(l[0] for l in rest):.2f}"])
+        table.append([name, f"${total(name):.2f}"] + block[0])
+        table.extend(["", ""] + row for row in block[1:])
+
+    print(f"Period: {period}\n")
+    header = ["Cluster", "Total", "Service", "Usage type", "Cost"]
+    widths = [max(len(row[i]) for row in table + [header]) for i in range(len(header))]
+    sep = "  "
+    print(sep.join(h.ljust(widths[i]) for i, h in enumerate(header)).rstrip())
+    print(sep.join("-" * w for w in widths))
+    for row in table:
+        print(sep.join(c.ljust(widths[i]) for i, c in enumerate(row)).rstrip())
+    for name in cluster_names:
+        err = results[name][1]
+        if err:
+            print(f"\n{name}: unavailable — {err}")
+
+
+def _breakdown_records(selected, results, period):
+    """Return the --breakdown --json array; selected is [(cluster, owner, region)]."""
+    out = []
+    for name, owner, region in selected:
+        breakdown, err = results[name]
+        entry = {"cluster": name, "owner": owner, "region": region, "period": period}
+        if err:
+            entry["error"] = err
+        else:
+            entry["total_usd"] = round(sum(sum(u.values()) for u in breakdown.values()), 2)
+            entry["services"] = {
+                service: {
+                    "cost_usd": round(sum(usage.values()), 2),
+                    "usage_types": {k: round(v, 2) for k, v in usage.items()},
+                }
+                for service, usage in breakdown.items()
+            }
+        out.append(entry)
+    return out
+
+
 def _format_table(rows, period):
     """rows: list of (cluster, owner, region, cost_str).
     period is printed once in the header rather than repeated per row.
@@ -153,21 +459,33 @@ def main():
                         help="Lookback window in days (default: 30, max: 365)")
     parser.add_argument("-J", "--json", action="store_true",
                         help="Emit JSON array instead of table")
+    parser.add_argument("--breakdown", action="store_true",
+                        help="Break spend down by AWS service and usage type (always queried live)")
+    parser.add_argument("--top", type=int, default=_BREAKDOWN_TOP,
+                        help=f"With --breakdown, usage types listed per cluster (default: {_BREAKDOWN_TOP})")
+    parser.add_argument("--no_cache", action="store_true",
+                        help="Query Cost Explorer directly and leave the daily cost cache untouched")
+    parser.add_argument("--refresh_cache", action="store_true",
+                        help="Re-fetch the whole window for the selected clusters into the daily cost cache")
     args = parser.parse_args()
 
     if args.days < 1 or args.days > 365:
         sys.exit("ERROR: --days must be between 1 and 365")
+    if args.top < 1:
+        sys.exit("ERROR: --top must be at least 1")
+    if args.no_cache and args.refresh_cache:
+        sys.exit("ERROR: --no_cache and --refresh_cache are mutually exclusive")
 
     if args.cluster_name:
         _validate_cluster_name(args.cluster_name)
         cluster_names = [args.cluster_name]
     else:
-        cluster_names = _enumerate_cluster_names()
+        cluster_names = _enumerate_clusters(_repo_root)
         if not cluster_names:
             sys.exit("No clusters found in active_clusters/")
 
     start, end = _date_range(args.days)
-    ce_client = boto3.client("ce", region_name="us-east-1")
+    ce_client = _aws_client("ce", "us-east-1")
 
     # Pre-flight: verify ClusterID tag is activated as a cost allocation tag.
     tag_active = _check_tag_activated(ce_client)
@@ -188,15 +506,53 @@ def main():
     rows = []
     tag_warning_shown = False
 
+    cluster_records = _read_cluster_records(cluster_names, _repo_root)
+    selected = []
     for name in cluster_names:
-        rec = _read_cluster_record(name, _repo_root)
+        rec = cluster_records[name]
         owner = _safe(rec["cluster_owner"]) if rec else "unknown"
         region = _safe(rec["region"]) if rec else "unknown"
-
         if args.owner and owner != args.owner:
             continue
+        selected.append((name, owner, region))
+
+    selected_names = [name for name, _, _ in selected]
+    period = f"{start} – {end}"
+
+    if args.breakdown:
+        results = _get_breakdowns(ce_client, selected_names, start, end)
+        if args.json:
+            print(json.dumps(_breakdown_records(selected, results, period), indent=2))
+            return
+        print(f"AWS Cost Explorer — last {args.days} days by service  (24-hour data lag applies)\n")
+        _format_breakdown(selected_names, results, period, top=args.top)
+        return
 
-        total, err = _get_cluster_cost(ce_client, name, start, end)
+    # The daily cache serves any window and only asks CE for the days past
+    # its high-water mark. Uncached, -N keeps the single filtered query and
+    # everything else is one grouped query for the whole selection.
+    costs = {}
+    if selected and not args.no_cache:
+        totals, err = _cached_costs(
+            ce_client, selected_names, start, end, _repo_root,
+            refresh=args.refresh_cache,
+        )
+        costs = {
+            name: (totals[name] if totals else None, err)
+            for name in selected_names
+        }
+    elif args.cluster_name and selected:
+        name = args.cluster_name
+        costs[name] = _get_cluster_cost(ce_client, name, start, end)
+    elif selected:
+        totals, err = _get_fleet_costs(ce_client, selected_names, start, end)
+        costs = {
+            name: (totals[name] if totals else None, err)
+            for name in selected_names
+        }
+
+    for name, owner, region in selected:
+        total, err = costs[name]
 
         if err:
             cost_str = f"unavailable — {err}"
@@ -208,8 +564,6 @@ def main():
 
         rows.append((name, owner, region, cost_str))
 
-    period = f"{start} – {end}"
-
     if args.json:
         out = [
             {"cluster": r[0], "owner": r[1], "region": r[2],
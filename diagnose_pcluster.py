@@ -19,18 +19,25 @@ if os.path.realpath(sys.prefix) != os.path.realpath(os.path.join(_repo_root, ".v
     )
 
 import argparse
+import base64
+import json
+import re
 import subprocess
+import threading
+import time
+import zlib
 from datetime import datetime, timedelta, timezone
 
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError
-
 sys.path.insert(0, _src_dir)
+from pcluster_aws import _aws_client
 from pcluster_core import (
+    _DESCRIBE_BACKENDS,
     _validate_cluster_name,
     _read_cluster_record,
-    _run_pcluster_cmd,
+    _describe_cluster,
     _clamp_int,
+    _ssh_control_options,
+    _ssh_multiplexed,
     _select_cw_log_group,
     _sinfo_state_is_ok,
 )
@@ -52,6 +59,176 @@ _LOCAL_LOGS = [
 ]
 
 _CW_STREAMS = ["cfn-init", "cloud-init-output", "cinc_client"]
+_CW_FETCH_WORKERS = 8  # one per stream; the logs client is thread-safe
+
+# --scan_errors: Logs Insights filters and counts every stream in the group
+# server-side. Grouping on the raw message would aggregate almost nothing,
+# since most bootstrap lines carry their own timestamp or PID, so rows are
+# grouped on a signature: the message with a leading timestamp parsed off and
+# every digit removed (Insights has only literal replace()). One sample
+# message per group comes back for _error_signature to refine client-side.
+_ERROR_SCAN_ROW_LIMIT = 10000
+_ERROR_SCAN_SIGNATURE = (
+    "replace(" * 10 + "body" + "".join(f', "{d}", "")' for d in "0123456789")
+)
+_ERROR_SCAN_QUERY = (
+    "fields @logStream, @message"
+    " | filter @message like /(?i)(error|fail|fatal|exception|traceback|denied|refused|timed out)/"
+    r" | parse @message /^(?:\S*\d{4}-\d\d-\d\d[T ]?\S*\s*(?:\d\d:\d\d:\d\d\S*\s*)?)?(?<body>.*)/"
+    f" | fields @logStream, {_ERROR_SCAN_SIGNATURE} as signature"
+    " | stats count(*) as events, earliest(@message) as sample by @logStream, signature"
+    " | sort events desc"
+    f" | limit {_ERROR_SCAN_ROW_LIMIT}"
+)
+_ERROR_SCAN_TIMEOUT = 120  # seconds to wait for the query before stopping it
+_ERROR_SCAN_MAX_POLL = 5.0
+_ERROR_SCAN_TOP_SIGNATURES = 25
+_ERROR_SCAN_TOP_NODES = 50
+
+# Applied in order to fold messages that differ only in timestamps, ids,
+# addresses and counters into one signature.
+_SIGNATURE_SUBS = [
+    (re.compile(r"^\S*\d{4}-\d\d-\d\d[T ]?\S*\s*(\d\d:\d\d:\d\d\S*\s*)?"), ""),
+    (re.compile(r"\b(i|vol|subnet|sg|eni|ami)-[0-9a-f]{8,17}\b"), r"\1-*"),
+    (re.compile(r"\bip-\d+-\d+-\d+-\d+\b"), "ip-*"),
+    (re.compile(r"\b\d{1,3}(\.\d{1,3}){3}\b"), "<ip>"),
+    (re.compile(r"\b(0x)?[0-9a-f]{8,}\b", re.I), "<hex>"),
+    (re.compile(r"\b\d+\b"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+_SIGNATURE_WIDTH = 120
+
+# --follow polls every stream at this interval while events keep arriving and
+# doubles it, up to the ceiling, while they do not.
+_FOLLOW_MIN_INTERVAL = 2.0
+_FOLLOW_MAX_INTERVAL = 30.0
+# A missing log group, head node or stream is looked for again this often;
+# a full stream listing on every poll would page the whole group forever
+# for a stream this cluster never writes.
+_FOLLOW_RESCAN_INTERVAL = 60.0
+
+# --compute_nodes: the head node ssh-es to every compute node at once, up to
+# --fanout at a time, so a 64-node cluster costs about what one node does.
+_DEFAULT_FANOUT = 64
+_MAX_FANOUT = 256
+_NODE_COLLECT_SECONDS = 60  # per node, after the connect timeout
+_FANOUT_MAX_SECONDS = 900   # local backstop should the head node stop answering
+_HOSTLIST_RE = re.compile(r"^[A-Za-z0-9_.\-\[\],]+$")
+
+# Run on each compute node by sh -s. Every section starts with an "@@@ name"
+# line; sudo -n because the logs and dmesg are root-only on most AMIs.
+_COMPUTE_COLLECT_SCRIPT = r"""
+n=__LINES__
+echo "@@@ cloud-init-output"
+sudo -n tail -n "$n" /var/log/cloud-init-output.log 2>&1
+echo "@@@ cinc"
+sudo -n tail -n "$n" /var/log/cinc/client.log 2>&1
+echo "@@@ dmesg"
+sudo -n dmesg -T 2>&1 | tail -n "$n"
+echo "@@@ nvidia-smi"
+if command -v nvidia-smi >/dev/null 2>&1; then
+  nvidia-smi --query-gpu=index,name,temperature.gpu,utilization.gpu,memory.used,memory.total,ecc.errors.uncorrected.volatile.total --format=csv,noheader 2>&1
+else
+  echo "(not installed)"
+fi
+echo "@@@ fi_info"
+PATH="$PATH:/opt/amazon/efa/bin"
+if command -v fi_info >/dev/null 2>&1; then
+  out=$(fi_info -p efa -t FI_EP_RDM 2>&1)
+  sum=$(echo "$out" | grep -E '^ *(provider|fabric|domain):')
+  if [ -n "$sum" ]; then
+    echo "$sum" | sort | uniq -c
+  else
+    echo "$out" | tail -n 1
+  fi
+else
+  echo "(not installed)"
+fi
+"""
+
+# Runs under the head node's python3, read from stdin, like check_pcluster's
+# probe. It prints one line per record, each zlib-compressed JSON in base64, as
+# soon as the record exists: first {"nodes": [...]} or {"error": ...}, then one
+# {"node", "rc", "output"} per compute node as it finishes, then {"done": true}.
+# Intra-cluster host keys change whenever a node is replaced, so they are not
+# pinned. Kept to what Python 3.6 offers.
+_FANOUT_SCRIPT = r"""
+import base64, json, subprocess, sys, threading, zlib
+from concurrent.futures import ThreadPoolExecutor
+
+timeout = __TIMEOUT__
+deadline = __DEADLINE__
+workers = __WORKERS__
+nodes = __NODES__
+collect = __COLLECT__
+lock = threading.Lock()
+
+
+def emit(record):
+    line = base64.b64encode(zlib.compress(json.dumps(record).encode())).decode()
+    with lock:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+
+# A powered-down dynamic node's base state is still IDLE, so -t idle lists
+# every unlaunched slot; the compact state's suffix (or a DOWN base state) is
+# what says there is no instance to reach.
+no_instance_suffixes = ("~", "#", "%", "!")
+no_instance_states = ("down", "powered_down", "powering_up")  # base state or +FLAG
+argv = ["sinfo", "-h", "-N", "-o", "%N %o %t"]
+argv += ["-n", nodes] if nodes else ["-t", "idle,alloc,mix,completing"]
+try:
+    out = subprocess.check_output(
+        argv, stderr=subprocess.STDOUT, universal_newlines=True, timeout=timeout,
+    )
+except (OSError, subprocess.SubprocessError) as e:
+    emit({"error": "sinfo failed: %s" % e})
+    sys.exit(0)
+targets, skipped = {}, set()
+for line in out.splitlines():
+    parts = line.split()
+    if len(parts) != 3:
+        continue
+    state = parts[2].lower()
+    flags = state.rstrip("*").split("+")
+    if state.endswith(no_instance_suffixes) or any(f in no_instance_states for f in flags):
+        skipped.add(parts[0])
+    else:
+        targets[parts[0]] = parts[1]
+record = {"nodes": sorted(targets)}
+if skipped:
+    record["skipped"] = sorted(skipped - set(targets))
+emit(record)
+
+
+def collect_node(name):
+    argv = [
+        "ssh", "-o", "BatchMode=yes", "-o", "ConnectTimeout=%d" % timeout,
+        "-o", "StrictHostKeyChecking=no", "-o", "UserKnownHostsFile=/dev/null",
+        "-o", "LogLevel=ERROR", targets[name], "sh", "-s",
+    ]
+    try:
+        proc = subprocess.Popen(
+            argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, universal_newlines=True,
+        )
+    except OSError as e:
+        emit({"node": name, "rc": 127, "output": str(e)})
+        return
+    try:
+        out, _ = proc.communicate(collect, timeout=deadline)
+        emit({"node": name, "rc": proc.returncode, "output": out})
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        out, _ = proc.communicate()
+        emit({"node": name, "rc": None, "output": out})
+
+
+with ThreadPoolExecutor(max_workers=workers) as pool:
+    list(pool.map(collect_node, sorted(targets)))
+emit({"done": True})
+"""
 
 
 def _banner(title):
@@ -69,6 +246,7 @@ def _ssh_args(head_ip, ssh_keypair, ec2_user, timeout):
         "-o", f"ConnectTimeout={timeout}",
         "-o", "StrictHostKeyChecking=accept-new",
         "-o", "BatchMode=yes",
+        *_ssh_control_options(),
         f"{ec2_user}@{head_ip}",
     ]
 
@@ -79,15 +257,144 @@ def _run_ssh(head_ip, ssh_keypair, ec2_user, timeout, remote_cmd):
     return result.returncode, result.stdout, result.stderr
 
 
-def _get_head_ip(cluster_name, region):
-    """Return (head_ip, error_str). Calls pcluster describe-cluster."""
+def _fanout_script(timeout, workers, nodes, n_lines):
+    """Return _FANOUT_SCRIPT filled in; nodes is a Slurm hostlist or None for every up node."""
+    return (
+        _FANOUT_SCRIPT
+        .replace("__TIMEOUT__", str(timeout))
+        .replace("__DEADLINE__", str(timeout + _NODE_COLLECT_SECONDS))
+        .replace("__WORKERS__", str(workers))
+        .replace("__NODES__", json.dumps(nodes or ""))
+        .replace("__COLLECT__", json.dumps(
+            _COMPUTE_COLLECT_SCRIPT.replace("__LINES__", str(n_lines))
+        ))
+    )
+
+
+def _decode_fanout_record(line):
+    """Return the dict one fan-out output line carries, or None for anything else."""
     try:
-        data = _run_pcluster_cmd(
-            ["describe-cluster", "--cluster-name", cluster_name, "--region", region],
-            _PCLUSTER_BIN,
-        )
+        record = json.loads(zlib.decompress(base64.b64decode(line.strip(), validate=True)))
+    except (ValueError, zlib.error):
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _stream_fanout(head_ip, ssh_keypair, ec2_user, timeout, script):
+    """Run script on the head node; yield each record as its line arrives, then (rc, stderr).
+
+    The last item yielded is always a tuple of the ssh exit code and stderr,
+    so the caller can tell an unreachable head node from a fan-out that ended
+    early.
+    """
+    proc = subprocess.Popen(
+        _ssh_args(head_ip, ssh_keypair, ec2_user, timeout) + ["python3", "-"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    watchdog = threading.Timer(_FANOUT_MAX_SECONDS, proc.kill)
+    watchdog.start()
+    try:
+        proc.stdin.write(script)
+        proc.stdin.close()
+        for line in proc.stdout:
+            record = _decode_fanout_record(line)
+            if record is not None:
+                yield record
+        stderr = proc.stderr.read()
+        yield proc.wait(), stderr
+    finally:
+        watchdog.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+
+def _split_sections(output):
+    """Return [(section, [lines])] from a node's "@@@ name"-delimited output.
+
+    Anything before the first marker, such as an ssh error, is filed under "ssh".
+    """
+    sections = []
+    for line in output.splitlines():
+        if line.startswith("@@@ "):
+            sections.append((line[4:].strip(), []))
+        elif line.strip():
+            if not sections:
+                sections.append(("ssh", []))
+            sections[-1][1].append(line)
+    return sections
+
+
+def _print_node_report(record):
+    node, rc = record["node"], record.get("rc")
+    sections = _split_sections(record.get("output", ""))
+    if rc is None:
+        _sub_banner(f"{node}  (timed out; partial output)")
+    elif rc == 255:
+        _sub_banner(f"{node}  (unreachable)")
+    else:
+        _sub_banner(node)
+    for name, lines in sections:
+        print(f"  [{name}]")
+        print("\n".join(f"    {line}" for line in lines) if lines else "    (empty)")
+
+
+def _diagnose_compute_nodes(head_ip, ssh_keypair, ec2_user, timeout, nodes, workers, n_lines):
+    """Collect logs and hardware summaries from compute nodes through the head node.
+
+    One SSH session to the head node carries everything: it runs
+    _FANOUT_SCRIPT, which ssh-es to up to workers compute nodes at once and
+    streams each node's compressed report back as soon as that node finishes.
+    Reports are printed in the order they arrive.
+    """
+    script = _fanout_script(timeout, workers, nodes, n_lines)
+    expected, reached, failed, done = None, 0, [], False
+    try:
+        for item in _stream_fanout(head_ip, ssh_keypair, ec2_user, timeout, script):
+            if isinstance(item, tuple):
+                rc, stderr = item
+                if expected is None:
+                    print(f"  fan-out failed (rc={rc}): {stderr.strip()[:200]}")
+                elif not done:
+                    print(f"\n  fan-out ended early (rc={rc}): {stderr.strip()[:200]}")
+            elif "error" in item:
+                print(f"  {item['error']}")
+                return
+            elif "nodes" in item:
+                expected = item["nodes"]
+                if item.get("skipped"):
+                    print(f"  skipped {len(item['skipped'])} powered-down or down node(s)")
+                if not expected:
+                    print("  (no matching compute nodes)" if nodes else "  (no idle or allocated compute nodes)")
+                    return
+                print(f"  {len(expected)} node(s), up to {workers} at a time")
+            elif "node" in item:
+                _print_node_report(item)
+                if item.get("rc") == 0:
+                    reached += 1
+                else:
+                    failed.append(item["node"])
+            elif item.get("done"):
+                done = True
+    except OSError as e:
+        print(f"  fan-out failed: {e}")
+        return
+    if expected:
+        print(f"\n  collected from {reached} of {len(expected)} node(s)")
+        if failed:
+            print(f"  incomplete: {', '.join(sorted(failed))}")
+
+
+def _describe_for_diagnose(cluster_name, region, backend="cli"):
+    """Return (describe-cluster data, error_str) on the chosen backend."""
+    try:
+        return _describe_cluster(cluster_name, region, _PCLUSTER_BIN, backend=backend), None
     except SystemExit as e:
         return None, str(e)
+
+
+def _get_head_ip(data):
+    """Return (head_ip, error_str) from describe-cluster data."""
     cs = data.get("clusterStatus", "UNKNOWN")
     if cs != "CREATE_COMPLETE":
         return None, f"cluster not in CREATE_COMPLETE state (clusterStatus={cs})"
@@ -98,10 +405,34 @@ def _get_head_ip(cluster_name, region):
     return ip, None
 
 
-def _fetch_cw_logs(cluster_name, region, streams, n_lines):
-    """Fetch the last n_lines events from each CW stream. Returns dict {stream: [lines]}."""
-    logs = boto3.client("logs", region_name=region)
-    results = {}
+def _head_stream_prefix(data):
+    """Return the "<hostname>.<instance-id>." prefix of the head node's log streams, or None.
+
+    PCluster names every stream after the node that wrote it, and the head
+    node's hostname is the EC2 default derived from its private IP.
+    """
+    head_node = (data or {}).get("headNode") or {}
+    ip, instance_id = head_node.get("privateIpAddress"), head_node.get("instanceId")
+    if not ip or not instance_id:
+        return None
+    return f"ip-{ip.replace('.', '-')}.{instance_id}."
+
+
+def _cw_streams(enable_monitoring):
+    """Return the head node streams diagnose reads, with the monitoring ones when enabled."""
+    if enable_monitoring == "true":
+        return _CW_STREAMS + ["grafana", "prometheus"]
+    return list(_CW_STREAMS)
+
+
+def _find_cw_log_group(logs, cluster_name):
+    """Return (log_group or None, error) for the cluster's newest /aws/parallelcluster group.
+
+    error is set only when the lookup itself failed; a group that does not
+    exist yet is (None, None).
+    """
+    from botocore.exceptions import BotoCoreError, ClientError
+
     try:
         group_names = []
         for page in logs.get_paginator("describe_log_groups").paginate(
@@ -116,63 +447,368 @@ def _fetch_cw_logs(cluster_name, region, streams, n_lines):
         return None, f"CloudWatch error: {code}"
     except BotoCoreError as e:
         return None, f"CloudWatch network error: {e}"
+    return _select_cw_log_group(cluster_name, group_names), None
+
+
+def _no_cw_log_group(cluster_name):
+    return (
+        f"no CloudWatch log group for '{cluster_name}' — PCluster creates "
+        f"/aws/parallelcluster/{cluster_name}-<timestamp> once the head node "
+        "starts logging, which is several minutes into a build"
+    )
+
 
-    log_group = _select_cw_log_group(cluster_name, group_names)
+def _resolve_cw_log_group(logs, cluster_name):
+    """Return (log_group, error), treating a group that does not exist yet as an error."""
+    log_group, err = _find_cw_log_group(logs, cluster_name)
+    if err:
+        return None, err
     if log_group is None:
-        return None, (
-            f"no CloudWatch log group for '{cluster_name}' — PCluster creates "
-            f"/aws/parallelcluster/{cluster_name}-<timestamp> once the head node "
-            "starts logging, which is several minutes into a build"
-        )
+        return None, _no_cw_log_group(cluster_name)
+    return log_group, None
+
+
+def _fetch_cw_logs(cluster_name, region, streams, n_lines, prefix=None):
+    """Fetch the last n_lines events from each CW stream. Returns dict {stream: [lines]}.
+
+    Streams are located by the head node's prefix (see _find_cw_streams)
+    and tailed concurrently.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    logs = _aws_client("logs", region)
+    log_group, err = _resolve_cw_log_group(logs, cluster_name)
+    if err:
+        return None, err
     print(f"  log group: {log_group}")
 
     try:
-        existing = []
+        targets = _find_cw_streams(logs, log_group, streams, prefix)
+    except ClientError as e:
+        code = e.response["Error"]["Code"]
+        if code == "AccessDeniedException":
+            return None, f"CloudWatch unavailable: {code} — add logs:DescribeLogStreams to the operator policy, or use --no_cw"
+        return None, f"CloudWatch error: {code}"
+    except BotoCoreError as e:
+        return None, f"CloudWatch network error: {e}"
+
+    found = [stream for stream in streams if stream in targets]
+    results = {stream: [] for stream in streams}
+    if found:
+        with ThreadPoolExecutor(max_workers=min(_CW_FETCH_WORKERS, len(found))) as pool:
+            tails = pool.map(
+                lambda stream: _tail_cw_stream(logs, log_group, targets[stream], n_lines),
+                found,
+            )
+            results.update(zip(found, tails))
+    return results, None
+
+
+def _find_cw_streams(logs, log_group, wanted, prefix=None):
+    """Return {name: log stream} for each name in wanted that has a stream.
+
+    With prefix, the head node's "<hostname>.<instance-id>." from
+    _head_stream_prefix, only the head node's own streams are listed, so a
+    compute node's cloud-init-output can never stand in for the head
+    node's, and the lookup costs one short page however many compute-node
+    streams the group holds. If that listing finds none of wanted (the
+    subnet gives resource-name or custom hostnames, not the IP-derived
+    one), streams are paged newest-activity first, keeping only the head
+    node's instance id. Without prefix (describe-cluster failed, or the head
+    node is not up yet) any stream containing the name is taken. Paging stops
+    once every name has a stream.
+    """
+    targets = {}
+    marker = ""
+    if prefix:
         for page in logs.get_paginator("describe_log_streams").paginate(
-            logGroupName=log_group, orderBy="LastEventTime", descending=True
+            logGroupName=log_group, logStreamNamePrefix=prefix
         ):
             for s in page.get("logStreams", []):
-                existing.append(s["logStreamName"])
+                name = s["logStreamName"][len(prefix):]
+                if name in wanted:
+                    targets[name] = s["logStreamName"]
+        if targets:
+            return targets
+        # The stream name is "<hostname>.<instance-id>.<log>"; only the
+        # hostname part of the prefix is a guess.
+        marker = "." + prefix.rstrip(".").rsplit(".", 1)[-1] + "."
+    for page in logs.get_paginator("describe_log_streams").paginate(
+        logGroupName=log_group, orderBy="LastEventTime", descending=True
+    ):
+        for s in page.get("logStreams", []):
+            for name in wanted:
+                if name in targets:
+                    continue
+                stream = s["logStreamName"]
+                if stream.endswith(marker + name) if marker else name in stream:
+                    targets[name] = stream
+        if len(targets) == len(wanted):
+            break
+    return targets
+
+
+def _format_cw_event(event):
+    ts = datetime.fromtimestamp(event["timestamp"] / 1000, tz=timezone.utc)
+    return f"  {ts.strftime('%Y-%m-%d %H:%M:%S')}  {event['message'].rstrip()}"
+
+
+def _tail_cw_stream(logs, log_group, stream_name, n_lines):
+    """Return the last n_lines events of one stream, paging backwards; [] on error."""
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    all_lines = []
+    kwargs = dict(
+        logGroupName=log_group,
+        logStreamName=stream_name,
+        startFromHead=False,
+    )
+    try:
+        while len(all_lines) < n_lines:
+            resp = logs.get_log_events(**kwargs)
+            events = resp.get("events", [])
+            if not events:
+                break
+            all_lines = [_format_cw_event(e) for e in events] + all_lines
+            next_token = resp.get("nextBackwardToken")
+            if not next_token or next_token == kwargs.get("nextToken"):
+                break
+            kwargs["nextToken"] = next_token
+    except (ClientError, BotoCoreError):
+        pass
+    return all_lines[-n_lines:]
+
+
+def _print_followed(name, events):
+    for e in events:
+        print(f"[{name}]{_format_cw_event(e)}")
+
+
+def _poll_cw_stream(logs, log_group, stream_name, token):
+    """Return (events, next_forward_token): every event written after token.
+
+    GetLogEvents hands back the token it was given once the stream has
+    nothing newer, which is what ends the loop.
+    """
+    events = []
+    while True:
+        resp = logs.get_log_events(
+            logGroupName=log_group, logStreamName=stream_name,
+            nextToken=token, startFromHead=True,
+        )
+        batch = resp.get("events", [])
+        events.extend(batch)
+        next_token = resp.get("nextForwardToken") or token
+        if not batch or next_token == token:
+            return events, next_token
+        token = next_token
+
+
+def _follow_cw_logs(cluster_name, region, streams, n_lines, prefix=None, backend=None):
+    """Print the last n_lines of each stream, then only new events as they arrive, until Ctrl-C.
+
+    Each stream's nextForwardToken is kept between polls, so a poll returns
+    only what was written since the last one. Early in a build the log
+    group, the head node and most streams do not exist yet. They are looked
+    for again every _FOLLOW_RESCAN_INTERVAL seconds, not on every poll, and
+    picked up when they appear; with backend set, the head node is
+    described again until its stream prefix is known, and streams taken
+    before then are looked up again under it.
+    """
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    logs = _aws_client("logs", region)
+    print("  following; press Ctrl-C to stop\n")
+
+    log_group, waiting = None, False
+    followed = {}  # wanted name -> [log stream, next forward token]
+    interval = _FOLLOW_MIN_INTERVAL
+    next_scan = time.monotonic()
+    try:
+        while True:
+            arrived = 0
+            missing = [name for name in streams if name not in followed]
+            unsure = prefix is None and backend
+            if (log_group is None or missing or unsure) and time.monotonic() >= next_scan:
+                next_scan = time.monotonic() + _FOLLOW_RESCAN_INTERVAL
+                if log_group is None:
+                    log_group, err = _find_cw_log_group(logs, cluster_name)
+                    if err:
+                        print(f"  {err}")
+                        return
+                    if log_group is None:
+                        if not waiting:
+                            print(f"  {_no_cw_log_group(cluster_name)}; waiting for it")
+                        waiting = True
+                    else:
+                        print(f"  log group: {log_group}")
+                if log_group is not None and unsure:
+                    prefix = _head_stream_prefix(
+                        _describe_for_diagnose(cluster_name, region, backend)[0]
+                    )
+                    if prefix:
+                        # Streams taken before the head node was known may be
+                        # a compute node's; look every one up again.
+                        missing = list(streams)
+                if log_group is not None and missing:
+                    try:
+                        found = _find_cw_streams(logs, log_group, missing, prefix)
+                        for name in missing:
+                            if name in followed and found.get(name) != followed[name][0]:
+                                del followed[name]
+                        for name, stream_name in found.items():
+                            if name in followed:
+                                continue
+                            resp = logs.get_log_events(
+                                logGroupName=log_group, logStreamName=stream_name,
+                                startFromHead=False, limit=n_lines,
+                            )
+                            _print_followed(name, resp.get("events", []))
+                            arrived += len(resp.get("events", []))
+                            followed[name] = [stream_name, resp.get("nextForwardToken")]
+                    except (ClientError, BotoCoreError) as e:
+                        print(f"  (stream lookup failed: {e})")
+            for name in streams:
+                if name not in followed or followed[name][1] is None:
+                    continue
+                stream_name, token = followed[name]
+                try:
+                    events, followed[name][1] = _poll_cw_stream(logs, log_group, stream_name, token)
+                except (ClientError, BotoCoreError) as e:
+                    print(f"[{name}]  (poll failed: {e})")
+                    continue
+                _print_followed(name, events)
+                arrived += len(events)
+            # Quiet or failing polls back off; any new event snaps back.
+            interval = _FOLLOW_MIN_INTERVAL if arrived else min(interval * 2, _FOLLOW_MAX_INTERVAL)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped following.")
+
+
+def _error_signature(message):
+    """Return message with its variable parts masked, so repeats of one failure group together."""
+    sig = message.strip()
+    for pattern, repl in _SIGNATURE_SUBS:
+        sig = pattern.sub(repl, sig)
+    sig = sig.strip()
+    return sig if len(sig) <= _SIGNATURE_WIDTH else sig[: _SIGNATURE_WIDTH - 1] + "…"
+
+
+def _run_insights_query(logs, log_group, query, start, end):
+    """Run one Logs Insights query and return (rows as dicts, error).
+
+    Polls get_query_results with a doubling delay capped at
+    _ERROR_SCAN_MAX_POLL; a query still running after _ERROR_SCAN_TIMEOUT is
+    stopped so it does not keep counting against the account's concurrent
+    query limit.
+    """
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    try:
+        query_id = logs.start_query(
+            logGroupName=log_group,
+            startTime=int(start.timestamp()),
+            endTime=int(end.timestamp()),
+            queryString=query,
+        )["queryId"]
+        deadline = time.monotonic() + _ERROR_SCAN_TIMEOUT
+        delay = 0.5
+        while True:
+            resp = logs.get_query_results(queryId=query_id)
+            status = resp.get("status")
+            if status == "Complete":
+                return [
+                    {f["field"]: f.get("value", "") for f in row}
+                    for row in resp.get("results", [])
+                ], None
+            if status not in ("Scheduled", "Running"):
+                return None, f"Logs Insights query ended with status {status}"
+            if time.monotonic() >= deadline:
+                try:
+                    logs.stop_query(queryId=query_id)
+                except (ClientError, BotoCoreError):
+                    pass
+                return None, f"Logs Insights query did not finish within {_ERROR_SCAN_TIMEOUT}s"
+            time.sleep(delay)
+            delay = min(delay * 2, _ERROR_SCAN_MAX_POLL)
     except ClientError as e:
         code = e.response["Error"]["Code"]
         if code == "AccessDeniedException":
-            return None, f"CloudWatch unavailable: {code} — add logs:DescribeLogStreams to the operator policy, or use --no_cw"
-        return None, f"CloudWatch error: {code}"
+            return None, f"Logs Insights unavailable: {code} — add logs:StartQuery and logs:GetQueryResults to the operator policy"
+        return None, f"Logs Insights error: {code}"
     except BotoCoreError as e:
         return None, f"CloudWatch network error: {e}"
 
-    for stream in streams:
-        matched = [s for s in existing if stream in s]
-        if not matched:
-            results[stream] = []
+
+def _summarize_error_rows(rows):
+    """Fold Insights rows into ({node: events}, [(signature, events, {nodes})]), largest first.
+
+    PCluster names streams <hostname>.<instance-id>.<log>, so the node is
+    everything before the first dot.
+    """
+    by_node = {}
+    by_signature = {}
+    for row in rows:
+        try:
+            events = int(float(row.get("events", "0")))
+        except ValueError:
             continue
-        target = matched[0]
-        all_lines = []
-        kwargs = dict(
-            logGroupName=log_group,
-            logStreamName=target,
-            startFromHead=False,
+        node = row.get("@logStream", "?").split(".", 1)[0]
+        by_node[node] = by_node.get(node, 0) + events
+        entry = by_signature.setdefault(_error_signature(row.get("sample", "")), [0, set()])
+        entry[0] += events
+        entry[1].add(node)
+    nodes = dict(sorted(by_node.items(), key=lambda kv: (-kv[1], kv[0])))
+    signatures = sorted(
+        ((sig, events, nodes_) for sig, (events, nodes_) in by_signature.items()),
+        key=lambda t: (-t[1], t[0]),
+    )
+    return nodes, signatures
+
+
+def _scan_cw_errors(cluster_name, region, hours):
+    """Print error counts by node and by message signature across every stream in the cluster's group."""
+    logs = _aws_client("logs", region)
+    log_group, err = _resolve_cw_log_group(logs, cluster_name)
+    if err:
+        print(f"  {err}")
+        return
+    print(f"  log group: {log_group}")
+    end = datetime.now(timezone.utc)
+    rows, err = _run_insights_query(
+        logs, log_group, _ERROR_SCAN_QUERY, end - timedelta(hours=hours), end
+    )
+    if err:
+        print(f"  {err}")
+        return
+    if len(rows) >= _ERROR_SCAN_ROW_LIMIT:
+        print(
+            f"  WARNING: the query returned its {_ERROR_SCAN_ROW_LIMIT}-row limit; "
+            "the rarest (stream, signature) rows and their counts are missing. "
+            "Narrow --hours for complete counts."
         )
-        try:
-            while len(all_lines) < n_lines:
-                resp = logs.get_log_events(**kwargs)
-                events = resp.get("events", [])
-                if not events:
-                    break
-                page_lines = [
-                    f"  {datetime.fromtimestamp(e['timestamp'] / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')}  {e['message'].rstrip()}"
-                    for e in events
-                ]
-                all_lines = page_lines + all_lines
-                next_token = resp.get("nextBackwardToken")
-                if not next_token or next_token == kwargs.get("nextToken"):
-                    break
-                kwargs["nextToken"] = next_token
-        except (ClientError, BotoCoreError):
-            pass
-        results[stream] = all_lines[-n_lines:]
+    nodes, signatures = _summarize_error_rows(rows)
+    if not nodes:
+        print(f"  No error or failure messages in the last {hours}h")
+        return
+    print(f"  {sum(nodes.values())} matching event(s) across {len(nodes)} node(s)")
 
-    return results, None
+    _sub_banner("Events by node")
+    width = max(len(n) for n in nodes)
+    for node, events in list(nodes.items())[:_ERROR_SCAN_TOP_NODES]:
+        print(f"  {node.ljust(width)}  {events}")
+    if len(nodes) > _ERROR_SCAN_TOP_NODES:
+        print(f"  ... and {len(nodes) - _ERROR_SCAN_TOP_NODES} more node(s)")
+
+    _sub_banner("Top message signatures")
+    print(f"  {'events':>7}  {'nodes':>5}  signature")
+    for sig, events, sig_nodes in signatures[:_ERROR_SCAN_TOP_SIGNATURES]:
+        print(f"  {events:>7}  {len(sig_nodes):>5}  {sig}")
+    if len(signatures) > _ERROR_SCAN_TOP_SIGNATURES:
+        print(f"  ... and {len(signatures) - _ERROR_SCAN_TOP_SIGNATURES} more signature(s)")
 
 
 def _tail_lines(text, n):
@@ -245,8 +881,57 @@ def main():
         "--no_cw", action="store_true",
         help="Skip CloudWatch log section",
     )
+    parser.add_argument(
+        "--follow", action="store_true",
+        help="Instead of the usual sections, print the last --cw_lines lines of "
+             "each head node bootstrap stream and then stream new events as "
+             "they arrive, until Ctrl-C",
+    )
+    parser.add_argument(
+        "--scan_errors", action="store_true",
+        help="Instead of the usual sections, count error and failure messages "
+             "across every stream in the cluster's CloudWatch log group, head "
+             "and compute nodes alike, over the last --hours hours",
+    )
+    parser.add_argument(
+        "--compute_nodes", action="store_true",
+        help="Instead of the usual sections, collect the last --log_lines lines "
+             "of cloud-init-output, cinc and dmesg plus nvidia-smi and fi_info "
+             "summaries from every idle or allocated compute node, in parallel "
+             "through the head node",
+    )
+    parser.add_argument(
+        "--nodes", default=None, metavar="HOSTLIST",
+        help="With --compute_nodes, only these nodes, as a Slurm hostlist "
+             "(e.g. queue1-dy-c5-[1-4]), whatever their state",
+    )
+    parser.add_argument(
+        "--fanout", type=int, default=_DEFAULT_FANOUT,
+        help=f"With --compute_nodes, nodes contacted at once "
+             f"(default: {_DEFAULT_FANOUT}, max: {_MAX_FANOUT})",
+    )
+    parser.add_argument(
+        "--describe_backend", choices=_DESCRIBE_BACKENDS, default="native",
+        help="How to read cluster status: native API calls, falling back to "
+             "the pcluster CLI on error (default), or the CLI only.",
+    )
     args = parser.parse_args()
+    if args.follow and (args.no_cw or args.scan_errors):
+        parser.error("--follow reads CloudWatch; it cannot be combined with --no_cw or --scan_errors")
+    if args.compute_nodes and (args.follow or args.scan_errors):
+        parser.error("--compute_nodes cannot be combined with --follow or --scan_errors")
+    if args.nodes is not None:
+        if not args.compute_nodes:
+            parser.error("--nodes requires --compute_nodes")
+        if not _HOSTLIST_RE.match(args.nodes):
+            parser.error(f"--nodes {args.nodes!r} is not a Slurm hostlist")
+
+    # Every remote command shares one SSH connection to the head node.
+    with _ssh_multiplexed():
+        _diagnose(args)
+
 
+def _diagnose(args):
     cluster_name = args.cluster_name
     _validate_cluster_name(cluster_name)
 
@@ -275,8 +960,29 @@ def main():
     print(f"Diagnosing cluster: {cluster_name}  ({region})")
     print(f"  serial: {serial}")
 
+    if args.scan_errors:
+        _banner(f"CloudWatch Logs Insights: error scan (last {args.hours}h)")
+        _scan_cw_errors(cluster_name, region, args.hours)
+        print("")
+        return
+
+    # The head node's identity names its log streams, whatever the cluster
+    # status; a failed build is when its bootstrap logs matter most.
+    described, err = _describe_for_diagnose(cluster_name, region, args.describe_backend)
+    stream_prefix = _head_stream_prefix(described)
+
+    if args.follow:
+        _banner("CloudWatch: following head node bootstrap logs")
+        _follow_cw_logs(
+            cluster_name, region, _cw_streams(enable_monitoring), cw_lines, stream_prefix,
+            args.describe_backend,
+        )
+        return
+
     # --- Head node IP ---
-    head_ip, err = _get_head_ip(cluster_name, region)
+    head_ip = None
+    if not err:
+        head_ip, err = _get_head_ip(described)
     if err:
         print(f"\nERROR: cannot reach cluster — {err}")
         print("CloudWatch logs may still be available; omit --no_cw to enable them.")
@@ -285,15 +991,25 @@ def main():
         print(f"  head node: {head_ip}")
         ssh_ok = True
 
+    if args.compute_nodes:
+        if not ssh_ok:
+            sys.exit(1)
+        fanout = _clamp_int(args.fanout, 1, _MAX_FANOUT, "--fanout")
+        _banner(f"Compute nodes (last {log_lines} lines each)")
+        _diagnose_compute_nodes(
+            head_ip, ssh_keypair, ec2_user, args.timeout, args.nodes, fanout, log_lines
+        )
+        print("")
+        return
+
     # -------------------------------------------------------------------------
     # Section 1: CloudWatch bootstrap logs
     # -------------------------------------------------------------------------
     if not args.no_cw:
         _banner("CloudWatch: head node bootstrap logs")
-        streams = _CW_STREAMS
-        if enable_monitoring == "true":
-            streams = streams + ["grafana", "prometheus"]
-        cw_results, cw_err = _fetch_cw_logs(cluster_name, region, streams, cw_lines)
+        cw_results, cw_err = _fetch_cw_logs(
+            cluster_name, region, _cw_streams(enable_monitoring), cw_lines, stream_prefix
+        )
         if cw_err:
             print(f"  {cw_err}")
         else:
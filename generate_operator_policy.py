@@ -21,16 +21,18 @@ if os.path.realpath(sys.prefix) != os.path.realpath(os.path.join(_repo_root, ".v
 import argparse
 import json
 
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError
+sys.path.insert(0, _src_dir)
+from pcluster_aws import _aws_client
 
 _TEMPLATE = os.path.join(_repo_root, "templates", "OperatorPolicy.json_src")
 _POLICY_NAME = "parallelcluster-operator-pclustermaker"
 
 
 def _get_account_id():
+    from botocore.exceptions import BotoCoreError, ClientError
+
     try:
-        return boto3.client("sts").get_caller_identity()["Account"]
+        return _aws_client("sts").get_caller_identity()["Account"]
     except (ClientError, BotoCoreError) as e:
         sys.exit(f"ERROR: could not resolve AWS account ID: {e}")
 
@@ -45,6 +47,8 @@ def _render(account_id):
 
 
 def _create_policy(iam, rendered, policy_name, description):
+    from botocore.exceptions import BotoCoreError, ClientError
+
     try:
         resp = iam.create_policy(
             PolicyName=policy_name,
@@ -117,7 +121,7 @@ def main():
     # policy file on disk after a failed create, which reads as success.
     arn = None
     if args.create:
-        iam = boto3.client("iam")
+        iam = _aws_client("iam")
         arn = _create_policy(iam, rendered, args.policy_name, args.description)
 
     if args.output:
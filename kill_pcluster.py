@@ -22,18 +22,12 @@ if os.path.realpath(sys.prefix) != os.path.realpath(os.path.join(_repo_root, ".v
 # Load some required Python libraries.
 
 import argparse
-import boto3
 import contextlib
-from botocore.exceptions import (
-    BotoCoreError,
-    ClientError,
-    EndpointConnectionError,
-    NoCredentialsError,
-)
 import json
 import subprocess
 
 sys.path.insert(0, _src_dir)
+from pcluster_aws import _activate_profile, _aws_client
 from pcluster_core import (
     _read_serial_first_line,
     _extract_rebuild_command,
@@ -170,8 +164,15 @@ def main():
 
     # Verify AZ with operator's base credentials before any profile switch.
 
+    from botocore.exceptions import (
+        BotoCoreError,
+        ClientError,
+        EndpointConnectionError,
+        NoCredentialsError,
+    )
+
     try:
-        ec2client = boto3.client("ec2", region_name=region)
+        ec2client = _aws_client("ec2", region)
         _az_info = ec2client.describe_availability_zones(ZoneNames=[az])
     except (
         ValueError,
@@ -193,9 +194,7 @@ def main():
     # Activate Turbot profile now that region is confirmed from the API.
     if turbot_account != "disabled":
         turbot_profile = "turbot__" + turbot_account + "__" + cluster_owner
-        os.environ["AWS_PROFILE"] = turbot_profile
-        os.environ["AWS_DEFAULT_REGION"] = region
-        boto3.setup_default_session(profile_name=turbot_profile)
+        _activate_profile(turbot_profile, region)
         p_val("turbot_account", debug_mode)
 
     cluster_destroy_command = " ".join(sys.argv)
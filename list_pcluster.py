@@ -24,11 +24,18 @@ import subprocess
 from datetime import datetime, timezone
 
 sys.path.insert(0, _src_dir)
-from pcluster_core import _read_cluster_record, _validate_cluster_name
+from pcluster_core import (
+    _DESCRIBE_BACKENDS,
+    _enumerate_clusters,
+    _inventory_path,
+    _read_cluster_records,
+    _sweep_stack_statuses,
+    _try_describe_cluster_native,
+)
 
 _PCLUSTER_BIN = os.path.join(_repo_root, ".venv", "bin", "pcluster")
-_ACTIVE_CLUSTERS_DIR = os.path.join(_repo_root, "active_clusters")
 _TRUNC = 20
+_LIVE_WORKERS = 8  # regions swept, or fallback clusters described, at once
 
 
 def _truncate(s, width):
@@ -53,7 +60,11 @@ def _age_str(deployment_date):
         return "?"
 
 
-def _live_status(cluster_name, region):
+def _live_status(cluster_name, region, backend="cli"):
+    if backend == "native":
+        data = _try_describe_cluster_native(cluster_name, region)
+        if data is not None:
+            return f"{data['clusterStatus']} / {data['cloudFormationStackStatus']}"
     try:
         result = subprocess.run(
             [_PCLUSTER_BIN, "describe-cluster",
@@ -73,20 +84,32 @@ def _live_status(cluster_name, region):
         return "ERR"
 
 
-def _enumerate_clusters():
-    if not os.path.isdir(_ACTIVE_CLUSTERS_DIR):
-        return []
-    names = []
-    for entry in os.scandir(_ACTIVE_CLUSTERS_DIR):
-        if not entry.is_dir(follow_symlinks=False):
-            continue
-        name = entry.name
-        try:
-            _validate_cluster_name(name)
-        except SystemExit:
-            continue
-        names.append(name)
-    return sorted(names)
+def _live_statuses(records, backend="cli"):
+    """Return {cluster_name: status} for records, one stack sweep per region.
+
+    Regions are swept concurrently; a cluster the sweep did not return (or
+    every cluster in a region whose sweep failed) falls back to _live_status.
+    The cli backend skips the sweep and describes each cluster.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    regions = sorted({r["region"] for r in records})
+    with ThreadPoolExecutor(max_workers=_LIVE_WORKERS) as pool:
+        sweeps = {}
+        if backend == "native" and regions:
+            sweeps = dict(zip(regions, pool.map(_sweep_stack_statuses, regions)))
+        statuses, missed = {}, []
+        for r in records:
+            hit = (sweeps.get(r["region"]) or {}).get(r["cluster_name"])
+            if hit is None:
+                missed.append(r)
+            else:
+                statuses[r["cluster_name"]] = f"{hit[0]} / {hit[1]}"
+        fallback = pool.map(
+            lambda r: _live_status(r["cluster_name"], r["region"], backend), missed
+        )
+        statuses.update(zip((r["cluster_name"] for r in missed), fallback))
+    return statuses
 
 
 def _print_table(records, wide):
@@ -147,7 +170,12 @@ def main():
     )
     parser.add_argument(
         "-L", "--live", action="store_true",
-        help="Query pcluster describe-cluster for live status (one API call per cluster).",
+        help="Query live status (one CloudFormation sweep per region).",
+    )
+    parser.add_argument(
+        "--describe_backend", choices=_DESCRIBE_BACKENDS, default="native",
+        help="How --live reads cluster status: native API calls, falling back "
+             "to the pcluster CLI on error (default), or the CLI only.",
     )
     parser.add_argument("-R", "--region", help="Filter by AWS region.")
     parser.add_argument("-O", "--owner", help="Filter by cluster owner.")
@@ -159,12 +187,21 @@ def main():
         "-J", "--json", action="store_true",
         help="Emit JSON array instead of table.",
     )
+    parser.add_argument(
+        "--rebuild_index", action="store_true",
+        help="Re-read every vars file into the local inventory index and exit.",
+    )
     args = parser.parse_args()
 
-    names = _enumerate_clusters()
+    names = _enumerate_clusters(_repo_root)
+    if args.rebuild_index:
+        indexed = _read_cluster_records(names, _repo_root, rebuild=True)
+        count = sum(rec is not None for rec in indexed.values())
+        print(f"Indexed {count} of {len(names)} cluster(s) in {_inventory_path(_repo_root)}")
+        return
+
     records = []
-    for name in names:
-        rec = _read_cluster_record(name, _repo_root)
+    for name, rec in _read_cluster_records(names, _repo_root).items():
         if rec is None:
             print(
                 f"WARNING: skipping {name} (vars file missing or unreadable)",
@@ -176,11 +213,14 @@ def main():
         if args.owner and rec["cluster_owner"] != args.owner:
             continue
         rec["age"] = _age_str(rec["deployment_date"])
-        rec["status"] = (
-            _live_status(rec["cluster_name"], rec["region"]) if args.live else "LOCAL"
-        )
+        rec["status"] = "LOCAL"
         records.append(rec)
 
+    if args.live:
+        statuses = _live_statuses(records, args.describe_backend)
+        for rec in records:
+            rec["status"] = statuses[rec["cluster_name"]]
+
     if args.json:
         print(json.dumps(records, indent=2))
     else:
@@ -22,24 +22,20 @@ if os.path.realpath(sys.prefix) != os.path.realpath(os.path.join(_repo_root, ".v
 # Load the required Python libraries.
 
 import argparse
-import boto3
 import contextlib
 import json
 import re
 import subprocess
 import tempfile
-from concurrent.futures import ThreadPoolExecutor
-from botocore.exceptions import (
-    BotoCoreError,
-    ClientError,
-    EndpointConnectionError,
-    NoCredentialsError,
-)
 from datetime import datetime as DateTime
-from jinja2 import Environment, FileSystemLoader as _FSLoader, StrictUndefined
+
+# botocore, jinja2 and concurrent.futures are imported inside main() at the
+# point the build first needs them, so --help and argument errors return
+# without paying for them.
 
 # Import the list of supported EC2 instances and some external functions.
 sys.path.insert(0, _src_dir)
+from pcluster_aws import _activate_profile, _aws_client, _aws_resource
 from pcluster_core import (
     _b,
     _validate_az_input,
@@ -54,6 +50,8 @@ from pcluster_core import (
     _normalize_fsx_buckets,
     _check_fsx_s3,
     _check_external_nfs_reachable,
+    _run_preflight,
+    _report_preflight_failures,
     _load_defaults_file,
     _resolve as _pcore_resolve,
     _resolve_bool as _pcore_resolve_bool,
@@ -63,18 +61,21 @@ from pcluster_core import (
     _delete_managed_policies,
     _setup_fsx_hydration_iam,
     _validate_network,
-    _get_efa_instance_types,
+    _cache_dir,
+    _describe_instance_types_cached,
+    _index_instance_types,
     _ssh_secret_name,
     _get_od_price,
-    _get_spot_price,
+    _get_spot_prices,
     _cost_summary_lines,
     _storage_summary_lines,
     _derive_head_node_bootstrap_timeout,
     _derive_docker_compose_staging,
     _derive_results_bucket,
+    _describe_cluster,
     _validate_download_checksum,
 )
-from pcluster_aux_data import ARM_OSES, base_os_efa, derive_ranks_per_node, is_gpu_instance, needs_efa_gdr, nvidia_gpu_count, parse_instance_type_list, usable_vcpu_count
+from pcluster_aux_data import ARM_OSES, base_os_efa, derive_ranks_per_node, is_gpu_instance, needs_efa_gdr, parse_instance_type_list
 from pcluster_aux_data import base_os_instance_check
 from pcluster_aux_data import ctrlC_Abort
 from pcluster_aux_data import default_instance_types
@@ -579,6 +580,12 @@ def main():
         type=int,
         default=None,
     )
+    parser.add_argument(
+        "--refresh_instance_cache",
+        action="store_true",
+        help="re-fetch EC2 instance type metadata instead of using the local cache "
+        "(active_clusters/.cache, refreshed weekly)",
+    )
     parser.add_argument(
         "--scaledown_idletime",
         help="idle minutes before compute node terminates (default = 5)",
@@ -935,9 +942,16 @@ def main():
     # Perform error checking on the selected AWS Region and Availability Zone.
     # Abort if a non-existent Region or Availability Zone was chosen.
 
+    from botocore.exceptions import (
+        BotoCoreError,
+        ClientError,
+        EndpointConnectionError,
+        NoCredentialsError,
+    )
+
     print(f"  Verifying region/AZ: {az}...")
     try:
-        ec2client = boto3.client("ec2", region_name=region)
+        ec2client = _aws_client("ec2", region)
         _az_info = ec2client.describe_availability_zones(ZoneNames=[az])
     except (
         ValueError,
@@ -957,15 +971,13 @@ def main():
     # correct cross-account credentials.
     if turbot_account != "disabled":
         turbot_profile = "turbot__" + turbot_account + "__" + cluster_owner
-        os.environ["AWS_PROFILE"] = turbot_profile
-        os.environ["AWS_DEFAULT_REGION"] = region
-        boto3.setup_default_session(profile_name=turbot_profile)
+        _activate_profile(turbot_profile, region)
         p_val("turbot_account", debug_mode)
         p_val("turbot_profile", debug_mode)
         # Reinitialize ec2client with the Turbot profile for VPC/subnet discovery
         # and spot price queries; the bootstrap client used for AZ verification
         # above operated on the operator's base credentials before profile switch.
-        ec2client = boto3.client("ec2", region_name=region)
+        ec2client = _aws_client("ec2", region)
 
     vars_file_path = os.path.join(_src_dir, "vars_files", cluster_name + ".yml")
     os.makedirs(os.path.join(_src_dir, "vars_files"), exist_ok=True)
@@ -996,8 +1008,8 @@ def main():
     #   - AWS account ID from STS
     #   - Check whether this cluster already exists
     print("  Resolving network, account ID, and cluster state...")
-    stsclient = boto3.client("sts", region_name=region)
-    pricing_client = boto3.client("pricing", region_name="us-east-1")
+    stsclient = _aws_client("sts", region)
+    pricing_client = _aws_client("pricing", "us-east-1")
 
     def _get_account_id():
         return stsclient.get_caller_identity()["Account"]
@@ -1016,6 +1028,8 @@ def main():
             stderr=subprocess.DEVNULL,
         )
 
+    from concurrent.futures import ThreadPoolExecutor
+
     with ThreadPoolExecutor(max_workers=3) as _pool:
         _fut_network = _pool.submit(
             _validate_network,
@@ -1189,68 +1203,9 @@ def main():
         p_fail(headnode_instance_type, "headnode_instance_type", ec2_instances_full_list)
     base_os_instance_check(base_os, headnode_instance_type, debug_mode)
 
-    # Architecture check — the head node and every queue type must share one
-    # architecture. The head node is included here because base_os_instance_check
-    # only knows the hardcoded ARM family prefixes above; describe_instance_types
-    # is authoritative and covers families that list does not yet name.
-    # describe_instance_types accepts max 100 per call; paginate in chunks.
-    _all_instance_types = [headnode_instance_type] + cpu_instance_types + gpu_instance_types
-    _arch_map = {}
-    _gpu_count_map = {}
-    _vcpu_map = {}
-    _chunk_size = 100
-    for _i in range(0, len(_all_instance_types), _chunk_size):
-        _chunk = _all_instance_types[_i:_i + _chunk_size]
-        _resp = ec2client.describe_instance_types(InstanceTypes=_chunk)
-        for _info in _resp["InstanceTypes"]:
-            _archs = _info["ProcessorInfo"]["SupportedArchitectures"]
-            _arch_map[_info["InstanceType"]] = "arm64" if "arm64" in _archs else "x86_64"
-            _gpu_count_map[_info["InstanceType"]] = nvidia_gpu_count(_info)
-            _vcpu_map[_info["InstanceType"]] = usable_vcpu_count(
-                _info, hyperthreading=hyperthreading
-            )
-    _unique_archs = set(_arch_map.values())
-    if len(_unique_archs) > 1:
-        _arch_detail = ", ".join(f"{t}={a}" for t, a in _arch_map.items())
-        refer_to_docs_and_quit(
-            f"The head node and all compute instance types must share the same CPU architecture.\n"
-            f"  Mixed architectures detected: {_arch_detail}\n"
-            f"  Use only x86_64 or only arm64/Graviton types."
-        )
-
-    # The base_os architecture must match the instance architecture. This catches
-    # families absent from the ARM prefix list in base_os_instance_check.
-    _cluster_arch = next(iter(_unique_archs), None)
-    if _cluster_arch:
-        _base_os_arch = "arm64" if base_os.endswith("arm") else "x86_64"
-        if _cluster_arch != _base_os_arch:
-            refer_to_docs_and_quit(
-                f"base_os={base_os} is {_base_os_arch} but the selected instance types "
-                f"are {_cluster_arch}.\n"
-                f"  Mixed: {', '.join(f'{t}={a}' for t, a in _arch_map.items())}"
-            )
-
     p_val("headnode_instance_type", debug_mode)
     p_val("headnode_root_volume_size", debug_mode)
 
-    # EFA: all CPU queue types must be EFA-capable (hard fail).
-    if enable_efa:
-        _efa_types = _get_efa_instance_types(ec2client, ec2_instances_efa)
-        _non_efa = [t for t in cpu_instance_types if t not in _efa_types]
-        if _non_efa:
-            refer_to_docs_and_quit(
-                f"EFA is enabled but the following CPU compute instance type(s) do not support EFA:\n"
-                f"  {', '.join(_non_efa)}\n"
-                f"  All CPU queue types must be EFA-capable when --enable_efa=true.\n"
-                f"  See: https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/efa.html"
-            )
-        if base_os not in base_os_efa:
-            error_msg = base_os + " does not support Elastic Fabric Adapter (EFA)!"
-            refer_to_docs_and_quit(error_msg)
-        if placement_group == "NONE":
-            placement_group = "DYNAMIC"
-        p_val("placement_group", debug_mode)
-
     p_val("compute_root_volume_size", debug_mode)
     p_val("base_os", debug_mode)
     print("Selected base operating system: " + base_os)
@@ -1260,32 +1215,6 @@ def main():
     if enable_gpu_queue:
         print(f"  GPU queue: {', '.join(gpu_instance_types)}")
 
-    # Ranks-per-node for the benchmark job script's GPU queue. A queue may hold
-    # several instance types with different GPU counts, so take the minimum: a
-    # value every node in the queue can satisfy. Zero means the GPU types report
-    # no NVIDIA devices, and the job script falls back to CPU-shaped ranks.
-    gpu_ranks_per_node = (
-        min(_gpu_count_map.get(t, 0) for t in gpu_instance_types)
-        if gpu_instance_types
-        else 0
-    )
-
-    # Schedulable vCPUs per node in each queue, taken the same way: the minimum
-    # every node in the queue can satisfy. These replaced two hardcoded
-    # instance-size ladders in the default Slurm submission script that named
-    # eleven suffixes each and emitted no --ntasks at all for anything else --
-    # c8g.medium, c7i.16xlarge, c6a.metal and every other unlisted size fell
-    # through to a commented-out fallback, so the job silently ran on one task.
-    # These count cores, not GPUs: gpu_ranks_per_node above is NVIDIA device
-    # count, which is the right rank shape for a GPU benchmark and the wrong one
-    # for --ntasks on a general-purpose job. Zero means the queue does not exist.
-    cpu_ranks_per_node = derive_ranks_per_node(
-        instance_types=cpu_instance_types, vcpu_map=_vcpu_map
-    )
-    gpu_vcpus_per_node = derive_ranks_per_node(
-        instance_types=gpu_instance_types, vcpu_map=_vcpu_map
-    )
-
     s3_bucketname = "parallelclustermaker-" + cluster_serial_number
     # Long-lived and account+region-scoped, so benchmark results survive the
     # teardown of the per-build bucket above.  See _derive_results_bucket.
@@ -1363,9 +1292,6 @@ def main():
         p_val("enable_external_nfs", debug_mode)
         p_val("external_nfs_server", debug_mode)
 
-    if enable_external_nfs:
-        _check_external_nfs_reachable(external_nfs_server)
-
     # Set external_nfs_server to a dummy value if external NFS support has not
     # been enabled.
 
@@ -1425,17 +1351,6 @@ def main():
             f"  Set head_node_bootstrap_timeout in the defaults file to override."
         )
 
-    # If a custom_ami was provided, perform error checking on its existence.
-
-    if custom_ami != "NONE":
-        try:
-            ec2client.describe_images(ImageIds=[custom_ami])
-        except ClientError:
-            error_msg = '"' + custom_ami + '" does not appear to be a valid AMI!'
-            refer_to_docs_and_quit(error_msg)
-        else:
-            p_val("custom_ami", debug_mode)
-
     # Fetch current EC2 spot prices for display only.
     # PCluster v3 uses CapacityType: SPOT and manages bid pricing automatically
     # at the fleet level — no SpotPrice field exists in the v3 config.
@@ -1443,7 +1358,7 @@ def main():
     # If the user selects ondemand instances, print a friendly reminder to the
     # console that spot is a more economical choice for HPC clusters.
 
-    spot_prices_by_type = {}
+    _pricing_types = []
     if cluster_type == "ondemand":
         p_val("cluster_type", debug_mode)
         print("  On-Demand instances were selected")
@@ -1452,47 +1367,6 @@ def main():
     elif cluster_type == "spot":
         p_val("cluster_type", debug_mode)
         _pricing_types = cpu_instance_types + gpu_instance_types
-        if _pricing_types:
-            # One batched call for all types; take the most recent price per type.
-            # MaxResults=1000 is the hard API limit; each type returns multiple AZ
-            # entries so paginate with a generous cap.
-            _spot_resp = ec2client.describe_spot_price_history(
-                InstanceTypes=_pricing_types,
-                MaxResults=min(len(_pricing_types) * 20, 1000),
-                ProductDescriptions=["Linux/UNIX (Amazon VPC)"],
-                AvailabilityZone=az,
-            )
-            _latest = {}
-            for _entry in _spot_resp["SpotPriceHistory"]:
-                _it = _entry["InstanceType"]
-                if _it not in _latest:
-                    _latest[_it] = float(_entry["SpotPrice"])
-            for _itype in _pricing_types:
-                if _itype not in _latest:
-                    refer_to_docs_and_quit(
-                        f"Instance type {_itype} is unavailable on the Spot market in {az}."
-                    )
-                spot_prices_by_type[_itype] = _latest[_itype]
-            print("  *** INFO *** PCluster v3 manages Spot bid pricing automatically at the")
-            print("  fleet level. The prices below are current market rates for reference only.")
-            print("  No bid price is set in the cluster config.")
-            if cpu_instance_types:
-                print("  CPU queue current spot prices:")
-                for _t in cpu_instance_types:
-                    print(f"    {_t}: ${spot_prices_by_type[_t]:.6f}/hr")
-            if gpu_instance_types:
-                print("  GPU queue current spot prices:")
-                for _t in gpu_instance_types:
-                    print(f"    {_t}: ${spot_prices_by_type[_t]:.6f}/hr")
-            print("")
-            print("  *** INFO *** To improve Spot acquisition rates:")
-            print("    - Add subnets from multiple AZs to --compute_subnet_ids")
-            print("      (Spot capacity is AZ-specific; one subnet = one pool)")
-            print("    - Specify multiple instance types of similar size in")
-            print("      --compute_instance_type / --gpu_instance_type")
-            print("      (e.g. c6i.2xlarge,c7i.2xlarge,c5.2xlarge)")
-            print("")
-        p_val("cluster_type", debug_mode)
     else:
         p_fail(cluster_type, "cluster_type", ["ondemand", "spot"])
 
@@ -1500,35 +1374,202 @@ def main():
     # clients from this point already use the correct cross-account credentials.
 
     # Instantiate S3 resource/client — Turbot profile already active if applicable.
-    s3 = boto3.resource("s3")
-    s3_client = boto3.client("s3")
+    s3 = _aws_resource("s3")
+    s3_client = _aws_client("s3")
+
+    # Every check below that touches the network is independent of the others
+    # except where one names another's output as an input, so they run
+    # concurrently through _run_preflight. A failing check does not stop the
+    # rest: every check that can run does, and the failures are reported
+    # together.
+    cache_dir = _cache_dir(_repo_root)
+
+    def _check_instance_metadata():
+        # Records come from a region-keyed local cache; only types it has not
+        # seen reach describe_instance_types. The same index answers the
+        # architecture and EFA checks, so no EFA catalog sweep is needed.
+        return {
+            "instance_index": _index_instance_types(
+                _describe_instance_types_cached(
+                    ec2client,
+                    region,
+                    [headnode_instance_type] + cpu_instance_types + gpu_instance_types,
+                    cache_dir,
+                    refresh=args.refresh_instance_cache,
+                ),
+                hyperthreading=hyperthreading,
+                efa_fallback=ec2_instances_efa,
+            )
+        }
+
+    def _check_architecture(instance_index):
+        # The head node and every queue type must share one architecture. The
+        # head node is included because base_os_instance_check only knows the
+        # hardcoded ARM family prefixes; describe_instance_types is
+        # authoritative and covers families that list does not yet name.
+        _arch_map = {t: i["arch"] for t, i in instance_index.items()}
+        _unique_archs = set(_arch_map.values())
+        if len(_unique_archs) > 1:
+            _arch_detail = ", ".join(f"{t}={a}" for t, a in _arch_map.items())
+            refer_to_docs_and_quit(
+                f"The head node and all compute instance types must share the same CPU architecture.\n"
+                f"  Mixed architectures detected: {_arch_detail}\n"
+                f"  Use only x86_64 or only arm64/Graviton types."
+            )
+        # The base_os architecture must match the instance architecture. This
+        # catches families absent from the ARM prefix list in base_os_instance_check.
+        _cluster_arch = next(iter(_unique_archs), None)
+        if _cluster_arch:
+            _base_os_arch = "arm64" if base_os.endswith("arm") else "x86_64"
+            if _cluster_arch != _base_os_arch:
+                refer_to_docs_and_quit(
+                    f"base_os={base_os} is {_base_os_arch} but the selected instance types "
+                    f"are {_cluster_arch}.\n"
+                    f"  Mixed: {', '.join(f'{t}={a}' for t, a in _arch_map.items())}"
+                )
+
+    def _check_efa(instance_index):
+        # All CPU queue types must be EFA-capable (hard fail).
+        _non_efa = [
+            t for t in cpu_instance_types
+            if not instance_index.get(t, {"efa": t in ec2_instances_efa})["efa"]
+        ]
+        if _non_efa:
+            refer_to_docs_and_quit(
+                f"EFA is enabled but the following CPU compute instance type(s) do not support EFA:\n"
+                f"  {', '.join(_non_efa)}\n"
+                f"  All CPU queue types must be EFA-capable when --enable_efa=true.\n"
+                f"  See: https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/efa.html"
+            )
+        if base_os not in base_os_efa:
+            error_msg = base_os + " does not support Elastic Fabric Adapter (EFA)!"
+            refer_to_docs_and_quit(error_msg)
 
-    # Check s3_bucketname using the correct (post-Turbot) credentials.
-    try:
-        s3_client.head_bucket(Bucket=s3_bucketname)
-        if _resuming:
-            print(f"  Found existing S3 bucket from interrupted run: {s3_bucketname}")
-            p_val("s3_bucketname", debug_mode)
-        else:
-            error_msg = "Found an existing S3 bucket associated with this cluster!"
+    def _check_custom_ami():
+        try:
+            ec2client.describe_images(ImageIds=[custom_ami])
+        except ClientError:
+            error_msg = '"' + custom_ami + '" does not appear to be a valid AMI!'
             refer_to_docs_and_quit(error_msg)
-    except ClientError as _e:
-        if _e.response["Error"]["Code"] in ("404", "NoSuchBucket"):
-            p_val("s3_bucketname", debug_mode)
-        else:
-            raise
+        p_val("custom_ami", debug_mode)
+
+    def _check_spot_prices():
+        # One batched call for all types, scoped to the build AZ. The result is
+        # keyed by (instance_type, az) and reused verbatim by the build summary,
+        # so the summary costs no further spot lookups and prices the same zone.
+        _spot = _get_spot_prices(ec2client, _pricing_types, az)
+        for _itype in _pricing_types:
+            if (_itype, az) not in _spot:
+                refer_to_docs_and_quit(
+                    f"Instance type {_itype} is unavailable on the Spot market in {az}."
+                )
+        print("  *** INFO *** PCluster v3 manages Spot bid pricing automatically at the")
+        print("  fleet level. The prices below are current market rates for reference only.")
+        print("  No bid price is set in the cluster config.")
+        if cpu_instance_types:
+            print("  CPU queue current spot prices:")
+            for _t in cpu_instance_types:
+                print(f"    {_t}: ${_spot[(_t, az)]:.6f}/hr")
+        if gpu_instance_types:
+            print("  GPU queue current spot prices:")
+            for _t in gpu_instance_types:
+                print(f"    {_t}: ${_spot[(_t, az)]:.6f}/hr")
+        print("")
+        print("  *** INFO *** To improve Spot acquisition rates:")
+        print("    - Add subnets from multiple AZs to --compute_subnet_ids")
+        print("      (Spot capacity is AZ-specific; one subnet = one pool)")
+        print("    - Specify multiple instance types of similar size in")
+        print("      --compute_instance_type / --gpu_instance_type")
+        print("      (e.g. c6i.2xlarge,c7i.2xlarge,c5.2xlarge)")
+        print("")
+        return {"spot_prices": _spot}
 
+    def _check_build_bucket():
+        # Check s3_bucketname using the correct (post-Turbot) credentials.
+        try:
+            s3_client.head_bucket(Bucket=s3_bucketname)
+            if _resuming:
+                print(f"  Found existing S3 bucket from interrupted run: {s3_bucketname}")
+                p_val("s3_bucketname", debug_mode)
+            else:
+                error_msg = "Found an existing S3 bucket associated with this cluster!"
+                refer_to_docs_and_quit(error_msg)
+        except ClientError as _e:
+            if _e.response["Error"]["Code"] in ("404", "NoSuchBucket"):
+                p_val("s3_bucketname", debug_mode)
+            else:
+                raise
+
+    _checks = [
+        {"name": "instance metadata", "run": _check_instance_metadata,
+         "outputs": ["instance_index"]},
+        {"name": "architecture", "run": _check_architecture,
+         "inputs": ["instance_index"]},
+    ]
+    if enable_efa:
+        _checks.append({"name": "EFA support", "run": _check_efa, "inputs": ["instance_index"]})
+    if custom_ami != "NONE":
+        _checks.append({"name": "custom AMI", "run": _check_custom_ami})
+    if _pricing_types:
+        _checks.append({"name": "spot prices", "run": _check_spot_prices,
+                        "outputs": ["spot_prices"]})
+    _checks.append({"name": "build bucket", "run": _check_build_bucket})
     # Validate FSx S3 import/export bucket and path existence with the correct
     # (post-Turbot) credentials.
     if enable_fsx and enable_fsx_hydration:
-        _check_fsx_s3(s3_client, fsx_s3_import_bucket, fsx_s3_import_path, "import")
-        _check_fsx_s3(
-            s3_client,
-            fsx_s3_export_bucket,
-            fsx_s3_export_path,
-            "export",
-            require_objects=False,
-        )
+        _checks.append({"name": "FSx import path", "run": lambda: _check_fsx_s3(
+            s3_client, fsx_s3_import_bucket, fsx_s3_import_path, "import")})
+        _checks.append({"name": "FSx export path", "run": lambda: _check_fsx_s3(
+            s3_client, fsx_s3_export_bucket, fsx_s3_export_path, "export",
+            require_objects=False)})
+    if enable_external_nfs:
+        _checks.append({"name": "external NFS", "run": lambda: _check_external_nfs_reachable(
+            external_nfs_server)})
+
+    _preflight, _timings, _failures = _run_preflight(_checks)
+    if debug_mode:
+        for _name, _secs in _timings.items():
+            print(f"  preflight {_name}: {_secs:.2f}s")
+    if _failures:
+        _report_preflight_failures(_failures)
+    p_val("cluster_type", debug_mode)
+
+    _instance_index = _preflight["instance_index"]
+    spot_prices = _preflight.get("spot_prices", {})
+    _gpu_count_map = {t: i["nvidia_gpus"] for t, i in _instance_index.items()}
+    _vcpu_map = {t: i["vcpus"] for t, i in _instance_index.items()}
+    if enable_efa:
+        if placement_group == "NONE":
+            placement_group = "DYNAMIC"
+        p_val("placement_group", debug_mode)
+
+    # Ranks-per-node for the benchmark job script's GPU queue. A queue may hold
+    # several instance types with different GPU counts, so take the minimum: a
+    # value every node in the queue can satisfy. Zero means the GPU types report
+    # no NVIDIA devices, and the job script falls back to CPU-shaped ranks.
+    gpu_ranks_per_node = (
+        min(_gpu_count_map.get(t, 0) for t in gpu_instance_types)
+        if gpu_instance_types
+        else 0
+    )
+
+    # Schedulable vCPUs per node in each queue, taken the same way: the minimum
+    # every node in the queue can satisfy. These replaced two hardcoded
+    # instance-size ladders in the default Slurm submission script that named
+    # eleven suffixes each and emitted no --ntasks at all for anything else --
+    # c8g.medium, c7i.16xlarge, c6a.metal and every other unlisted size fell
+    # through to a commented-out fallback, so the job silently ran on one task.
+    # These count cores, not GPUs: gpu_ranks_per_node above is NVIDIA device
+    # count, which is the right rank shape for a GPU benchmark and the wrong one
+    # for --ntasks on a general-purpose job. Zero means the queue does not exist.
+    cpu_ranks_per_node = derive_ranks_per_node(
+        instance_types=cpu_instance_types, vcpu_map=_vcpu_map
+    )
+    gpu_vcpus_per_node = derive_ranks_per_node(
+        instance_types=gpu_instance_types, vcpu_map=_vcpu_map
+    )
+
+    if enable_fsx and enable_fsx_hydration:
         p_val("fsx_s3_import_bucket", debug_mode)
         p_val("fsx_s3_import_path", debug_mode)
         p_val("fsx_s3_export_bucket", debug_mode)
@@ -1548,7 +1589,7 @@ def main():
 
     print("  Setting up IAM roles and policies...")
 
-    iam = boto3.client("iam")
+    iam = _aws_client("iam")
     ec2_iam_policy = "pclustermaker-policy-" + cluster_serial_number
     ec2_iam_role = "pclustermaker-role-" + cluster_serial_number
     ec2_json_policy_template = os.path.join(
@@ -1863,6 +1904,8 @@ def main():
 
     # Generate the vars_file for this cluster.
 
+    from jinja2 import Environment, FileSystemLoader as _FSLoader, StrictUndefined
+
     try:
         _jenv = Environment(
             loader=_FSLoader(os.path.join(_repo_root, "templates")),
@@ -2033,27 +2076,17 @@ def main():
     # Fetch head node IP for the summary.
     _head_ip = ""
     try:
-        import subprocess as _sp
-
-        _desc = _sp.run(
-            [
-                ".venv/bin/pcluster",
-                "describe-cluster",
-                "--cluster-name",
-                cluster_name,
-                "--region",
-                region,
-            ],
-            capture_output=True,
-            text=True,
-            cwd=_repo_root,
+        _info = _describe_cluster(
+            cluster_name,
+            region,
+            os.path.join(_repo_root, ".venv", "bin", "pcluster"),
+            backend="native",
         )
-        if _desc.returncode == 0:
-            _info = json.loads(_desc.stdout)
-            _head_ip = _info.get("headNode", {}).get("publicIpAddress") or _info.get(
-                "headNode", {}
-            ).get("privateIpAddress", "")
-    except Exception:
+        _head_ip = _info.get("headNode", {}).get("publicIpAddress") or _info.get(
+            "headNode", {}
+        ).get("privateIpAddress", "")
+    except (SystemExit, Exception):
+        # Best effort: the build has succeeded, so the summary still prints.
         pass
 
     # Print a human-friendly cluster build summary.
@@ -2093,7 +2126,7 @@ def main():
         print(f"  Options:           {', '.join(_enabled)}")
     for _cost_line in _cost_summary_lines(
         pricing_client=pricing_client,
-        ec2client=ec2client,
+        spot_prices=spot_prices,
         headnode_instance_type=headnode_instance_type,
         cpu_instance_types=cpu_instance_types,
         max_cpu_queue_size=max_cpu_queue_size,
@@ -2102,7 +2135,9 @@ def main():
         max_gpu_queue_size=max_gpu_queue_size,
         enable_gpu_queue=enable_gpu_queue,
         region=region,
+        az=az,
         cluster_type=cluster_type,
+        cache_dir=cache_dir,
     ):
         print(_cost_line)
     print("")
@@ -15,7 +15,6 @@ if os.path.realpath(sys.prefix) != os.path.realpath(os.path.join(_repo_root, ".v
 import argparse
 import json
 import subprocess
-import time
 from datetime import datetime
 
 sys.path.insert(0, _src_dir)
@@ -32,16 +31,22 @@ from pcluster_queue_editor import (
     _check_queue_arch_matches_cluster,
     _print_update_reminder,
     _recovery_guidance,
+    _classify_queue_update,
+    _diff_cluster_configs,
+    _applied_path,
+    _record_applied_config,
+    _forget_applied_config,
+    _read_config_file,
     _make_yaml,
+    _read_queue_edits,
+    _validate_queue_set,
     COMPUTE_RESOURCE_SUFFIX,
 )
 from pcluster_aux_data import is_gpu_instance
-from pcluster_core import _validate_region
+from pcluster_core import _WAIT_TIMEOUT, _validate_region, _wait_transition, _wait_until
 
 
 _PCLUSTER_BIN = os.path.join(_repo_root, ".venv", "bin", "pcluster")
-_POLL_INTERVAL = 30
-_POLL_TIMEOUT = 90  # 90 × 30s = 45 min
 
 
 def _ts():
@@ -74,70 +79,133 @@ def _get_fleet_status(cluster_name, region):
     return data.get("computeFleetStatus", "UNKNOWN")
 
 
-def _poll_fleet(cluster_name, region, target, label):
-    # Ctrl-C is caught around the whole loop: the describe-cluster subprocess is
+def _poll_fleet(cluster_name, region, target, label, record=True):
+    def reached():
+        status = _get_fleet_status(cluster_name, region)
+        print(f"  [{_ts()}] computeFleetStatus: {status}")
+        if status == "PROTECTED":
+            sys.exit(
+                "ERROR: compute fleet is in PROTECTED state — Slurm has locked the fleet due to repeated failures.\n"
+                "Investigate node failures before retrying."
+            )
+        return status == target
+
+    # Ctrl-C is caught around the whole wait: the describe-cluster subprocess is
     # where most of the wall clock goes, and an interrupt landing there used to
     # escape as a bare traceback with no note that AWS was still working.
     try:
-        for i in range(_POLL_TIMEOUT):
-            status = _get_fleet_status(cluster_name, region)
-            print(f"  [{_ts()}] computeFleetStatus: {status}")
-            if status == target:
-                return
-            if status == "PROTECTED":
-                sys.exit(
-                    "ERROR: compute fleet is in PROTECTED state — Slurm has locked the fleet due to repeated failures.\n"
-                    "Investigate node failures before retrying."
-                )
-            if i == _POLL_TIMEOUT - 1:
-                sys.exit(
-                    f"ERROR: timed out after {_POLL_TIMEOUT * _POLL_INTERVAL // 60} min waiting for {label}.\n"
-                    f"Check status with: pcluster describe-cluster --cluster-name {cluster_name} --region {region}"
-                )
-            time.sleep(_POLL_INTERVAL)
+        waited = _wait_until(reached, _wait_transition(cluster_name, label), repo_root=_repo_root,
+                             record=record)
     except KeyboardInterrupt:
         print(
             f"\nInterrupted. The fleet operation is still running in AWS.\n"
             f"Check status with: pcluster describe-cluster --cluster-name {cluster_name} --region {region}"
         )
         sys.exit(1)
+    if waited is None:
+        sys.exit(
+            f"ERROR: timed out after {_WAIT_TIMEOUT // 60} min waiting for {label}.\n"
+            f"Check status with: pcluster describe-cluster --cluster-name {cluster_name} --region {region}"
+        )
+
+
+_UPDATE_FAIL_STATES = {
+    "UPDATE_FAILED", "UPDATE_ROLLBACK_IN_PROGRESS",
+    "UPDATE_ROLLBACK_COMPLETE", "UPDATE_ROLLBACK_FAILED",
+}
 
 
 def _poll_cluster_update(cluster_name, region):
-    _FAIL_STATES = {
-        "UPDATE_FAILED", "UPDATE_ROLLBACK_IN_PROGRESS",
-        "UPDATE_ROLLBACK_COMPLETE", "UPDATE_ROLLBACK_FAILED",
-    }
+    def reached():
+        data = _run_pcluster(["describe-cluster", "--cluster-name", cluster_name], region)
+        cs = data.get("clusterStatus", "UNKNOWN")
+        cfs = data.get("cloudFormationStackStatus", "UNKNOWN")
+        print(f"  [{_ts()}] clusterStatus: {cs}  cloudFormationStackStatus: {cfs}")
+        if cs in _UPDATE_FAIL_STATES or cfs in _UPDATE_FAIL_STATES:
+            sys.exit(
+                f"ERROR: cluster update failed (clusterStatus={cs}, cloudFormationStackStatus={cfs}).\n"
+                f"Check CloudFormation events for details."
+            )
+        return cs == "UPDATE_COMPLETE" and cfs == "UPDATE_COMPLETE"
+
     try:
-        for i in range(_POLL_TIMEOUT):
-            data = _run_pcluster(["describe-cluster", "--cluster-name", cluster_name], region)
-            cs = data.get("clusterStatus", "UNKNOWN")
-            cfs = data.get("cloudFormationStackStatus", "UNKNOWN")
-            print(f"  [{_ts()}] clusterStatus: {cs}  cloudFormationStackStatus: {cfs}")
-            if cs == "UPDATE_COMPLETE" and cfs == "UPDATE_COMPLETE":
-                return
-            if cs in _FAIL_STATES or cfs in _FAIL_STATES:
-                sys.exit(
-                    f"ERROR: cluster update failed (clusterStatus={cs}, cloudFormationStackStatus={cfs}).\n"
-                    f"Check CloudFormation events for details."
-                )
-            if i == _POLL_TIMEOUT - 1:
-                sys.exit(
-                    f"ERROR: timed out after {_POLL_TIMEOUT * _POLL_INTERVAL // 60} min waiting for UPDATE_COMPLETE.\n"
-                    f"Check status with: pcluster describe-cluster --cluster-name {cluster_name} --region {region}"
-                )
-            time.sleep(_POLL_INTERVAL)
+        waited = _wait_until(reached, _wait_transition(cluster_name, "cluster update"),
+                             repo_root=_repo_root)
     except KeyboardInterrupt:
         print(
             f"\nInterrupted. The cluster update is still running in AWS.\n"
             f"Check status with: pcluster describe-cluster --cluster-name {cluster_name} --region {region}"
         )
         sys.exit(1)
+    if waited is None:
+        sys.exit(
+            f"ERROR: timed out after {_WAIT_TIMEOUT // 60} min waiting for UPDATE_COMPLETE.\n"
+            f"Check status with: pcluster describe-cluster --cluster-name {cluster_name} --region {region}"
+        )
+
+
+def _live_update_plan(baseline, pending):
+    """Return (needs_stop, reasons) for the change from baseline to pending.
+
+    baseline is the last-applied config. Without one, what is deployed is
+    unknown (the .bak copy is only the config before this edit, and a manual
+    update may have come between), so the fleet is stopped.
+    """
+    if baseline is None:
+        return True, ["no last-applied config to compare with: needs a stopped fleet"]
+    if pending is None:
+        return True, ["the new config cannot be read: needs a stopped fleet"]
+    return _classify_queue_update(baseline, pending)
 
 
-def _apply_with_wait(cluster_name, region, config_path):
+def _apply_update(cluster_name, region, config_path):
+    print(f"[{_ts()}] Applying updated cluster configuration...")
+    result = _run_pcluster(
+        ["update-cluster", "--cluster-name", cluster_name,
+         "--cluster-configuration", config_path],
+        region,
+    )
+    print(json.dumps(result, indent=2))
+    print(f"[{_ts()}] Waiting for cluster update to complete...")
+    _poll_cluster_update(cluster_name, region)
+    _record_applied_config(config_path)
+
+
+def _apply_with_wait(cluster_name, region, config_path, live=False):
+    pending = _read_config_file(config_path)
+    applied = _read_config_file(_applied_path(config_path))
+    if applied is not None and pending is not None:
+        changes = _diff_cluster_configs(applied, pending)
+        if not changes:
+            print(
+                f"[{_ts()}] {config_path} matches the config last applied to {cluster_name}; "
+                "skipping the fleet stop and update-cluster."
+            )
+            return
+        print("Changes from the last-applied config:")
+        for line in changes:
+            print(f"  {line}")
+
     _check_pcluster()
     _validate_region(region)
+
+    if live:
+        needs_stop, reasons = _live_update_plan(applied, pending)
+        for reason in reasons:
+            print(f"  {reason}")
+        if not needs_stop:
+            # Nodes in untouched queues keep running jobs throughout.
+            print(f"[{_ts()}] Every change applies to a running fleet; skipping the fleet stop.")
+            try:
+                _apply_update(cluster_name, region, config_path)
+            except SystemExit as _e:
+                if _e.code not in (0, None):
+                    print(_recovery_guidance(cluster_name, region, config_path, "live"))
+                raise
+            print(f"[{_ts()}] Cluster update complete; the compute fleet was not stopped. Done.")
+            return
+        print(f"[{_ts()}] The fleet has to be stopped for this change; running the full cycle.")
+
     print(
         "\n*** WARNING: this operation can take up to 30 minutes and should not be interrupted.\n"
         "    Run inside screen or tmux if there is any risk of losing your terminal session. ***\n"
@@ -150,7 +218,8 @@ def _apply_with_wait(cluster_name, region, config_path):
         sys.exit(
             "ERROR: compute fleet is in PROTECTED state — investigate node failures before retrying."
         )
-    if status not in ("STOPPED", "STOP_REQUESTED", "STOPPING", "DISABLED"):
+    requested = status not in ("STOPPED", "STOP_REQUESTED", "STOPPING", "DISABLED")
+    if requested:
         print(f"[{_ts()}] Requesting fleet stop...")
         _run_pcluster(
             ["update-compute-fleet", "--cluster-name", cluster_name, "--status", "STOP_REQUESTED"],
@@ -161,24 +230,15 @@ def _apply_with_wait(cluster_name, region, config_path):
 
     # Step 2 — poll until STOPPED
     print(f"[{_ts()}] Waiting for fleet to reach STOPPED...")
-    _poll_fleet(cluster_name, region, "STOPPED", "fleet stop")
+    # A stop already under way is not timed from its start, so it is not recorded.
+    _poll_fleet(cluster_name, region, "STOPPED", "fleet stop", record=requested)
 
     # Steps 3-6 run with the fleet already stopped. Any failure from here on
     # leaves the cluster with no compute capacity, so every exit path has to
     # tell the operator how to get back to RUNNING.
     try:
-        # Step 3 — apply config
-        print(f"[{_ts()}] Applying updated cluster configuration...")
-        result = _run_pcluster(
-            ["update-cluster", "--cluster-name", cluster_name,
-             "--cluster-configuration", config_path],
-            region,
-        )
-        print(json.dumps(result, indent=2))
-
-        # Step 4 — poll until UPDATE_COMPLETE
-        print(f"[{_ts()}] Waiting for cluster update to complete...")
-        _poll_cluster_update(cluster_name, region)
+        # Steps 3 and 4 — apply config, poll until UPDATE_COMPLETE
+        _apply_update(cluster_name, region, config_path)
     except SystemExit as _e:
         if _e.code not in (0, None):
             print(_recovery_guidance(cluster_name, region, config_path, "update"))
@@ -202,6 +262,38 @@ def _apply_with_wait(cluster_name, region, config_path):
     print(f"[{_ts()}] Compute fleet is RUNNING. Done.")
 
 
+def _print_dry_run(config, config_path, live):
+    """Print what writing config would change, measured against the last-applied config."""
+    applied = baseline = _read_config_file(_applied_path(config_path))
+    label = "the last-applied config"
+    if baseline is None:
+        baseline = _read_config_file(config_path)
+        label = config_path
+    changes = _diff_cluster_configs(baseline, config) if baseline is not None else []
+    print(f"\n[dry-run] Changes from {label}:")
+    for line in changes:
+        print(f"  {line}")
+    if not changes:
+        print("  none; -W would skip the fleet stop and update-cluster")
+    elif live:
+        needs_stop, reasons = _live_update_plan(applied, config)
+        for reason in reasons:
+            print(f"  {reason}")
+        print("  --live would " + ("run the full stop/update/start cycle" if needs_stop
+                                   else "apply this without stopping the fleet"))
+    print("\n[dry-run] No changes made.")
+
+
+def _apply_or_remind(cluster_name, args, config, config_path, queue_name, action):
+    """Apply a freshly written config with -W, or print the manual steps."""
+    region = config["Region"]
+    if args.wait:
+        _apply_with_wait(cluster_name, region, config_path, live=args.live)
+    else:
+        _forget_applied_config(config_path)
+        _print_update_reminder(cluster_name, region, queue_name, action)
+
+
 def _do_list(cluster_name):
     config, _ = _load_cluster_config(cluster_name)
     queues = config.get("Scheduling", {}).get("SlurmQueues", [])
@@ -240,7 +332,9 @@ def _do_list(cluster_name):
         )
 
 
-def _do_add(cluster_name, args):
+def _do_add(cluster_name, args, staged=None):
+    """Add one queue. With staged=(config, config_path), add it to that
+    in-memory config and return the queue name; nothing is written or applied."""
     if not args.ec2_instance_type:
         sys.exit("ERROR: -E/--ec2-type is required for add")
     if args.initial_size < 0:
@@ -268,7 +362,7 @@ def _do_add(cluster_name, args):
         print("      Enabled: true")
         print("      GdrSupport: true")
 
-    config, config_path = _load_cluster_config(cluster_name)
+    config, config_path = staged or _load_cluster_config(cluster_name)
     queues = config["Scheduling"]["SlurmQueues"]
 
     _check_queue_arch_matches_cluster(config, instance_types)
@@ -281,7 +375,6 @@ def _do_add(cluster_name, args):
     custom_actions = _get_custom_actions(queues)
     additional_iam = _get_additional_iam_policies(queues)
     root_volume_encrypted = _get_root_volume_encrypted(queues)
-    region = config["Region"]
 
     capacity_type = "SPOT" if args.capacity_type == "spot" else "ONDEMAND"
     min_count = args.initial_size if args.maintain_initial_size == "true" else 0
@@ -340,20 +433,22 @@ ComputeResources:
 
     new_queue = _make_yaml().load(stanza_yaml)
     queues.append(new_queue)
+    if staged:
+        return queue_name
+    if args.dry_run:
+        _print_dry_run(config, config_path, args.live)
+        return
     _write_cluster_config(config_path, config)
-    if args.wait:
-        _apply_with_wait(cluster_name, region, config_path)
-    else:
-        _print_update_reminder(cluster_name, region, queue_name, "added to")
+    _apply_or_remind(cluster_name, args, config, config_path, queue_name, "added to")
 
 
-def _do_remove(cluster_name, args):
+def _do_remove(cluster_name, args, staged=None):
+    """Remove one queue; staged works as for _do_add."""
     if not args.queue_name:
         sys.exit("ERROR: -Q/--queue-name is required for remove")
 
-    config, config_path = _load_cluster_config(cluster_name)
+    config, config_path = staged or _load_cluster_config(cluster_name)
     queues = config["Scheduling"]["SlurmQueues"]
-    region = config["Region"]
 
     existing_names = [q.get("Name") for q in queues]
     if args.queue_name not in existing_names:
@@ -367,11 +462,51 @@ def _do_remove(cluster_name, args):
 
     filtered = [q for q in queues if q.get("Name") != args.queue_name]
     config["Scheduling"]["SlurmQueues"] = filtered
+    if staged:
+        return args.queue_name
+    if args.dry_run:
+        _print_dry_run(config, config_path, args.live)
+        return
     _write_cluster_config(config_path, config)
-    if args.wait:
-        _apply_with_wait(cluster_name, region, config_path)
-    else:
-        _print_update_reminder(cluster_name, region, args.queue_name, "removed from")
+    _apply_or_remind(cluster_name, args, config, config_path, args.queue_name, "removed from")
+
+
+def _do_batch(cluster_name, args, parser):
+    """Stage every edit in args.edits, validate the result, then write and apply it once.
+
+    Each line is parsed with this script's own parser and staged by _do_add
+    or _do_remove against the config as the previous lines left it. Any
+    failure exits before the config is written, so a batch lands whole or
+    not at all, and -W stops and restarts the fleet once for all of it.
+    """
+    config, config_path = _load_cluster_config(cluster_name)
+    changes = []
+    for number, argv in _read_queue_edits(args.edits):
+        where = f"{args.edits} line {number}"
+        try:
+            edit = parser.parse_args(["-N", cluster_name, "-A", *argv])
+        except SystemExit:
+            sys.exit(f"ERROR: {where}: invalid edit: {' '.join(argv)}")
+        if edit.action == "add" and not (edit.queue_type and edit.queue_name):
+            # The default name comes from the clock, so two unnamed adds in
+            # one batch would collide.
+            sys.exit(f"ERROR: {where}: add needs -T/--type and -Q/--queue-name in a batch")
+        stage = _do_add if edit.action == "add" else _do_remove
+        try:
+            name = stage(cluster_name, edit, staged=(config, config_path))
+        except SystemExit as exc:
+            sys.exit(f"ERROR: {where}: {str(exc.code).removeprefix('ERROR: ')}")
+        changes.append((edit.action, name))
+    _validate_queue_set(config)
+
+    print(f"Staged {len(changes)} queue edit(s) for {cluster_name}:")
+    for action, name in changes:
+        print(f"  {'+' if action == 'add' else '-'} {name}")
+    if args.dry_run:
+        _print_dry_run(config, config_path, args.live)
+        return
+    _write_cluster_config(config_path, config)
+    _apply_or_remind(cluster_name, args, config, config_path, [name for _, name in changes], "changed")
 
 
 def main():
@@ -380,8 +515,13 @@ def main():
     )
     parser.add_argument("-N", "--cluster_name", required=True, help="Cluster name")
     parser.add_argument(
-        "-A", "--action", required=True, choices=["add", "remove", "list"],
-        help="Action to perform"
+        "-A", "--action", required=True, choices=["add", "remove", "list", "batch"],
+        help="Action to perform; batch applies every edit in --edits with one update cycle"
+    )
+    parser.add_argument(
+        "--edits", default=None, metavar="FILE",
+        help="With -A batch: file of edits, one per line, each written as the "
+             "arguments after -A (e.g. 'remove -Q old-gpu')"
     )
     parser.add_argument(
         "-T", "--type", dest="queue_type", default=None, choices=["compute", "gpu"],
@@ -416,17 +556,37 @@ def main():
         "-W", "--wait", action="store_true", default=False,
         help=(
             "After writing the config, automatically stop the fleet, apply the update, and restart "
-            "the fleet, polling every 30s until complete. Without this flag, the required commands "
+            "the fleet, polling until complete. Without this flag, the required commands "
             "are printed instead. (default: false)"
         ),
     )
 
+    parser.add_argument(
+        "--live", action="store_true", default=False,
+        help=(
+            "With -W, skip the fleet stop and restart when every change can be applied "
+            "to a running cluster (adding a queue, or changing one under "
+            "QueueUpdateStrategy DRAIN/TERMINATE); otherwise the full cycle runs"
+        ),
+    )
+
+    parser.add_argument(
+        "--dry_run", action="store_true", default=False,
+        help="Print how the edit would change the last-applied config, then exit without writing it",
+    )
+
     args = parser.parse_args()
     cluster_name = args.cluster_name
+    if args.live and not args.wait:
+        parser.error("--live applies only with -W/--wait")
 
     # remove keys off --queue-name alone; _do_remove never reads queue_type.
     if args.action == "add" and not args.queue_type:
         parser.error("-T/--type is required for 'add'")
+    if args.dry_run and args.action == "list":
+        parser.error("--dry_run applies only to add, remove and batch")
+    if (args.action == "batch") != (args.edits is not None):
+        parser.error("--edits is required for 'batch' and applies only to it")
 
     if args.action == "list":
         _do_list(cluster_name)
@@ -434,6 +594,8 @@ def main():
         _do_add(cluster_name, args)
     elif args.action == "remove":
         _do_remove(cluster_name, args)
+    elif args.action == "batch":
+        _do_batch(cluster_name, args, parser)
 
 
 if __name__ == "__main__":
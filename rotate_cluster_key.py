@@ -37,12 +37,11 @@ if os.path.realpath(sys.prefix) != os.path.realpath(os.path.join(_repo_root, ".v
     )
 
 import argparse
-import boto3
 import subprocess
 import tempfile
-from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
 
 sys.path.insert(0, _src_dir)
+from pcluster_aws import _activate_profile, _aws_client
 from pcluster_core import (
     _validate_cluster_name,
     _validate_az_input,
@@ -117,13 +116,12 @@ def main():
     if turbot_account and turbot_account != "disabled":
         cluster_owner = vf.get("cluster_owner", "")
         turbot_profile = f"turbot__{turbot_account}__{cluster_owner}"
-        os.environ["AWS_PROFILE"] = turbot_profile
-        os.environ["AWS_DEFAULT_REGION"] = region
-        boto3.setup_default_session(profile_name=turbot_profile)
+        _activate_profile(turbot_profile, region)
         print(f"  Using Turbot profile: {turbot_profile}")
 
-    ec2 = boto3.client("ec2", region_name=region)
-    sm = boto3.client("secretsmanager", region_name=region)
+    from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
+    ec2 = _aws_client("ec2", region)
+    sm = _aws_client("secretsmanager", region)
 
     # Resolve live head node IP.
     try:
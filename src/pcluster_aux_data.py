@@ -87,10 +87,10 @@ def ctrlC_Abort(
             print("No IAM roles or policies exist for this cluster.")
             print("")
         else:
-            import boto3
+            from pcluster_aws import _aws_client
             from pcluster_core import _delete_managed_policies
 
-            iam = boto3.client("iam")
+            iam = _aws_client("iam")
             ec2_iam_policy = "pclustermaker-policy-" + str(cluster_serial_number)
             ec2_iam_role = "pclustermaker-role-" + str(cluster_serial_number)
 
@@ -834,6 +834,16 @@ def nvidia_gpu_count(instance_type_info):
     )
 
 
+def efa_supported(instance_type_info, fallback):
+    """EFA support from one describe_instance_types InstanceTypes entry."""
+    # NetworkInfo.EfaSupported is authoritative when present; the static list
+    # only answers for a record that omits it.
+    efa = (instance_type_info.get("NetworkInfo") or {}).get("EfaSupported")
+    if efa is None:
+        return instance_type_info.get("InstanceType") in fallback
+    return bool(efa)
+
+
 def usable_vcpu_count(instance_type_info, *, hyperthreading):
     """Schedulable vCPUs from one describe_instance_types InstanceTypes entry."""
     # DisableSimultaneousMultithreading is what config.pcluster.j2 sets when
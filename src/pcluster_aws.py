@@ -0,0 +1,71 @@
+"""
+Shared boto3 sessions and clients for every entry point.
+
+One session per (profile, region) and one client per service within it, all
+built with the same botocore Config. Clients are thread-safe, so the thread
+pools in make_pcluster.py and the fleet tools share them rather than each
+worker paying for client construction and a fresh TLS handshake.
+"""
+
+import os
+import threading
+
+# Wider than any thread pool the tools run, so a worker never queues for a
+# socket; botocore's default of 10 is below a preflight plus a price fan-out.
+_MAX_POOL_CONNECTIONS = 32
+# Adaptive mode adds client-side rate limiting on top of standard retries,
+# which is what keeps Pricing and Cost Explorer fan-outs from throttling.
+_RETRY_ATTEMPTS = 10
+
+_SESSIONS = {}
+_CLIENTS = {}
+_LOCK = threading.Lock()
+
+
+def _client_config():
+    """Return the botocore Config every shared client is built with."""
+    from botocore.config import Config
+
+    return Config(
+        retries={"mode": "adaptive", "max_attempts": _RETRY_ATTEMPTS},
+        max_pool_connections=_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+    )
+
+
+def _session_key(profile, region):
+    # AWS_PROFILE is read at session creation, so it is part of the key: a
+    # client built before a Turbot switch must never be handed out after it.
+    return (profile or os.environ.get("AWS_PROFILE"), region)
+
+
+def _aws_session(region=None, *, profile=None):
+    """Return the memoized boto3 Session for (profile, region)."""
+    import boto3
+
+    key = _session_key(profile, region)
+    with _LOCK:
+        if key not in _SESSIONS:
+            _SESSIONS[key] = boto3.session.Session(profile_name=key[0], region_name=region)
+        return _SESSIONS[key]
+
+
+def _aws_client(service, region=None, *, profile=None):
+    """Return the memoized client for service under (profile, region)."""
+    key = (service, *_session_key(profile, region))
+    session = _aws_session(region, profile=profile)
+    with _LOCK:
+        if key not in _CLIENTS:
+            _CLIENTS[key] = session.client(service, config=_client_config())
+        return _CLIENTS[key]
+
+
+def _aws_resource(service, region=None, *, profile=None):
+    """Return a boto3 resource on the shared session; resources are not thread-safe, so not memoized."""
+    return _aws_session(region, profile=profile).resource(service, config=_client_config())
+
+
+def _activate_profile(profile, region):
+    """Make profile the default for later clients and for child pcluster/aws CLI processes."""
+    os.environ["AWS_PROFILE"] = profile
+    os.environ["AWS_DEFAULT_REGION"] = region
@@ -7,20 +7,45 @@ venv guard that the main scripts enforce at import time.
 """
 
 import contextlib
+import io
 import json
 import os
+import random
 import re
 import socket
 import subprocess
 import sys
+import threading
 import time
-import yaml
 from datetime import datetime as DateTime, timezone
 
-try:
-    from botocore.exceptions import ClientError as _ClientError
-except ImportError:
-    _ClientError = Exception
+from pcluster_aws import _aws_client
+
+# yaml, botocore and concurrent.futures are imported where they are used:
+# together they are most of this module's import time, and list_pcluster,
+# access_cluster and every --help run never touch them.
+
+
+def _client_error():
+    """Return botocore's ClientError, imported on first use.
+
+    An except clause evaluates its class only when an exception is in flight,
+    and by then the client that raised it has already imported botocore.
+    """
+    try:
+        from botocore.exceptions import ClientError
+    except ImportError:
+        return Exception
+    return ClientError
+
+
+def _botocore_error():
+    """Return botocore's BotoCoreError, imported on first use."""
+    try:
+        from botocore.exceptions import BotoCoreError
+    except ImportError:
+        return Exception
+    return BotoCoreError
 
 
 def _b(v):
@@ -175,7 +200,7 @@ def _check_fsx_s3(s3_client, bucket, path, label, *, require_objects=True):
         return
     try:
         s3_client.head_bucket(Bucket=bucket)
-    except _ClientError as _e:
+    except _client_error() as _e:
         code = (
             _e.response.get("Error", {}).get("Code", "")
             if hasattr(_e, "response") and _e.response
@@ -198,7 +223,7 @@ def _check_fsx_s3(s3_client, bucket, path, label, *, require_objects=True):
         return
     try:
         result = s3_client.list_objects_v2(Bucket=bucket, Prefix=path)
-    except _ClientError as _e:
+    except _client_error() as _e:
         sys.exit(f"ERROR: Lustre hydration: cannot list s3://{bucket}/{path}: {_e}")
     if result.get("KeyCount", 0) == 0:
         sys.exit(f"ERROR: Please ensure s3://{bucket}/{path} exists!")
@@ -357,6 +382,8 @@ def _load_defaults_file(defaults_path, toolkit_defaults_path, cluster_name):
             f"    # Edit {cluster_name}.yml for this cluster\n"
             f"    --use_defaults={cluster_name}.yml\n"
         )
+    import yaml
+
     try:
         with open(defaults_path) as fh:
             return yaml.safe_load(fh) or {}
@@ -743,7 +770,7 @@ def _setup_iam(
             iam, ec2_iam_role, ec2_iam_policy, aws_account_id,
             suppress=True, enable_monitoring=True,
         )
-    except _ClientError as e:
+    except _client_error() as e:
         if e.response["Error"]["Code"] != "NoSuchEntity":
             raise
 
@@ -883,6 +910,65 @@ def _ssh_secret_name(cluster_name, cluster_serial_number):
     return f"parallelcluster/{cluster_name}/{cluster_serial_number}/ssh-private-key"
 
 
+# A backstop only: _ssh_multiplexed closes its masters on the way out, and
+# this bounds how long one survives a run that was killed before it could.
+_SSH_CONTROL_PERSIST = 60
+_SSH_CONTROL_DIR = None
+
+
+def _ssh_control_options():
+    """Return the ssh -o options that reuse one master connection per host.
+
+    Empty outside _ssh_multiplexed, so a caller's ssh argv is unchanged unless
+    it has opted in.
+    """
+    if _SSH_CONTROL_DIR is None:
+        return []
+    return [
+        "-o", "ControlMaster=auto",
+        # %C is a fixed-length hash of host, port and user, which keeps the
+        # socket path inside the ~104-byte sun_path limit on macOS.
+        "-o", f"ControlPath={os.path.join(_SSH_CONTROL_DIR, '%C')}",
+        "-o", f"ControlPersist={_SSH_CONTROL_PERSIST}",
+    ]
+
+
+@contextlib.contextmanager
+def _ssh_multiplexed():
+    """Share one SSH connection per host across every ssh run inside the block.
+
+    The first ssh to a host becomes the master and later ones ride its
+    session, so a run pays one TCP and key-exchange handshake per host rather
+    than one per remote command. Control sockets live in a private directory
+    for this invocation only; on exit each master is told to close and the
+    directory is removed.
+    """
+    import shutil
+    import tempfile
+
+    global _SSH_CONTROL_DIR
+    # /tmp rather than $TMPDIR, whose macOS path is long enough to push the
+    # socket past sun_path.
+    control_dir = tempfile.mkdtemp(
+        prefix="pcm-ssh-", dir="/tmp" if os.path.isdir("/tmp") else None
+    )
+    previous, _SSH_CONTROL_DIR = _SSH_CONTROL_DIR, control_dir
+    try:
+        yield control_dir
+    finally:
+        _SSH_CONTROL_DIR = previous
+        for sock in os.listdir(control_dir):
+            # ssh wants a destination even when ControlPath names the socket
+            # outright; it is never resolved.
+            with contextlib.suppress(OSError, subprocess.SubprocessError):
+                subprocess.run(
+                    ["ssh", "-O", "exit", "-o", f"ControlPath={os.path.join(control_dir, sock)}",
+                     "mux"],
+                    capture_output=True, stdin=subprocess.DEVNULL, timeout=10,
+                )
+        shutil.rmtree(control_dir, ignore_errors=True)
+
+
 _AUTHORIZED_KEYS = "$HOME/.ssh/authorized_keys"
 
 
@@ -963,6 +1049,8 @@ def _remove_old_key_script(authorized_keys=_AUTHORIZED_KEYS):
 
 def _read_turbot_from_vars_file(vars_file_path):
     """Return turbot_account from a rendered vars file, or 'disabled' if absent/unreadable."""
+    import yaml
+
     try:
         with open(vars_file_path) as _f:
             data = yaml.safe_load(_f) or {}
@@ -972,28 +1060,183 @@ def _read_turbot_from_vars_file(vars_file_path):
         return "disabled"
 
 
-def _get_efa_instance_types(ec2client, fallback):
-    """Return the set of EFA-capable instance type strings from EC2.
+_INSTANCE_TYPE_CACHE_TTL = 7 * 24 * 3600  # EC2 publishes new types roughly monthly
+_DESCRIBE_INSTANCE_TYPES_MAX = 100  # hard API limit on InstanceTypes per call
+
 
-    Pages through describe_instance_types with the efa-supported filter.
-    Falls back to the provided static list on any error so the caller always
-    gets a usable set even in restricted or offline environments.
+def _cache_dir(repo_root):
+    """Return the local cache directory; dot-prefixed so cluster scans skip it."""
+    return os.path.join(repo_root, "active_clusters", ".cache")
+
+
+def _read_json_cache(path, ttl):
+    """Return the {"fetched_at", "data"} document at path, or None if stale or unreadable."""
+    try:
+        with open(path) as fh:
+            doc = json.load(fh)
+        fresh = time.time() - float(doc["fetched_at"]) <= ttl
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return doc if fresh and "data" in doc else None
+
+
+def _write_json_cache(path, data, fetched_at=None):
+    """Atomically write data to path; a cache that cannot be written is skipped."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w") as fh:
+            json.dump(
+                {"fetched_at": fetched_at or time.time(), "data": data}, fh, default=str
+            )
+        os.replace(tmp_path, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
+
+def _describe_instance_types_cached(ec2client, region, instance_types, cache_dir, *, refresh=False):
+    """Return {instance_type: describe_instance_types record} from a region-keyed cache.
+
+    Types absent from the cache are fetched live in 100-type chunks and merged
+    back in. The merge keeps the original fetched_at, so the whole file expires
+    together and a type added last week cannot keep a month-old file alive.
     """
+    path = os.path.join(cache_dir, f"instance_types.{region}.json")
+    doc = None if refresh else _read_json_cache(path, _INSTANCE_TYPE_CACHE_TTL)
+    records = dict(doc["data"]) if doc else {}
+    missing = [t for t in dict.fromkeys(instance_types) if t not in records]
+    for i in range(0, len(missing), _DESCRIBE_INSTANCE_TYPES_MAX):
+        resp = ec2client.describe_instance_types(
+            InstanceTypes=missing[i:i + _DESCRIBE_INSTANCE_TYPES_MAX]
+        )
+        for info in resp["InstanceTypes"]:
+            records[info["InstanceType"]] = info
+    if missing:
+        _write_json_cache(path, records, fetched_at=doc["fetched_at"] if doc else None)
+    return {t: records[t] for t in instance_types if t in records}
+
+
+def _index_instance_types(records, *, hyperthreading, efa_fallback):
+    """Reduce describe_instance_types records to the facts preflight checks use.
+
+    Returns {instance_type: {"arch", "vcpus", "threads_per_core", "nvidia_gpus",
+    "efa"}}, where vcpus is the schedulable count under the hyperthreading setting.
+    """
+    from pcluster_aux_data import efa_supported, nvidia_gpu_count, usable_vcpu_count
+
+    index = {}
+    for itype, info in records.items():
+        archs = (info.get("ProcessorInfo") or {}).get("SupportedArchitectures", [])
+        index[itype] = {
+            "arch": "arm64" if "arm64" in archs else "x86_64",
+            "vcpus": usable_vcpu_count(info, hyperthreading=hyperthreading),
+            "threads_per_core": (info.get("VCpuInfo") or {}).get("DefaultThreadsPerCore") or 1,
+            "nvidia_gpus": nvidia_gpu_count(info),
+            "efa": efa_supported(info, efa_fallback),
+        }
+    return index
+
+
+class _PerThreadStdout:
+    """sys.stdout stand-in that routes writes from registered threads to their own buffer."""
+
+    def __init__(self, real):
+        self._real = real
+        self.buffers = {}
+
+    def write(self, text):
+        return self.buffers.get(threading.get_ident(), self._real).write(text)
+
+    def flush(self):
+        self._real.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._real, name)
+
+
+def _run_preflight(checks, initial=None, *, max_workers=8):
+    """Run preflight checks concurrently, each as soon as its inputs exist.
+
+    Each check is a dict: "name", "run" (called with its inputs as keyword
+    arguments, returning a dict holding its outputs), and optional "inputs"
+    and "outputs" name lists. Only declared outputs are published; a check
+    that does not return one fails. initial seeds the available values.
+
+    Returns (results, timings, failures). A check that raises SystemExit or any
+    other exception is a failure, not an abort, so every independent check
+    still runs; checks whose inputs a failure never produced are skipped and
+    reported with it. Each check's printed output is buffered and replayed in
+    declaration order, so concurrent checks do not interleave on the terminal.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    results = dict(initial or {})
+    timings, failures, output = {}, [], {}
+    producers = {o: c["name"] for c in checks for o in c.get("outputs", ())}
+    for check in checks:
+        unknown = [i for i in check.get("inputs", ()) if i not in producers and i not in results]
+        if unknown:
+            raise ValueError(f"preflight check {check['name']} needs unknown inputs {unknown}")
+
+    stdout = _PerThreadStdout(sys.stdout)
+
+    def _execute(check):
+        buf = io.StringIO()
+        stdout.buffers[threading.get_ident()] = buf
+        start = time.monotonic()
+        try:
+            return check["run"](**{i: results[i] for i in check.get("inputs", ())})
+        finally:
+            timings[check["name"]] = time.monotonic() - start
+            output[check["name"]] = buf.getvalue()
+            del stdout.buffers[threading.get_ident()]
+
+    pending, running = list(checks), {}
+    sys.stdout = stdout
     try:
-        types = []
-        paginator = ec2client.get_paginator("describe_instance_types")
-        for page in paginator.paginate(
-            Filters=[{"Name": "network-info.efa-supported", "Values": ["true"]}]
-        ):
-            for it in page["InstanceTypes"]:
-                types.append(it["InstanceType"])
-        if types:
-            return set(types)
-        # Empty result is unexpected; fall through to fallback.
-        print("  Note: describe_instance_types returned no EFA instances; using built-in list.")
-    except Exception as _e:
-        print(f"  Note: could not query EFA instance types ({_e}); using built-in list.")
-    return set(fallback)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                ready = [c for c in pending if all(i in results for i in c.get("inputs", ()))]
+                for check in ready:
+                    pending.remove(check)
+                    running[pool.submit(_execute, check)] = check
+                if not running:
+                    # Nothing in flight can produce the missing inputs any more:
+                    # their producers failed or were skipped themselves.
+                    for check in pending:
+                        missing = [i for i in check.get("inputs", ()) if i not in results]
+                        failures.append((check["name"], f"skipped — needs {', '.join(missing)}"))
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    check = running.pop(future)
+                    try:
+                        produced = future.result()
+                        results.update({o: produced[o] for o in check.get("outputs", ())})
+                    except SystemExit as e:
+                        reason = e.code if isinstance(e.code, str) else "failed (details above)"
+                        failures.append((check["name"], reason))
+                    except Exception as e:
+                        failures.append((check["name"], f"{type(e).__name__}: {e}"))
+    finally:
+        sys.stdout = stdout._real
+    for check in checks:
+        print(output.get(check["name"], ""), end="")
+    order = [c["name"] for c in checks]
+    failures.sort(key=lambda f: order.index(f[0]))
+    return results, timings, failures
+
+
+def _report_preflight_failures(failures):
+    """Print every collected preflight failure together, then exit 1."""
+    print("*** ERROR ***")
+    print(f"{len(failures)} preflight check(s) did not pass:")
+    for name, reason in failures:
+        print(f"  {name}: {reason}")
+    print("")
+    print("Aborting...")
+    sys.exit(1)
 
 
 def _validate_network(
@@ -1042,15 +1285,55 @@ def _validate_network(
     vpc_id = vpc_ids[0]
     vpc_cidr = vpc_info["Vpcs"][0].get("CidrBlock", "10.0.0.0/8")
 
-    def _discover_subnet(target_az, private_only=False):
+    _gpu_private = use_private_gpu_subnet == "true"
+    # Falling back to compute's AZs is what README.md documents ("--gpu_az
+    # falls back to compute_az then --az"), and compute_az_list already
+    # defaults to [az].
+    _gpu_azs = gpu_az_list or compute_az_list
+    # Copying compute's subnets is correct only when nothing distinguishes
+    # the GPU queue's placement. It is *not* correct when the operator asked
+    # for private GPU subnets and compute's are not known to be private:
+    # --use_private_gpu_subnet=true was silently ignored on that path, and
+    # the GPU fleet landed on whatever subnets compute used -- public ones if
+    # --use_private_compute_subnet was left at its default, which is exactly
+    # the case the flag exists for.
+    _compute_is_private = (
+        not compute_subnet_ids_override and use_private_compute_subnet == "true"
+    )
+    _reuse_compute = not gpu_az_list and not (_gpu_private and not _compute_is_private)
+
+    # Every AZ that needs discovery is resolved by one describe_subnets call into
+    # an AZ -> subnets index. The private/public split is read from each
+    # subnet's MapPublicIpOnLaunch rather than issued as a filtered query per AZ.
+    _wanted_azs = []
+    if not headnode_subnet_id:
+        _wanted_azs.append(az)
+    if not compute_subnet_ids_override:
+        _wanted_azs += compute_az_list
+    if not gpu_subnet_ids_override and not _reuse_compute:
+        _wanted_azs += _gpu_azs
+    _wanted_azs = list(dict.fromkeys(_wanted_azs))
+
+    subnets_by_az = {a: [] for a in _wanted_azs}
+    if _wanted_azs:
         filters = [
-            {"Name": "availabilityZone", "Values": [target_az]},
+            {"Name": "availabilityZone", "Values": _wanted_azs},
             {"Name": "vpc-id", "Values": [vpc_id]},
         ]
-        if private_only:
-            filters.append({"Name": "map-public-ip-on-launch", "Values": ["false"]})
-        info = ec2client.describe_subnets(Filters=filters)
-        subnets = info["Subnets"]
+        kwargs = {}
+        while True:
+            info = ec2client.describe_subnets(Filters=filters, **kwargs)
+            for subnet in info["Subnets"]:
+                subnets_by_az.setdefault(subnet["AvailabilityZone"], []).append(subnet)
+            if not info.get("NextToken"):
+                break
+            kwargs = {"NextToken": info["NextToken"]}
+
+    def _discover_subnet(target_az, private_only=False):
+        subnets = [
+            s for s in subnets_by_az.get(target_az, [])
+            if not (private_only and s.get("MapPublicIpOnLaunch"))
+        ]
         if not subnets:
             suffix = (
                 " (private subnets only — map-public-ip-on-launch=false)"
@@ -1094,38 +1377,21 @@ def _validate_network(
             s.strip() for s in gpu_subnet_ids_override.split(",") if s.strip()
         ]
         print(f"  Using explicit GPU subnet(s): {', '.join(gpu_subnet_ids)}")
+    elif _reuse_compute:
+        gpu_subnet_ids = list(compute_subnet_ids)
     else:
-        _gpu_private = use_private_gpu_subnet == "true"
-        # Falling back to compute's AZs is what README.md documents ("--gpu_az
-        # falls back to compute_az then --az"), and compute_az_list already
-        # defaults to [az].
-        _gpu_azs = gpu_az_list or compute_az_list
-        # Copying compute's subnets is correct only when nothing distinguishes
-        # the GPU queue's placement. It is *not* correct when the operator asked
-        # for private GPU subnets and compute's are not known to be private:
-        # --use_private_gpu_subnet=true was silently ignored on that path, and
-        # the GPU fleet landed on whatever subnets compute used -- public ones if
-        # --use_private_compute_subnet was left at its default, which is exactly
-        # the case the flag exists for.
-        _compute_is_private = (
-            not compute_subnet_ids_override and use_private_compute_subnet == "true"
-        )
-        _reuse_compute = not gpu_az_list and not (_gpu_private and not _compute_is_private)
-        if _reuse_compute:
-            gpu_subnet_ids = list(compute_subnet_ids)
-        else:
-            _gpu_label = "private GPU" if _gpu_private else "GPU"
-            if not gpu_az_list:
-                print(
-                    f"  --use_private_gpu_subnet=true with no --gpu_subnet_ids: "
-                    f"discovering private subnets rather than reusing compute's."
-                )
+        _gpu_label = "private GPU" if _gpu_private else "GPU"
+        if not gpu_az_list:
             print(
-                f"  Auto-discovering {_gpu_label} subnet(s) in: {', '.join(_gpu_azs)}..."
+                f"  --use_private_gpu_subnet=true with no --gpu_subnet_ids: "
+                f"discovering private subnets rather than reusing compute's."
             )
-            gpu_subnet_ids = [
-                _discover_subnet(gaz, private_only=_gpu_private) for gaz in _gpu_azs
-            ]
+        print(
+            f"  Auto-discovering {_gpu_label} subnet(s) in: {', '.join(_gpu_azs)}..."
+        )
+        gpu_subnet_ids = [
+            _discover_subnet(gaz, private_only=_gpu_private) for gaz in _gpu_azs
+        ]
 
     return vpc_id, headnode_subnet_id, compute_subnet_ids, gpu_subnet_ids, vpc_cidr
 
@@ -1163,6 +1429,10 @@ _REGION_TO_LOCATION = {
 }
 
 
+_OD_PRICE_CACHE_TTL = 24 * 3600  # the Pricing catalog republishes at most daily
+_PRICE_LOOKUP_WORKERS = 8  # Pricing throttles hard; a handful in flight is the sweet spot
+
+
 def _get_od_price(pricing_client, instance_type, region):
     """Return (price_float, None) on success or (None, reason_str) on failure."""
     location = _REGION_TO_LOCATION.get(region)
@@ -1181,7 +1451,7 @@ def _get_od_price(pricing_client, instance_type, region):
             ],
             MaxResults=1,
         )
-    except _ClientError as e:
+    except _client_error() as e:
         code = e.response["Error"]["Code"]
         if code in ("AccessDeniedException", "AccessDenied"):
             return None, "unavailable — add pricing:GetProducts to operator IAM policy"
@@ -1202,47 +1472,84 @@ def _get_od_price(pricing_client, instance_type, region):
         return None, f"unavailable — unexpected Pricing API response shape: {e}"
 
 
-def _get_spot_price(ec2client, instance_type):
-    """Return (price_float, None) on success or (None, reason_str) on failure."""
-    try:
-        resp = ec2client.describe_spot_price_history(
-            InstanceTypes=[instance_type],
-            ProductDescriptions=["Linux/UNIX"],
-            MaxResults=1,
-        )
-    except _ClientError as e:
-        code = e.response["Error"]["Code"]
-        return None, f"unavailable — {code}"
-    except Exception as e:
-        return None, f"unavailable — {e}"
+def _get_od_prices(pricing_client, instance_types, region, cache_dir=None):
+    """Return {instance_type: (price, reason)}, looking up uncached types concurrently.
 
-    history = resp.get("SpotPriceHistory", [])
-    if not history:
-        return None, f"unavailable — no spot price history for '{instance_type}'"
-    try:
-        return float(history[0]["SpotPrice"]), None
-    except (KeyError, ValueError) as e:
-        return None, f"unavailable — unexpected spot price response: {e}"
+    Successful prices are kept for a day in cache_dir (None disables the cache);
+    failures are never cached, so a policy fix takes effect on the next run.
+    """
+    path = os.path.join(cache_dir, f"od_prices.{region}.json") if cache_dir else None
+    doc = _read_json_cache(path, _OD_PRICE_CACHE_TTL) if path else None
+    cached = doc["data"] if doc and isinstance(doc["data"], dict) else {}
+    results = {t: (float(cached[t]), None) for t in instance_types if t in cached}
+    missing = [t for t in dict.fromkeys(instance_types) if t not in results]
+    if missing:
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = min(_PRICE_LOOKUP_WORKERS, len(missing))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            fetched = pool.map(lambda t: _get_od_price(pricing_client, t, region), missing)
+            results.update(zip(missing, fetched))
+        fresh = {t: results[t][0] for t in missing if results[t][0] is not None}
+        if path and fresh:
+            _write_json_cache(path, {**cached, **fresh}, doc["fetched_at"] if doc else None)
+    return results
+
+
+def _get_spot_prices(ec2client, instance_types, az):
+    """Return {(instance_type, az): price} from one describe_spot_price_history call.
+
+    History comes back newest first, so the first entry seen per type wins. A
+    type with no history in az is absent; API errors propagate to the caller.
+    """
+    types_ = list(dict.fromkeys(instance_types))
+    if not types_:
+        return {}
+    # MaxResults=1000 is the hard API limit; each type returns several entries.
+    resp = ec2client.describe_spot_price_history(
+        InstanceTypes=types_,
+        MaxResults=min(len(types_) * 20, 1000),
+        ProductDescriptions=["Linux/UNIX (Amazon VPC)"],
+        AvailabilityZone=az,
+    )
+    prices = {}
+    for entry in resp["SpotPriceHistory"]:
+        key = (entry["InstanceType"], entry.get("AvailabilityZone", az))
+        prices.setdefault(key, float(entry["SpotPrice"]))
+    return prices
 
 
 def _cost_summary_lines(
     *,
-    pricing_client, ec2client,
+    pricing_client, spot_prices,
     headnode_instance_type,
     cpu_instance_types, max_cpu_queue_size, enable_cpu_queue,
     gpu_instance_types, max_gpu_queue_size, enable_gpu_queue,
-    region, cluster_type,
+    region, az, cluster_type, cache_dir=None,
 ):
     """Return list of strings to inject into the build summary.
 
     Returns a single-element list with an error message on unexpected failure.
     Only types whose OD lookup succeeds contribute to the spot range, so the
     two ranges are always derived from the same subset of instance types.
+    Every price is looked up once, up front and concurrently; cache_dir is
+    passed through to _get_od_prices. Spot prices are not fetched here:
+    spot_prices is the {(instance_type, az): price} map preflight already built,
+    so the summary agrees with the prices printed during validation.
     """
     try:
         lines = []
         is_spot = cluster_type == "spot"
 
+        queued = []
+        if enable_cpu_queue and cpu_instance_types and max_cpu_queue_size > 0:
+            queued += cpu_instance_types
+        if enable_gpu_queue and gpu_instance_types and max_gpu_queue_size > 0:
+            queued += gpu_instance_types
+        od_by_type = _get_od_prices(
+            pricing_client, [headnode_instance_type] + queued, region, cache_dir
+        )
+
         def _price_range(types):
             """Return (od_min, od_max, sp_min, sp_max, partial_note).
 
@@ -1250,23 +1557,16 @@ def _cost_summary_lines(
             partial_note is set when at least one type failed but others succeeded.
             Returns all-None when every type fails; caller checks od_min is None.
             """
-            od_prices, spot_prices = [], []
-            failed, succeeded = 0, 0
-            for t in types:
-                od, _ = _get_od_price(pricing_client, t, region)
-                if od is None:
-                    failed += 1
-                    continue
-                succeeded += 1
-                od_prices.append(od)
-                if is_spot:
-                    sp, _ = _get_spot_price(ec2client, t)
-                    if sp is not None:
-                        spot_prices.append(sp)
+            od_prices = [od_by_type[t][0] for t in types if od_by_type[t][0] is not None]
+            queue_spot = [
+                spot_prices[(t, az)] for t in types
+                if is_spot and od_by_type[t][0] is not None and (t, az) in spot_prices
+            ]
+            failed, succeeded = len(types) - len(od_prices), len(od_prices)
             od_min = min(od_prices) if od_prices else None
             od_max = max(od_prices) if od_prices else None
-            sp_min = min(spot_prices) if spot_prices else None
-            sp_max = max(spot_prices) if spot_prices else None
+            sp_min = min(queue_spot) if queue_spot else None
+            sp_max = max(queue_spot) if queue_spot else None
             partial_note = f" ({failed} type(s) unavailable)" if failed and succeeded else ""
             return od_min, od_max, sp_min, sp_max, partial_note
 
@@ -1288,7 +1588,7 @@ def _cost_summary_lines(
 
         lines.append("  Estimated hourly cost (max fleet, on-demand unless noted):")
 
-        hn_od, hn_err = _get_od_price(pricing_client, headnode_instance_type, region)
+        hn_od, hn_err = od_by_type[headnode_instance_type]
         if hn_od is not None:
             lines.append(f"    Head node  ({headnode_instance_type} × 1):   ${hn_od:.3f}/hr")
         else:
@@ -1566,22 +1866,33 @@ def _safe(s):
     return _SAFE_STR_RE.sub("", s)
 
 
+def _is_active_cluster_dir(cluster_name, repo_root):
+    """True if active_clusters/<cluster_name> is a directory inside active_clusters/."""
+    cluster_dir = os.path.realpath(
+        os.path.join(repo_root, "active_clusters", cluster_name)
+    )
+    active_root = os.path.realpath(os.path.join(repo_root, "active_clusters"))
+    if not cluster_dir.startswith(active_root + os.sep):
+        return False
+    return os.path.isdir(cluster_dir)
+
+
+def _vars_file_path(cluster_name, repo_root):
+    return os.path.join(repo_root, "src", "vars_files", cluster_name + ".yml")
+
+
 def _read_cluster_record(cluster_name, repo_root):
     """Read cluster metadata from src/vars_files/<cluster_name>.yml.
 
     Returns a dict, or None if the vars file is missing or unparseable.
     Defense-in-depth path check protects callers that bypass _enumerate_clusters.
     """
-    cluster_dir = os.path.realpath(
-        os.path.join(repo_root, "active_clusters", cluster_name)
-    )
-    active_root = os.path.realpath(os.path.join(repo_root, "active_clusters"))
-    if not cluster_dir.startswith(active_root + os.sep):
-        return None
-    if not os.path.isdir(cluster_dir):
+    if not _is_active_cluster_dir(cluster_name, repo_root):
         return None
 
-    vars_path = os.path.join(repo_root, "src", "vars_files", cluster_name + ".yml")
+    import yaml
+
+    vars_path = _vars_file_path(cluster_name, repo_root)
     try:
         with open(vars_path) as fh:
             data = yaml.safe_load(fh)
@@ -1636,13 +1947,102 @@ def _read_cluster_record(cluster_name, repo_root):
     }
 
 
+_INVENTORY_VERSION = 1  # bump whenever _read_cluster_record's fields change
+
+
+def _inventory_path(repo_root):
+    return os.path.join(_cache_dir(repo_root), "inventory.json")
+
+
+def _enumerate_clusters(repo_root):
+    """Return the sorted names of the cluster directories under active_clusters/.
+
+    Entries that are not real directories or not valid cluster names (the
+    dot-prefixed .cache among them) are skipped.
+    """
+    names = []
+    try:
+        with os.scandir(os.path.join(repo_root, "active_clusters")) as it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                try:
+                    _validate_cluster_name(entry.name)
+                except SystemExit:
+                    continue
+                names.append(entry.name)
+    except OSError:
+        pass
+    return sorted(names)
+
+
+def _read_cluster_records(cluster_names, repo_root, *, rebuild=False):
+    """Return {cluster_name: record or None} for cluster_names, via the inventory index.
+
+    The index (active_clusters/.cache/inventory.json) holds each cluster's
+    parsed record with the mtime and size of the vars file it came from. An
+    entry is reused only while both still match, so a warm listing costs one
+    JSON read and a stat per cluster instead of a YAML parse per cluster.
+    Anything else goes through _read_cluster_record. A missing, corrupt or
+    older-version index is rebuilt, as is any index when rebuild=True. The
+    index is rewritten only when an entry changed.
+    """
+    path = _inventory_path(repo_root)
+    # Entries are validated one by one against their vars file, never by age.
+    doc = None if rebuild else _read_json_cache(path, float("inf"))
+    data = doc["data"] if doc and isinstance(doc["data"], dict) else {}
+    if data.get("version") != _INVENTORY_VERSION or not isinstance(data.get("clusters"), dict):
+        data = {"version": _INVENTORY_VERSION, "clusters": {}}
+    entries = data["clusters"]
+    changed = doc is None
+
+    records = {}
+    for name in cluster_names:
+        try:
+            st = os.stat(_vars_file_path(name, repo_root))
+            stamp = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            stamp = None
+        entry = entries.get(name)
+        if (
+            stamp is not None
+            and isinstance(entry, dict)
+            and entry.get("stamp") == stamp
+            and _is_active_cluster_dir(name, repo_root)
+        ):
+            records[name] = entry["record"]
+            continue
+        rec = _read_cluster_record(name, repo_root)
+        records[name] = rec
+        if rec is not None and stamp is not None:
+            entries[name] = {"stamp": stamp, "record": rec}
+            changed = True
+        elif entries.pop(name, None) is not None:
+            changed = True
+    if changed:
+        _write_json_cache(path, data)
+    return records
+
+
 # ---------------------------------------------------------------------------
 # Fleet stop/start helpers (shared by stop_pcluster.py and start_pcluster.py)
 # ---------------------------------------------------------------------------
 
 _REGION_RE = re.compile(r"^[a-z]{2}(-[a-z]+)+-\d+$")
-_FLEET_POLL_INTERVAL = 30
-_FLEET_POLL_TIMEOUT = 90  # 90 × 30 s = 45 min
+
+# _wait_until's schedule: quick first polls, since a fleet often settles in
+# well under a minute, backing off to the cap for long CloudFormation updates.
+_WAIT_FIRST_DELAY = 5.0
+_WAIT_BACKOFF = 1.5
+_WAIT_MAX_DELAY = 60.0
+_WAIT_JITTER = 0.2  # ±20%, so concurrent waits do not poll in lockstep
+_WAIT_TIMEOUT = 45 * 60
+# Once a transition has history, polling drops back to _WAIT_FIRST_DELAY at
+# this fraction of its median duration, where completion is most likely.
+_WAIT_WINDOW = 0.8
+_WAIT_HISTORY_SIZE = 10  # durations kept per cluster and transition
+_WAIT_HISTORY_VERSION = 2
+_WAIT_HISTORY_LOCK = threading.Lock()
 
 
 def _validate_region(region):
@@ -1700,12 +2100,155 @@ def _run_pcluster_cmd(subcmd_args, pcluster_bin):
         )
 
 
-def _get_fleet_status(cluster_name, region, pcluster_bin):
-    """Return the current computeFleetStatus string for cluster_name."""
-    data = _run_pcluster_cmd(
+_DESCRIBE_BACKENDS = ("native", "cli")
+
+# PCluster reports the stack status as clusterStatus, except that rollbacks
+# are reported as the failure of the operation being rolled back
+# (cloud_formation_status_to_cluster_status in pcluster/api).
+_CLUSTER_STATUS_FROM_STACK = {
+    "ROLLBACK_IN_PROGRESS": "CREATE_FAILED",
+    "ROLLBACK_FAILED": "CREATE_FAILED",
+    "ROLLBACK_COMPLETE": "CREATE_FAILED",
+    "UPDATE_COMPLETE_CLEANUP_IN_PROGRESS": "UPDATE_IN_PROGRESS",
+    "UPDATE_ROLLBACK_IN_PROGRESS": "UPDATE_FAILED",
+    "UPDATE_ROLLBACK_FAILED": "UPDATE_FAILED",
+    "UPDATE_ROLLBACK_COMPLETE_CLEANUP_IN_PROGRESS": "UPDATE_FAILED",
+    "UPDATE_ROLLBACK_COMPLETE": "UPDATE_FAILED",
+}
+_HEAD_NODE_STATES = ["pending", "running", "stopping", "stopped"]
+
+
+def _native_fleet_status(cluster_name, region):
+    """Read computeFleetStatus from the cluster's DynamoDB status table, as PCluster does."""
+    ddb = _aws_client("dynamodb", region)
+    try:
+        item = ddb.get_item(
+            TableName=f"parallelcluster-{cluster_name}",
+            Key={"Id": {"S": "COMPUTE_FLEET"}},
+            ConsistentRead=True,
+        ).get("Item")
+    except _client_error() as e:
+        # The table is created part-way through the stack; until then
+        # PCluster itself reports UNKNOWN rather than failing.
+        if e.response.get("Error", {}).get("Code") == "ResourceNotFoundException":
+            return "UNKNOWN"
+        raise
+    if not item:
+        return "UNKNOWN"
+    # PCluster 3.2+ nests the status in a Data map; 3.0/3.1 stored it flat.
+    if "Data" in item:
+        return item["Data"]["M"]["status"]["S"]
+    return item["Status"]["S"]
+
+
+def _native_head_node(cluster_name, region):
+    """Return describe-cluster's headNode dict from EC2, or None if there is no head node."""
+    ec2 = _aws_client("ec2", region)
+    reservations = ec2.describe_instances(
+        Filters=[
+            {"Name": "tag:parallelcluster:cluster-name", "Values": [cluster_name]},
+            {"Name": "tag:parallelcluster:node-type", "Values": ["HeadNode"]},
+            {"Name": "instance-state-name", "Values": _HEAD_NODE_STATES},
+        ]
+    )["Reservations"]
+    instances = [i for r in reservations for i in r["Instances"]]
+    if not instances:
+        return None
+    inst = instances[0]
+    head = {
+        "instanceId": inst["InstanceId"],
+        "instanceType": inst["InstanceType"],
+        "state": inst["State"]["Name"],
+        "privateIpAddress": inst.get("PrivateIpAddress", ""),
+    }
+    if inst.get("PublicIpAddress"):
+        head["publicIpAddress"] = inst["PublicIpAddress"]
+    if inst.get("LaunchTime"):
+        head["launchTime"] = inst["LaunchTime"].isoformat()
+    return head
+
+
+def _describe_cluster_native(cluster_name, region):
+    """Build describe-cluster's status fields from CloudFormation, DynamoDB and EC2.
+
+    Three API calls on the shared clients instead of a pcluster subprocess,
+    which spends most of its time importing the CLI. Only the fields the tools
+    read are produced. Raises ClientError/BotoCoreError on any API failure.
+    """
+    stack = _aws_client("cloudformation", region).describe_stacks(
+        StackName=cluster_name
+    )["Stacks"][0]
+    stack_status = stack["StackStatus"]
+    tags = {t["Key"]: t["Value"] for t in stack.get("Tags", [])}
+    data = {
+        "clusterName": cluster_name,
+        "region": region,
+        "version": tags.get("parallelcluster:version", ""),
+        "clusterStatus": _CLUSTER_STATUS_FROM_STACK.get(stack_status, stack_status),
+        "cloudFormationStackStatus": stack_status,
+        "computeFleetStatus": _native_fleet_status(cluster_name, region),
+    }
+    head = _native_head_node(cluster_name, region)
+    if head is not None:
+        data["headNode"] = head
+    return data
+
+
+def _try_describe_cluster_native(cluster_name, region):
+    """Return _describe_cluster_native's result, or None so the caller can fall back to the CLI.
+
+    A missing permission, absent credentials, or a stack layout this code does
+    not know should cost speed, never the answer: the CLI remains authoritative.
+    """
+    try:
+        return _describe_cluster_native(cluster_name, region)
+    except (_client_error(), _botocore_error(), ImportError, KeyError, IndexError):
+        return None
+
+
+def _sweep_stack_statuses(region):
+    """Return {stack_name: (clusterStatus, cloudFormationStackStatus)} for every stack in region.
+
+    One paginated describe_stacks call covers every cluster in the region,
+    where describe-cluster costs a round trip (or a subprocess) per cluster.
+    Returns None if the sweep fails, so callers fall back to per-cluster calls.
+    """
+    try:
+        cfn = _aws_client("cloudformation", region)
+        statuses = {}
+        for page in cfn.get_paginator("describe_stacks").paginate():
+            for stack in page.get("Stacks", []):
+                status = stack["StackStatus"]
+                statuses[stack["StackName"]] = (
+                    _CLUSTER_STATUS_FROM_STACK.get(status, status),
+                    status,
+                )
+        return statuses
+    except (_client_error(), _botocore_error(), ImportError, KeyError):
+        return None
+
+
+def _describe_cluster(cluster_name, region, pcluster_bin, *, backend="cli"):
+    """Return describe-cluster data from backend ("native" or "cli").
+
+    The native backend falls back to the CLI on any failure; CLI failures
+    raise SystemExit as _run_pcluster_cmd does.
+    """
+    if backend not in _DESCRIBE_BACKENDS:
+        raise ValueError(f"unknown describe-cluster backend: {backend!r}")
+    if backend == "native":
+        data = _try_describe_cluster_native(cluster_name, region)
+        if data is not None:
+            return data
+    return _run_pcluster_cmd(
         ["describe-cluster", "--cluster-name", cluster_name, "--region", region],
         pcluster_bin,
     )
+
+
+def _get_fleet_status(cluster_name, region, pcluster_bin, *, backend="cli"):
+    """Return the current computeFleetStatus string for cluster_name."""
+    data = _describe_cluster(cluster_name, region, pcluster_bin, backend=backend)
     return data.get("computeFleetStatus", "UNKNOWN")
 
 
@@ -1740,37 +2283,345 @@ def _fleet_action_plan(status, action):
     return "request"
 
 
-def _poll_fleet(cluster_name, region, target, label, pcluster_bin):
-    """Poll describe-cluster until computeFleetStatus == target.
+def _wait_history_path(repo_root):
+    return os.path.join(_cache_dir(repo_root), "wait_history.json")
+
+
+def _read_wait_history(repo_root):
+    doc = _read_json_cache(_wait_history_path(repo_root), float("inf"))
+    data = doc["data"] if doc and isinstance(doc["data"], dict) else {}
+    if data.get("version") != _WAIT_HISTORY_VERSION or not isinstance(data.get("transitions"), dict):
+        data = {"version": _WAIT_HISTORY_VERSION, "transitions": {}}
+    return data
+
+
+def _wait_transition(cluster_name, label):
+    """Return the wait history key for label on cluster_name.
+
+    A 2-node fleet and a 500-node one settle on very different clocks, so
+    each cluster keeps its own history.
+    """
+    return f"{cluster_name}/{label}"
+
+
+def _expected_wait(transition, repo_root):
+    """Return the median recorded duration of transition in seconds, or None without history."""
+    durations = _read_wait_history(repo_root)["transitions"].get(transition)
+    if not isinstance(durations, list) or not durations:
+        return None
+    durations = sorted(durations)
+    mid = len(durations) // 2
+    return durations[mid] if len(durations) % 2 else (durations[mid - 1] + durations[mid]) / 2
+
+
+def _record_wait(transition, seconds, repo_root):
+    """Append one completed wait to transition's history, keeping the newest _WAIT_HISTORY_SIZE."""
+    with _WAIT_HISTORY_LOCK:
+        data = _read_wait_history(repo_root)
+        durations = data["transitions"].get(transition)
+        if not isinstance(durations, list):
+            durations = []
+        data["transitions"][transition] = (durations + [round(seconds, 1)])[-_WAIT_HISTORY_SIZE:]
+        _write_json_cache(_wait_history_path(repo_root), data)
 
-    Raises SystemExit on PROTECTED state, timeout, or KeyboardInterrupt.
+
+def _wait_delays(expected=None):
+    """Yield the sleeps between polls, before jitter.
+
+    The delay starts at _WAIT_FIRST_DELAY and grows by _WAIT_BACKOFF up to
+    _WAIT_MAX_DELAY. With an expected duration, the step that would overshoot
+    _WAIT_WINDOW of it is shortened to land there, and the backoff restarts
+    from the first delay, so polling is densest around the likely finish.
+    """
+    planned, delay = 0.0, _WAIT_FIRST_DELAY
+    window = expected * _WAIT_WINDOW if expected else None
+    while True:
+        if window is not None and planned < window < planned + delay:
+            yield window - planned
+            planned, delay, window = window, _WAIT_FIRST_DELAY, None
+            continue
+        yield delay
+        planned += delay
+        delay = min(delay * _WAIT_BACKOFF, _WAIT_MAX_DELAY)
+
+
+def _wait_until(poll, transition, *, timeout=_WAIT_TIMEOUT, repo_root=None, record=True, cancel=None):
+    """Call poll() on an adaptive schedule until it returns True.
+
+    Returns the seconds waited, or None once timeout has passed or the
+    threading.Event cancel, if given, is set; cancel also cuts a sleep short.
+    poll is expected to report its own progress and to raise SystemExit on a
+    failure state. transition is a _wait_transition key. With repo_root, the
+    schedule is shaped by this transition's past durations (see
+    _wait_delays), and with record a wait that needed at least one sleep is
+    added to them; a transition already complete on the first poll says
+    nothing about how long it takes. Pass record=False for a transition that
+    started before this wait, whose duration would be understated.
+    """
+    expected = _expected_wait(transition, repo_root) if repo_root else None
+    start = time.monotonic()
+    delays = _wait_delays(expected)
+    slept = False
+    while True:
+        if poll():
+            waited = time.monotonic() - start
+            if repo_root and record and slept:
+                _record_wait(transition, waited, repo_root)
+            return waited
+        remaining = timeout - (time.monotonic() - start)
+        if remaining <= 0:
+            return None
+        jitter = random.uniform(1 - _WAIT_JITTER, 1 + _WAIT_JITTER)
+        delay = min(next(delays) * jitter, remaining)
+        if cancel is None:
+            time.sleep(delay)
+        elif cancel.wait(delay):
+            return None
+        slept = True
+
+
+def _poll_fleet(cluster_name, region, target, label, pcluster_bin, *, backend="cli", repo_root=None,
+                record=True):
+    """Poll describe-cluster until computeFleetStatus == target, on _wait_until's schedule.
+
+    label names the transition in messages and, with repo_root, in this
+    cluster's wait history; record is passed to _wait_until. Raises
+    SystemExit on PROTECTED state, timeout, or KeyboardInterrupt.
     """
+    def reached():
+        status = _get_fleet_status(cluster_name, region, pcluster_bin, backend=backend)
+        print(f"  [{_fleet_ts()}] computeFleetStatus: {status}")
+        if status == "PROTECTED":
+            raise SystemExit(
+                "ERROR: compute fleet is in PROTECTED state — investigate node "
+                "failures before retrying.\n"
+                f"  pcluster describe-cluster --cluster-name {cluster_name} --region {region}"
+            )
+        return status == target
+
     # Ctrl-C is caught around the whole loop, not just time.sleep(). The
     # describe-cluster subprocess and its JSON parse take real wall-clock time,
     # and an interrupt landing there escaped as a raw traceback with no hint
     # that the fleet operation was still running in AWS.
     try:
-        for i in range(_FLEET_POLL_TIMEOUT):
-            status = _get_fleet_status(cluster_name, region, pcluster_bin)
-            print(f"  [{_fleet_ts()}] computeFleetStatus: {status}")
-            if status == target:
-                return
-            if status == "PROTECTED":
-                raise SystemExit(
-                    "ERROR: compute fleet is in PROTECTED state — investigate node "
-                    "failures before retrying.\n"
-                    f"  pcluster describe-cluster --cluster-name {cluster_name} --region {region}"
-                )
-            if i == _FLEET_POLL_TIMEOUT - 1:
-                raise SystemExit(
-                    f"ERROR: timed out after {_FLEET_POLL_TIMEOUT * _FLEET_POLL_INTERVAL // 60} min "
-                    f"waiting for {label}.\n"
-                    f"  pcluster describe-cluster --cluster-name {cluster_name} --region {region}"
-                )
-            time.sleep(_FLEET_POLL_INTERVAL)
+        waited = _wait_until(reached, _wait_transition(cluster_name, label), repo_root=repo_root,
+                             record=record)
     except KeyboardInterrupt:
         print(
             f"\nInterrupted. Fleet operation still running in AWS.\n"
             f"  pcluster describe-cluster --cluster-name {cluster_name} --region {region}"
         )
         raise SystemExit(1)
+    if waited is None:
+        raise SystemExit(
+            f"ERROR: timed out after {_WAIT_TIMEOUT // 60} min "
+            f"waiting for {label}.\n"
+            f"  pcluster describe-cluster --cluster-name {cluster_name} --region {region}"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Multi-cluster fleet stop/start (stop_pcluster.py / start_pcluster.py with
+# --all or several -N names)
+# ---------------------------------------------------------------------------
+
+_FLEET_REQUESTS = {"stop": "STOP_REQUESTED", "start": "START_REQUESTED"}
+# Requests and first describes are short API calls; the waits mostly sleep,
+# so every waiting cluster gets its own thread up to this many.
+_FLEET_ACTION_WORKERS = 16
+_FLEET_WAIT_WORKERS = 64
+_FLEET_TABLE_REFRESH = 1.0  # seconds between live table redraws
+
+
+def _select_cluster_records(names, repo_root, *, owner=None, region=None):
+    """Return {cluster_name: record or None} for names, or for every cluster when names is None.
+
+    A cluster named explicitly is kept even without a readable record, so it
+    is reported rather than silently skipped. One found by enumeration
+    without a record is kept only when nothing filters, since it cannot be
+    placed by owner or region.
+    """
+    explicit = names is not None
+    if not explicit:
+        names = _enumerate_clusters(repo_root)
+    selected = {}
+    for name, rec in _read_cluster_records(sorted(set(names)), repo_root).items():
+        if rec is None:
+            if explicit or not (owner or region):
+                selected[name] = None
+            continue
+        if region and rec["region"] != region:
+            continue
+        if owner and rec["cluster_owner"] != owner:
+            continue
+        selected[name] = rec
+    return selected
+
+
+def _fleet_table_lines(rows):
+    headers = ("Cluster", "Region", "computeFleetStatus", "Result", "Elapsed")
+    table = [
+        (r["cluster"], _safe(r["region"]), _safe(r["status"]), _safe(r["result"]),
+         f"{r['elapsed']:.0f}s" if r.get("elapsed") is not None else "-")
+        for r in rows
+    ]
+    widths = [max(len(h), *(len(row[i]) for row in table)) for i, h in enumerate(headers)]
+    sep = "  "
+    return [
+        sep.join(h.ljust(widths[i]) for i, h in enumerate(headers)).rstrip(),
+        sep.join("-" * w for w in widths),
+        *(sep.join(c.ljust(widths[i]) for i, c in enumerate(row)).rstrip() for row in table),
+    ]
+
+
+def _fleet_error(err):
+    """Fold a SystemExit's message onto one short table cell."""
+    text = " ".join(str(err.code).removeprefix("ERROR: ").split())
+    return text[:100] or "failed"
+
+
+def _fleet_action_many(action, records, pcluster_bin, *, wait, backend, repo_root, confirm=None):
+    """Stop or start the compute fleet of every cluster in records at once; return the exit status.
+
+    Every fleet's status is read and planned with _fleet_action_plan, then
+    every update-compute-fleet request is issued up front. With wait, all the
+    fleets are then polled concurrently, each on its own _wait_until
+    schedule, while a status table is redrawn in place (or, when stdout is
+    not a terminal, each change is printed as a line). confirm, if given, is
+    called once before the first request. Returns 1 if any cluster was
+    protected, failed, or did not reach its target, else 0.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    done_states = _FLEET_DONE_STATES[action]
+    label = f"fleet {action}"
+    rows = {
+        name: {"cluster": name, "region": rec["region"] if rec else "unknown",
+               "status": "-", "result": "", "elapsed": None, "failed": False}
+        for name, rec in records.items()
+    }
+    if not rows:
+        print("No clusters selected.")
+        return 0
+
+    def fail(name, result):
+        rows[name].update(result=result, failed=True)
+
+    def plan(name):
+        row = rows[name]
+        if records[name] is None:
+            return fail(name, "no cluster record")
+        try:
+            row["status"] = _get_fleet_status(name, row["region"], pcluster_bin, backend=backend)
+        except SystemExit as e:
+            return fail(name, _fleet_error(e))
+        step = _fleet_action_plan(row["status"], action)
+        row["result"] = {"abort": "PROTECTED", "done": "already done",
+                         "wait": "in progress", "request": "to request"}[step]
+        row["failed"] = step == "abort"
+
+    def request(name):
+        row = rows[name]
+        try:
+            _run_pcluster_cmd(
+                ["update-compute-fleet", "--cluster-name", name, "--region", row["region"],
+                 "--status", _FLEET_REQUESTS[action]],
+                pcluster_bin,
+            )
+        except SystemExit as e:
+            return fail(name, _fleet_error(e))
+        row["result"] = "requested"
+
+    with ThreadPoolExecutor(max_workers=min(_FLEET_ACTION_WORKERS, len(rows))) as pool:
+        list(pool.map(plan, rows))
+    ordered = [rows[name] for name in sorted(rows)]
+    print("\n".join(_fleet_table_lines(ordered)))
+
+    to_request = [r["cluster"] for r in ordered if r["result"] == "to request"]
+    if to_request:
+        if confirm:
+            confirm()
+        print(f"\nRequesting {label} on {len(to_request)} cluster(s)...")
+        with ThreadPoolExecutor(max_workers=min(_FLEET_ACTION_WORKERS, len(to_request))) as pool:
+            list(pool.map(request, to_request))
+
+    waiting = [r["cluster"] for r in ordered if r["result"] in ("requested", "in progress")]
+    if wait and waiting:
+        _wait_fleets(waiting, rows, done_states, label, pcluster_bin, backend, repo_root)
+    print("")
+    print("\n".join(_fleet_table_lines(ordered)))
+
+    failed = [r for r in ordered if r["failed"]]
+    if failed:
+        print(f"\n{len(failed)} of {len(ordered)} cluster(s) failed.")
+    elif wait:
+        print(f"\nAll {len(ordered)} fleet(s) reached {'/'.join(done_states)}.")
+    return 1 if failed else 0
+
+
+def _wait_fleets(names, rows, done_states, label, pcluster_bin, backend, repo_root):
+    """Poll every fleet in names concurrently until each settles, showing progress as it goes."""
+    from concurrent.futures import ThreadPoolExecutor, wait
+
+    cancel = threading.Event()
+    changed = threading.Event()
+    started = time.monotonic()
+
+    def wait_one(name):
+        row = rows[name]
+        # Only a transition this run requested is timed from its start.
+        record = row["result"] == "requested"
+        row["result"] = "waiting"
+
+        def reached():
+            status = _get_fleet_status(name, row["region"], pcluster_bin, backend=backend)
+            row["elapsed"] = time.monotonic() - started
+            if status != row["status"]:
+                row["status"] = status
+                changed.set()
+            if status == "PROTECTED":
+                raise SystemExit("PROTECTED")
+            return status in done_states
+
+        try:
+            waited = _wait_until(reached, _wait_transition(name, label), repo_root=repo_root,
+                                 record=record, cancel=cancel)
+        except SystemExit as e:
+            waited = None
+            row.update(result=_fleet_error(e), failed=True)
+        else:
+            if waited is not None:
+                row["result"] = "done"
+            elif not cancel.is_set():
+                row.update(result=f"timed out after {_WAIT_TIMEOUT // 60} min", failed=True)
+        changed.set()
+
+    live = sys.stdout.isatty()
+    drawn = 0
+    print("")
+    pool = ThreadPoolExecutor(max_workers=min(_FLEET_WAIT_WORKERS, len(names)))
+    try:
+        pending = {pool.submit(wait_one, name) for name in names}
+        while pending:
+            _, pending = wait(pending, timeout=_FLEET_TABLE_REFRESH)
+            if not changed.is_set():
+                continue
+            changed.clear()
+            if live:
+                lines = _fleet_table_lines([rows[name] for name in names])
+                # Move back over the previous table and draw over it.
+                print((f"\033[{drawn}F\033[J" if drawn else "") + "\n".join(lines), flush=True)
+                drawn = len(lines)
+            else:
+                for name in names:
+                    row = rows[name]
+                    if row.get("reported") != (row["status"], row["result"]):
+                        row["reported"] = (row["status"], row["result"])
+                        print(f"  [{_fleet_ts()}] {name}: {row['status']}  {row['result']}", flush=True)
+    except KeyboardInterrupt:
+        cancel.set()
+        print("\nInterrupted. Fleet operations still running in AWS.")
+        raise SystemExit(1)
+    finally:
+        cancel.set()
+        pool.shutdown(wait=True)
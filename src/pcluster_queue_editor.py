@@ -1,12 +1,11 @@
 import copy
 import os
 import re
+import shlex
 import shutil
 import sys
 import tempfile
 
-from ruamel.yaml import YAML
-
 from pcluster_aux_data import (
     ec2_instances_full_list,
     is_arm_instance,
@@ -18,6 +17,9 @@ from pcluster_aux_data import (
 
 def _make_yaml():
     """Return a configured ruamel YAML instance."""
+    # Imported here so manage_pcluster_queue --help does not load ruamel.
+    from ruamel.yaml import YAML
+
     yaml = YAML()
     yaml.preserve_quotes = True
     yaml.indent(mapping=2, sequence=4, offset=2)
@@ -83,6 +85,44 @@ def _write_cluster_config(config_path, config_dict):
         raise
 
 
+def _applied_path(config_path):
+    return config_path + ".applied"
+
+
+def _record_applied_config(config_path):
+    """Keep a copy of config_path as the config the cluster now runs."""
+    applied = _applied_path(config_path)
+    shutil.copy2(config_path, applied + ".tmp")
+    os.replace(applied + ".tmp", applied)
+
+
+def _forget_applied_config(config_path):
+    """Drop the last-applied copy once it can no longer be trusted to match the cluster.
+
+    Without -W the operator runs update-cluster by hand, so this script never
+    learns whether, or which, config was deployed. A stale copy that happened
+    to equal a later edit would make that edit look like a no-op.
+    """
+    try:
+        os.unlink(_applied_path(config_path))
+    except FileNotFoundError:
+        pass
+
+
+def _read_config_file(path):
+    """Return the YAML document at path, or None if there is none or it cannot be read."""
+    from ruamel.yaml import YAMLError
+
+    try:
+        with open(path) as fh:
+            return _make_yaml().load(fh)
+    except FileNotFoundError:
+        return None
+    except (OSError, YAMLError) as exc:
+        print(f"WARNING: ignoring unreadable {path}: {exc}")
+        return None
+
+
 # PCluster's NameValidator (NAME_MAX_LENGTH = 25) is registered on both
 # BaseQueue and BaseComputeResource, and _do_add derives the compute resource
 # name as f"{queue_name}-resource". A 25-char queue name therefore yields a
@@ -264,15 +304,262 @@ def _get_root_volume_encrypted(queues):
     return False
 
 
+BATCHABLE_ACTIONS = ("add", "remove")
+
+
+def _read_queue_edits(path):
+    """Return [(line_number, argv)] for each edit in a batch file.
+
+    One edit per line, written as the manage_pcluster_queue.py arguments that
+    follow -A, e.g. "add -T gpu -Q train -E p5.48xlarge". Blank lines and
+    lines starting with # are skipped.
+    """
+    try:
+        with open(path) as fh:
+            lines = fh.read().splitlines()
+    except OSError as exc:
+        sys.exit(f"ERROR: cannot read edits file {path}: {exc.strerror}")
+    edits = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        try:
+            argv = shlex.split(line)
+        except ValueError as exc:
+            sys.exit(f"ERROR: {path} line {number}: {exc}")
+        if argv[0] not in BATCHABLE_ACTIONS:
+            sys.exit(
+                f"ERROR: {path} line {number}: each edit must start with "
+                f"{' or '.join(BATCHABLE_ACTIONS)}, not {argv[0]!r}"
+            )
+        edits.append((number, argv))
+    if not edits:
+        sys.exit(f"ERROR: no edits found in {path}")
+    return edits
+
+
+def _validate_queue_set(config):
+    """Check the queue list as a whole once every edit in a batch is staged.
+
+    Each edit is validated as it is staged; this catches what only the end
+    state shows, before anything is written or the fleet is stopped.
+    """
+    queues = config.get("Scheduling", {}).get("SlurmQueues") or []
+    if not queues:
+        sys.exit("ERROR: the edits leave no queues. A cluster must have at least one queue.")
+    names = [q.get("Name") for q in queues]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        sys.exit(f"ERROR: the edits leave duplicate queue names: {', '.join(duplicates)}")
+    for queue in queues:
+        resources = [cr.get("Name") for cr in queue.get("ComputeResources", [])]
+        if len(set(resources)) != len(resources):
+            sys.exit(f"ERROR: queue '{queue.get('Name')}' has duplicate compute resource names")
+
+
+# ParallelCluster 3's update policies for Scheduling/SlurmQueues: a queue can
+# be added to a running cluster, removing one needs a stopped fleet, and the
+# settings below can change inside an existing queue on a running fleet only
+# when SlurmSettings.QueueUpdateStrategy is DRAIN or TERMINATE. Within
+# ComputeResources that covers adding a compute resource or an instance
+# type; removing either still needs a stopped fleet. Everything else is
+# treated as needing a stopped fleet, which is always safe.
+LIVE_QUEUE_UPDATE_STRATEGIES = ("DRAIN", "TERMINATE")
+_STRATEGY_QUEUE_KEYS = {"ComputeResources", "ComputeSettings", "CustomActions", "Iam", "Networking"}
+
+
+def _plain(node):
+    """Return node as plain dicts and lists, so equality ignores key order and YAML styling."""
+    if isinstance(node, dict):
+        return {k: _plain(v) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_plain(v) for v in node]
+    return node
+
+
+def _by_name(items):
+    return {item.get("Name"): item for item in items or []}
+
+
+def _queues_by_name(config):
+    return _by_name(_plain(config.get("Scheduling", {}).get("SlurmQueues")))
+
+
+def _outside_queues(config):
+    """Return config without the queue list or QueueUpdateStrategy, for comparison."""
+    config = _plain(config)
+    scheduling = dict(config.get("Scheduling") or {})
+    scheduling.pop("SlurmQueues", None)
+    settings = dict(scheduling.get("SlurmSettings") or {})
+    settings.pop("QueueUpdateStrategy", None)
+    scheduling["SlurmSettings"] = settings
+    return {**config, "Scheduling": scheduling}
+
+
+def _compute_resource_removals(old_queue, new_queue):
+    """Return (removed, trimmed) for the compute resources of one queue.
+
+    Compute resources are matched by Name. removed has one line per compute
+    resource new_queue drops and per instance type it drops from a kept
+    compute resource. trimmed is old_queue's ComputeResources with those
+    removals applied, so comparing it with new_queue's shows what else changed.
+    """
+    new_crs = _by_name(new_queue.get("ComputeResources"))
+    removed, trimmed = [], []
+    for cr in old_queue.get("ComputeResources") or []:
+        name = cr.get("Name")
+        if name not in new_crs:
+            removed.append(f"compute resource {name} removed")
+            continue
+        new_cr, cr = new_crs[name], dict(cr)
+        if "InstanceType" in cr and cr["InstanceType"] != new_cr.get("InstanceType"):
+            removed.append(f"instance type {cr.pop('InstanceType')} removed from {name}")
+        kept = {i.get("InstanceType") for i in new_cr.get("Instances") or []}
+        for instance in cr.get("Instances") or []:
+            if instance.get("InstanceType") not in kept:
+                removed.append(f"instance type {instance.get('InstanceType')} removed from {name}")
+        if "Instances" in cr:
+            cr["Instances"] = [i for i in cr["Instances"] if i.get("InstanceType") in kept]
+        trimmed.append(cr)
+    return removed, trimmed
+
+
+def _classify_queue_update(before, after):
+    """Return (needs_stop, reasons) for updating a cluster from config before to after.
+
+    needs_stop is False only when every difference can be applied with the
+    compute fleet running; reasons has one line per difference saying how
+    it is applied. Nodes in queues the update does not touch keep running
+    either way only when needs_stop is False.
+    """
+    strategy = (after.get("Scheduling", {}).get("SlurmSettings") or {}).get("QueueUpdateStrategy")
+    old, new = _queues_by_name(before), _queues_by_name(after)
+    needs_stop, reasons = False, []
+    for name in sorted(set(new) - set(old)):
+        reasons.append(f"queue {name} added: applied to the running fleet")
+    for name in sorted(set(old) - set(new)):
+        needs_stop = True
+        reasons.append(f"queue {name} removed: needs a stopped fleet")
+    for name in sorted(set(old) & set(new)):
+        old_queue = old[name]
+        removed, trimmed = _compute_resource_removals(old_queue, new[name])
+        for line in removed:
+            needs_stop = True
+            reasons.append(f"queue {name}: {line}: needs a stopped fleet")
+        if removed:
+            old_queue = {**old_queue, "ComputeResources": trimmed}
+        changed = _changed_keys(old_queue, new[name])
+        if not changed:
+            continue
+        if strategy in LIVE_QUEUE_UPDATE_STRATEGIES and set(changed) <= _STRATEGY_QUEUE_KEYS:
+            reasons.append(
+                f"queue {name} changed ({', '.join(changed)}): applied under "
+                f"QueueUpdateStrategy={strategy}"
+            )
+        else:
+            needs_stop = True
+            reasons.append(
+                f"queue {name} changed ({', '.join(changed)}): needs a stopped fleet"
+                + ("" if strategy in LIVE_QUEUE_UPDATE_STRATEGIES else
+                   " unless QueueUpdateStrategy is DRAIN or TERMINATE")
+            )
+    if _outside_queues(before) != _outside_queues(after):
+        needs_stop = True
+        reasons.append("settings outside the queue list changed: needs a stopped fleet")
+    return needs_stop, reasons
+
+
+def _changed_keys(old, new):
+    return sorted(k for k in set(old) | set(new) if old.get(k) != new.get(k))
+
+
+def _changed_paths(old, new, prefix=""):
+    """Return the dotted paths under which mappings old and new differ."""
+    paths = []
+    for key in _changed_keys(old, new):
+        a, b = old.get(key), new.get(key)
+        path = f"{prefix}{key}"
+        if isinstance(a, dict) and isinstance(b, dict):
+            paths.extend(_changed_paths(a, b, path + "."))
+        else:
+            paths.append(path)
+    return paths
+
+
+def _diff_cluster_configs(before, after):
+    """Return one line per structural difference from config before to after.
+
+    Values are compared as data, so re-quoting a value, reordering mapping
+    keys or moving a comment is not a change. Queues and their compute
+    resources are matched by Name and reported as added (+), removed (-) or
+    changed (~) with the keys that changed; a changed ComputeResources list
+    is broken down the same way per compute resource. A new order of the
+    same queues is a change too, since the first queue is Slurm's default
+    partition. Everything outside the queue list is reported by dotted path.
+    An empty list means the configs are equivalent.
+    """
+    lines = []
+    old_queues, new_queues = _queues_by_name(before), _queues_by_name(after)
+    for name in sorted(set(new_queues) - set(old_queues)):
+        lines.append(f"+ queue {name}")
+    for name in sorted(set(old_queues) - set(new_queues)):
+        lines.append(f"- queue {name}")
+    for name in sorted(set(old_queues) & set(new_queues)):
+        old_q, new_q = old_queues[name], new_queues[name]
+        keys = _changed_keys(old_q, new_q)
+        if not keys:
+            continue
+        lines.append(f"~ queue {name}: {', '.join(keys)}")
+        if "ComputeResources" not in keys:
+            continue
+        old_crs = _by_name(old_q.get("ComputeResources"))
+        new_crs = _by_name(new_q.get("ComputeResources"))
+        for cr in sorted(set(new_crs) - set(old_crs)):
+            lines.append(f"  + compute resource {cr}")
+        for cr in sorted(set(old_crs) - set(new_crs)):
+            lines.append(f"  - compute resource {cr}")
+        for cr in sorted(set(old_crs) & set(new_crs)):
+            cr_keys = _changed_keys(old_crs[cr], new_crs[cr])
+            if cr_keys:
+                lines.append(f"  ~ compute resource {cr}: {', '.join(cr_keys)}")
+        if set(old_crs) == set(new_crs) and list(old_crs) != list(new_crs):
+            lines.append("  ~ compute resources reordered")
+    kept = [n for n in old_queues if n in new_queues]
+    if kept != [n for n in new_queues if n in old_queues]:
+        lines.append("~ queue order")
+    # QueueUpdateStrategy lives outside the queue list, so compare with it kept.
+    outside = [_plain(c) for c in (before, after)]
+    for config in outside:
+        config.get("Scheduling", {}).pop("SlurmQueues", None)
+    lines.extend(f"~ {path}" for path in _changed_paths(*outside))
+    return lines
+
+
 def _recovery_guidance(cluster_name, region, config_path, stage):
     """Return operator recovery steps for a failed -W (wait) queue update.
 
-    stage is one of "update", "start". A failure after the fleet has been
-    stopped leaves the cluster with zero compute capacity; without these steps
-    the operator is told only that a step failed, not that jobs are queued
+    stage is one of "update", "start", or "live" for a --live update, which
+    never stopped the fleet. A failure after the fleet has been stopped
+    leaves the cluster with zero compute capacity; without these steps the
+    operator is told only that a step failed, not that jobs are queued
     behind a fleet nobody restarted.
     """
     backup = config_path + ".bak"
+    if stage == "live":
+        return "\n".join([
+            "",
+            "*** LIVE UPDATE FAILED ***",
+            "  The compute fleet was not stopped; queues the update did not touch are unaffected.",
+            "",
+            "  1. Inspect what went wrong:",
+            f"       pcluster describe-cluster --cluster-name {cluster_name} --region {region}",
+            "",
+            "  2. To roll the configuration back to the previous generation:",
+            f"       cp {backup} {config_path}",
+            f"       pcluster update-cluster --cluster-name {cluster_name} \\",
+            f"         --cluster-configuration {config_path} --region {region}",
+            "",
+        ])
     lines = [
         "",
         "*** RECOVERY REQUIRED ***",
@@ -308,8 +595,12 @@ def _recovery_guidance(cluster_name, region, config_path, stage):
 
 
 def _print_update_reminder(cluster_name, region, queue_name, action):
+    """Print the manual apply steps; queue_name may be a list of the names a batch changed."""
     config_rel = f"active_clusters/{cluster_name}/config.{cluster_name}"
-    print(f'\nQueue "{queue_name}" {action} in {config_rel}\n')
+    if isinstance(queue_name, list):
+        print(f'\nQueues {", ".join(queue_name)} {action} in {config_rel}\n')
+    else:
+        print(f'\nQueue "{queue_name}" {action} in {config_rel}\n')
     print("To apply this change:\n")
     print(
         f"1. Stop the compute fleet:\n"
@@ -22,30 +22,62 @@ import argparse
 
 sys.path.insert(0, _src_dir)
 from pcluster_core import (
+    _DESCRIBE_BACKENDS,
     _validate_cluster_name,
     _validate_region,
     _read_cluster_record,
     _run_pcluster_cmd,
     _get_fleet_status,
     _fleet_action_plan,
+    _fleet_action_many,
     _poll_fleet,
+    _select_cluster_records,
 )
 
 _PCLUSTER_BIN = os.path.join(_repo_root, ".venv", "bin", "pcluster")
 
 
+def _start_many(args):
+    """Start every selected cluster's fleet at once; return the combined exit status."""
+    names = None if args.all else args.cluster_name
+    for name in names or ():
+        _validate_cluster_name(name)
+    if args.region:
+        _validate_region(args.region)
+    records = _select_cluster_records(names, _repo_root, owner=args.owner, region=args.region)
+    return _fleet_action_many(
+        "start", records, _PCLUSTER_BIN, wait=args.wait, backend=args.describe_backend,
+        repo_root=_repo_root,
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Start the compute fleet of a stopped ParallelCluster stack."
     )
-    parser.add_argument("-N", "--cluster_name", required=True, help="Cluster name")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("-N", "--cluster_name", nargs="+", metavar="NAME",
+                        help="Cluster name; several names start every fleet at once")
+    target.add_argument("-A", "--all", action="store_true",
+                        help="Start the fleet of every cluster under active_clusters/ at once")
+    parser.add_argument("-O", "--owner", default=None,
+                        help="With --all or several names: only clusters owned by this user")
     parser.add_argument("-R", "--region", default=None,
-                        help="AWS region (default: from cluster record)")
+                        help="AWS region (default: from cluster record); with --all or "
+                             "several names, only clusters in this region")
     parser.add_argument("-W", "--wait", action="store_true",
                         help="Wait for fleet to reach RUNNING before exiting")
+    parser.add_argument("--describe_backend", choices=_DESCRIBE_BACKENDS, default="native",
+                        help="How to read fleet status: native API calls, falling back "
+                             "to the pcluster CLI on error (default), or the CLI only")
     args = parser.parse_args()
 
-    cluster_name = args.cluster_name
+    if args.all or len(args.cluster_name) > 1:
+        sys.exit(_start_many(args))
+    if args.owner:
+        parser.error("--owner applies only with --all or several names")
+
+    cluster_name = args.cluster_name[0]
     _validate_cluster_name(cluster_name)
 
     rec = _read_cluster_record(cluster_name, _repo_root)
@@ -57,7 +89,8 @@ def main():
         sys.exit(f"ERROR: no region found for cluster {cluster_name!r} — pass -R/--region")
     _validate_region(region)
 
-    status = _get_fleet_status(cluster_name, region, _PCLUSTER_BIN)
+    status = _get_fleet_status(cluster_name, region, _PCLUSTER_BIN,
+                               backend=args.describe_backend)
     print(f"Cluster:              {cluster_name}")
     print(f"Region:               {region}")
     print(f"computeFleetStatus:   {status}")
@@ -74,7 +107,10 @@ def main():
         print(f"Fleet is already {status} — a start is already in progress.")
         if args.wait:
             print("Waiting for fleet to reach RUNNING...")
-            _poll_fleet(cluster_name, region, "RUNNING", "fleet start", _PCLUSTER_BIN)
+            # The start began before this run, so its duration would be
+            # understated; poll on its history but do not add to it.
+            _poll_fleet(cluster_name, region, "RUNNING", "fleet start", _PCLUSTER_BIN,
+                        backend=args.describe_backend, repo_root=_repo_root, record=False)
             print("Fleet is RUNNING.")
         else:
             print(
@@ -92,7 +128,8 @@ def main():
 
     if args.wait:
         print("Waiting for fleet to reach RUNNING...")
-        _poll_fleet(cluster_name, region, "RUNNING", "fleet start", _PCLUSTER_BIN)
+        _poll_fleet(cluster_name, region, "RUNNING", "fleet start", _PCLUSTER_BIN,
+                    backend=args.describe_backend, repo_root=_repo_root)
         print("Fleet is RUNNING.")
     else:
         print(
@@ -22,6 +22,7 @@ sys.path.insert(
 
 from pcluster_aux_data import (  # noqa: F401
     base_os_efa,
+    efa_supported,
     is_arm_instance,
     is_gpu_instance,
     needs_efa_gdr,
@@ -485,9 +486,12 @@ class _FakeIAM:
 
 
 def _make_boto3_with_iam(iam_client, monkeypatch):
-    fake_boto3 = types.ModuleType("boto3")
-    fake_boto3.client = lambda service, **kw: iam_client if service == "iam" else None
-    monkeypatch.setitem(sys.modules, "boto3", fake_boto3)
+    import pcluster_aws
+
+    monkeypatch.setattr(
+        pcluster_aws, "_aws_client",
+        lambda service, *a, **kw: iam_client if service == "iam" else None,
+    )
 
 
 def test_ctrlC_abort_iam_cleanup_no_fsx(monkeypatch):
@@ -664,6 +668,20 @@ class TestNeedsEfaGdr:
         assert not needs_efa_gdr(itype)
 
 
+class TestEfaSupported:
+    def test_the_record_flag_wins_over_the_static_list(self):
+        info = {"InstanceType": "c5n.18xlarge", "NetworkInfo": {"EfaSupported": False}}
+        assert efa_supported(info, ["c5n.18xlarge"]) is False
+
+    def test_a_record_flag_of_true_needs_no_static_entry(self):
+        info = {"InstanceType": "c8gn.48xlarge", "NetworkInfo": {"EfaSupported": True}}
+        assert efa_supported(info, []) is True
+
+    def test_a_record_without_the_flag_falls_back_to_the_static_list(self):
+        assert efa_supported({"InstanceType": "c5n.18xlarge"}, ["c5n.18xlarge"]) is True
+        assert efa_supported({"InstanceType": "m5.large"}, ["c5n.18xlarge"]) is False
+
+
 class TestNvidiaGpuCount:
     """Shapes are taken verbatim from ec2:DescribeInstanceTypes responses.
 
@@ -853,11 +871,14 @@ class TestDeriveRanksPerNode:
             "cpu_ranks_per_node": "cpu_instance_types",
             "gpu_vcpus_per_node": "gpu_instance_types",
         }, assigned
+        # The fetch goes through the region-keyed cache in pcluster_core, which
+        # is the only route to describe_instance_types from make_pcluster.
         described = [
             node
             for node in ast.walk(tree)
             if isinstance(node, ast.Call)
-            and getattr(node.func, "attr", None) == "describe_instance_types"
+            and getattr(node.func, "attr", getattr(node.func, "id", None))
+            in ("describe_instance_types", "_describe_instance_types_cached")
         ]
         assert len(described) == 1, (
             f"{len(described)} describe_instance_types calls -- the vCPU counts must "
@@ -4,6 +4,7 @@ import json
 import os
 import subprocess
 import sys
+import time
 import types
 
 import pytest
@@ -11,6 +12,8 @@ import pytest
 # Import module-level — venv guard passes when running under .venv/bin/python
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import check_pcluster as chk
+import diagnose_pcluster as diag
+import pcluster_core
 
 
 def _proc(rc=0, stdout="", stderr=""):
@@ -362,8 +365,7 @@ class TestCheckS3:
             def head_bucket(self, **kwargs):
                 pass
 
-        import boto3
-        monkeypatch.setattr(boto3, "client", lambda *a, **kw: _FakeS3())
+        monkeypatch.setattr(chk, "_aws_client", lambda *a, **kw: _FakeS3())
         ok, err = chk.check_s3("my-bucket", "us-east-1")
         assert ok is True
         assert err is None
@@ -377,8 +379,7 @@ class TestCheckS3:
                     {"Error": {"Code": "NoSuchBucket", "Message": "nope"}}, "HeadBucket"
                 )
 
-        import boto3
-        monkeypatch.setattr(boto3, "client", lambda *a, **kw: _FakeS3())
+        monkeypatch.setattr(chk, "_aws_client", lambda *a, **kw: _FakeS3())
         ok, err = chk.check_s3("missing-bucket", "us-east-1")
         assert ok is False
         assert "NoSuchBucket" in err
@@ -403,8 +404,10 @@ def _stage_main(monkeypatch, argv=("check_pcluster.py", "-N", "mycluster"), **ov
     rec.update(overrides.pop("rec", {}))
     monkeypatch.setattr(chk, "check_vars_file", lambda n: (True, None, rec))
     monkeypatch.setattr(chk, "check_cfn_status",
-                        lambda n, r: (True, "status=CREATE_COMPLETE", "1.2.3.4"))
+                        lambda n, r, b: (True, "status=CREATE_COMPLETE", "1.2.3.4"))
     monkeypatch.setattr(chk, "check_head_ip", lambda ip: (True, None))
+    # No probe: every SSH check takes its own round trip, stubbed below.
+    monkeypatch.setattr(chk, "probe_head_node", lambda *a: (None, None))
     monkeypatch.setattr(chk, "check_ssh", lambda *a: (True, None))
     monkeypatch.setattr(chk, "check_slurm", lambda *a: (True, None))
     monkeypatch.setattr(chk, "check_postinstall", lambda *a: (True, None))
@@ -473,7 +476,7 @@ class TestCheckPclusterMainAggregation:
     def test_cfn_failure_skips_the_entire_ssh_chain(self, monkeypatch, capsys):
         _stage_main(
             monkeypatch,
-            check_cfn_status=lambda n, r: (False, "rc=1", None),
+            check_cfn_status=lambda n, r, b: (False, "rc=1", None),
         )
         with pytest.raises(SystemExit) as exc:
             chk.main()
@@ -519,3 +522,352 @@ class TestCheckPclusterMainAggregation:
         with pytest.raises(SystemExit):
             chk.main()
         assert seen["timeout"] == chk._MAX_TIMEOUT
+
+
+# ---------------------------------------------------------------------------
+# Single-round-trip probe
+# ---------------------------------------------------------------------------
+
+def _probe_script(timeout, commands):
+    return (
+        chk._PROBE_SCRIPT
+        .replace("__TIMEOUT__", str(timeout))
+        .replace("__COMMANDS__", json.dumps(commands))
+    )
+
+
+class TestProbeScript:
+    """The script runs on the head node; run it here under the local python."""
+
+    def _run(self, timeout, commands):
+        result = subprocess.run(
+            [sys.executable, "-"], input=_probe_script(timeout, commands),
+            capture_output=True, text=True, timeout=30,
+        )
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout)
+
+    def test_reports_every_command(self):
+        out = self._run(5, {"ok": ["echo", "5 idle"], "bad": ["false"]})
+        assert out["echo"] == "OK"
+        assert out["ok"] == {"rc": 0, "stdout": "5 idle\n", "stderr": ""}
+        assert out["bad"]["rc"] == 1
+
+    def test_a_missing_command_is_rc_127(self):
+        out = self._run(5, {"gone": ["no-such-command-pcm"]})
+        assert out["gone"]["rc"] == 127
+
+    def test_commands_run_in_parallel_and_a_slow_one_times_out(self):
+        import time
+
+        started = time.monotonic()
+        out = self._run(1, {"a": ["sleep", "5"], "b": ["sleep", "5"], "c": ["echo", "x"]})
+        assert time.monotonic() - started < 4
+        assert out["a"]["rc"] is None and out["b"]["rc"] is None
+        assert out["c"]["rc"] == 0
+
+
+class TestProbeHeadNode:
+    def _probe(self, monkeypatch, proc, monitoring=False):
+        seen = {}
+
+        def _run(args, **kw):
+            seen["args"], seen["kw"] = args, kw
+            if isinstance(proc, Exception):
+                raise proc
+            return proc
+
+        monkeypatch.setattr(subprocess, "run", _run)
+        result = chk.probe_head_node("1.2.3.4", "/k.pem", "ubuntu", 15, monitoring)
+        return result, seen
+
+    def test_one_ssh_carries_every_check(self, monkeypatch):
+        payload = {"echo": "OK",
+                   "sinfo": {"rc": 0, "stdout": "4 idle\n", "stderr": ""},
+                   "postinstall": {"rc": 0, "stdout": "", "stderr": ""},
+                   "grafana": {"rc": 0, "stdout": '{"database":"ok"}', "stderr": ""}}
+        (probe, err), seen = self._probe(
+            monkeypatch, _proc(stdout=json.dumps(payload)), monitoring=True
+        )
+        assert err is None and probe == payload
+        assert seen["args"][-2:] == ["python3", "-"]
+        script = seen["kw"]["input"]
+        for cmd in (chk._SINFO_CMD, chk._POSTINSTALL_CMD, chk._GRAFANA_HEALTH_CMD):
+            assert json.dumps(cmd) in script
+
+    def test_grafana_is_probed_only_with_monitoring(self, monkeypatch):
+        payload = {"echo": "OK", "sinfo": {"rc": 0, "stdout": "", "stderr": ""},
+                   "postinstall": {"rc": 0, "stdout": "", "stderr": ""}}
+        (probe, _), seen = self._probe(monkeypatch, _proc(stdout=json.dumps(payload)))
+        assert probe is not None
+        assert "grafana" not in seen["kw"]["input"]
+
+    def test_unreachable_head_node_is_an_ssh_error(self, monkeypatch):
+        (probe, err), _ = self._probe(monkeypatch, _proc(rc=255, stderr="Connection refused"))
+        assert probe is None and "rc=255" in err
+
+    def test_timeout_is_an_ssh_error(self, monkeypatch):
+        (probe, err), _ = self._probe(monkeypatch, subprocess.TimeoutExpired("ssh", 1))
+        assert probe is None and "timed out" in err
+
+    def test_no_python3_falls_back_without_an_error(self, monkeypatch):
+        (probe, err), _ = self._probe(
+            monkeypatch, _proc(rc=127, stderr="python3: command not found")
+        )
+        assert (probe, err) == (None, None)
+
+    def test_a_probe_missing_a_result_falls_back(self, monkeypatch):
+        (probe, err), _ = self._probe(monkeypatch, _proc(stdout='{"echo": "OK"}'))
+        assert (probe, err) == (None, None)
+
+
+class TestMainUsesTheProbe:
+    _PROBE = {
+        "echo": "OK",
+        "sinfo": {"rc": 0, "stdout": "2 idle\n1 down\n", "stderr": ""},
+        "postinstall": {"rc": 1, "stdout": "", "stderr": ""},
+        "grafana": {"rc": 0, "stdout": '{"database": "ok"}', "stderr": ""},
+    }
+
+    def _no_round_trips(self):
+        fail = lambda *a: pytest.fail("per-check SSH round trip")  # noqa: E731
+        return dict(check_ssh=fail, check_slurm=fail, check_postinstall=fail, check_grafana=fail)
+
+    def test_probe_results_feed_the_usual_report(self, monkeypatch, capsys):
+        _stage_main(
+            monkeypatch, rec={"enable_monitoring": "true"},
+            probe_head_node=lambda *a: (self._PROBE, None), **self._no_round_trips(),
+        )
+        with pytest.raises(SystemExit) as exc:
+            chk.main()
+        out = capsys.readouterr().out
+        assert exc.value.code == 1
+        assert f"{chk._PASS} SSH reachability" in out
+        assert f"{chk._PASS} Slurm — 2 node(s) usable, 1 down/drained" in out
+        assert f"{chk._FAIL} postinstall complete — marker file absent" in out
+        assert f"{chk._PASS} Grafana health" in out
+
+    def test_unreachable_probe_skips_without_retrying(self, monkeypatch, capsys):
+        _stage_main(
+            monkeypatch,
+            probe_head_node=lambda *a: (None, "SSH connection timed out"),
+            **self._no_round_trips(),
+        )
+        with pytest.raises(SystemExit) as exc:
+            chk.main()
+        out = capsys.readouterr().out
+        assert exc.value.code == 1
+        assert f"{chk._FAIL} SSH reachability — SSH connection timed out" in out
+        assert out.count(chk._SKIP) == 2
+
+    def test_timed_out_probe_is_a_failure(self):
+        assert chk._slurm_result(None, "", "timed out") == (False, "sinfo timed out")
+        assert chk._postinstall_result(None)[0] is False
+        assert chk._grafana_result(None, "")[0] is False
+
+
+# ---------------------------------------------------------------------------
+# SSH connection multiplexing
+# ---------------------------------------------------------------------------
+
+class TestSshMultiplexing:
+    """One handshake per run: every ssh inside _ssh_multiplexed shares a
+    ControlMaster socket in a private directory that is gone afterwards."""
+
+    def test_no_control_options_outside_the_block(self):
+        args = chk._ssh_args("1.2.3.4", "/k.pem", "ubuntu", 15)
+        assert not any(a.startswith("Control") for a in args)
+
+    @pytest.mark.parametrize("module", [chk, diag], ids=["check", "diagnose"])
+    def test_every_ssh_inside_the_block_shares_one_control_path(self, module):
+        with pcluster_core._ssh_multiplexed() as control_dir:
+            first = module._ssh_args("1.2.3.4", "/k.pem", "ubuntu", 15)
+            second = module._ssh_args("1.2.3.4", "/k.pem", "ubuntu", 15)
+        assert first == second
+        assert "ControlMaster=auto" in first
+        assert f"ControlPath={control_dir}/%C" in first
+        # Options must precede the destination or ssh reads them as the command.
+        assert first[-1] == "ubuntu@1.2.3.4"
+
+    def test_masters_are_closed_and_the_directory_removed(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(subprocess, "run", lambda args, **kw: calls.append(args) or _proc())
+        with pcluster_core._ssh_multiplexed() as control_dir:
+            open(os.path.join(control_dir, "abc123"), "w").close()
+        assert calls == [[
+            "ssh", "-O", "exit", "-o", f"ControlPath={control_dir}/abc123", "mux",
+        ]]
+        assert not os.path.exists(control_dir)
+        assert pcluster_core._ssh_control_options() == []
+
+    def test_cleanup_runs_when_the_block_exits_early(self):
+        with pytest.raises(SystemExit):
+            with pcluster_core._ssh_multiplexed() as control_dir:
+                sys.exit(1)
+        assert not os.path.exists(control_dir)
+        assert pcluster_core._ssh_control_options() == []
+
+    def test_main_runs_every_check_inside_one_session(self, monkeypatch):
+        seen = []
+        _stage_main(
+            monkeypatch,
+            check_ssh=lambda *a: seen.append(pcluster_core._SSH_CONTROL_DIR) or (True, None),
+            check_slurm=lambda *a: seen.append(pcluster_core._SSH_CONTROL_DIR) or (True, None),
+        )
+        with pytest.raises(SystemExit):
+            chk.main()
+        assert len(seen) == 2 and seen[0] is not None and seen[0] == seen[1]
+
+
+# ---------------------------------------------------------------------------
+# --all fleet mode
+# ---------------------------------------------------------------------------
+
+def _fleet_rec(owner="rmarable", region="us-east-1"):
+    return dict(_REC, cluster_owner=owner, region=region)
+
+
+class TestRunChecks:
+    def test_results_are_structured_and_streamed(self, monkeypatch):
+        _stage_main(monkeypatch, check_s3=lambda b, r: (False, "NoSuchBucket"))
+        lines = []
+        results = chk.run_checks("mycluster", _fleet_rec(), 15, "native", emit=lines.append)
+        assert [r["check"] for r in results] == [
+            "CloudFormation status", "head node IP", "SSH reachability",
+            "Slurm", "postinstall complete", "S3 bucket: my-bucket",
+        ]
+        assert results[-1] == {"result": "FAIL", "check": "S3 bucket: my-bucket",
+                               "detail": "NoSuchBucket"}
+        assert lines[-1] == f"  {chk._FAIL} S3 bucket: my-bucket — NoSuchBucket"
+        assert len(lines) == len(results)
+
+
+class TestFleetMode:
+    @pytest.fixture
+    def fleet(self, monkeypatch):
+        records = {
+            "alpha": _fleet_rec(),
+            "bravo": _fleet_rec(owner="alice", region="us-west-2"),
+            "charlie": _fleet_rec(),
+        }
+        _stage_main(monkeypatch)
+        monkeypatch.setattr(chk, "_enumerate_clusters", lambda repo_root: sorted(records))
+        monkeypatch.setattr(
+            chk, "_read_cluster_records",
+            lambda names, root: {n: records.get(n) for n in names},
+        )
+        return records
+
+    def _main(self, monkeypatch, *argv):
+        monkeypatch.setattr(sys, "argv", ["check_pcluster.py", "--all", *argv])
+        with pytest.raises(SystemExit) as exc:
+            chk.main()
+        return exc.value.code
+
+    def test_all_healthy_exits_zero_with_a_summary(self, fleet, monkeypatch, capsys):
+        assert self._main(monkeypatch) == 0
+        out = capsys.readouterr().out
+        assert "All 3 cluster(s) healthy." in out
+        assert out.count("healthy") >= 3
+
+    def test_one_failure_sets_the_exit_code(self, fleet, monkeypatch, capsys):
+        monkeypatch.setattr(chk, "check_s3", lambda b, r: (r != "us-west-2", "NoSuchBucket"))
+        assert self._main(monkeypatch) == 1
+        out = capsys.readouterr().out
+        assert "1 of 3 cluster(s) failed." in out
+        assert "S3 bucket: my-bucket" in out.splitlines()[3]
+
+    def test_owner_and_region_filter_the_fleet(self, fleet, monkeypatch, capsys):
+        self._main(monkeypatch, "-J", "-O", "rmarable")
+        assert [r["cluster"] for r in json.loads(capsys.readouterr().out)] == ["alpha", "charlie"]
+        self._main(monkeypatch, "-J", "-R", "us-west-2")
+        assert [r["cluster"] for r in json.loads(capsys.readouterr().out)] == ["bravo"]
+
+    def test_json_carries_every_check(self, fleet, monkeypatch, capsys):
+        self._main(monkeypatch, "-J")
+        reports = json.loads(capsys.readouterr().out)
+        assert all(r["healthy"] and not r["timed_out"] for r in reports)
+        assert reports[0]["checks"][0] == {"result": "PASS", "check": "vars file", "detail": None}
+
+    def test_an_unreadable_record_fails_without_stopping_the_sweep(self, fleet, monkeypatch, capsys):
+        fleet["bravo"] = None
+        assert self._main(monkeypatch, "-J") == 1
+        reports = {r["cluster"]: r for r in json.loads(capsys.readouterr().out)}
+        assert reports["bravo"]["checks"][0]["result"] == "FAIL"
+        assert reports["alpha"]["healthy"]
+
+    def test_an_exception_in_one_cluster_is_contained(self, fleet, monkeypatch, capsys):
+        def cfn(name, region, backend):
+            if name == "charlie":
+                raise RuntimeError("boom")
+            return True, "status=CREATE_COMPLETE", "1.2.3.4"
+
+        monkeypatch.setattr(chk, "check_cfn_status", cfn)
+        assert self._main(monkeypatch, "-J") == 1
+        reports = {r["cluster"]: r for r in json.loads(capsys.readouterr().out)}
+        assert reports["charlie"]["checks"][-1]["detail"] == "boom"
+        assert reports["alpha"]["healthy"] and reports["bravo"]["healthy"]
+
+    def test_a_cluster_past_its_budget_is_reported_as_timed_out(self, fleet, monkeypatch):
+        import threading
+
+        release = threading.Event()
+
+        def cfn(name, region, backend):
+            if name == "bravo":
+                release.wait(10)
+            return True, "status=CREATE_COMPLETE", "1.2.3.4"
+
+        monkeypatch.setattr(chk, "check_cfn_status", cfn)
+        monkeypatch.setattr(chk, "_BUDGET_POLL_SECONDS", 0.05)
+        try:
+            reports = chk._run_fleet_checks(dict(fleet), 15, "native", budget=0.2)
+        finally:
+            release.set()
+        by_name = {r["cluster"]: r for r in reports}
+        assert by_name["bravo"]["timed_out"] and not by_name["bravo"]["healthy"]
+        assert by_name["alpha"]["healthy"] and by_name["charlie"]["healthy"]
+
+    def test_a_stuck_check_is_replaced_so_the_queue_keeps_moving(self, fleet, monkeypatch):
+        import threading
+
+        release = threading.Event()
+
+        def cfn(name, region, backend):
+            if name == "alpha":
+                release.wait(10)
+            return True, "status=CREATE_COMPLETE", "1.2.3.4"
+
+        monkeypatch.setattr(chk, "check_cfn_status", cfn)
+        monkeypatch.setattr(chk, "_BUDGET_POLL_SECONDS", 0.05)
+        monkeypatch.setattr(chk, "_CHECK_WORKERS", 1)
+        try:
+            reports = chk._run_fleet_checks(dict(fleet), 15, "native", budget=0.2)
+        finally:
+            release.set()
+        assert [r["timed_out"] for r in reports] == [True, False, False]
+
+    def test_the_process_exits_when_the_budget_runs_out(self):
+        """Interpreter exit joins ThreadPoolExecutor workers; a stuck check
+        must not hold the process open past its budget."""
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = (
+            "import sys, time\n"
+            f"sys.path.insert(0, {repo_root!r})\n"
+            "import check_pcluster as chk\n"
+            "chk._BUDGET_POLL_SECONDS = 0.05\n"
+            "chk._check_one = lambda *a: time.sleep(60)\n"
+            "reports = chk._run_fleet_checks({'stuck': None}, 15, 'native', 0.2)\n"
+            "print(reports[0]['timed_out'])\n"
+        )
+        started = time.monotonic()
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True,
+                                text=True, timeout=30)
+        assert result.stdout.strip() == "True", result.stderr
+        assert time.monotonic() - started < 15
+
+    def test_filters_without_all_are_rejected(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys, "argv", ["check_pcluster.py", "-N", "mycluster", "-O", "me"])
+        with pytest.raises(SystemExit) as exc:
+            chk.main()
+        assert exc.value.code == 2
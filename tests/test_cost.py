@@ -1,4 +1,4 @@
-"""Tests for _get_od_price, _get_spot_price, and _cost_summary_lines."""
+"""Tests for _get_od_price, _get_od_prices, _get_spot_prices, and _cost_summary_lines."""
 
 import json
 import os
@@ -7,7 +7,12 @@ import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
 
-from pcluster_core import _get_od_price, _get_spot_price, _cost_summary_lines
+from pcluster_core import (
+    _cost_summary_lines,
+    _get_od_price,
+    _get_od_prices,
+    _get_spot_prices,
+)
 
 try:
     from botocore.exceptions import ClientError
@@ -61,18 +66,21 @@ class _FakePricingClient:
 
 class _FakeEC2Client:
     def __init__(self, spot_responses):
-        # spot_responses: dict of instance_type -> price_str, or Exception
+        # spot_responses: dict of instance_type -> price_str, or an Exception to raise
         self._responses = spot_responses
+        self.calls = []
 
     def describe_spot_price_history(self, **kwargs):
-        itype = kwargs["InstanceTypes"][0]
-        val = self._responses.get(itype)
-        if val is None:
-            return {"SpotPriceHistory": []}
-        if isinstance(val, Exception):
-            raise val
-        return {"SpotPriceHistory": [{"InstanceType": itype, "SpotPrice": val,
-                                       "AvailabilityZone": "us-east-1a"}]}
+        self.calls.append(kwargs)
+        if isinstance(self._responses, Exception):
+            raise self._responses
+        az = kwargs["AvailabilityZone"]
+        # Newest first, as the API returns it.
+        return {"SpotPriceHistory": [
+            {"InstanceType": t, "SpotPrice": p, "AvailabilityZone": az}
+            for t in kwargs["InstanceTypes"] if t in self._responses
+            for p in (self._responses[t], "9.99")
+        ]}
 
 
 # ---------------------------------------------------------------------------
@@ -124,29 +132,38 @@ class TestGetOdPrice:
 
 
 # ---------------------------------------------------------------------------
-# _get_spot_price
+# _get_spot_prices
 # ---------------------------------------------------------------------------
 
-class TestGetSpotPrice:
-    def test_success(self):
+class TestGetSpotPrices:
+    def test_one_call_prices_every_type_in_the_az(self):
+        client = _FakeEC2Client({"c8g.2xlarge": "0.136600", "c7g.2xlarge": "0.12"})
+        prices = _get_spot_prices(client, ["c8g.2xlarge", "c7g.2xlarge"], "us-east-1a")
+        assert len(client.calls) == 1
+        assert client.calls[0]["AvailabilityZone"] == "us-east-1a"
+        assert prices == {
+            ("c8g.2xlarge", "us-east-1a"): pytest.approx(0.1366),
+            ("c7g.2xlarge", "us-east-1a"): pytest.approx(0.12),
+        }
+
+    def test_the_newest_entry_wins(self):
         client = _FakeEC2Client({"c8g.2xlarge": "0.136600"})
-        price, err = _get_spot_price(client, "c8g.2xlarge")
-        assert err is None
-        assert abs(price - 0.1366) < 1e-6
+        prices = _get_spot_prices(client, ["c8g.2xlarge"], "us-east-1a")
+        assert prices[("c8g.2xlarge", "us-east-1a")] == pytest.approx(0.1366)
 
-    def test_no_history_returns_none(self):
+    def test_a_type_without_history_is_absent(self):
+        prices = _get_spot_prices(_FakeEC2Client({}), ["c8g.2xlarge"], "us-east-1a")
+        assert prices == {}
+
+    def test_no_types_makes_no_call(self):
         client = _FakeEC2Client({})
-        price, err = _get_spot_price(client, "c8g.2xlarge")
-        assert price is None
-        assert "no spot price history" in err
+        assert _get_spot_prices(client, [], "us-east-1a") == {}
+        assert client.calls == []
 
-    def test_client_error(self):
-        client = _FakeEC2Client(
-            {"c8g.2xlarge": _fake_client_error("UnsupportedOperation")}
-        )
-        price, err = _get_spot_price(client, "c8g.2xlarge")
-        assert price is None
-        assert "UnsupportedOperation" in err
+    def test_client_errors_propagate(self):
+        client = _FakeEC2Client(_fake_client_error("UnsupportedOperation"))
+        with pytest.raises(Exception, match="UnsupportedOperation"):
+            _get_spot_prices(client, ["c8g.2xlarge"], "us-east-1a")
 
 
 # ---------------------------------------------------------------------------
@@ -154,27 +171,28 @@ class TestGetSpotPrice:
 # ---------------------------------------------------------------------------
 
 def _make_clients(od_prices=None, spot_prices=None):
+    """Return a pricing client and the (type, az)-keyed map preflight would build."""
     return (
         _FakePricingClient(od_prices or {}),
-        _FakeEC2Client(spot_prices or {}),
+        {(t, "us-east-1a"): float(p) for t, p in (spot_prices or {}).items()},
     )
 
 
 _COST_PARAMS = (
-    "pricing_client", "ec2client", "headnode_instance_type",
+    "pricing_client", "spot_prices", "headnode_instance_type",
     "cpu_instance_types", "max_cpu_queue_size", "enable_cpu_queue",
     "gpu_instance_types", "max_gpu_queue_size", "enable_gpu_queue",
-    "region", "cluster_type",
+    "region", "az", "cluster_type", "cache_dir",
 )
 
 
 class TestCostSummaryLinesTakesKeywordsOnly:
-    """11 parameters holding two same-shaped triples -- (types, size, enabled) for
+    """13 parameters holding two same-shaped triples -- (types, size, enabled) for
     the CPU queue and again for the GPU queue -- so transposing the two triples at
     the call site prices the GPU fleet as the CPU queue and reads as a plausible
-    summary. The two clients are worse: `_get_od_price` and `_get_spot_price` each
-    wrap their call in `except Exception` and return a `"unavailable -- ..."`
-    reason, so a transposed client pair degrades every price rather than raising.
+    summary. `region` and `az` are both plain strings as well, and `_get_od_price`
+    wraps its call in `except Exception` and returns an `"unavailable -- ..."`
+    reason, so a transposed pair degrades every price rather than raising.
     Every test here called through keywords already and only production used the
     ordering, which is exactly the gap `_storage_summary_lines` was made
     keyword-only to close (`TestStorageSummaryLinesTakesKeywordsOnly`)."""
@@ -193,13 +211,13 @@ class TestCostSummaryLinesTakesKeywordsOnly:
         )
 
     def test_calling_positionally_raises(self):
-        pc, ec2 = _make_clients(od_prices={"c8g.2xlarge": "0.31904"})
+        pc, spot = _make_clients(od_prices={"c8g.2xlarge": "0.31904"})
         with pytest.raises(TypeError):
             _cost_summary_lines(
-                pc, ec2, "c8g.2xlarge",
+                pc, spot, "c8g.2xlarge",
                 ["c8g.2xlarge"], 8, True,
                 [], 0, False,
-                "us-east-1", "ondemand",
+                "us-east-1", "us-east-1a", "ondemand",
             )
 
     def test_the_signature_still_names_every_parameter_the_summary_needs(self):
@@ -260,17 +278,17 @@ class TestCostSummaryLinesTakesKeywordsOnly:
 
 class TestCostSummaryLines:
     def test_ondemand_single_type(self):
-        pc, ec2 = _make_clients(
+        pc, spot = _make_clients(
             od_prices={"c8g.2xlarge": "0.31904"},
         )
         lines = _cost_summary_lines(
-            pricing_client=pc, ec2client=ec2,
+            pricing_client=pc, spot_prices=spot,
             headnode_instance_type="c8g.2xlarge",
             cpu_instance_types=["c8g.2xlarge"], max_cpu_queue_size=8,
             enable_cpu_queue=True,
             gpu_instance_types=[], max_gpu_queue_size=0,
             enable_gpu_queue=False,
-            region="us-east-1", cluster_type="ondemand",
+            region="us-east-1", az="us-east-1a", cluster_type="ondemand",
         )
         assert any("Head node" in l for l in lines)
         assert any("CPU queue" in l for l in lines)
@@ -280,108 +298,122 @@ class TestCostSummaryLines:
         assert "spot" not in cpu_line
 
     def test_spot_shows_spot_price(self):
-        pc, ec2 = _make_clients(
+        pc, spot = _make_clients(
             od_prices={"c8g.2xlarge": "0.31904"},
             spot_prices={"c8g.2xlarge": "0.1366"},
         )
         lines = _cost_summary_lines(
-            pricing_client=pc, ec2client=ec2,
+            pricing_client=pc, spot_prices=spot,
             headnode_instance_type="c8g.2xlarge",
             cpu_instance_types=["c8g.2xlarge"], max_cpu_queue_size=4,
             enable_cpu_queue=True,
             gpu_instance_types=[], max_gpu_queue_size=0,
             enable_gpu_queue=False,
-            region="us-east-1", cluster_type="spot",
+            region="us-east-1", az="us-east-1a", cluster_type="spot",
         )
         cpu_line = next(l for l in lines if "CPU queue" in l)
         assert "spot" in cpu_line
         assert "Note:" in "\n".join(lines)
 
+    def test_spot_prices_from_another_az_are_ignored(self):
+        pc, _ = _make_clients(od_prices={"c8g.2xlarge": "0.31904"})
+        lines = _cost_summary_lines(
+            pricing_client=pc, spot_prices={("c8g.2xlarge", "us-east-1b"): 0.01},
+            headnode_instance_type="c8g.2xlarge",
+            cpu_instance_types=["c8g.2xlarge"], max_cpu_queue_size=4,
+            enable_cpu_queue=True,
+            gpu_instance_types=[], max_gpu_queue_size=0,
+            enable_gpu_queue=False,
+            region="us-east-1", az="us-east-1a", cluster_type="spot",
+        )
+        cpu_line = next(l for l in lines if "CPU queue" in l)
+        assert "spot" not in cpu_line
+
     def test_range_for_multi_type(self):
-        pc, ec2 = _make_clients(
+        pc, spot = _make_clients(
             od_prices={"c8g.2xlarge": "0.31904", "c7g.2xlarge": "0.29000"},
         )
         lines = _cost_summary_lines(
-            pricing_client=pc, ec2client=ec2,
+            pricing_client=pc, spot_prices=spot,
             headnode_instance_type="c8g.2xlarge",
             cpu_instance_types=["c8g.2xlarge", "c7g.2xlarge"],
             max_cpu_queue_size=8, enable_cpu_queue=True,
             gpu_instance_types=[], max_gpu_queue_size=0, enable_gpu_queue=False,
-            region="us-east-1", cluster_type="ondemand",
+            region="us-east-1", az="us-east-1a", cluster_type="ondemand",
         )
         cpu_line = next(l for l in lines if "CPU queue" in l)
         assert "–" in cpu_line  # range separator
 
     def test_no_range_when_same_price(self):
-        pc, ec2 = _make_clients(
+        pc, spot = _make_clients(
             od_prices={"c8g.2xlarge": "0.31904", "c8g.2xlarge-twin": "0.31904"},
         )
         lines = _cost_summary_lines(
-            pricing_client=pc, ec2client=ec2,
+            pricing_client=pc, spot_prices=spot,
             headnode_instance_type="c8g.2xlarge",
             cpu_instance_types=["c8g.2xlarge"], max_cpu_queue_size=2,
             enable_cpu_queue=True,
             gpu_instance_types=[], max_gpu_queue_size=0, enable_gpu_queue=False,
-            region="us-east-1", cluster_type="ondemand",
+            region="us-east-1", az="us-east-1a", cluster_type="ondemand",
         )
         cpu_line = next(l for l in lines if "CPU queue" in l)
         assert "–" not in cpu_line
 
     def test_all_types_unavailable_shows_unavailable(self):
-        pc, ec2 = _make_clients(od_prices={})
+        pc, spot = _make_clients(od_prices={})
         lines = _cost_summary_lines(
-            pricing_client=pc, ec2client=ec2,
+            pricing_client=pc, spot_prices=spot,
             headnode_instance_type="xx.fake",
             cpu_instance_types=["xx.fake"], max_cpu_queue_size=4,
             enable_cpu_queue=True,
             gpu_instance_types=[], max_gpu_queue_size=0, enable_gpu_queue=False,
-            region="us-east-1", cluster_type="ondemand",
+            region="us-east-1", az="us-east-1a", cluster_type="ondemand",
         )
         cpu_line = next(l for l in lines if "CPU queue" in l)
         assert "unavailable" in cpu_line
 
     def test_partial_type_failure_annotated(self):
-        pc, ec2 = _make_clients(
+        pc, spot = _make_clients(
             od_prices={"c8g.2xlarge": "0.31904"},  # c7g.2xlarge missing
         )
         lines = _cost_summary_lines(
-            pricing_client=pc, ec2client=ec2,
+            pricing_client=pc, spot_prices=spot,
             headnode_instance_type="c8g.2xlarge",
             cpu_instance_types=["c8g.2xlarge", "c7g.2xlarge"],
             max_cpu_queue_size=4, enable_cpu_queue=True,
             gpu_instance_types=[], max_gpu_queue_size=0, enable_gpu_queue=False,
-            region="us-east-1", cluster_type="ondemand",
+            region="us-east-1", az="us-east-1a", cluster_type="ondemand",
         )
         cpu_line = next(l for l in lines if "CPU queue" in l)
         assert "unavailable" in cpu_line  # partial note present
         assert "$" in cpu_line            # price still shown for the successful type
 
     def test_gpu_queue_shown_when_enabled(self):
-        pc, ec2 = _make_clients(
+        pc, spot = _make_clients(
             od_prices={"c8g.2xlarge": "0.31904", "p3.2xlarge": "3.06000"},
         )
         lines = _cost_summary_lines(
-            pricing_client=pc, ec2client=ec2,
+            pricing_client=pc, spot_prices=spot,
             headnode_instance_type="c8g.2xlarge",
             cpu_instance_types=["c8g.2xlarge"], max_cpu_queue_size=8,
             enable_cpu_queue=True,
             gpu_instance_types=["p3.2xlarge"], max_gpu_queue_size=4,
             enable_gpu_queue=True,
-            region="us-east-1", cluster_type="ondemand",
+            region="us-east-1", az="us-east-1a", cluster_type="ondemand",
         )
         assert any("GPU queue" in l for l in lines)
 
     def test_gpu_queue_absent_when_disabled(self):
-        pc, ec2 = _make_clients(
+        pc, spot = _make_clients(
             od_prices={"c8g.2xlarge": "0.31904"},
         )
         lines = _cost_summary_lines(
-            pricing_client=pc, ec2client=ec2,
+            pricing_client=pc, spot_prices=spot,
             headnode_instance_type="c8g.2xlarge",
             cpu_instance_types=["c8g.2xlarge"], max_cpu_queue_size=8,
             enable_cpu_queue=True,
             gpu_instance_types=[], max_gpu_queue_size=0, enable_gpu_queue=False,
-            region="us-east-1", cluster_type="ondemand",
+            region="us-east-1", az="us-east-1a", cluster_type="ondemand",
         )
         assert not any("GPU queue" in l for l in lines)
 
@@ -393,12 +425,12 @@ class TestCostSummaryLines:
                 raise RuntimeError("boom")
 
         lines = _cost_summary_lines(
-            pricing_client=_BrokenPricing(), ec2client=_FakeEC2Client({}),
+            pricing_client=_BrokenPricing(), spot_prices={},
             headnode_instance_type="c8g.2xlarge",
             cpu_instance_types=["c8g.2xlarge"], max_cpu_queue_size=4,
             enable_cpu_queue=True,
             gpu_instance_types=[], max_gpu_queue_size=0, enable_gpu_queue=False,
-            region="us-east-1", cluster_type="ondemand",
+            region="us-east-1", az="us-east-1a", cluster_type="ondemand",
         )
         assert all("unavailable" in l or "Estimated" in l for l in lines)
 
@@ -412,12 +444,112 @@ class TestCostSummaryLines:
         # Inject a broken object as max_cpu_queue_size to trigger the outer except
         lines = _cost_summary_lines(
             pricing_client=_FakePricingClient({"c8g.2xlarge": "0.31904"}),
-            ec2client=_FakeEC2Client({}),
+            spot_prices={},
             headnode_instance_type="c8g.2xlarge",
             cpu_instance_types=["c8g.2xlarge"], max_cpu_queue_size=_BrokenArg(),
             enable_cpu_queue=True,
             gpu_instance_types=[], max_gpu_queue_size=0, enable_gpu_queue=False,
-            region="us-east-1", cluster_type="ondemand",
+            region="us-east-1", az="us-east-1a", cluster_type="ondemand",
         )
         assert len(lines) == 1
         assert "unavailable" in lines[0]
+
+
+# ---------------------------------------------------------------------------
+# _get_od_prices
+# ---------------------------------------------------------------------------
+
+class _CountingPricingClient(_FakePricingClient):
+    def __init__(self, responses):
+        super().__init__(responses)
+        self.calls = []
+
+    def get_products(self, **kwargs):
+        itype = next(
+            f["Value"] for f in kwargs["Filters"] if f["Field"] == "instanceType"
+        )
+        self.calls.append(itype)
+        return super().get_products(**kwargs)
+
+
+class TestGetOdPrices:
+    def test_returns_a_result_for_every_type(self):
+        pc = _CountingPricingClient({"c8g.2xlarge": "0.31904"})
+        result = _get_od_prices(pc, ["c8g.2xlarge", "xx.fake"], "us-east-1")
+        assert result["c8g.2xlarge"] == (pytest.approx(0.31904), None)
+        assert result["xx.fake"][0] is None and "not found" in result["xx.fake"][1]
+
+    def test_each_type_is_looked_up_once(self):
+        pc = _CountingPricingClient({"c8g.2xlarge": "0.31904"})
+        _get_od_prices(pc, ["c8g.2xlarge", "c8g.2xlarge"], "us-east-1")
+        assert pc.calls == ["c8g.2xlarge"]
+
+    def test_lookups_run_concurrently(self):
+        import threading
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        class _Rendezvous(_FakePricingClient):
+            def get_products(self, **kwargs):
+                # Serial lookups would never release the barrier and time out.
+                barrier.wait()
+                return super().get_products(**kwargs)
+
+        pc = _Rendezvous({t: "1.0" for t in ("a.large", "b.large", "c.large")})
+        result = _get_od_prices(pc, ["a.large", "b.large", "c.large"], "us-east-1")
+        assert all(price == 1.0 for price, _ in result.values())
+
+    def test_a_warm_cache_makes_no_calls(self, tmp_path):
+        _get_od_prices(
+            _CountingPricingClient({"c8g.2xlarge": "0.31904"}),
+            ["c8g.2xlarge"], "us-east-1", str(tmp_path),
+        )
+        pc = _CountingPricingClient({})
+        result = _get_od_prices(pc, ["c8g.2xlarge"], "us-east-1", str(tmp_path))
+        assert pc.calls == []
+        assert result["c8g.2xlarge"] == (pytest.approx(0.31904), None)
+
+    def test_the_cache_is_keyed_by_region(self, tmp_path):
+        _get_od_prices(
+            _CountingPricingClient({"c8g.2xlarge": "0.31904"}),
+            ["c8g.2xlarge"], "us-east-1", str(tmp_path),
+        )
+        pc = _CountingPricingClient({"c8g.2xlarge": "0.35"})
+        _get_od_prices(pc, ["c8g.2xlarge"], "us-west-2", str(tmp_path))
+        assert pc.calls == ["c8g.2xlarge"]
+
+    def test_failures_are_not_cached(self, tmp_path):
+        _get_od_prices(_CountingPricingClient({}), ["c8g.2xlarge"], "us-east-1", str(tmp_path))
+        pc = _CountingPricingClient({"c8g.2xlarge": "0.31904"})
+        result = _get_od_prices(pc, ["c8g.2xlarge"], "us-east-1", str(tmp_path))
+        assert pc.calls == ["c8g.2xlarge"]
+        assert result["c8g.2xlarge"][0] == pytest.approx(0.31904)
+
+    def test_a_day_old_cache_is_refetched(self, tmp_path):
+        _get_od_prices(
+            _CountingPricingClient({"c8g.2xlarge": "0.31904"}),
+            ["c8g.2xlarge"], "us-east-1", str(tmp_path),
+        )
+        path = tmp_path / "od_prices.us-east-1.json"
+        doc = json.loads(path.read_text())
+        doc["fetched_at"] -= 25 * 3600
+        path.write_text(json.dumps(doc))
+        pc = _CountingPricingClient({"c8g.2xlarge": "0.31904"})
+        _get_od_prices(pc, ["c8g.2xlarge"], "us-east-1", str(tmp_path))
+        assert pc.calls == ["c8g.2xlarge"]
+
+    def test_the_build_summary_reuses_the_cache(self, tmp_path):
+        kwargs = dict(
+            spot_prices={},
+            headnode_instance_type="c8g.2xlarge",
+            cpu_instance_types=["c8g.2xlarge", "c7g.2xlarge"], max_cpu_queue_size=4,
+            enable_cpu_queue=True,
+            gpu_instance_types=[], max_gpu_queue_size=0, enable_gpu_queue=False,
+            region="us-east-1", az="us-east-1a", cluster_type="ondemand", cache_dir=str(tmp_path),
+        )
+        prices = {"c8g.2xlarge": "0.31904", "c7g.2xlarge": "0.29"}
+        first = _cost_summary_lines(pricing_client=_CountingPricingClient(prices), **kwargs)
+        pc = _CountingPricingClient({})
+        second = _cost_summary_lines(pricing_client=pc, **kwargs)
+        assert pc.calls == []
+        assert first == second
@@ -183,6 +183,465 @@ class TestGetClusterCost:
         assert abs(total - 5.00) < 1e-6
 
 
+# ---------------------------------------------------------------------------
+# _get_fleet_costs
+# ---------------------------------------------------------------------------
+
+def _grouped_period(groups):
+    return {"Groups": [
+        {"Keys": [f"ClusterID${name}"],
+         "Metrics": {"UnblendedCost": {"Amount": str(amount), "Unit": "USD"}}}
+        for name, amount in groups
+    ]}
+
+
+class _FakeGroupedCE:
+    def __init__(self, pages):
+        # pages: list of (periods, next_token|None); periods are lists of groups
+        self._pages = list(pages)
+        self.calls = []
+
+    def get_cost_and_usage(self, **kwargs):
+        self.calls.append(kwargs)
+        periods, token = self._pages[len(self.calls) - 1]
+        resp = {"ResultsByTime": [_grouped_period(g) for g in periods]}
+        if token:
+            resp["NextPageToken"] = token
+        return resp
+
+
+class TestGetFleetCosts:
+    def test_one_grouped_query_covers_every_cluster(self):
+        client = _FakeGroupedCE([([[("osiris", 47.82), ("bifrost", 12.10)]], None)])
+        totals, err = cp._get_fleet_costs(
+            client, ["osiris", "bifrost"], "2026-06-24", "2026-07-24"
+        )
+        assert err is None
+        assert totals == pytest.approx({"osiris": 47.82, "bifrost": 12.10})
+        assert len(client.calls) == 1
+        call = client.calls[0]
+        assert call["GroupBy"] == [{"Type": "TAG", "Key": "ClusterID"}]
+        assert call["Filter"]["Tags"]["Values"] == ["osiris", "bifrost"]
+
+    def test_periods_and_pages_are_summed_per_cluster(self):
+        client = _FakeGroupedCE([
+            ([[("osiris", 10.0)], [("osiris", 5.0), ("bifrost", 1.0)]], "tok1"),
+            ([[("bifrost", 2.0)]], None),
+        ])
+        totals, err = cp._get_fleet_costs(
+            client, ["osiris", "bifrost"], "2025-01-01", "2026-07-24"
+        )
+        assert err is None
+        assert totals == pytest.approx({"osiris": 15.0, "bifrost": 3.0})
+        assert client.calls[1]["NextPageToken"] == "tok1"
+
+    def test_cluster_without_a_group_is_zero(self):
+        client = _FakeGroupedCE([([[("osiris", 4.0)]], None)])
+        totals, _ = cp._get_fleet_costs(
+            client, ["osiris", "idle"], "2026-06-24", "2026-07-24"
+        )
+        assert totals["idle"] == 0.0
+
+    def test_untagged_and_foreign_groups_are_ignored(self):
+        client = _FakeGroupedCE([([[("", 99.0), ("someone-else", 7.0)]], None)])
+        totals, _ = cp._get_fleet_costs(client, ["osiris"], "2026-06-24", "2026-07-24")
+        assert totals == {"osiris": 0.0}
+
+    def test_access_denied(self):
+        class _CE:
+            def get_cost_and_usage(self, **kwargs):
+                raise _fake_ce_error("AccessDeniedException")
+        totals, err = cp._get_fleet_costs(_CE(), ["osiris"], "2026-06-24", "2026-07-24")
+        assert totals is None
+        assert "ce:GetCostAndUsage" in err
+
+
+class TestMainQueryMode:
+    """Uncached query selection; the cached path is covered by TestMainCache."""
+
+    @pytest.fixture
+    def run_main(self, monkeypatch, capsys):
+        records = {
+            "osiris": {"cluster_owner": "rmarable", "region": "us-east-1"},
+            "bifrost": {"cluster_owner": "alice", "region": "us-west-2"},
+        }
+        monkeypatch.setattr(cp, "_enumerate_clusters", lambda repo_root: sorted(records))
+        monkeypatch.setattr(
+            cp, "_read_cluster_records",
+            lambda names, root: {n: records.get(n) for n in names},
+        )
+        monkeypatch.setattr(cp, "_check_tag_activated", lambda ce: True)
+        monkeypatch.setattr(cp, "_aws_client", lambda *a, **k: object())
+
+        def run(*argv):
+            monkeypatch.setattr(
+                sys, "argv", ["cost_pcluster.py", "-J", "--no_cache", *argv]
+            )
+            cp.main()
+            return json.loads(capsys.readouterr().out)
+
+        return run
+
+    def test_fleet_report_uses_one_grouped_query(self, run_main, monkeypatch):
+        fleet_calls = []
+
+        def fleet(ce, names, start, end):
+            fleet_calls.append(names)
+            return {n: 1.5 for n in names}, None
+
+        monkeypatch.setattr(cp, "_get_fleet_costs", fleet)
+        monkeypatch.setattr(cp, "_get_cluster_cost", lambda *a: pytest.fail("per-cluster query"))
+        out = run_main()
+        assert fleet_calls == [["bifrost", "osiris"]]
+        assert [r["cost_usd"] for r in out] == ["$1.50", "$1.50"]
+
+    def test_owner_filter_narrows_the_grouped_query(self, run_main, monkeypatch):
+        fleet_calls = []
+
+        def fleet(ce, names, start, end):
+            fleet_calls.append(names)
+            return {n: 0.0 for n in names}, None
+
+        monkeypatch.setattr(cp, "_get_fleet_costs", fleet)
+        out = run_main("-O", "alice")
+        assert fleet_calls == [["bifrost"]]
+        assert out[0]["cost_usd"] == "$0.00 *"
+
+    def test_fleet_error_is_reported_on_every_row(self, run_main, monkeypatch):
+        monkeypatch.setattr(cp, "_get_fleet_costs", lambda *a: (None, "CE error: Throttling"))
+        out = run_main()
+        assert all(r["cost_usd"] == "unavailable — CE error: Throttling" for r in out)
+
+    def test_cluster_name_keeps_the_per_cluster_query(self, run_main, monkeypatch):
+        monkeypatch.setattr(cp, "_get_fleet_costs", lambda *a: pytest.fail("grouped query"))
+        monkeypatch.setattr(cp, "_get_cluster_cost", lambda ce, name, s, e: (2.0, None))
+        out = run_main("-N", "osiris")
+        assert out == [{"cluster": "osiris", "owner": "rmarable", "region": "us-east-1",
+                        "period": out[0]["period"], "cost_usd": "$2.00"}]
+
+
+# ---------------------------------------------------------------------------
+# _cached_costs
+# ---------------------------------------------------------------------------
+
+class _FakeDailyCE:
+    """Serves DAILY grouped results from {cluster: {day: usd}} for any window."""
+
+    def __init__(self, spend):
+        self.spend = spend
+        self.calls = []
+
+    def get_cost_and_usage(self, **kwargs):
+        self.calls.append(kwargs)
+        assert kwargs["Granularity"] == "DAILY"
+        start = date.fromisoformat(kwargs["TimePeriod"]["Start"])
+        end = date.fromisoformat(kwargs["TimePeriod"]["End"])
+        names = kwargs["Filter"]["Tags"]["Values"]
+        periods = []
+        day = start
+        while day < end:
+            iso = day.isoformat()
+            periods.append({
+                "TimePeriod": {"Start": iso},
+                "Groups": [
+                    {"Keys": [f"ClusterID${n}"],
+                     "Metrics": {"UnblendedCost": {"Amount": str(self.spend[n][iso])}}}
+                    for n in names if iso in self.spend.get(n, {})
+                ],
+            })
+            day = date.fromordinal(day.toordinal() + 1)
+        return {"ResultsByTime": periods}
+
+
+def _window(today, days):
+    end = today
+    start = date.fromordinal(end.toordinal() - days)
+    return start.isoformat(), end.isoformat()
+
+
+class TestCachedCosts:
+    TODAY = date(2026, 7, 24)
+
+    @pytest.fixture(autouse=True)
+    def _today(self, monkeypatch):
+        monkeypatch.setattr(cp, "_utc_today", lambda: self.TODAY)
+
+    def _spend(self, days=400, per_day=1.0):
+        first = self.TODAY.toordinal() - days
+        return {date.fromordinal(first + i).isoformat(): per_day for i in range(days)}
+
+    def test_cold_cache_fetches_the_whole_window(self, tmp_path):
+        ce = _FakeDailyCE({"osiris": self._spend()})
+        start, end = _window(self.TODAY, 30)
+        totals, err = cp._cached_costs(ce, ["osiris"], start, end, str(tmp_path))
+        assert err is None
+        assert totals == {"osiris": pytest.approx(30.0)}
+        assert ce.calls[0]["TimePeriod"] == {"Start": start, "End": end}
+        assert os.path.isfile(cp._cost_cache_path(str(tmp_path)))
+
+    def test_warm_cache_only_fetches_the_restatement_window(self, tmp_path):
+        ce = _FakeDailyCE({"osiris": self._spend()})
+        start, end = _window(self.TODAY, 365)
+        cp._cached_costs(ce, ["osiris"], start, end, str(tmp_path))
+        ce.calls.clear()
+        totals, _ = cp._cached_costs(ce, ["osiris"], start, end, str(tmp_path))
+        assert totals == {"osiris": pytest.approx(365.0)}
+        assert len(ce.calls) == 1
+        assert ce.calls[0]["TimePeriod"]["Start"] == "2026-07-21"
+
+    def test_restated_days_replace_cached_values(self, tmp_path):
+        spend = self._spend()
+        ce = _FakeDailyCE({"osiris": spend})
+        start, end = _window(self.TODAY, 10)
+        cp._cached_costs(ce, ["osiris"], start, end, str(tmp_path))
+        spend["2026-07-23"] = 5.0
+        totals, _ = cp._cached_costs(ce, ["osiris"], start, end, str(tmp_path))
+        assert totals == {"osiris": pytest.approx(14.0)}
+
+    def test_narrower_window_is_served_from_the_cache(self, tmp_path):
+        ce = _FakeDailyCE({"osiris": self._spend()})
+        cp._cached_costs(ce, ["osiris"], *_window(self.TODAY, 90), str(tmp_path))
+        ce.calls.clear()
+        totals, _ = cp._cached_costs(ce, ["osiris"], *_window(self.TODAY, 7), str(tmp_path))
+        assert totals == {"osiris": pytest.approx(7.0)}
+        assert [c["TimePeriod"]["Start"] for c in ce.calls] == ["2026-07-21"]
+
+    def test_wider_window_refetches_from_its_start(self, tmp_path):
+        ce = _FakeDailyCE({"osiris": self._spend()})
+        cp._cached_costs(ce, ["osiris"], *_window(self.TODAY, 7), str(tmp_path))
+        ce.calls.clear()
+        start, end = _window(self.TODAY, 90)
+        totals, _ = cp._cached_costs(ce, ["osiris"], start, end, str(tmp_path))
+        assert totals == {"osiris": pytest.approx(90.0)}
+        assert ce.calls[0]["TimePeriod"]["Start"] == start
+
+    def test_clusters_sharing_a_fetch_start_share_one_query(self, tmp_path):
+        ce = _FakeDailyCE({"osiris": self._spend(), "bifrost": self._spend(per_day=2.0)})
+        start, end = _window(self.TODAY, 30)
+        totals, _ = cp._cached_costs(ce, ["osiris", "bifrost"], start, end, str(tmp_path))
+        assert totals == {"osiris": pytest.approx(30.0), "bifrost": pytest.approx(60.0)}
+        assert len(ce.calls) == 1
+
+    def test_a_stale_high_water_mark_does_not_leave_a_gap(self, tmp_path):
+        ce = _FakeDailyCE({"osiris": self._spend()})
+        cp._cached_costs(ce, ["osiris"], *_window(date(2026, 6, 1), 30), str(tmp_path))
+        start, end = _window(self.TODAY, 10)
+        totals, _ = cp._cached_costs(ce, ["osiris"], start, end, str(tmp_path))
+        assert totals == {"osiris": pytest.approx(10.0)}
+        assert ce.calls[-1]["TimePeriod"]["Start"] == start
+
+    def test_refresh_refetches_the_whole_window(self, tmp_path):
+        ce = _FakeDailyCE({"osiris": self._spend()})
+        start, end = _window(self.TODAY, 30)
+        cp._cached_costs(ce, ["osiris"], start, end, str(tmp_path))
+        ce.calls.clear()
+        cp._cached_costs(ce, ["osiris"], start, end, str(tmp_path), refresh=True)
+        assert ce.calls[0]["TimePeriod"]["Start"] == start
+
+    def test_error_leaves_the_cache_unwritten(self, tmp_path):
+        class _CE:
+            def get_cost_and_usage(self, **kwargs):
+                raise _fake_ce_error("AccessDeniedException")
+        totals, err = cp._cached_costs(_CE(), ["osiris"], *_window(self.TODAY, 30), str(tmp_path))
+        assert totals is None
+        assert "ce:GetCostAndUsage" in err
+        assert not os.path.exists(cp._cost_cache_path(str(tmp_path)))
+
+    def test_corrupt_cache_is_rebuilt(self, tmp_path):
+        path = cp._cost_cache_path(str(tmp_path))
+        os.makedirs(os.path.dirname(path))
+        with open(path, "w") as fh:
+            fh.write("{not json")
+        ce = _FakeDailyCE({"osiris": self._spend()})
+        totals, err = cp._cached_costs(ce, ["osiris"], *_window(self.TODAY, 5), str(tmp_path))
+        assert err is None
+        assert totals == {"osiris": pytest.approx(5.0)}
+
+    def test_days_past_the_retention_horizon_are_pruned(self, tmp_path):
+        ce = _FakeDailyCE({"osiris": self._spend()})
+        cp._cached_costs(ce, ["osiris"], *_window(self.TODAY, 365), str(tmp_path))
+        with open(cp._cost_cache_path(str(tmp_path))) as fh:
+            entry = json.load(fh)["data"]["clusters"]["osiris"]
+        horizon = date.fromordinal(self.TODAY.toordinal() - cp._COST_CACHE_RETENTION_DAYS)
+        assert min(entry["daily"]) >= horizon.isoformat()
+        assert entry["through"] == self.TODAY.isoformat()
+
+
+class TestMainCache:
+    def test_report_goes_through_the_cache_by_default(self, monkeypatch, capsys, tmp_path):
+        monkeypatch.setattr(cp, "_repo_root", str(tmp_path))
+        monkeypatch.setattr(cp, "_enumerate_clusters", lambda repo_root: ["osiris"])
+        monkeypatch.setattr(
+            cp, "_read_cluster_records",
+            lambda names, root: {"osiris": {"cluster_owner": "rmarable", "region": "us-east-1"}},
+        )
+        monkeypatch.setattr(cp, "_check_tag_activated", lambda ce: True)
+        monkeypatch.setattr(cp, "_aws_client", lambda *a, **k: object())
+        calls = []
+
+        def cached(ce, names, start, end, root, *, refresh=False):
+            calls.append((names, root, refresh))
+            return {"osiris": 3.0}, None
+
+        monkeypatch.setattr(cp, "_cached_costs", cached)
+        monkeypatch.setattr(cp, "_get_fleet_costs", lambda *a: pytest.fail("uncached query"))
+        monkeypatch.setattr(sys, "argv", ["cost_pcluster.py", "-J", "--refresh_cache"])
+        cp.main()
+        assert calls == [(["osiris"], str(tmp_path), True)]
+        assert json.loads(capsys.readouterr().out)[0]["cost_usd"] == "$3.00"
+
+    def test_no_cache_and_refresh_cache_conflict(self, monkeypatch):
+        monkeypatch.setattr(
+            sys, "argv", ["cost_pcluster.py", "--no_cache", "--refresh_cache"]
+        )
+        with pytest.raises(SystemExit) as exc:
+            cp.main()
+        assert "mutually exclusive" in str(exc.value)
+
+
+# ---------------------------------------------------------------------------
+# --breakdown
+# ---------------------------------------------------------------------------
+
+def _breakdown_group(service, usage_type, amount):
+    return {"Keys": [service, usage_type],
+            "Metrics": {"UnblendedCost": {"Amount": str(amount), "Unit": "USD"}}}
+
+
+class TestRateLimiter:
+    def test_calls_are_spaced_by_the_rate(self, monkeypatch):
+        clock = [100.0]
+        sleeps = []
+        monkeypatch.setattr(cp.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(cp.time, "sleep", sleeps.append)
+        wait = cp._rate_limiter(4.0)
+        for _ in range(3):
+            wait()
+        assert sleeps == pytest.approx([0.25, 0.5])
+
+    def test_idle_time_is_not_banked(self, monkeypatch):
+        clock = [100.0]
+        sleeps = []
+        monkeypatch.setattr(cp.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(cp.time, "sleep", sleeps.append)
+        wait = cp._rate_limiter(4.0)
+        wait()
+        clock[0] += 10
+        wait()
+        wait()
+        assert sleeps == pytest.approx([0.25])
+
+
+class TestGetClusterBreakdown:
+    def test_groups_by_service_and_usage_type(self):
+        calls = []
+
+        class _CE:
+            def get_cost_and_usage(self, **kwargs):
+                calls.append(kwargs)
+                return {"ResultsByTime": [
+                    {"Groups": [
+                        _breakdown_group("Amazon FSx", "USE1-Lustre-Storage", 30.0),
+                        _breakdown_group("Amazon Elastic Compute Cloud - Compute",
+                                         "BoxUsage:c5.xlarge", 12.0),
+                    ]},
+                    {"Groups": [_breakdown_group("Amazon FSx", "USE1-Lustre-Storage", 5.0)]},
+                ]}
+
+        throttled = []
+        breakdown, err = cp._get_cluster_breakdown(
+            _CE(), "osiris", "2026-06-24", "2026-07-24", lambda: throttled.append(1)
+        )
+        assert err is None
+        assert breakdown == {
+            "Amazon FSx": {"USE1-Lustre-Storage": pytest.approx(35.0)},
+            "Amazon Elastic Compute Cloud - Compute": {"BoxUsage:c5.xlarge": pytest.approx(12.0)},
+        }
+        assert calls[0]["GroupBy"] == [
+            {"Type": "DIMENSION", "Key": "SERVICE"},
+            {"Type": "DIMENSION", "Key": "USAGE_TYPE"},
+        ]
+        assert calls[0]["Filter"]["Tags"]["Values"] == ["osiris"]
+        assert throttled == [1]
+
+    def test_error_is_returned(self):
+        class _CE:
+            def get_cost_and_usage(self, **kwargs):
+                raise _fake_ce_error("LimitExceededException")
+        breakdown, err = cp._get_cluster_breakdown(_CE(), "osiris", "2026-06-24", "2026-07-24")
+        assert breakdown is None
+        assert "LimitExceededException" in err
+
+
+class TestGetBreakdowns:
+    def test_every_cluster_is_queried_under_one_limiter(self, monkeypatch):
+        throttles = set()
+
+        def fake(ce, name, start, end, throttle):
+            throttles.add(throttle)
+            return {"Amazon FSx": {"Storage": 1.0}}, None
+
+        monkeypatch.setattr(cp, "_get_cluster_breakdown", fake)
+        results = cp._get_breakdowns(object(), ["a", "b", "c"], "s", "e")
+        assert sorted(results) == ["a", "b", "c"]
+        assert len(throttles) == 1
+
+    def test_no_clusters_issue_no_queries(self, monkeypatch):
+        monkeypatch.setattr(cp, "_get_cluster_breakdown", lambda *a: pytest.fail("queried"))
+        assert cp._get_breakdowns(object(), [], "s", "e") == {}
+
+
+class TestFormatBreakdown:
+    RESULTS = {
+        "osiris": ({"Amazon FSx": {"Lustre-Storage": 30.0},
+                    "Amazon EC2": {"BoxUsage:c5.xlarge": 12.0, "EBS:VolumeUsage": 0.001}}, None),
+        "bifrost": ({"Amazon EC2": {"BoxUsage:c5.xlarge": 3.0}}, None),
+        "broken": (None, "CE error: Throttling"),
+    }
+
+    def test_clusters_are_ordered_by_spend_with_their_top_usage_types(self, capsys):
+        cp._format_breakdown(["bifrost", "osiris", "broken"], self.RESULTS, "p")
+        rows = capsys.readouterr().out.splitlines()[4:]
+        assert rows[0].split()[:5] == ["osiris", "$42.00", "Amazon", "FSx", "Lustre-Storage"]
+        assert rows[1].split() == ["Amazon", "EC2", "BoxUsage:c5.xlarge", "$12.00"]
+        assert rows[2].split()[:2] == ["bifrost", "$3.00"]
+        assert rows[3].split() == ["broken", "n/a"]
+
+    def test_usage_types_past_top_share_one_row(self, capsys):
+        results = {"osiris": ({"Amazon EC2": {f"BoxUsage:{i}": float(i) for i in range(1, 8)}}, None)}
+        cp._format_breakdown(["osiris"], results, "p", top=3)
+        out = capsys.readouterr().out
+        assert "BoxUsage:7" in out and "BoxUsage:5" in out
+        assert "BoxUsage:4" not in out
+        assert "other (4 usage types)" in out and "$10.00" in out
+
+    def test_the_table_does_not_widen_with_the_fleet(self, capsys):
+        results = {f"c{i:02d}": ({"Amazon EC2": {"BoxUsage": 1.0}}, None) for i in range(60)}
+        cp._format_breakdown(sorted(results), results, "p")
+        lines = capsys.readouterr().out.splitlines()
+        assert max(len(line) for line in lines) < 80
+        assert len(lines) == 4 + 60
+
+    def test_negligible_usage_types_are_omitted(self, capsys):
+        cp._format_breakdown(["osiris", "bifrost"], self.RESULTS, "p")
+        assert "EBS:VolumeUsage" not in capsys.readouterr().out
+
+    def test_failed_cluster_row_and_note(self, capsys):
+        cp._format_breakdown(["osiris", "broken"], self.RESULTS, "p")
+        out = capsys.readouterr().out
+        assert "n/a" in out
+        assert "broken: unavailable — CE error: Throttling" in out
+
+    def test_records_carry_numeric_totals(self):
+        out = cp._breakdown_records(
+            [("osiris", "rmarable", "us-east-1"), ("broken", "alice", "us-west-2")],
+            self.RESULTS, "p",
+        )
+        assert out[0]["total_usd"] == 42.0
+        assert out[0]["services"]["Amazon EC2"]["cost_usd"] == 12.0
+        assert out[1]["error"] == "CE error: Throttling"
+
+
 # ---------------------------------------------------------------------------
 # _format_table
 # ---------------------------------------------------------------------------
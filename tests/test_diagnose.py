@@ -1,8 +1,12 @@
 """Tests for diagnose_pcluster.py helper functions."""
 
+import base64
+import json
 import os
 import re
+import subprocess
 import sys
+import zlib
 
 import pytest
 
@@ -273,3 +277,602 @@ class TestSelectCwLogGroup:
 
     def test_no_groups_at_all(self):
         assert _select_cw_log_group("osiris", []) is None
+
+
+# ---------------------------------------------------------------------------
+# _fetch_cw_logs
+# ---------------------------------------------------------------------------
+
+_GROUP = "/aws/parallelcluster/osiris-202607260359"
+
+
+class _FakePaginator:
+    def __init__(self, pages, consumed):
+        self._pages = pages
+        self._consumed = consumed
+
+    def paginate(self, **kwargs):
+        self.kwargs = kwargs
+        prefix = kwargs.get("logStreamNamePrefix", "")
+        for page in self._pages:
+            self._consumed.append(page)
+            yield {"logStreams": [st for st in page.get("logStreams", [])
+                                  if st["logStreamName"].startswith(prefix)]} if prefix else page
+
+
+class _FakeLogs:
+    """describe_log_streams pages newest first; get_log_events serves one page per stream."""
+
+    def __init__(self, stream_pages, events):
+        self.stream_pages = stream_pages
+        self.events = events
+        self.stream_pages_read = []
+        self.event_calls = []
+
+    def get_paginator(self, name):
+        if name == "describe_log_groups":
+            return _FakePaginator([{"logGroups": [{"logGroupName": _GROUP}]}], [])
+        self.stream_paginator = _FakePaginator(self.stream_pages, self.stream_pages_read)
+        return self.stream_paginator
+
+    def get_log_events(self, **kwargs):
+        self.event_calls.append(kwargs["logStreamName"])
+        if "nextToken" in kwargs:
+            return {"events": [], "nextBackwardToken": kwargs["nextToken"]}
+        return {
+            "events": [{"timestamp": 0, "message": m} for m in self.events.get(kwargs["logStreamName"], [])],
+            "nextBackwardToken": "b1",
+        }
+
+
+def _streams(*names):
+    return {"logStreams": [{"logStreamName": n} for n in names]}
+
+
+class TestFetchCwLogs:
+    HEAD = "ip-10-0-0-1.i-0abc"
+
+    def _fetch(self, monkeypatch, fake, streams=("cfn-init", "cloud-init-output", "cinc_client"), n=10,
+               prefix=None):
+        monkeypatch.setattr(dx, "_aws_client", lambda *a, **k: fake)
+        return dx._fetch_cw_logs("osiris", "us-east-1", list(streams), n, prefix)
+
+    def test_the_head_node_prefix_skips_compute_node_streams(self, monkeypatch):
+        """A compute node's cloud-init-output, written moments ago, must not
+        stand in for the head node's, written at bootstrap."""
+        fake = _FakeLogs(
+            [
+                _streams("ip-10-0-9-9.i-0def.cloud-init-output",
+                         *(f"ip-10-1-{i}-1.i-{i:04x}.slurmd" for i in range(50))),
+                _streams(f"{self.HEAD}.cfn-init", f"{self.HEAD}.cloud-init-output",
+                         f"{self.HEAD}.cinc_client"),
+            ],
+            {},
+        )
+        results, err = self._fetch(monkeypatch, fake, prefix=self.HEAD + ".")
+        assert err is None
+        assert fake.stream_paginator.kwargs == {"logGroupName": _GROUP,
+                                                "logStreamNamePrefix": self.HEAD + "."}
+        assert sorted(fake.event_calls) == sorted(
+            f"{self.HEAD}.{s}" for s in ("cfn-init", "cloud-init-output", "cinc_client")
+        )
+
+    def test_a_prefix_that_matches_nothing_falls_back_to_the_instance_id(self, monkeypatch):
+        """Subnets with resource-name hostnames name the head node i-0abc, not
+        ip-10-0-0-1, so the IP-derived prefix lists nothing."""
+        head = "i-0abc.i-0abc"
+        fake = _FakeLogs(
+            [
+                _streams("i-0def.i-0def.cloud-init-output", f"{head}.cfn-init"),
+                _streams(f"{head}.cloud-init-output", f"{head}.cinc_client"),
+            ],
+            {},
+        )
+        results, err = self._fetch(monkeypatch, fake, prefix=self.HEAD + ".")
+        assert err is None
+        assert fake.stream_paginator.kwargs["orderBy"] == "LastEventTime"
+        assert sorted(fake.event_calls) == sorted(
+            f"{head}.{s}" for s in ("cfn-init", "cloud-init-output", "cinc_client")
+        )
+
+    def test_stream_scan_stops_once_every_stream_is_found(self, monkeypatch):
+        fake = _FakeLogs(
+            [
+                _streams(f"{self.HEAD}.cfn-init", f"{self.HEAD}.cloud-init-output"),
+                _streams(f"{self.HEAD}.cinc_client", "ip-10-0-9-9.i-0def.cloud-init-output"),
+                _streams(*(f"ip-10-1-{i}-1.i-{i:04x}.slurmd" for i in range(50))),
+            ],
+            {},
+        )
+        results, err = self._fetch(monkeypatch, fake)
+        assert err is None
+        assert len(fake.stream_pages_read) == 2
+        assert sorted(fake.event_calls) == sorted(
+            f"{self.HEAD}.{s}" for s in ("cfn-init", "cloud-init-output", "cinc_client")
+        )
+
+    def test_the_most_recently_active_match_wins(self, monkeypatch):
+        fake = _FakeLogs(
+            [_streams("ip-new.i-1.cfn-init"), _streams("ip-old.i-2.cfn-init")],
+            {"ip-new.i-1.cfn-init": ["new"], "ip-old.i-2.cfn-init": ["old"]},
+        )
+        results, _ = self._fetch(monkeypatch, fake, streams=("cfn-init",))
+        assert [line.split()[-1] for line in results["cfn-init"]] == ["new"]
+
+    def test_a_missing_stream_is_empty_and_others_still_fetched(self, monkeypatch):
+        fake = _FakeLogs(
+            [_streams(f"{self.HEAD}.cfn-init")],
+            {f"{self.HEAD}.cfn-init": ["line one", "line two"]},
+        )
+        results, err = self._fetch(monkeypatch, fake, streams=("cfn-init", "grafana"))
+        assert err is None
+        assert list(results) == ["cfn-init", "grafana"]
+        assert results["grafana"] == []
+        assert results["cfn-init"][-1].endswith("line two")
+
+    def test_tail_is_trimmed_to_n_lines(self, monkeypatch):
+        fake = _FakeLogs(
+            [_streams(f"{self.HEAD}.cfn-init")],
+            {f"{self.HEAD}.cfn-init": [f"l{i}" for i in range(20)]},
+        )
+        results, _ = self._fetch(monkeypatch, fake, streams=("cfn-init",), n=5)
+        assert [line.split()[-1] for line in results["cfn-init"]] == ["l15", "l16", "l17", "l18", "l19"]
+
+
+class TestHeadStreamPrefix:
+    def test_prefix_is_hostname_then_instance_id(self):
+        data = {"headNode": {"privateIpAddress": "10.0.0.1", "instanceId": "i-0abc"}}
+        assert dx._head_stream_prefix(data) == "ip-10-0-0-1.i-0abc."
+
+    @pytest.mark.parametrize("data", [None, {}, {"headNode": {"privateIpAddress": "10.0.0.1"}}])
+    def test_no_head_node_means_no_prefix(self, data):
+        assert dx._head_stream_prefix(data) is None
+
+
+# ---------------------------------------------------------------------------
+# --scan_errors
+# ---------------------------------------------------------------------------
+
+class _FakeFollowLogs(_FakeLogs):
+    """Streams grow between polls; a forward token is the index of the next unread event."""
+
+    def __init__(self, streams):
+        super().__init__([], {})
+        self.streams = streams  # log stream name -> list of messages
+        self.forward_tokens = []
+
+    def get_paginator(self, name):
+        if name == "describe_log_streams":
+            return _FakePaginator([_streams(*self.streams)], self.stream_pages_read)
+        return super().get_paginator(name)
+
+    def get_log_events(self, **kwargs):
+        messages = self.streams[kwargs["logStreamName"]]
+        if "nextToken" in kwargs:
+            self.forward_tokens.append(kwargs["nextToken"])
+            start = int(kwargs["nextToken"][1:])
+            batch = messages[start:start + 2]  # small pages, to exercise paging
+        else:
+            start = max(len(messages) - kwargs["limit"], 0)
+            batch = messages[start:]
+        return {
+            "events": [{"timestamp": 0, "message": m} for m in batch],
+            "nextForwardToken": f"f{start + len(batch)}",
+        }
+
+
+class TestFollowCwLogs:
+    HEAD = "ip-10-0-0-1.i-0abc"
+
+    def _follow(self, monkeypatch, fake, steps, streams=("cfn-init", "cloud-init-output"), n=2,
+                prefix=None, backend=None):
+        """Run the follow loop on a fake clock; each sleep runs the next step, and the last one stops it."""
+        sleeps = []
+        clock = [1000.0]
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+            if not steps:
+                raise KeyboardInterrupt
+            steps.pop(0)()
+
+        monkeypatch.setattr(dx, "_aws_client", lambda *a, **k: fake)
+        monkeypatch.setattr(dx.time, "sleep", sleep)
+        monkeypatch.setattr(dx.time, "monotonic", lambda: clock[0])
+        dx._follow_cw_logs("osiris", "us-east-1", list(streams), n, prefix, backend)
+        return sleeps
+
+    def test_prints_the_tail_then_only_new_events(self, monkeypatch, capsys):
+        init = f"{self.HEAD}.cfn-init"
+        fake = _FakeFollowLogs({init: ["one", "two", "three"]})
+        self._follow(monkeypatch, fake, [lambda: fake.streams[init].extend(["four", "five", "six"])])
+        lines = [l for l in capsys.readouterr().out.splitlines() if l.startswith("[")]
+        assert [l.split()[-1] for l in lines] == ["two", "three", "four", "five", "six"]
+        assert all(l.startswith("[cfn-init]") for l in lines)
+        assert fake.forward_tokens[:3] == ["f3", "f3", "f5"]
+
+    def test_a_stream_that_appears_later_is_picked_up(self, monkeypatch, capsys):
+        init = f"{self.HEAD}.cfn-init"
+        fake = _FakeFollowLogs({init: ["a"]})
+        quiet = lambda: None
+        self._follow(monkeypatch, fake, [
+            lambda: fake.streams.update({f"{self.HEAD}.cloud-init-output": ["b"]}),
+        ] + [quiet] * 6)
+        assert "[cloud-init-output]" in capsys.readouterr().out
+
+    def test_missing_streams_are_looked_for_on_the_slow_cadence(self, monkeypatch):
+        """A stream this cluster never writes must not cost a full listing every poll."""
+        fake = _FakeFollowLogs({f"{self.HEAD}.cfn-init": ["a"]})
+        sleeps = self._follow(monkeypatch, fake, [lambda: None] * 20)
+        assert len(fake.stream_pages_read) == 1 + int(sum(sleeps[:-1]) // dx._FOLLOW_RESCAN_INTERVAL)
+        assert len(fake.stream_pages_read) < len(sleeps) / 2
+
+    def test_streams_taken_before_the_head_node_is_known_are_looked_up_again(self, monkeypatch, capsys):
+        """Until describe-cluster names the head node, a compute node's
+        cloud-init-output is the only match; it must not be followed for the
+        rest of the session once the head node's own stream is known."""
+        compute = "ip-10-0-9-9.i-0def.cloud-init-output"
+        head = f"{self.HEAD}.cloud-init-output"
+        fake = _FakeFollowLogs({compute: ["from compute"]})
+        described = [None]
+        monkeypatch.setattr(dx, "_describe_for_diagnose", lambda *a: (described[0], None))
+
+        def head_node_up():
+            described[0] = {"headNode": {"privateIpAddress": "10.0.0.1", "instanceId": "i-0abc"}}
+            fake.streams[head] = ["from head"]
+
+        quiet = lambda: None
+        self._follow(monkeypatch, fake, [head_node_up] + [quiet] * 6
+                     + [lambda: fake.streams[compute].append("stale")] + [quiet] * 2,
+                     streams=("cloud-init-output",), backend="native")
+        lines = [l for l in capsys.readouterr().out.splitlines() if l.startswith("[")]
+        assert [l.split()[-1] for l in lines] == ["compute", "head"]
+
+    def test_a_log_group_that_appears_later_is_waited_for(self, monkeypatch, capsys):
+        fake = _FakeFollowLogs({f"{self.HEAD}.cfn-init": ["a"]})
+        groups = []
+        real = fake.get_paginator
+
+        def get_paginator(name):
+            if name == "describe_log_groups":
+                return _FakePaginator([{"logGroups": groups}], [])
+            return real(name)
+
+        fake.get_paginator = get_paginator
+        quiet = lambda: None
+        self._follow(monkeypatch, fake, [
+            quiet, lambda: groups.append({"logGroupName": _GROUP}),
+        ] + [quiet] * 6)
+        out = capsys.readouterr().out
+        assert out.count("waiting for it") == 1
+        assert f"log group: {_GROUP}" in out
+        assert "[cfn-init]" in out
+
+    def test_quiet_polls_back_off_and_activity_resets(self, monkeypatch):
+        init = f"{self.HEAD}.cfn-init"
+        fake = _FakeFollowLogs({init: ["a"]})
+        quiet = lambda: None
+        sleeps = self._follow(monkeypatch, fake, [
+            quiet, quiet, lambda: fake.streams[init].append("b"), quiet,
+        ] + [quiet] * 6)
+        lo, hi = dx._FOLLOW_MIN_INTERVAL, dx._FOLLOW_MAX_INTERVAL
+        assert sleeps[:5] == [lo, lo * 2, lo * 4, lo, lo * 2]
+        assert max(sleeps) == hi
+
+    def test_ctrl_c_stops_cleanly(self, monkeypatch, capsys):
+        fake = _FakeFollowLogs({})
+        self._follow(monkeypatch, fake, [])
+        assert "Stopped following." in capsys.readouterr().out
+
+
+class TestErrorSignature:
+    def test_ids_addresses_and_counters_are_masked(self):
+        a = dx._error_signature(
+            "Jul 26 03:59:12 ip-10-0-1-23 slurmd[1234]: error: Unable to register: Connection refused"
+        )
+        b = dx._error_signature(
+            "Jul 27 11:02:40 ip-10-0-7-8 slurmd[99]: error: Unable to register: Connection refused"
+        )
+        assert a == b
+        assert "Connection refused" in a
+
+    def test_leading_timestamp_and_instance_id_are_dropped(self):
+        sig = dx._error_signature(
+            "2026-07-26 03:59:12,123 ERROR cfn-init failed on i-0abc1234def567890 (10.0.1.23)"
+        )
+        assert sig == "ERROR cfn-init failed on i-* (<ip>)"
+
+    def test_long_messages_are_truncated(self):
+        assert len(dx._error_signature("error " + "x" * 500)) == dx._SIGNATURE_WIDTH
+
+
+class _FakeInsights:
+    def __init__(self, statuses, rows=(), start_exc=None):
+        self.statuses = list(statuses)
+        self.rows = list(rows)
+        self.start_exc = start_exc
+        self.started = None
+        self.stopped = []
+
+    def start_query(self, **kwargs):
+        if self.start_exc:
+            raise self.start_exc
+        self.started = kwargs
+        return {"queryId": "q-1"}
+
+    def get_query_results(self, queryId):
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return {"status": status, "results": [
+            [{"field": k, "value": v} for k, v in row.items()] for row in self.rows
+        ] if status == "Complete" else []}
+
+    def stop_query(self, queryId):
+        self.stopped.append(queryId)
+
+
+class TestRunInsightsQuery:
+    @pytest.fixture(autouse=True)
+    def _no_sleep(self, monkeypatch):
+        self.sleeps = []
+        monkeypatch.setattr(dx.time, "sleep", self.sleeps.append)
+
+    def _run(self, fake):
+        from datetime import datetime, timezone
+
+        end = datetime(2026, 7, 26, tzinfo=timezone.utc)
+        return dx._run_insights_query(
+            fake, _GROUP, dx._ERROR_SCAN_QUERY, end.replace(day=25), end
+        )
+
+    def test_polls_with_backoff_until_complete(self):
+        fake = _FakeInsights(
+            ["Scheduled", "Running", "Running", "Running", "Running", "Complete"],
+            rows=[{"@logStream": "ip-1.i-1.cfn-init", "@message": "error x", "events": "3"}],
+        )
+        rows, err = self._run(fake)
+        assert err is None
+        assert rows == [{"@logStream": "ip-1.i-1.cfn-init", "@message": "error x", "events": "3"}]
+        assert self.sleeps == [0.5, 1.0, 2.0, 4.0, 5.0]
+        assert fake.started["logGroupName"] == _GROUP
+        assert fake.started["endTime"] - fake.started["startTime"] == 24 * 3600
+
+    def test_failed_query_is_an_error(self):
+        rows, err = self._run(_FakeInsights(["Failed"]))
+        assert rows is None and "Failed" in err
+
+    def test_a_query_past_the_deadline_is_stopped(self, monkeypatch):
+        clock = iter([0, dx._ERROR_SCAN_TIMEOUT + 1])
+        monkeypatch.setattr(dx.time, "monotonic", lambda: next(clock))
+        fake = _FakeInsights(["Running"])
+        rows, err = self._run(fake)
+        assert rows is None and "did not finish" in err
+        assert fake.stopped == ["q-1"]
+
+    def test_access_denied_names_the_permissions(self):
+        from botocore.exceptions import ClientError
+
+        fake = _FakeInsights(["Complete"], start_exc=ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "no"}}, "StartQuery"
+        ))
+        rows, err = self._run(fake)
+        assert rows is None and "logs:StartQuery" in err
+
+
+class TestSummarizeErrorRows:
+    def test_counts_fold_by_node_and_signature(self):
+        rows = [
+            {"@logStream": "ip-10-0-1-1.i-01.cloud-init-output",
+             "sample": "2026-07-26 03:00:01 error: mount failed on 10.0.0.5", "events": "4"},
+            {"@logStream": "ip-10-0-1-2.i-02.cloud-init-output",
+             "sample": "2026-07-26 03:00:09 error: mount failed on 10.0.0.6", "events": "2"},
+            {"@logStream": "ip-10-0-1-2.i-02.slurmd",
+             "sample": "error: Unable to register", "events": "7"},
+        ]
+        nodes, signatures = dx._summarize_error_rows(rows)
+        assert nodes == {"ip-10-0-1-2": 9, "ip-10-0-1-1": 4}
+        assert signatures[0] == ("error: Unable to register", 7, {"ip-10-0-1-2"})
+        assert signatures[1] == (
+            "error: mount failed on <ip>", 6, {"ip-10-0-1-1", "ip-10-0-1-2"}
+        )
+
+    def test_malformed_counts_are_skipped(self):
+        nodes, signatures = dx._summarize_error_rows(
+            [{"@logStream": "n.i.log", "sample": "error", "events": "?"}]
+        )
+        assert nodes == {} and signatures == []
+
+
+class TestScanErrorsOutput:
+    def test_report_lists_nodes_and_signatures(self, monkeypatch, capsys):
+        fake = _FakeLogs([], {})
+        monkeypatch.setattr(dx, "_aws_client", lambda *a, **k: fake)
+        monkeypatch.setattr(dx, "_run_insights_query", lambda *a: ([
+            {"@logStream": "ip-10-0-1-1.i-01.cfn-init", "sample": "FATAL: boom", "events": "5"},
+        ], None))
+        dx._scan_cw_errors("osiris", "us-east-1", 24)
+        out = capsys.readouterr().out
+        assert f"log group: {_GROUP}" in out
+        assert "5 matching event(s) across 1 node(s)" in out
+        assert "FATAL: boom" in out
+
+    def test_a_full_result_set_is_flagged_as_truncated(self, monkeypatch, capsys):
+        monkeypatch.setattr(dx, "_aws_client", lambda *a, **k: _FakeLogs([], {}))
+        row = {"@logStream": "ip-10-0-1-1.i-01.cfn-init", "sample": "FATAL: boom", "events": "1"}
+        monkeypatch.setattr(dx, "_run_insights_query",
+                            lambda *a: ([row] * dx._ERROR_SCAN_ROW_LIMIT, None))
+        dx._scan_cw_errors("osiris", "us-east-1", 24)
+        assert "WARNING: the query returned its 10000-row limit" in capsys.readouterr().out
+
+    def test_the_query_groups_on_a_normalized_signature(self):
+        """Grouping on the raw message would aggregate next to nothing."""
+        query = dx._ERROR_SCAN_QUERY
+        assert "by @logStream, signature" in query
+        assert "by @logStream, @message" not in query
+        for digit in "0123456789":
+            assert f'"{digit}", ""' in query
+
+    def test_no_matches(self, monkeypatch, capsys):
+        monkeypatch.setattr(dx, "_aws_client", lambda *a, **k: _FakeLogs([], {}))
+        monkeypatch.setattr(dx, "_run_insights_query", lambda *a: ([], None))
+        dx._scan_cw_errors("osiris", "us-east-1", 6)
+        assert "No error or failure messages in the last 6h" in capsys.readouterr().out
+
+
+# ---------------------------------------------------------------------------
+# --compute_nodes fan-out
+# ---------------------------------------------------------------------------
+
+def _fake_bin(tmp_path, name, body):
+    path = tmp_path / name
+    path.write_text(f"#!{sys.executable}\nimport sys\n{body}")
+    path.chmod(0o755)
+
+
+class TestFanoutScript:
+    """The head-node script, run locally against a fake sinfo and ssh."""
+
+    def _run(self, tmp_path, nodes=None, sinfo_rows="compute-1 10.0.0.1 idle\ncompute-2 10.0.0.2 mix\n"):
+        _fake_bin(tmp_path, "sinfo", f"sys.stdout.write({sinfo_rows!r})\n"
+                  "open(sys.argv[0] + '.args', 'w').write(' '.join(sys.argv[1:]))")
+        _fake_bin(tmp_path, "ssh", (
+            "host = sys.argv[sys.argv.index('sh') - 1]\n"
+            "script = sys.stdin.read()\n"
+            "if host == '10.0.0.9':\n"
+            "    sys.stderr.write('ssh: connect to host 10.0.0.9: Connection refused\\n')\n"
+            "    sys.exit(255)\n"
+            "print('@@@ cloud-init-output')\n"
+            "print('booted ' + host)\n"
+            "print('@@@ dmesg')\n"
+            "print('lines=' + script.split('n=')[1].split()[0])\n"
+        ))
+        env = dict(os.environ, PATH=f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+        result = subprocess.run(
+            [sys.executable, "-"], input=dx._fanout_script(5, 4, nodes, 7),
+            capture_output=True, text=True, env=env, timeout=60,
+        )
+        assert result.returncode == 0, result.stderr
+        records = [dx._decode_fanout_record(line) for line in result.stdout.splitlines()]
+        assert None not in records
+        return records, (tmp_path / "sinfo.args").read_text()
+
+    def test_every_node_reports_between_the_node_list_and_done(self, tmp_path):
+        records, sinfo_args = self._run(tmp_path)
+        assert records[0] == {"nodes": ["compute-1", "compute-2"]}
+        assert records[-1] == {"done": True}
+        reports = {r["node"]: r for r in records[1:-1]}
+        assert set(reports) == {"compute-1", "compute-2"}
+        assert reports["compute-1"]["rc"] == 0
+        assert "booted 10.0.0.1" in reports["compute-1"]["output"]
+        assert "lines=7" in reports["compute-2"]["output"]
+        assert "-t idle,alloc,mix,completing" in sinfo_args
+
+    def test_nodes_without_an_instance_are_skipped(self, tmp_path):
+        """Powered-down dynamic slots still have base state IDLE; ssh-ing to
+        hundreds of them would swamp the report with doomed attempts."""
+        rows = "".join(
+            f"compute-{i} 10.0.0.{i} {state}\n"
+            for i, state in enumerate(["idle", "idle~", "idle#", "mix%", "alloc!",
+                                       "down*", "idle+powered_down", "mix"], start=1)
+        )
+        records, sinfo_args = self._run(tmp_path, sinfo_rows=rows)
+        assert records[0] == {
+            "nodes": ["compute-1", "compute-8"],
+            "skipped": ["compute-2", "compute-3", "compute-4", "compute-5", "compute-6", "compute-7"],
+        }
+        assert {r["node"] for r in records[1:-1]} == {"compute-1", "compute-8"}
+        assert "%t" in sinfo_args
+
+    def test_an_explicit_hostlist_ignores_node_state(self, tmp_path):
+        _, sinfo_args = self._run(tmp_path, nodes="compute-[1-2]")
+        assert "-n compute-[1-2]" in sinfo_args and "-t" not in sinfo_args
+
+    def test_an_unreachable_node_is_reported_not_dropped(self, tmp_path):
+        records, _ = self._run(tmp_path, sinfo_rows="compute-9 10.0.0.9 alloc\n")
+        report = records[1]
+        assert report["rc"] == 255 and "Connection refused" in report["output"]
+
+    @pytest.mark.parametrize("nodes", [None, "compute-[1-2]"])
+    def test_the_filled_in_script_is_valid_python(self, nodes):
+        compile(dx._fanout_script(5, 4, nodes, 7), "<fanout>", "exec")
+
+
+class TestComputeCollectScript:
+    """The fi_info section, run under sh against a fake fi_info."""
+
+    def _fi_info(self, tmp_path, output):
+        _fake_bin(tmp_path, "fi_info", f"sys.stdout.write({output!r})\n")
+        script = dx._COMPUTE_COLLECT_SCRIPT
+        section = script[script.index('echo "@@@ fi_info"'):]
+        env = dict(os.environ, PATH=f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+        result = subprocess.run(["sh", "-c", section], capture_output=True, text=True, env=env, timeout=30)
+        return result.stdout.splitlines()[1:]
+
+    def test_providers_are_counted(self, tmp_path):
+        out = self._fi_info(tmp_path, "provider: efa\n    fabric: efa\nprovider: efa\n    fabric: efa\n")
+        assert [line.split() for line in out] == [["2", "fabric:", "efa"], ["2", "provider:", "efa"]]
+
+    def test_an_error_shows_its_last_line(self, tmp_path):
+        out = self._fi_info(tmp_path, "fi_getinfo: -61 (No data available)\n")
+        assert out == ["fi_getinfo: -61 (No data available)"]
+
+
+def _encode(record):
+    return base64.b64encode(zlib.compress(json.dumps(record).encode())).decode()
+
+
+class TestFanoutRecords:
+    def test_round_trip(self):
+        assert dx._decode_fanout_record(_encode({"node": "a", "rc": 0}) + "\n") == {"node": "a", "rc": 0}
+
+    @pytest.mark.parametrize("line", ["", "Warning: Permanently added host", "bm90IHpsaWI=",
+                                      _encode(["not", "a", "dict"])])
+    def test_anything_else_is_ignored(self, line):
+        assert dx._decode_fanout_record(line) is None
+
+    def test_sections_split_on_markers(self):
+        output = "ssh noise\n@@@ dmesg\nline 1\n\n@@@ nvidia-smi\n"
+        assert dx._split_sections(output) == [
+            ("ssh", ["ssh noise"]), ("dmesg", ["line 1"]), ("nvidia-smi", []),
+        ]
+
+
+class TestDiagnoseComputeNodes:
+    def _run(self, monkeypatch, capsys, items):
+        monkeypatch.setattr(dx, "_stream_fanout", lambda *a: iter(items))
+        dx._diagnose_compute_nodes("1.2.3.4", "/k.pem", "ubuntu", 10, None, 64, 30)
+        return capsys.readouterr().out
+
+    def test_reports_print_as_they_arrive_with_a_summary(self, monkeypatch, capsys):
+        out = self._run(monkeypatch, capsys, [
+            {"nodes": ["c-1", "c-2"]},
+            {"node": "c-2", "rc": 0, "output": "@@@ dmesg\nok\n"},
+            {"node": "c-1", "rc": None, "output": "@@@ dmesg\n"},
+            {"done": True},
+            (0, ""),
+        ])
+        assert out.index("--- c-2 ---") < out.index("--- c-1  (timed out")
+        assert "collected from 1 of 2 node(s)" in out
+        assert "incomplete: c-1" in out
+
+    def test_skipped_nodes_are_counted(self, monkeypatch, capsys):
+        out = self._run(monkeypatch, capsys, [
+            {"nodes": ["c-1"], "skipped": ["c-2", "c-3"]},
+            {"node": "c-1", "rc": 0, "output": ""},
+            {"done": True},
+            (0, ""),
+        ])
+        assert "skipped 2 powered-down or down node(s)" in out
+        assert "collected from 1 of 1 node(s)" in out
+
+    def test_an_unreachable_head_node(self, monkeypatch, capsys):
+        out = self._run(monkeypatch, capsys, [(255, "Connection timed out")])
+        assert "fan-out failed (rc=255): Connection timed out" in out
+
+    def test_a_fanout_cut_short_says_so(self, monkeypatch, capsys):
+        out = self._run(monkeypatch, capsys, [{"nodes": ["c-1"]}, (137, "")])
+        assert "fan-out ended early (rc=137)" in out
+
+    def test_no_nodes_up(self, monkeypatch, capsys):
+        out = self._run(monkeypatch, capsys, [{"nodes": []}, {"done": True}, (0, "")])
+        assert "(no idle or allocated compute nodes)" in out
@@ -10,14 +10,24 @@ import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
 
+import pcluster_core
 from pcluster_core import (
     _validate_region,
     _run_pcluster_cmd,
+    _describe_cluster,
+    _describe_cluster_native,
     _get_fleet_status,
     _fleet_action_plan,
     _poll_fleet,
-    _FLEET_POLL_INTERVAL,
-    _FLEET_POLL_TIMEOUT,
+    _WAIT_FIRST_DELAY,
+    _WAIT_MAX_DELAY,
+    _expected_wait,
+    _fleet_action_many,
+    _select_cluster_records,
+    _record_wait,
+    _wait_delays,
+    _wait_transition,
+    _wait_until,
 )
 
 
@@ -100,10 +110,171 @@ class TestGetFleetStatus:
         assert _get_fleet_status("mycluster", "us-east-1", "/bin/pcluster") == "UNKNOWN"
 
 
+# ---------------------------------------------------------------------------
+# _describe_cluster_native / _describe_cluster
+# ---------------------------------------------------------------------------
+
+class _ClientError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class _FakeCfn:
+    def __init__(self, stack_status="CREATE_COMPLETE", error=None):
+        self.stack_status = stack_status
+        self.error = error
+
+    def describe_stacks(self, StackName):
+        if self.error:
+            raise self.error
+        return {"Stacks": [{
+            "StackName": StackName,
+            "StackStatus": self.stack_status,
+            "Tags": [{"Key": "parallelcluster:version", "Value": "3.13.0"}],
+        }]}
+
+
+class _FakeDynamo:
+    def __init__(self, item=None, error=None):
+        self.item = item
+        self.error = error
+        self.calls = []
+
+    def get_item(self, **kw):
+        self.calls.append(kw)
+        if self.error:
+            raise self.error
+        return {"Item": self.item} if self.item is not None else {}
+
+
+class _FakeEc2:
+    def __init__(self, instances=()):
+        self.instances = list(instances)
+        self.filters = None
+
+    def describe_instances(self, Filters):
+        self.filters = Filters
+        return {"Reservations": [{"Instances": self.instances}] if self.instances else []}
+
+
+_HEAD = {
+    "InstanceId": "i-0123", "InstanceType": "c8g.2xlarge",
+    "State": {"Name": "running"},
+    "PrivateIpAddress": "10.0.0.5", "PublicIpAddress": "54.1.2.3",
+}
+
+
+def _fleet_item(status):
+    return {"Id": {"S": "COMPUTE_FLEET"},
+            "Data": {"M": {"status": {"S": status}}}}
+
+
+@pytest.fixture
+def fake_aws(monkeypatch):
+    monkeypatch.setattr(pcluster_core, "_client_error", lambda: _ClientError)
+    clients = {
+        "cloudformation": _FakeCfn(),
+        "dynamodb": _FakeDynamo(_fleet_item("RUNNING")),
+        "ec2": _FakeEc2([_HEAD]),
+    }
+    monkeypatch.setattr(pcluster_core, "_aws_client", lambda svc, region=None, **k: clients[svc])
+    return clients
+
+
+class TestDescribeClusterNative:
+    def test_builds_the_fields_the_tools_read(self, fake_aws):
+        data = _describe_cluster_native("mycluster", "us-east-1")
+        assert data["clusterStatus"] == "CREATE_COMPLETE"
+        assert data["cloudFormationStackStatus"] == "CREATE_COMPLETE"
+        assert data["computeFleetStatus"] == "RUNNING"
+        assert data["version"] == "3.13.0"
+        assert data["headNode"]["publicIpAddress"] == "54.1.2.3"
+        assert data["headNode"]["privateIpAddress"] == "10.0.0.5"
+
+    def test_head_node_is_found_by_pcluster_tags(self, fake_aws):
+        _describe_cluster_native("mycluster", "us-east-1")
+        filters = {f["Name"]: f["Values"] for f in fake_aws["ec2"].filters}
+        assert filters["tag:parallelcluster:cluster-name"] == ["mycluster"]
+        assert filters["tag:parallelcluster:node-type"] == ["HeadNode"]
+
+    def test_fleet_status_is_read_from_the_cluster_table(self, fake_aws):
+        _describe_cluster_native("mycluster", "us-east-1")
+        call = fake_aws["dynamodb"].calls[0]
+        assert call["TableName"] == "parallelcluster-mycluster"
+        assert call["Key"] == {"Id": {"S": "COMPUTE_FLEET"}}
+
+    def test_pre_3_2_flat_status_attribute(self, fake_aws):
+        fake_aws["dynamodb"].item = {"Id": {"S": "COMPUTE_FLEET"}, "Status": {"S": "STOPPED"}}
+        assert _describe_cluster_native("mycluster", "us-east-1")["computeFleetStatus"] == "STOPPED"
+
+    def test_rollback_maps_to_the_failed_operation(self, fake_aws):
+        fake_aws["cloudformation"].stack_status = "UPDATE_ROLLBACK_COMPLETE"
+        data = _describe_cluster_native("mycluster", "us-east-1")
+        assert data["clusterStatus"] == "UPDATE_FAILED"
+        assert data["cloudFormationStackStatus"] == "UPDATE_ROLLBACK_COMPLETE"
+
+    def test_missing_status_table_is_unknown(self, fake_aws):
+        fake_aws["dynamodb"].error = _ClientError("ResourceNotFoundException")
+        fake_aws["cloudformation"].stack_status = "CREATE_IN_PROGRESS"
+        assert _describe_cluster_native("mycluster", "us-east-1")["computeFleetStatus"] == "UNKNOWN"
+
+    def test_no_head_node_omits_the_key(self, fake_aws):
+        fake_aws["ec2"].instances = []
+        assert "headNode" not in _describe_cluster_native("mycluster", "us-east-1")
+
+    def test_private_only_head_node_has_no_public_ip(self, fake_aws):
+        fake_aws["ec2"].instances = [{k: v for k, v in _HEAD.items() if k != "PublicIpAddress"}]
+        head = _describe_cluster_native("mycluster", "us-east-1")["headNode"]
+        assert "publicIpAddress" not in head
+
+
+class TestDescribeClusterBackend:
+    def test_native_does_not_start_the_cli(self, fake_aws, monkeypatch):
+        def _run(*a, **kw):
+            raise AssertionError("pcluster CLI should not run")
+        monkeypatch.setattr(subprocess, "run", _run)
+        data = _describe_cluster("mycluster", "us-east-1", "/bin/pcluster", backend="native")
+        assert data["computeFleetStatus"] == "RUNNING"
+
+    def test_native_falls_back_to_the_cli_on_api_error(self, fake_aws, monkeypatch):
+        fake_aws["cloudformation"].error = _ClientError("AccessDenied")
+        payload = json.dumps({"computeFleetStatus": "STOPPED"})
+        monkeypatch.setattr(subprocess, "run", lambda *a, **kw: _proc(stdout=payload))
+        data = _describe_cluster("mycluster", "us-east-1", "/bin/pcluster", backend="native")
+        assert data["computeFleetStatus"] == "STOPPED"
+
+    def test_cli_backend_never_calls_the_api(self, monkeypatch):
+        def _client(*a, **kw):
+            raise AssertionError("no AWS client expected")
+        monkeypatch.setattr(pcluster_core, "_aws_client", _client)
+        payload = json.dumps({"computeFleetStatus": "RUNNING"})
+        monkeypatch.setattr(subprocess, "run", lambda *a, **kw: _proc(stdout=payload))
+        assert _get_fleet_status("mycluster", "us-east-1", "/bin/pcluster") == "RUNNING"
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError):
+            _describe_cluster("mycluster", "us-east-1", "/bin/pcluster", backend="grpc")
+
+
 # ---------------------------------------------------------------------------
 # _poll_fleet
 # ---------------------------------------------------------------------------
 
+def _fake_clock(monkeypatch):
+    """Make pcluster_core.time.sleep advance a fake monotonic clock; return the sleeps."""
+    now, sleeps = [0.0], []
+
+    def _sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr("pcluster_core.time.monotonic", lambda: now[0])
+    monkeypatch.setattr("pcluster_core.time.sleep", _sleep)
+    monkeypatch.setattr("pcluster_core.random.uniform", lambda a, b: 1.0)
+    return sleeps
+
+
 class TestPollFleet:
     def test_returns_when_target_reached(self, monkeypatch):
         payload = json.dumps({"computeFleetStatus": "STOPPED"})
@@ -124,8 +295,8 @@ class TestPollFleet:
         payload = json.dumps({"computeFleetStatus": "STOP_REQUESTED"})
         monkeypatch.setattr(subprocess, "run",
                             lambda *a, **kw: _proc(stdout=payload))
-        monkeypatch.setattr("pcluster_core.time.sleep", lambda _: None)
-        with pytest.raises(SystemExit, match="timed out"):
+        _fake_clock(monkeypatch)
+        with pytest.raises(SystemExit, match="timed out after 45 min"):
             _poll_fleet("mycluster", "us-east-1", "STOPPED", "fleet stop", "/bin/pcluster")
 
     def test_keyboard_interrupt_exits(self, monkeypatch, capsys):
@@ -163,6 +334,224 @@ class TestPollFleet:
         assert "still running in AWS" in out
 
 
+# ---------------------------------------------------------------------------
+# _wait_until
+# ---------------------------------------------------------------------------
+
+def _done_after(n):
+    calls = [0]
+
+    def poll():
+        calls[0] += 1
+        return calls[0] > n
+
+    return poll
+
+
+class TestWaitDelays:
+    def test_backs_off_from_the_first_delay_to_the_cap(self):
+        delays = _wait_delays()
+        first = [next(delays) for _ in range(12)]
+        assert first[0] == _WAIT_FIRST_DELAY
+        assert first == sorted(first)
+        assert first[-1] == _WAIT_MAX_DELAY
+
+    def test_history_lands_a_poll_at_the_window_then_polls_fast(self):
+        delays = _wait_delays(expected=600)
+        schedule, planned = [], 0.0
+        while planned < 480:
+            schedule.append(next(delays))
+            planned += schedule[-1]
+        assert planned == pytest.approx(480)  # 0.8 of the expected 600 s
+        assert next(delays) == _WAIT_FIRST_DELAY
+
+
+class TestWaitUntil:
+    def test_a_fleet_that_settles_in_35s_is_seen_within_45s(self, monkeypatch):
+        """A fixed 30 s interval saw it at 60 s."""
+        sleeps = _fake_clock(monkeypatch)
+        waited = _wait_until(lambda: sum(sleeps) >= 35, "fleet stop")
+        assert 35 <= waited <= 45
+
+    def test_returns_none_at_the_timeout(self, monkeypatch):
+        sleeps = _fake_clock(monkeypatch)
+        assert _wait_until(lambda: False, "fleet stop", timeout=300) is None
+        assert sum(sleeps) == pytest.approx(300)
+
+    def test_a_45_minute_wait_polls_far_less_than_every_30s(self, monkeypatch):
+        sleeps = _fake_clock(monkeypatch)
+        _wait_until(lambda: sum(sleeps) >= 45 * 60, "cluster update")
+        assert len(sleeps) < 60
+
+    def test_jitter_stays_within_bounds(self, monkeypatch):
+        sleeps = _fake_clock(monkeypatch)
+        monkeypatch.setattr("pcluster_core.random.uniform", lambda a, b: b)
+        _wait_until(_done_after(1), "fleet stop")
+        assert sleeps == [pytest.approx(_WAIT_FIRST_DELAY * 1.2)]
+
+    def test_history_is_recorded_and_shapes_the_next_wait(self, monkeypatch, tmp_path):
+        sleeps = _fake_clock(monkeypatch)
+        _wait_until(lambda: sum(sleeps) >= 600, "fleet start", repo_root=str(tmp_path))
+        expected = _expected_wait("fleet start", str(tmp_path))
+        assert expected == pytest.approx(sum(sleeps), abs=0.1)
+        assert _expected_wait("fleet stop", str(tmp_path)) is None
+
+        sleeps.clear()
+        _wait_until(lambda: sum(sleeps) >= 600, "fleet start", repo_root=str(tmp_path))
+        window = sleeps.index(_WAIT_FIRST_DELAY, 1)  # the backoff restarts at the window
+        assert sum(sleeps[:window]) == pytest.approx(0.8 * expected)
+
+    def test_a_joined_transition_uses_the_history_but_is_not_recorded(self, monkeypatch, tmp_path):
+        sleeps = _fake_clock(monkeypatch)
+        for _ in range(3):
+            _record_wait("a/fleet start", 600, str(tmp_path))
+        _wait_until(lambda: sum(sleeps) >= 500, "a/fleet start", repo_root=str(tmp_path), record=False)
+        window = sleeps.index(_WAIT_FIRST_DELAY, 1)
+        assert sum(sleeps[:window]) == pytest.approx(480)
+        assert _expected_wait("a/fleet start", str(tmp_path)) == 600
+
+    def test_each_cluster_keeps_its_own_history(self, tmp_path):
+        _record_wait(_wait_transition("small", "fleet start"), 60, str(tmp_path))
+        _record_wait(_wait_transition("large", "fleet start"), 900, str(tmp_path))
+        assert _expected_wait(_wait_transition("small", "fleet start"), str(tmp_path)) == 60
+        assert _expected_wait(_wait_transition("large", "fleet start"), str(tmp_path)) == 900
+
+    def test_an_already_complete_transition_is_not_recorded(self, monkeypatch, tmp_path):
+        _fake_clock(monkeypatch)
+        _wait_until(lambda: True, "fleet stop", repo_root=str(tmp_path))
+        assert _expected_wait("fleet stop", str(tmp_path)) is None
+
+    def test_history_keeps_the_newest_durations_and_uses_the_median(self, tmp_path):
+        for seconds in [1000, 10, 20, 30] + [40] * 9:
+            _record_wait("fleet stop", seconds, str(tmp_path))
+        assert _expected_wait("fleet stop", str(tmp_path)) == 40
+
+    def test_a_corrupt_history_is_ignored(self, tmp_path):
+        cache = tmp_path / "active_clusters" / ".cache"
+        cache.mkdir(parents=True)
+        (cache / "wait_history.json").write_text("{not json")
+        assert _expected_wait("fleet stop", str(tmp_path)) is None
+        _record_wait("fleet stop", 12, str(tmp_path))
+        assert _expected_wait("fleet stop", str(tmp_path)) == 12
+
+
+# ---------------------------------------------------------------------------
+# _fleet_action_many
+# ---------------------------------------------------------------------------
+
+class _FakeFleets:
+    """Fleet statuses by cluster; a request moves the fleet straight to its target."""
+
+    def __init__(self, monkeypatch, statuses, fail_requests=()):
+        self.statuses = dict(statuses)
+        self.requests = []
+        self.fail_requests = set(fail_requests)
+        monkeypatch.setattr(pcluster_core, "_get_fleet_status", self.status)
+        monkeypatch.setattr(pcluster_core, "_run_pcluster_cmd", self.run)
+
+    def status(self, name, region, binary, *, backend):
+        return self.statuses[name]
+
+    def run(self, cmd, binary):
+        name, status = cmd[cmd.index("--cluster-name") + 1], cmd[cmd.index("--status") + 1]
+        if name in self.fail_requests:
+            raise SystemExit("ERROR: pcluster exited 1:\nAccessDenied")
+        self.requests.append((name, status))
+        self.statuses[name] = {"STOP_REQUESTED": "STOPPED", "START_REQUESTED": "RUNNING"}[status]
+
+
+def _records(*names):
+    return {name: {"region": "us-east-1", "cluster_owner": "alice"} for name in names}
+
+
+class TestFleetActionMany:
+    def _run(self, action="stop", records=None, wait=False, confirm=None):
+        return _fleet_action_many(
+            action, records, "/bin/pcluster", wait=wait, backend="native",
+            repo_root=None, confirm=confirm,
+        )
+
+    def test_every_request_goes_out_up_front_and_only_where_planned(self, monkeypatch, capsys):
+        fleets = _FakeFleets(monkeypatch, {"a": "RUNNING", "b": "STOPPED", "c": "STOPPING", "d": "RUNNING"})
+        confirms = []
+        code = self._run(records=_records("a", "b", "c", "d"), confirm=lambda: confirms.append(1))
+        assert code == 0
+        assert sorted(fleets.requests) == [("a", "STOP_REQUESTED"), ("d", "STOP_REQUESTED")]
+        assert confirms == [1]
+        out = capsys.readouterr().out
+        assert "already done" in out and "in progress" in out
+
+    def test_protected_missing_and_failed_clusters_fail_the_run(self, monkeypatch, capsys):
+        fleets = _FakeFleets(monkeypatch, {"a": "PROTECTED", "b": "RUNNING", "c": "RUNNING"},
+                             fail_requests={"c"})
+        records = _records("a", "b", "c")
+        records["z"] = None
+        assert self._run(records=records) == 1
+        assert fleets.requests == [("b", "STOP_REQUESTED")]
+        out = capsys.readouterr().out
+        assert "PROTECTED" in out and "no cluster record" in out and "AccessDenied" in out
+        assert "3 of 4 cluster(s) failed." in out
+
+    def test_nothing_to_request_never_asks_for_confirmation(self, monkeypatch):
+        _FakeFleets(monkeypatch, {"a": "STOPPED"})
+        self._run(records=_records("a"), confirm=lambda: pytest.fail("prompted"))
+
+    def test_wait_polls_every_fleet_to_its_target(self, monkeypatch, capsys):
+        _FakeFleets(monkeypatch, {"a": "STOPPED", "b": "RUNNING", "c": "RUNNING"})
+        assert self._run(action="start", records=_records("a", "b", "c"), wait=True) == 0
+        out = capsys.readouterr().out
+        assert "All 3 fleet(s) reached RUNNING/ENABLED." in out
+        assert out.count("done") >= 3
+
+    def test_a_fleet_that_never_settles_times_out(self, monkeypatch, capsys):
+        fleets = _FakeFleets(monkeypatch, {"a": "RUNNING", "b": "STOP_REQUESTED"})
+        monkeypatch.setattr(pcluster_core, "_wait_until",
+                            lambda poll, *a, **k: 1.0 if poll() else None)
+        assert self._run(records=_records("a", "b"), wait=True) == 1
+        assert fleets.requests == [("a", "STOP_REQUESTED")]
+        assert "timed out after 45 min" in capsys.readouterr().out
+
+    def test_only_requested_transitions_are_recorded(self, monkeypatch):
+        _FakeFleets(monkeypatch, {"a": "RUNNING", "b": "STOPPING"})
+        recorded = []
+
+        def fake_wait(poll, transition, *, repo_root=None, record=True, cancel=None, **k):
+            recorded.append((transition, repo_root, record))
+            return 1.0
+
+        monkeypatch.setattr(pcluster_core, "_wait_until", fake_wait)
+        assert _fleet_action_many("stop", _records("a", "b"), "/bin/pcluster", wait=True,
+                                  backend="native", repo_root="/repo") == 0
+        assert sorted(recorded) == [("a/fleet stop", "/repo", True), ("b/fleet stop", "/repo", False)]
+
+    def test_no_clusters(self, capsys):
+        assert self._run(records={}) == 0
+        assert "No clusters selected." in capsys.readouterr().out
+
+
+class TestSelectClusterRecords:
+    def _stage(self, monkeypatch, tmp_path, records):
+        for name in records:
+            (tmp_path / "active_clusters" / name).mkdir(parents=True)
+        (tmp_path / "active_clusters" / ".cache").mkdir(exist_ok=True)
+        monkeypatch.setattr(pcluster_core, "_read_cluster_records",
+                            lambda names, root: {n: records[n] for n in names})
+
+    def test_all_filters_by_owner_and_region(self, monkeypatch, tmp_path):
+        self._stage(monkeypatch, tmp_path, {
+            "a": {"region": "us-east-1", "cluster_owner": "alice"},
+            "b": {"region": "us-west-2", "cluster_owner": "alice"},
+            "c": {"region": "us-east-1", "cluster_owner": "bob"},
+            "broken": None,
+        })
+        assert list(_select_cluster_records(None, str(tmp_path), owner="alice", region="us-east-1")) == ["a"]
+        assert sorted(_select_cluster_records(None, str(tmp_path))) == ["a", "b", "broken", "c"]
+
+    def test_a_named_cluster_without_a_record_is_kept(self, monkeypatch, tmp_path):
+        self._stage(monkeypatch, tmp_path, {"gone": None})
+        assert _select_cluster_records(["gone"], str(tmp_path), owner="alice") == {"gone": None}
+
+
 # ---------------------------------------------------------------------------
 # _fleet_action_plan
 # ---------------------------------------------------------------------------
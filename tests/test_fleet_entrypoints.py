@@ -31,8 +31,11 @@ def _stage(mod, monkeypatch, status, argv_extra=(), record=None):
     def _run(cmd, binary):
         record.setdefault("run_calls", []).append(list(cmd))
 
-    def _poll(cluster, region, target, label, binary):
+    def _poll(cluster, region, target, label, binary, *, backend, repo_root, **kwargs):
         record.setdefault("polls", []).append(target)
+        record["backend"] = backend
+        record["repo_root"] = repo_root
+        record["recorded"] = kwargs.get("record", True)
 
     monkeypatch.setattr(mod, "_run_pcluster_cmd", _run)
     monkeypatch.setattr(mod, "_poll_fleet", _poll)
@@ -101,6 +104,22 @@ class TestStopFleet:
         stop_mod.main()
         assert rec["polls"] == ["STOPPED"]
 
+    def test_polling_uses_the_native_backend_by_default(self, stop_mod, monkeypatch):
+        rec = _stage(stop_mod, monkeypatch, "RUNNING", argv_extra=["-W"])
+        stop_mod.main()
+        assert rec["backend"] == "native"
+
+    def test_waits_record_history_under_the_repo(self, stop_mod, monkeypatch):
+        rec = _stage(stop_mod, monkeypatch, "RUNNING", argv_extra=["-W"])
+        stop_mod.main()
+        assert rec["repo_root"] == stop_mod._repo_root
+
+    def test_describe_backend_cli_is_passed_through(self, stop_mod, monkeypatch):
+        rec = _stage(stop_mod, monkeypatch, "RUNNING",
+                     argv_extra=["-W", "--describe_backend", "cli"])
+        stop_mod.main()
+        assert rec["backend"] == "cli"
+
     def test_no_wait_does_not_poll(self, stop_mod, monkeypatch):
         rec = _stage(stop_mod, monkeypatch, "RUNNING")
         stop_mod.main()
@@ -113,6 +132,15 @@ class TestStopFleet:
         assert exc.value.code == 0
         assert rec["polls"] == ["STOPPED"]
         assert "run_calls" not in rec
+        # Joined mid-transition, so the duration is not added to the history.
+        assert rec["repo_root"] == stop_mod._repo_root
+        assert rec["recorded"] is False
+
+    def test_a_requested_stop_is_recorded_in_the_wait_history(self, stop_mod, monkeypatch):
+        rec = _stage(stop_mod, monkeypatch, "RUNNING", argv_extra=["-W"])
+        stop_mod.main()
+        assert rec["repo_root"] == stop_mod._repo_root
+        assert rec["recorded"] is True
 
     def test_missing_cluster_record_aborts(self, stop_mod, monkeypatch):
         rec = _stage(stop_mod, monkeypatch, "RUNNING")
@@ -164,9 +192,64 @@ class TestStartFleet:
         rec = _stage(start_mod, monkeypatch, "STOPPED", argv_extra=["-W"])
         start_mod.main()
         assert rec["polls"] == ["RUNNING"]
+        assert rec["repo_root"] == start_mod._repo_root
+
+    def test_a_start_already_under_way_is_not_recorded(self, start_mod, monkeypatch):
+        rec = _stage(start_mod, monkeypatch, "STARTING", argv_extra=["-W"])
+        with pytest.raises(SystemExit):
+            start_mod.main()
+        assert rec["polls"] == ["RUNNING"]
+        assert rec["repo_root"] == start_mod._repo_root
+        assert rec["recorded"] is False
 
     def test_start_has_no_abort_window(self, start_mod):
         """Starting a fleet destroys nothing, so it deliberately does not prompt.
         Pinning this keeps a copy-paste from stop_pcluster.py from adding a
         pointless 5-second delay to every start."""
         assert not hasattr(start_mod, "ctrlC_Abort")
+
+
+class TestManyClusters:
+    """--all and several -N names hand off to _fleet_action_many."""
+
+    def _stage_many(self, mod, monkeypatch, argv):
+        seen = {}
+
+        def _many(action, records, binary, *, wait, backend, repo_root, confirm=None):
+            seen.update(action=action, records=records, wait=wait, confirm=confirm)
+            return 1
+
+        def _select(names, repo_root, *, owner=None, region=None):
+            seen.update(names=names, owner=owner, region=region)
+            return {"a": {"region": REGION}}
+
+        monkeypatch.setattr(mod, "_fleet_action_many", _many)
+        monkeypatch.setattr(mod, "_select_cluster_records", _select)
+        monkeypatch.setattr(sys, "argv", [mod.__name__] + argv)
+        with pytest.raises(SystemExit) as exc:
+            mod.main()
+        return seen, exc.value.code
+
+    def test_all_stops_every_selected_cluster_with_one_abort_window(self, stop_mod, monkeypatch):
+        seen, code = self._stage_many(stop_mod, monkeypatch, ["-A", "-O", "alice", "-R", REGION, "-W"])
+        assert code == 1  # the combined status is the exit status
+        assert seen["action"] == "stop" and seen["wait"] is True
+        assert seen["names"] is None and seen["owner"] == "alice" and seen["region"] == REGION
+        assert seen["confirm"] is stop_mod._confirm_stop
+
+    def test_several_names_start_at_once_without_a_prompt(self, start_mod, monkeypatch):
+        seen, _ = self._stage_many(start_mod, monkeypatch, ["-N", "a", "b"])
+        assert seen["action"] == "start" and seen["names"] == ["a", "b"]
+        assert seen["confirm"] is None
+
+    def test_owner_needs_a_multi_cluster_selector(self, stop_mod, monkeypatch):
+        monkeypatch.setattr(sys, "argv", [stop_mod.__name__, "-N", CLUSTER, "-O", "alice"])
+        with pytest.raises(SystemExit) as exc:
+            stop_mod.main()
+        assert exc.value.code == 2
+
+    def test_names_and_all_are_exclusive(self, stop_mod, monkeypatch):
+        monkeypatch.setattr(sys, "argv", [stop_mod.__name__, "-N", CLUSTER, "-A"])
+        with pytest.raises(SystemExit) as exc:
+            stop_mod.main()
+        assert exc.value.code == 2
@@ -0,0 +1,97 @@
+"""
+Startup budgets for every entry point, measured with `python -X importtime`.
+
+boto3/botocore, jinja2, yaml, ruamel and concurrent.futures are imported where
+they are first used, so --help and argument errors return without them. A new
+top-level import of one of them fails the forbidden-module test outright; a
+slower creep shows up as a blown budget.
+"""
+
+import os
+import re
+import subprocess
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VENV_PYTHON = os.path.join(REPO_ROOT, ".venv", "bin", "python")
+
+# Cumulative import time for `<script> --help`, best of _RUNS, in ms. Each is
+# roughly twice what the script measures today; the heavy libraries alone
+# cost 30-100 ms apiece, so re-adding any of them at module level trips it.
+_BUDGET_MS = {
+    "access_cluster.py": 120,
+    "check_pcluster.py": 120,
+    "cost_pcluster.py": 120,
+    "diagnose_pcluster.py": 120,
+    "generate_operator_policy.py": 100,
+    "grafana_tunnel.py": 120,
+    "kill_pcluster.py": 120,
+    "list_pcluster.py": 120,
+    "make_pcluster.py": 130,
+    "manage_pcluster_queue.py": 130,
+    "rotate_cluster_key.py": 120,
+    "start_pcluster.py": 120,
+    "stop_pcluster.py": 120,
+}
+_RUNS = 3
+_DEFERRED = {"boto3", "botocore", "jinja2", "yaml", "ruamel", "concurrent"}
+
+_LINE_RE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)$")
+
+pytestmark = pytest.mark.skipif(
+    not os.path.isfile(VENV_PYTHON),
+    reason="entry points only run under the repo's .venv interpreter",
+)
+
+
+def _importtime(script):
+    """Return (cumulative top-level import µs, imported module names) for script --help."""
+    env = dict(os.environ)
+    # Bytecode caching must be on, or every run measures compile time instead
+    # of import time.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run(
+        [VENV_PYTHON, "-X", "importtime", os.path.join(REPO_ROOT, script), "--help"],
+        capture_output=True, text=True, cwd=REPO_ROOT, env=env, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    total, modules = 0, set()
+    for line in result.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if not m:
+            continue
+        modules.add(m.group(3))
+        if len(m.group(2)) == 1:
+            total += int(m.group(1))
+    return total, modules
+
+
+@pytest.fixture(scope="module")
+def measurements():
+    cache = {}
+
+    def measure(script):
+        if script not in cache:
+            _importtime(script)  # warm the bytecode cache
+            runs = [_importtime(script) for _ in range(_RUNS)]
+            cache[script] = (min(t for t, _ in runs), runs[0][1])
+        return cache[script]
+
+    return measure
+
+
+@pytest.mark.parametrize("script", sorted(_BUDGET_MS))
+def test_help_does_not_import_deferred_libraries(script, measurements):
+    _, modules = measurements(script)
+    loaded = sorted({m.split(".")[0] for m in modules} & _DEFERRED)
+    assert not loaded, f"{script} --help imported {loaded}"
+
+
+@pytest.mark.parametrize("script", sorted(_BUDGET_MS))
+def test_startup_stays_within_budget(script, measurements):
+    total_us, _ = measurements(script)
+    assert total_us / 1000 <= _BUDGET_MS[script], (
+        f"{script} --help spent {total_us / 1000:.0f} ms importing "
+        f"(budget {_BUDGET_MS[script]} ms)"
+    )
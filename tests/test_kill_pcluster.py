@@ -50,7 +50,7 @@ def staged(kp, tmp_path, monkeypatch):
         def describe_availability_zones(self, ZoneNames):
             return {"AvailabilityZones": [{"RegionName": "us-east-1"}]}
 
-    monkeypatch.setattr(kp.boto3, "client", lambda *a, **k: _Ec2())
+    monkeypatch.setattr(kp, "_aws_client", lambda *a, **k: _Ec2())
     # The abort window is a 5-second sleep; tests must not pay for it.
     monkeypatch.setattr(kp, "ctrlC_Abort", lambda *a, **k: None)
 
@@ -209,7 +209,7 @@ class TestTeardownPreflight:
             def describe_availability_zones(self, ZoneNames):
                 return {"AvailabilityZones": []}
 
-        monkeypatch.setattr(staged["mod"].boto3, "client", lambda *a, **k: _Empty())
+        monkeypatch.setattr(staged["mod"], "_aws_client", lambda *a, **k: _Empty())
         with pytest.raises(SystemExit) as exc:
             staged["mod"].main()
         assert exc.value.code == 1
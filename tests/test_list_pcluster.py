@@ -49,6 +49,23 @@ def _make_cluster_tree(tmp_path, cluster_name, vars_content=None):
     return tmp_path
 
 
+class TestEnumerateClusters:
+    def test_only_valid_cluster_directories_are_listed(self, tmp_path):
+        from pcluster_core import _enumerate_clusters
+
+        active = tmp_path / "active_clusters"
+        for name in ("bifrost", "osiris", ".cache", "Bad_Name"):
+            (active / name).mkdir(parents=True)
+        (active / "stray-file").write_text("")
+        (active / "linked").symlink_to(active / "osiris")
+        assert _enumerate_clusters(str(tmp_path)) == ["bifrost", "osiris"]
+
+    def test_a_missing_active_clusters_dir_lists_nothing(self, tmp_path):
+        from pcluster_core import _enumerate_clusters
+
+        assert _enumerate_clusters(str(tmp_path)) == []
+
+
 # ---------------------------------------------------------------------------
 # _read_cluster_record
 # ---------------------------------------------------------------------------
@@ -196,3 +213,224 @@ class TestAgeStr:
         assert mod._age_str("not-a-date") == "?"
         assert mod._age_str("") == "?"
         assert mod._age_str(None) == "?"
+
+
+# ---------------------------------------------------------------------------
+# --live: one stack sweep per region
+# ---------------------------------------------------------------------------
+
+
+class _FakePaginator:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def paginate(self):
+        return iter(self.pages)
+
+
+class _FakeCfn:
+    def __init__(self, pages=None, error=None):
+        self.pages = pages or []
+        self.error = error
+
+    def get_paginator(self, name):
+        assert name == "describe_stacks"
+        if self.error:
+            raise self.error
+        return _FakePaginator(self.pages)
+
+
+class TestSweepStackStatuses:
+    def test_collects_every_page(self, monkeypatch):
+        import pcluster_core
+
+        cfn = _FakeCfn([
+            {"Stacks": [{"StackName": "a", "StackStatus": "CREATE_COMPLETE"}]},
+            {"Stacks": [{"StackName": "b", "StackStatus": "ROLLBACK_COMPLETE"}]},
+        ])
+        monkeypatch.setattr(pcluster_core, "_aws_client", lambda *a, **k: cfn)
+        assert pcluster_core._sweep_stack_statuses("us-east-1") == {
+            "a": ("CREATE_COMPLETE", "CREATE_COMPLETE"),
+            "b": ("CREATE_FAILED", "ROLLBACK_COMPLETE"),
+        }
+
+    def test_api_failure_returns_none(self, monkeypatch):
+        import pcluster_core
+        from botocore.exceptions import ClientError
+
+        err = ClientError({"Error": {"Code": "AccessDenied"}}, "DescribeStacks")
+        monkeypatch.setattr(pcluster_core, "_aws_client", lambda *a, **k: _FakeCfn(error=err))
+        assert pcluster_core._sweep_stack_statuses("us-east-1") is None
+
+
+class TestLiveStatuses:
+    def _records(self, *pairs):
+        return [{"cluster_name": n, "region": r} for n, r in pairs]
+
+    def _load(self, monkeypatch, sweeps):
+        from entrypoint_harness import load_entrypoint
+
+        mod = load_entrypoint("list_pcluster.py")
+        swept, described = [], []
+
+        def _sweep(region):
+            swept.append(region)
+            return sweeps.get(region)
+
+        def _describe(name, region, backend):
+            described.append(name)
+            return "FALLBACK"
+
+        monkeypatch.setattr(mod, "_sweep_stack_statuses", _sweep)
+        monkeypatch.setattr(mod, "_live_status", _describe)
+        return mod, swept, described
+
+    def test_one_sweep_per_region(self, monkeypatch):
+        mod, swept, described = self._load(monkeypatch, {
+            "us-east-1": {"a": ("CREATE_COMPLETE", "CREATE_COMPLETE"),
+                          "b": ("UPDATE_FAILED", "UPDATE_ROLLBACK_COMPLETE")},
+            "eu-west-1": {"c": ("CREATE_COMPLETE", "CREATE_COMPLETE")},
+        })
+        recs = self._records(("a", "us-east-1"), ("b", "us-east-1"), ("c", "eu-west-1"))
+        statuses = mod._live_statuses(recs, "native")
+        assert sorted(swept) == ["eu-west-1", "us-east-1"]
+        assert described == []
+        assert statuses == {
+            "a": "CREATE_COMPLETE / CREATE_COMPLETE",
+            "b": "UPDATE_FAILED / UPDATE_ROLLBACK_COMPLETE",
+            "c": "CREATE_COMPLETE / CREATE_COMPLETE",
+        }
+
+    def test_clusters_the_sweep_missed_fall_back(self, monkeypatch):
+        mod, _, described = self._load(monkeypatch, {
+            "us-east-1": {"a": ("CREATE_COMPLETE", "CREATE_COMPLETE")},
+        })
+        recs = self._records(("a", "us-east-1"), ("gone", "us-east-1"))
+        statuses = mod._live_statuses(recs, "native")
+        assert described == ["gone"]
+        assert statuses["gone"] == "FALLBACK"
+
+    def test_failed_sweep_falls_back_for_the_whole_region(self, monkeypatch):
+        mod, _, described = self._load(monkeypatch, {"us-east-1": None})
+        recs = self._records(("a", "us-east-1"), ("b", "us-east-1"))
+        mod._live_statuses(recs, "native")
+        assert sorted(described) == ["a", "b"]
+
+    def test_cli_backend_does_not_sweep(self, monkeypatch):
+        mod, swept, described = self._load(monkeypatch, {})
+        mod._live_statuses(self._records(("a", "us-east-1")), "cli")
+        assert swept == []
+        assert described == ["a"]
+
+
+# ---------------------------------------------------------------------------
+# _read_cluster_records: the inventory index
+# ---------------------------------------------------------------------------
+
+
+class TestInventoryIndex:
+    def _index(self, root):
+        import json
+        from pcluster_core import _inventory_path
+
+        with open(_inventory_path(str(root))) as fh:
+            return json.load(fh)["data"]
+
+    def _no_yaml(self, monkeypatch):
+        import yaml
+
+        def _boom(*a, **k):
+            raise AssertionError("vars file parsed despite a warm index")
+
+        monkeypatch.setattr(yaml, "safe_load", _boom)
+
+    def test_cold_read_matches_read_cluster_record(self, tmp_path):
+        from pcluster_core import _read_cluster_records
+
+        root = _make_cluster_tree(tmp_path, "mycluster", _MINIMAL_VARS)
+        recs = _read_cluster_records(["mycluster"], str(root))
+        assert recs["mycluster"] == _read_cluster_record("mycluster", str(root))
+        assert "mycluster" in self._index(root)["clusters"]
+
+    def test_warm_index_parses_no_yaml(self, tmp_path, monkeypatch):
+        from pcluster_core import _read_cluster_records
+
+        root = _make_cluster_tree(tmp_path, "mycluster", _MINIMAL_VARS)
+        first = _read_cluster_records(["mycluster"], str(root))
+        self._no_yaml(monkeypatch)
+        assert _read_cluster_records(["mycluster"], str(root)) == first
+
+    def test_edited_vars_file_is_reparsed(self, tmp_path):
+        from pcluster_core import _read_cluster_records
+
+        root = _make_cluster_tree(tmp_path, "mycluster", _MINIMAL_VARS)
+        _read_cluster_records(["mycluster"], str(root))
+        vars_file = root / "src" / "vars_files" / "mycluster.yml"
+        vars_file.write_text(_MINIMAL_VARS.replace('"alice"', '"bob-the-builder"'))
+        recs = _read_cluster_records(["mycluster"], str(root))
+        assert recs["mycluster"]["cluster_owner"] == "bob-the-builder"
+
+    def test_same_size_edit_is_caught_by_mtime(self, tmp_path):
+        from pcluster_core import _read_cluster_records
+
+        root = _make_cluster_tree(tmp_path, "mycluster", _MINIMAL_VARS)
+        _read_cluster_records(["mycluster"], str(root))
+        vars_file = root / "src" / "vars_files" / "mycluster.yml"
+        st = vars_file.stat()
+        vars_file.write_text(_MINIMAL_VARS.replace('"alice"', '"carol"'))
+        os.utime(vars_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        recs = _read_cluster_records(["mycluster"], str(root))
+        assert recs["mycluster"]["cluster_owner"] == "carol"
+
+    def test_corrupt_index_is_rebuilt(self, tmp_path, monkeypatch):
+        from pcluster_core import _inventory_path, _read_cluster_records
+
+        root = _make_cluster_tree(tmp_path, "mycluster", _MINIMAL_VARS)
+        _read_cluster_records(["mycluster"], str(root))
+        with open(_inventory_path(str(root)), "w") as fh:
+            fh.write("{not json")
+        recs = _read_cluster_records(["mycluster"], str(root))
+        assert recs["mycluster"]["cluster_owner"] == "alice"
+        self._no_yaml(monkeypatch)
+        _read_cluster_records(["mycluster"], str(root))
+
+    def test_older_index_version_is_discarded(self, tmp_path):
+        import pcluster_core
+
+        root = _make_cluster_tree(tmp_path, "mycluster", _MINIMAL_VARS)
+        pcluster_core._read_cluster_records(["mycluster"], str(root))
+        pcluster_core._write_json_cache(
+            pcluster_core._inventory_path(str(root)),
+            {"version": 0, "clusters": {"mycluster": {"stamp": [0, 0], "record": {}}}},
+        )
+        recs = pcluster_core._read_cluster_records(["mycluster"], str(root))
+        assert recs["mycluster"]["region"] == "us-east-1"
+        assert self._index(root)["version"] == pcluster_core._INVENTORY_VERSION
+
+    def test_removed_cluster_dir_is_not_served_from_the_index(self, tmp_path):
+        import shutil
+        from pcluster_core import _read_cluster_records
+
+        root = _make_cluster_tree(tmp_path, "mycluster", _MINIMAL_VARS)
+        _read_cluster_records(["mycluster"], str(root))
+        shutil.rmtree(root / "active_clusters" / "mycluster")
+        assert _read_cluster_records(["mycluster"], str(root)) == {"mycluster": None}
+        assert "mycluster" not in self._index(root)["clusters"]
+
+    def test_unreadable_vars_file_is_not_indexed(self, tmp_path):
+        from pcluster_core import _read_cluster_records
+
+        root = _make_cluster_tree(tmp_path, "mycluster", "key: [unclosed")
+        assert _read_cluster_records(["mycluster"], str(root)) == {"mycluster": None}
+        assert self._index(root)["clusters"] == {}
+
+    def test_list_rebuild_index_command(self, tmp_path, monkeypatch, capsys):
+        from entrypoint_harness import load_entrypoint
+
+        root = _make_cluster_tree(tmp_path, "mycluster", _MINIMAL_VARS)
+        mod = load_entrypoint("list_pcluster.py")
+        monkeypatch.setattr(mod, "_repo_root", str(root))
+        monkeypatch.setattr(sys, "argv", ["list_pcluster.py", "--rebuild_index"])
+        mod.main()
+        assert "Indexed 1 of 1 cluster(s)" in capsys.readouterr().out
+        assert "mycluster" in self._index(root)["clusters"]
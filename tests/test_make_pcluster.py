@@ -33,6 +33,8 @@ from pcluster_core import (
     _derive_docker_compose_staging,
     _derive_results_bucket,
     _validate_download_checksum,
+    _run_preflight,
+    _report_preflight_failures,
 )
 
 # ---------------------------------------------------------------------------
@@ -1334,3 +1336,118 @@ class TestDeriveResultsBucket:
         """A 63-character overrun is an opaque S3 error mid-build otherwise."""
         with pytest.raises(SystemExit):
             _derive_results_bucket(aws_account_id="1" * 40, region="ap-southeast-4")
+
+
+# ---------------------------------------------------------------------------
+# _run_preflight
+# ---------------------------------------------------------------------------
+
+
+class TestRunPreflight:
+    def test_independent_checks_run_concurrently(self):
+        import threading
+
+        barrier = threading.Barrier(3, timeout=5)
+        # Run serially, the first check would wait on the barrier forever.
+        checks = [{"name": n, "run": barrier.wait} for n in ("a", "b", "c")]
+        _, _, failures = _run_preflight(checks)
+        assert failures == []
+
+    def test_a_check_receives_the_outputs_it_names(self):
+        seen = {}
+        checks = [
+            {"name": "consumer", "run": lambda index: seen.update(index=index),
+             "inputs": ["index"]},
+            {"name": "producer", "run": lambda: {"index": {"c5.xlarge": 4}},
+             "outputs": ["index"]},
+        ]
+        results, _, failures = _run_preflight(checks)
+        assert failures == []
+        assert seen == {"index": {"c5.xlarge": 4}}
+        assert results["index"] == {"c5.xlarge": 4}
+
+    def test_initial_values_satisfy_inputs(self):
+        checks = [{"name": "c", "run": lambda region: {"echo": region},
+                   "inputs": ["region"], "outputs": ["echo"]}]
+        results, _, _ = _run_preflight(checks, {"region": "us-east-1"})
+        assert results["echo"] == "us-east-1"
+
+    def test_every_failure_is_collected(self, capsys):
+        def _quit():
+            print("*** ERROR ***")
+            sys.exit(1)
+
+        checks = [
+            {"name": "ami", "run": lambda: sys.exit("ERROR: bad AMI")},
+            {"name": "ok", "run": lambda: None},
+            {"name": "bucket", "run": _quit},
+            {"name": "api", "run": lambda: 1 / 0},
+        ]
+        _, _, failures = _run_preflight(checks)
+        assert failures == [
+            ("ami", "ERROR: bad AMI"),
+            ("bucket", "failed (details above)"),
+            ("api", "ZeroDivisionError: division by zero"),
+        ]
+
+    def test_dependents_of_a_failed_check_are_skipped(self):
+        ran = []
+        checks = [
+            {"name": "metadata", "run": lambda: sys.exit("throttled"),
+             "outputs": ["index"]},
+            {"name": "arch", "run": lambda index: ran.append("arch"),
+             "inputs": ["index"]},
+            {"name": "bucket", "run": lambda: ran.append("bucket")},
+        ]
+        _, _, failures = _run_preflight(checks)
+        assert ran == ["bucket"]
+        assert failures == [("metadata", "throttled"), ("arch", "skipped — needs index")]
+
+    def test_a_missing_declared_output_fails_the_check(self):
+        _, _, failures = _run_preflight(
+            [{"name": "c", "run": lambda: {}, "outputs": ["index"]}]
+        )
+        assert failures and failures[0][0] == "c"
+
+    def test_an_undeclared_input_is_a_programming_error(self):
+        with pytest.raises(ValueError, match="unknown inputs"):
+            _run_preflight([{"name": "c", "run": lambda x: None, "inputs": ["x"]}])
+
+    def test_output_is_replayed_in_declaration_order(self, capsys):
+        import threading
+
+        second_printed = threading.Event()
+
+        def _first():
+            second_printed.wait(5)
+            print("first")
+
+        def _second():
+            print("second")
+            second_printed.set()
+
+        _run_preflight([{"name": "1", "run": _first}, {"name": "2", "run": _second}])
+        assert capsys.readouterr().out == "first\nsecond\n"
+
+    def test_every_check_records_its_wall_time(self):
+        import time
+
+        _, timings, _ = _run_preflight([
+            {"name": "slow", "run": lambda: time.sleep(0.05)},
+            {"name": "fast", "run": lambda: None},
+        ])
+        assert set(timings) == {"slow", "fast"}
+        assert timings["slow"] >= 0.05
+
+    def test_stdout_is_restored(self):
+        before = sys.stdout
+        _run_preflight([{"name": "x", "run": lambda: sys.exit(1)}])
+        assert sys.stdout is before
+
+    def test_the_report_names_every_failure_and_exits(self, capsys):
+        with pytest.raises(SystemExit) as exc:
+            _report_preflight_failures([("custom AMI", "bad"), ("build bucket", "exists")])
+        assert exc.value.code == 1
+        out = capsys.readouterr().out
+        assert "2 preflight check(s) did not pass" in out
+        assert "custom AMI: bad" in out and "build bucket: exists" in out
@@ -116,9 +116,9 @@ def staged(mp, tmp_path, monkeypatch):
     iam = _FakeIam()
     clients = {"ec2": _FakeEc2(), "sts": _FakeSts(), "iam": iam,
                "s3": _FakeS3Client(), "pricing": object()}
-    monkeypatch.setattr(mp.boto3, "client",
-                        lambda name, **kw: clients.get(name, object()))
-    monkeypatch.setattr(mp.boto3, "resource", lambda *a, **k: _FakeS3Resource())
+    monkeypatch.setattr(mp, "_aws_client",
+                        lambda name, *a, **kw: clients.get(name, object()))
+    monkeypatch.setattr(mp, "_aws_resource", lambda *a, **k: _FakeS3Resource())
 
     record = {"calls": []}
 
@@ -150,7 +150,6 @@ def staged(mp, tmp_path, monkeypatch):
     )
     monkeypatch.setattr(mp, "_setup_iam", lambda *a, **k: None)
     monkeypatch.setattr(mp, "_get_od_price", lambda *a, **k: 0.34)
-    monkeypatch.setattr(mp, "_get_spot_price", lambda *a, **k: 0.11)
 
     deleted = []
     monkeypatch.setattr(
@@ -211,8 +210,8 @@ def _playbook_vars(record):
 def _swap_ec2(staged, monkeypatch, ec2):
     """Replace only the ec2 client; every other client stays as staged."""
     clients = dict(staged["clients"], ec2=ec2)
-    monkeypatch.setattr(staged["mod"].boto3, "client",
-                        lambda name, **kw: clients.get(name, object()))
+    monkeypatch.setattr(staged["mod"], "_aws_client",
+                        lambda name, *a, **kw: clients.get(name, object()))
 
 
 def _rendered_vars(staged):
@@ -346,6 +345,35 @@ class TestExistingS3Bucket:
         assert _playbook_vars(staged["record"]) is not None
 
 
+class TestPreflightFailuresAreReportedTogether:
+    """Network-bound checks run through _run_preflight, so one failure no longer
+    hides the next: the operator sees every problem from a single run."""
+
+    def test_a_bad_ami_and_an_existing_bucket_are_both_reported(
+        self, staged, monkeypatch, capsys
+    ):
+        class _BucketExists:
+            def head_bucket(self, Bucket=None, **kw):
+                return {}
+
+        class _NoSuchAmi(_FakeEc2):
+            def describe_images(self, **kw):
+                raise ClientError(
+                    {"Error": {"Code": "InvalidAMIID.NotFound", "Message": "x"}},
+                    "DescribeImages",
+                )
+
+        monkeypatch.setitem(staged["clients"], "s3", _BucketExists())
+        _swap_ec2(staged, monkeypatch, _NoSuchAmi())
+        with pytest.raises(SystemExit):
+            _run_main(staged, monkeypatch, "--custom_ami", "ami-0missing")
+        out = capsys.readouterr().out
+        assert "does not appear to be a valid AMI" in out
+        assert "existing S3 bucket" in out
+        assert "2 preflight check(s) did not pass" in out
+        assert _playbook_vars(staged["record"]) is None
+
+
 class TestBuildAbortWindow:
     def test_abort_window_opens_before_ansible_runs(self, staged, monkeypatch):
         """Ctrl-C in the window is supposed to cancel the build and clean up
@@ -612,6 +640,39 @@ class TestGpuRanksPerNodeReachTheVarsFile:
         )
 
 
+class _PricedPricing:
+    """get_products with the one-line PriceList shape _get_od_price parses."""
+
+    def get_products(self, **kw):
+        payload = {"terms": {"OnDemand": {"T": {"priceDimensions": {"D": {
+            "pricePerUnit": {"USD": "0.34"}}}}}}}
+        return {"PriceList": [json.dumps(payload)]}
+
+
+class TestSpotPricesAreFetchedOnce:
+    """Preflight already asks describe_spot_price_history for every queue type
+    in the build AZ. The summary used to ask again per type with no AZ, which
+    cost a round trip per type and could quote another zone's price."""
+
+    def test_the_summary_reuses_the_preflight_response(self, staged, monkeypatch, capsys):
+        class _Counting(_FakeEc2):
+            calls = []
+
+            def describe_spot_price_history(self, InstanceTypes=None, **kw):
+                type(self).calls.append(kw.get("AvailabilityZone"))
+                return super().describe_spot_price_history(InstanceTypes=InstanceTypes, **kw)
+
+        clients = dict(staged["clients"], ec2=_Counting(), pricing=_PricedPricing())
+        monkeypatch.setattr(staged["mod"], "_aws_client",
+                            lambda name, *a, **kw: clients.get(name, object()))
+        with pytest.raises(SystemExit):
+            _run_main(staged, monkeypatch, "--cluster_type", "spot")
+        out = capsys.readouterr().out
+        assert _Counting.calls == [AZ]
+        cpu_line = next(l for l in out.splitlines() if "CPU queue  (" in l)
+        assert "/hr spot" in cpu_line
+
+
 class TestStorageReachesTheBuildSummary:
     """A cluster built with --enable_fsx=true printed "Options: FSx/Lustre" and
     nothing else: no /fsx, no size, and the only task naming the hydration
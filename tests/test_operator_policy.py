@@ -117,7 +117,7 @@ class TestGeneratorWritesNothingWhenCreateFails:
         mod = _load_generator()
         out = tmp_path / "operator-policy.json"
         monkeypatch.setattr(mod, "_get_account_id", lambda: ACCOUNT_ID)
-        monkeypatch.setattr(mod.boto3, "client", lambda *a, **k: object())
+        monkeypatch.setattr(mod, "_aws_client", lambda *a, **k: object())
 
         def fake_create(iam, rendered, policy_name, description):
             if create_ok:
@@ -0,0 +1,107 @@
+"""Tests for src/pcluster_aws.py — the shared session and client factory."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+import pcluster_aws
+
+
+class _FakeSession:
+    created = []
+
+    def __init__(self, profile_name=None, region_name=None):
+        self.profile_name = profile_name
+        self.region_name = region_name
+        type(self).created.append((profile_name, region_name))
+
+    def client(self, service, config=None):
+        return {"service": service, "profile": self.profile_name,
+                "region": self.region_name, "config": config}
+
+    def resource(self, service, config=None):
+        return {"resource": service, "config": config}
+
+
+@pytest.fixture
+def fake_sessions(monkeypatch):
+    import boto3
+
+    monkeypatch.setattr(pcluster_aws, "_SESSIONS", {})
+    monkeypatch.setattr(pcluster_aws, "_CLIENTS", {})
+    monkeypatch.setattr(_FakeSession, "created", [])
+    monkeypatch.setattr(boto3.session, "Session", _FakeSession)
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+    return _FakeSession
+
+
+class TestAwsClient:
+    def test_the_same_service_and_region_share_one_client(self, fake_sessions):
+        assert pcluster_aws._aws_client("ec2", "us-east-1") is pcluster_aws._aws_client(
+            "ec2", "us-east-1"
+        )
+
+    def test_services_in_one_region_share_one_session(self, fake_sessions):
+        pcluster_aws._aws_client("ec2", "us-east-1")
+        pcluster_aws._aws_client("sts", "us-east-1")
+        assert fake_sessions.created == [(None, "us-east-1")]
+
+    def test_regions_get_their_own_session_and_client(self, fake_sessions):
+        east = pcluster_aws._aws_client("ec2", "us-east-1")
+        west = pcluster_aws._aws_client("ec2", "us-west-2")
+        assert east is not west
+        assert west["region"] == "us-west-2"
+
+    def test_a_turbot_switch_never_reuses_an_earlier_client(self, fake_sessions):
+        """The AZ check runs on the operator's own credentials; everything after
+        the switch must run on the Turbot profile's."""
+        before = pcluster_aws._aws_client("ec2", "us-east-1")
+        pcluster_aws._activate_profile("turbot__123__alice", "us-east-1")
+        after = pcluster_aws._aws_client("ec2", "us-east-1")
+        assert before is not after
+        assert after["profile"] == "turbot__123__alice"
+        assert os.environ["AWS_PROFILE"] == "turbot__123__alice"
+        assert os.environ["AWS_DEFAULT_REGION"] == "us-east-1"
+
+    def test_an_explicit_profile_is_honored(self, fake_sessions):
+        client = pcluster_aws._aws_client("ec2", "us-east-1", profile="other")
+        assert client["profile"] == "other"
+
+    def test_resources_are_not_memoized(self, fake_sessions):
+        assert pcluster_aws._aws_resource("s3") is not pcluster_aws._aws_resource("s3")
+
+
+class TestClientConfig:
+    def test_retries_are_adaptive(self):
+        config = pcluster_aws._client_config()
+        assert config.retries["mode"] == "adaptive"
+        assert config.retries["max_attempts"] == pcluster_aws._RETRY_ATTEMPTS
+
+    def test_the_pool_is_wider_than_botocores_default(self):
+        assert pcluster_aws._client_config().max_pool_connections == 32
+
+    def test_tcp_keepalive_is_on(self):
+        assert pcluster_aws._client_config().tcp_keepalive is True
+
+
+class TestNoEntryPointBuildsItsOwnClient:
+    """Every entry point goes through the factory; a stray boto3.client() call
+    would skip the shared Config and the Turbot-aware session key."""
+
+    @pytest.mark.parametrize("script", [
+        "make_pcluster.py", "kill_pcluster.py", "check_pcluster.py",
+        "cost_pcluster.py", "diagnose_pcluster.py", "rotate_cluster_key.py",
+        "generate_operator_policy.py", "src/pcluster_aux_data.py",
+    ])
+    def test_no_direct_boto3_clients(self, script):
+        import re
+
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with open(os.path.join(repo_root, script)) as fh:
+            text = fh.read()
+        assert not re.search(r"boto3\.(client|resource|setup_default_session)\(", text)
@@ -12,6 +12,7 @@ Covers:
   - _delete_managed_policies
   - _setup_fsx_hydration_iam
   - _validate_network
+  - _describe_instance_types_cached / _index_instance_types
 """
 
 import json
@@ -36,7 +37,8 @@ from pcluster_core import (
     _delete_managed_policies,
     _setup_fsx_hydration_iam,
     _validate_network,
-    _get_efa_instance_types,
+    _describe_instance_types_cached,
+    _index_instance_types,
     _ssh_secret_name,
 )
 
@@ -861,8 +863,11 @@ def _make_ec2client(
         return {"Vpcs": vpcs}
 
     def describe_subnets(Filters):
-        az = next((f["Values"][0] for f in Filters if f["Name"] == "availabilityZone"), None)
-        return {"Subnets": subnets_by_az.get(az, [])}
+        azs = next((f["Values"] for f in Filters if f["Name"] == "availabilityZone"), [])
+        return {"Subnets": [
+            dict(subnet, AvailabilityZone=az)
+            for az in azs for subnet in subnets_by_az.get(az, [])
+        ]}
 
     client.describe_vpcs = describe_vpcs
     client.describe_subnets = describe_subnets
@@ -972,14 +977,18 @@ class TestValidateNetwork:
 
 
 def _make_public_private_ec2client():
-    """Fake EC2 client that honors the map-public-ip-on-launch filter.
+    """Fake EC2 client whose subnets carry MapPublicIpOnLaunch.
 
-    _make_ec2client above ignores it, so it cannot tell a private discovery from
-    a public one -- which is precisely the distinction --use_private_gpu_subnet
-    exists to make.
+    _make_ec2client above has no public subnets, so it cannot tell a private
+    discovery from a public one -- which is precisely the distinction
+    --use_private_gpu_subnet exists to make.
     """
-    public = {"us-east-1a": [{"SubnetId": "subnet-public-a"}]}
-    private = {"us-east-1a": [{"SubnetId": "subnet-private-a"}]}
+    subnets = [
+        {"SubnetId": "subnet-public-a", "AvailabilityZone": "us-east-1a",
+         "MapPublicIpOnLaunch": True},
+        {"SubnetId": "subnet-private-a", "AvailabilityZone": "us-east-1a",
+         "MapPublicIpOnLaunch": False},
+    ]
 
     client = types.SimpleNamespace()
     client.describe_vpcs = lambda Filters: {
@@ -987,15 +996,8 @@ def _make_public_private_ec2client():
     }
 
     def describe_subnets(Filters):
-        az = next(
-            (f["Values"][0] for f in Filters if f["Name"] == "availabilityZone"), None
-        )
-        private_only = any(
-            f["Name"] == "map-public-ip-on-launch" and f["Values"] == ["false"]
-            for f in Filters
-        )
-        table = private if private_only else public
-        return {"Subnets": table.get(az, [])}
+        azs = next((f["Values"] for f in Filters if f["Name"] == "availabilityZone"), [])
+        return {"Subnets": [s for s in subnets if s["AvailabilityZone"] in azs]}
 
     client.describe_subnets = describe_subnets
     return client
@@ -1043,32 +1045,15 @@ class TestPrivateGpuSubnetIsNotSilentlyIgnored:
         )
 
     def test_the_flag_reaches_a_discovery_not_just_a_different_list(self):
-        """The private subnet must come from a filtered describe_subnets call."""
-        ec2 = _make_public_private_ec2client()
-        seen = []
-        _inner = ec2.describe_subnets
-
-        def _spy(Filters):
-            seen.append(Filters)
-            return _inner(Filters)
-
-        ec2.describe_subnets = _spy
-        _validate_network(
-            ec2, "us-east-1a", "vpc_default",
-            headnode_subnet_id="subnet-hn",
-            compute_az_list=["us-east-1a"],
-            compute_subnet_ids_override="",
+        """The private subnet must be chosen by MapPublicIpOnLaunch, not by
+        position: the public subnet is listed first in the same AZ."""
+        compute, gpu = self._call(
             use_private_compute_subnet="false",
             gpu_az_list=None,
             use_private_gpu_subnet="true",
         )
-        assert any(
-            any(
-                f["Name"] == "map-public-ip-on-launch" and f["Values"] == ["false"]
-                for f in filters
-            )
-            for filters in seen
-        ), "no describe_subnets call filtered for private subnets"
+        assert compute[0] != gpu[0]
+        assert gpu == ["subnet-private-a"]
 
     def test_the_default_still_reuses_computes_subnets(self):
         """Vacuity guard: the fix must not make every GPU queue discover its own.
@@ -1134,19 +1119,13 @@ class TestPrivateGpuSubnetIsNotSilentlyIgnored:
         _inner = ec2.describe_subnets
 
         def _spy(Filters):
-            az = next(
-                (f["Values"][0] for f in Filters if f["Name"] == "availabilityZone"),
-                None,
-            )
-            private_only = any(
-                f["Name"] == "map-public-ip-on-launch" for f in Filters
-            )
-            if private_only:
-                seen.append(az)
+            seen.append(next(
+                f["Values"] for f in Filters if f["Name"] == "availabilityZone"
+            ))
             return _inner(Filters)
 
         ec2.describe_subnets = _spy
-        _validate_network(
+        _, _, _, gpu, _ = _validate_network(
             ec2, "us-east-1a", "vpc_default",
             headnode_subnet_id="subnet-hn",
             compute_az_list=["us-east-1a"],
@@ -1155,58 +1134,216 @@ class TestPrivateGpuSubnetIsNotSilentlyIgnored:
             gpu_az_list=None,
             use_private_gpu_subnet="true",
         )
-        assert seen == ["us-east-1a"]
+        assert seen == [["us-east-1a"]]
+        assert gpu == ["subnet-private-a"]
+
+
+class TestSubnetDiscoveryIsBatched:
+    """Each AZ used to cost its own describe_subnets round trip, serially, so a
+    multi-AZ spot cluster paid one per AZ before anything else could proceed."""
+
+    _AZS = ["us-east-1a", "us-east-1b", "us-east-1c", "us-east-1d"]
+
+    def _spy_client(self):
+        ec2 = _make_ec2client(
+            subnets_by_az={a: [{"SubnetId": f"subnet-{a[-1]}"}] for a in self._AZS}
+        )
+        calls = []
+        _inner = ec2.describe_subnets
+
+        def _spy(Filters, **kw):
+            calls.append(Filters)
+            return _inner(Filters)
+
+        ec2.describe_subnets = _spy
+        return ec2, calls
+
+    def test_every_az_is_resolved_by_one_call(self):
+        ec2, calls = self._spy_client()
+        _, hn, compute, gpu, _ = _validate_network(
+            ec2, "us-east-1a", "vpc_default",
+            headnode_subnet_id="",
+            compute_az_list=self._AZS[:3],
+            compute_subnet_ids_override="",
+            use_private_compute_subnet="false",
+            gpu_az_list=["us-east-1d"],
+        )
+        assert len(calls) == 1
+        filters = {f["Name"]: f["Values"] for f in calls[0]}
+        assert filters["availabilityZone"] == self._AZS
+        assert filters["vpc-id"] == ["vpc-abc12345"]
+        assert hn == "subnet-a"
+        assert compute == ["subnet-a", "subnet-b", "subnet-c"]
+        assert gpu == ["subnet-d"]
+
+    def test_no_call_when_every_subnet_is_explicit(self):
+        ec2, calls = self._spy_client()
+        _validate_network(
+            ec2, "us-east-1a", "vpc_default",
+            headnode_subnet_id="subnet-hn",
+            compute_az_list=self._AZS,
+            compute_subnet_ids_override="subnet-c1",
+            use_private_compute_subnet="false",
+        )
+        assert calls == []
+
+    def test_follows_next_token(self):
+        ec2 = _make_ec2client()
+        pages = [
+            {"Subnets": [{"SubnetId": "subnet-a", "AvailabilityZone": "us-east-1a"}],
+             "NextToken": "t1"},
+            {"Subnets": [{"SubnetId": "subnet-b", "AvailabilityZone": "us-east-1b"}]},
+        ]
+        ec2.describe_subnets = lambda Filters, **kw: pages[1 if kw.get("NextToken") else 0]
+        _, _, compute, _, _ = _validate_network(
+            ec2, "us-east-1a", "vpc_default",
+            headnode_subnet_id="subnet-hn",
+            compute_az_list=["us-east-1a", "us-east-1b"],
+            compute_subnet_ids_override="",
+            use_private_compute_subnet="false",
+        )
+        assert compute == ["subnet-a", "subnet-b"]
+
+    def test_an_az_missing_from_the_response_still_fails_by_name(self, capsys):
+        ec2 = _make_ec2client(subnets_by_az={"us-east-1a": [{"SubnetId": "subnet-a"}]})
+        with pytest.raises(SystemExit):
+            _validate_network(
+                ec2, "us-east-1a", "vpc_default",
+                headnode_subnet_id="",
+                compute_az_list=["us-east-1a", "us-east-1b"],
+                compute_subnet_ids_override="",
+                use_private_compute_subnet="false",
+            )
+        assert "No subnets found in AZ us-east-1b" in capsys.readouterr().out
 
 
 # ---------------------------------------------------------------------------
-# _get_efa_instance_types
+# _describe_instance_types_cached / _index_instance_types
 # ---------------------------------------------------------------------------
 
 _STATIC_FALLBACK = ["c5n.18xlarge", "p4d.24xlarge"]
 
 
-class _FakeEC2ForEfa:
-    def __init__(self, pages=None, raises=None):
-        self._pages = pages if pages is not None else []
-        self._raises = raises
+def _it_record(itype, arch="x86_64", vcpus=8, tpc=2, efa=None, gpus=None):
+    rec = {
+        "InstanceType": itype,
+        "ProcessorInfo": {"SupportedArchitectures": [arch]},
+        "VCpuInfo": {"DefaultVCpus": vcpus, "DefaultThreadsPerCore": tpc},
+    }
+    if efa is not None:
+        rec["NetworkInfo"] = {"EfaSupported": efa}
+    if gpus:
+        rec["GpuInfo"] = {"Gpus": [{"Manufacturer": "NVIDIA", "Count": gpus}]}
+    return rec
 
-    def get_paginator(self, operation):
-        assert operation == "describe_instance_types"
-        return self
 
-    def paginate(self, **kwargs):
-        if self._raises:
-            raise self._raises
-        return self._pages
+class _CountingEc2ForTypes:
+    def __init__(self):
+        self.requested = []
 
+    def describe_instance_types(self, InstanceTypes):
+        self.requested.append(list(InstanceTypes))
+        return {"InstanceTypes": [_it_record(t) for t in InstanceTypes]}
 
-class TestGetEfaInstanceTypes:
-    def test_returns_live_types_when_api_succeeds(self):
-        pages = [
-            {"InstanceTypes": [{"InstanceType": "p5.48xlarge"}, {"InstanceType": "hpc7a.48xlarge"}]},
-            {"InstanceTypes": [{"InstanceType": "c6gn.16xlarge"}]},
-        ]
-        ec2 = _FakeEC2ForEfa(pages=pages)
-        result = _get_efa_instance_types(ec2, _STATIC_FALLBACK)
-        assert result == {"p5.48xlarge", "hpc7a.48xlarge", "c6gn.16xlarge"}
-
-    def test_falls_back_on_api_error(self, capsys):
-        ec2 = _FakeEC2ForEfa(raises=Exception("AccessDenied"))
-        result = _get_efa_instance_types(ec2, _STATIC_FALLBACK)
-        assert result == set(_STATIC_FALLBACK)
-        assert "built-in list" in capsys.readouterr().out
-
-    def test_falls_back_on_empty_response(self, capsys):
-        ec2 = _FakeEC2ForEfa(pages=[{"InstanceTypes": []}])
-        result = _get_efa_instance_types(ec2, _STATIC_FALLBACK)
-        assert result == set(_STATIC_FALLBACK)
-        assert "built-in list" in capsys.readouterr().out
-
-    def test_live_result_does_not_contain_fallback_types(self):
-        pages = [{"InstanceTypes": [{"InstanceType": "p5.48xlarge"}]}]
-        ec2 = _FakeEC2ForEfa(pages=pages)
-        result = _get_efa_instance_types(ec2, _STATIC_FALLBACK)
-        assert "c5n.18xlarge" not in result
+
+class TestDescribeInstanceTypesCached:
+    def test_a_cold_cache_fetches_once_and_a_warm_cache_not_at_all(self, tmp_path):
+        ec2 = _CountingEc2ForTypes()
+        first = _describe_instance_types_cached(
+            ec2, "us-east-1", ["c5.xlarge", "c5.2xlarge"], str(tmp_path)
+        )
+        second = _describe_instance_types_cached(
+            ec2, "us-east-1", ["c5.xlarge", "c5.2xlarge"], str(tmp_path)
+        )
+        assert ec2.requested == [["c5.xlarge", "c5.2xlarge"]]
+        assert first == second
+
+    def test_only_the_missing_types_reach_the_api(self, tmp_path):
+        ec2 = _CountingEc2ForTypes()
+        _describe_instance_types_cached(ec2, "us-east-1", ["c5.xlarge"], str(tmp_path))
+        result = _describe_instance_types_cached(
+            ec2, "us-east-1", ["c5.xlarge", "m5.large"], str(tmp_path)
+        )
+        assert ec2.requested[-1] == ["m5.large"]
+        assert set(result) == {"c5.xlarge", "m5.large"}
+
+    def test_the_cache_is_keyed_by_region(self, tmp_path):
+        ec2 = _CountingEc2ForTypes()
+        _describe_instance_types_cached(ec2, "us-east-1", ["c5.xlarge"], str(tmp_path))
+        _describe_instance_types_cached(ec2, "us-west-2", ["c5.xlarge"], str(tmp_path))
+        assert len(ec2.requested) == 2
+
+    def test_refresh_bypasses_the_cache(self, tmp_path):
+        ec2 = _CountingEc2ForTypes()
+        _describe_instance_types_cached(ec2, "us-east-1", ["c5.xlarge"], str(tmp_path))
+        _describe_instance_types_cached(
+            ec2, "us-east-1", ["c5.xlarge"], str(tmp_path), refresh=True
+        )
+        assert len(ec2.requested) == 2
+
+    def test_an_expired_cache_is_refetched(self, tmp_path):
+        ec2 = _CountingEc2ForTypes()
+        _describe_instance_types_cached(ec2, "us-east-1", ["c5.xlarge"], str(tmp_path))
+        path = tmp_path / "instance_types.us-east-1.json"
+        doc = json.loads(path.read_text())
+        doc["fetched_at"] -= 8 * 24 * 3600
+        path.write_text(json.dumps(doc))
+        _describe_instance_types_cached(ec2, "us-east-1", ["c5.xlarge"], str(tmp_path))
+        assert len(ec2.requested) == 2
+
+    def test_a_corrupt_cache_is_treated_as_a_miss(self, tmp_path):
+        (tmp_path / "instance_types.us-east-1.json").write_text("{not json")
+        ec2 = _CountingEc2ForTypes()
+        result = _describe_instance_types_cached(
+            ec2, "us-east-1", ["c5.xlarge"], str(tmp_path)
+        )
+        assert "c5.xlarge" in result
+
+    def test_requests_are_chunked_at_the_api_limit(self, tmp_path):
+        ec2 = _CountingEc2ForTypes()
+        types_ = [f"c5.{i}xlarge" for i in range(150)]
+        _describe_instance_types_cached(ec2, "us-east-1", types_, str(tmp_path))
+        assert [len(c) for c in ec2.requested] == [100, 50]
+
+
+class TestIndexInstanceTypes:
+    def test_reports_every_fact_preflight_needs(self):
+        index = _index_instance_types(
+            {"p4d.24xlarge": _it_record("p4d.24xlarge", vcpus=96, efa=True, gpus=8)},
+            hyperthreading=False,
+            efa_fallback=[],
+        )
+        assert index["p4d.24xlarge"] == {
+            "arch": "x86_64", "vcpus": 48, "threads_per_core": 2,
+            "nvidia_gpus": 8, "efa": True,
+        }
+
+    def test_efa_support_comes_from_the_record_not_the_static_list(self):
+        index = _index_instance_types(
+            {"c5n.18xlarge": _it_record("c5n.18xlarge", efa=False)},
+            hyperthreading=True,
+            efa_fallback=_STATIC_FALLBACK,
+        )
+        assert index["c5n.18xlarge"]["efa"] is False
+
+    def test_a_record_without_network_info_falls_back_to_the_static_list(self):
+        index = _index_instance_types(
+            {"c5n.18xlarge": _it_record("c5n.18xlarge"),
+             "m5.large": _it_record("m5.large")},
+            hyperthreading=True,
+            efa_fallback=_STATIC_FALLBACK,
+        )
+        assert index["c5n.18xlarge"]["efa"] is True
+        assert index["m5.large"]["efa"] is False
+
+    def test_graviton_reports_arm64(self):
+        index = _index_instance_types(
+            {"c8g.xlarge": _it_record("c8g.xlarge", arch="arm64", tpc=1)},
+            hyperthreading=False,
+            efa_fallback=[],
+        )
+        assert index["c8g.xlarge"]["arch"] == "arm64"
+        assert index["c8g.xlarge"]["vcpus"] == 8
 
 
 # ---------------------------------------------------------------------------
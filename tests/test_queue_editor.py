@@ -20,6 +20,10 @@ from pcluster_queue_editor import (
     _recovery_guidance,
     _make_yaml,
     _config_path,
+    _read_queue_edits,
+    _validate_queue_set,
+    _classify_queue_update,
+    _diff_cluster_configs,
     COMPUTE_RESOURCE_SUFFIX,
     PCLUSTER_NAME_MAX_LENGTH,
     QUEUE_NAME_MAX_LENGTH,
@@ -146,12 +150,154 @@ class TestRecoveryGuidance:
         assert "START_REQUESTED" in out
         assert ".bak" not in out
 
+    def test_live_stage_offers_rollback_without_restart(self):
+        out = _recovery_guidance("mycluster", "us-east-2", "/tmp/config.mycluster", "live")
+        assert "was not stopped" in out
+        assert "/tmp/config.mycluster.bak" in out
+        assert "START_REQUESTED" not in out
+
     def test_guidance_names_the_cluster_and_region(self):
         out = _recovery_guidance("mycluster", "eu-west-1", "/tmp/c", "update")
         assert "mycluster" in out
         assert "eu-west-1" in out
 
 
+class TestClassifyQueueUpdate:
+    @staticmethod
+    def _pair(strategy=None):
+        before = _make_yaml().load(SAMPLE_CONFIG)
+        after = _make_yaml().load(SAMPLE_CONFIG)
+        if strategy:
+            after["Scheduling"]["SlurmSettings"]["QueueUpdateStrategy"] = strategy
+        return before, after
+
+    @staticmethod
+    def _new_queue(name):
+        return {"Name": name, "ComputeResources": [{"Name": "cr", "MaxCount": 2}]}
+
+    def test_no_change_needs_no_stop(self):
+        assert _classify_queue_update(*self._pair()) == (False, [])
+
+    def test_adding_a_queue_is_live(self):
+        before, after = self._pair()
+        after["Scheduling"]["SlurmQueues"].append(self._new_queue("extra"))
+        needs_stop, reasons = _classify_queue_update(before, after)
+        assert not needs_stop
+        assert reasons == ["queue extra added: applied to the running fleet"]
+
+    def test_removing_a_queue_needs_a_stop(self):
+        before, after = self._pair("DRAIN")
+        before["Scheduling"]["SlurmQueues"].append(self._new_queue("extra"))
+        needs_stop, reasons = _classify_queue_update(before, after)
+        assert needs_stop
+        assert reasons == ["queue extra removed: needs a stopped fleet"]
+
+    @pytest.mark.parametrize("strategy", ["DRAIN", "TERMINATE"])
+    def test_changing_compute_resources_is_live_under_a_strategy(self, strategy):
+        before, after = self._pair(strategy)
+        after["Scheduling"]["SlurmQueues"][0]["ComputeResources"][0]["MaxCount"] = 16
+        needs_stop, reasons = _classify_queue_update(before, after)
+        assert not needs_stop
+        assert f"QueueUpdateStrategy={strategy}" in reasons[0]
+
+    def test_changing_compute_resources_needs_a_stop_without_a_strategy(self):
+        before, after = self._pair()
+        after["Scheduling"]["SlurmQueues"][0]["ComputeResources"][0]["MaxCount"] = 16
+        needs_stop, reasons = _classify_queue_update(before, after)
+        assert needs_stop
+        assert "unless QueueUpdateStrategy is DRAIN or TERMINATE" in reasons[0]
+
+    def test_adding_a_compute_resource_or_instance_type_is_live_under_a_strategy(self):
+        before, after = self._pair("DRAIN")
+        resources = after["Scheduling"]["SlurmQueues"][0]["ComputeResources"]
+        resources[0]["Instances"].append({"InstanceType": "c8g.4xlarge"})
+        resources.append({"Name": "big", "Instances": [{"InstanceType": "c8g.8xlarge"}]})
+        needs_stop, reasons = _classify_queue_update(before, after)
+        assert not needs_stop
+        assert reasons == ["queue compute changed (ComputeResources): applied under QueueUpdateStrategy=DRAIN"]
+
+    def test_removing_a_compute_resource_needs_a_stop_under_any_strategy(self):
+        before, after = self._pair("TERMINATE")
+        after["Scheduling"]["SlurmQueues"][0]["ComputeResources"] = [
+            {"Name": "big", "Instances": [{"InstanceType": "c8g.8xlarge"}]}]
+        needs_stop, reasons = _classify_queue_update(before, after)
+        assert needs_stop
+        assert reasons == [
+            "queue compute: compute resource compute-resource removed: needs a stopped fleet",
+            "queue compute changed (ComputeResources): applied under QueueUpdateStrategy=TERMINATE",
+        ]
+
+    def test_removing_an_instance_type_needs_a_stop_under_any_strategy(self):
+        before, after = self._pair("DRAIN")
+        resource = after["Scheduling"]["SlurmQueues"][0]["ComputeResources"][0]
+        resource["Instances"] = [{"InstanceType": "c8g.4xlarge"}]
+        needs_stop, reasons = _classify_queue_update(before, after)
+        assert needs_stop
+        assert reasons[0] == (
+            "queue compute: instance type c8g.2xlarge removed from compute-resource: needs a stopped fleet")
+
+    def test_changing_capacity_type_needs_a_stop_under_any_strategy(self):
+        before, after = self._pair("TERMINATE")
+        after["Scheduling"]["SlurmQueues"][0]["CapacityType"] = "ONDEMAND"
+        needs_stop, reasons = _classify_queue_update(before, after)
+        assert needs_stop
+        assert reasons == ["queue compute changed (CapacityType): needs a stopped fleet"]
+
+    def test_settings_outside_the_queues_need_a_stop(self):
+        before, after = self._pair()
+        after["Scheduling"]["SlurmSettings"]["ScaledownIdletime"] = 10
+        after["Scheduling"]["SlurmQueues"].append(self._new_queue("extra"))
+        needs_stop, reasons = _classify_queue_update(before, after)
+        assert needs_stop
+        assert reasons[-1] == "settings outside the queue list changed: needs a stopped fleet"
+
+
+class TestDiffClusterConfigs:
+    @staticmethod
+    def _pair():
+        return _make_yaml().load(SAMPLE_CONFIG), _make_yaml().load(SAMPLE_CONFIG)
+
+    def test_requoting_and_key_order_are_not_changes(self):
+        requoted = SAMPLE_CONFIG.replace("Os: ubuntu2404", "Os: 'ubuntu2404'").replace(
+            "  Scheduler: slurm\n  SlurmSettings:\n    ScaledownIdletime: 5\n",
+            "  SlurmSettings:\n    ScaledownIdletime: 5\n  Scheduler: slurm  # comment\n",
+        )
+        assert requoted != SAMPLE_CONFIG
+        assert _diff_cluster_configs(_make_yaml().load(SAMPLE_CONFIG), _make_yaml().load(requoted)) == []
+
+    def test_queues_are_matched_by_name(self):
+        before, after = self._pair()
+        after["Scheduling"]["SlurmQueues"] = [{"Name": "other", "ComputeResources": []}]
+        assert _diff_cluster_configs(before, after) == ["+ queue other", "- queue compute"]
+
+    def test_compute_resource_changes_are_itemized(self):
+        before, after = self._pair()
+        resources = after["Scheduling"]["SlurmQueues"][0]["ComputeResources"]
+        resources[0]["MaxCount"] = 16
+        resources.append({"Name": "extra", "MaxCount": 1})
+        assert _diff_cluster_configs(before, after) == [
+            "~ queue compute: ComputeResources",
+            "  + compute resource extra",
+            "  ~ compute resource compute-resource: MaxCount",
+        ]
+
+    def test_a_new_queue_order_is_a_change(self):
+        before, after = self._pair()
+        extra = {"Name": "extra", "ComputeResources": []}
+        before["Scheduling"]["SlurmQueues"].append(extra)
+        after["Scheduling"]["SlurmQueues"].insert(0, extra)
+        assert _diff_cluster_configs(before, after) == ["~ queue order"]
+
+    def test_settings_outside_the_queues_are_reported_by_path(self):
+        before, after = self._pair()
+        after["HeadNode"]["Ssh"]["KeyName"] = "rotated"
+        after["Scheduling"]["SlurmSettings"]["QueueUpdateStrategy"] = "DRAIN"
+        assert _diff_cluster_configs(before, after) == [
+            "~ HeadNode.Ssh.KeyName",
+            "~ Scheduling.SlurmSettings.QueueUpdateStrategy",
+        ]
+
+
 class TestValidateInstanceTypes:
     def test_valid_compute_list(self):
         result = _validate_instance_types("c8g.2xlarge,c7g.2xlarge", require_gpu=False)
@@ -680,3 +826,271 @@ class TestQueueCliFlagNames:
         assert "remove" not in guard.group(0), (
             f"main() still requires -T for remove: {guard.group(0)!r}"
         )
+
+
+# ---------------------------------------------------------------------------
+# Batch edits (-A batch)
+# ---------------------------------------------------------------------------
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from entrypoint_harness import load_entrypoint
+
+
+class TestReadQueueEdits:
+    def test_comments_and_blank_lines_are_skipped(self, tmp_path):
+        edits = tmp_path / "edits"
+        edits.write_text("# reshape\n\nadd -T gpu -Q train -E 'p5.48xlarge'\nremove -Q old\n")
+        assert _read_queue_edits(str(edits)) == [
+            (3, ["add", "-T", "gpu", "-Q", "train", "-E", "p5.48xlarge"]),
+            (4, ["remove", "-Q", "old"]),
+        ]
+
+    @pytest.mark.parametrize("line", ["list", "batch --edits other", "-Q x"])
+    def test_only_add_and_remove_are_batchable(self, tmp_path, line):
+        edits = tmp_path / "edits"
+        edits.write_text(line + "\n")
+        with pytest.raises(SystemExit, match="line 1: each edit must start with add or remove"):
+            _read_queue_edits(str(edits))
+
+    def test_an_empty_file_is_an_error(self, tmp_path):
+        edits = tmp_path / "edits"
+        edits.write_text("# nothing yet\n")
+        with pytest.raises(SystemExit, match="no edits found"):
+            _read_queue_edits(str(edits))
+
+
+class TestValidateQueueSet:
+    def test_duplicate_queue_names(self):
+        config = _make_yaml().load(SAMPLE_CONFIG)
+        queues = config["Scheduling"]["SlurmQueues"]
+        queues.append(queues[0])
+        with pytest.raises(SystemExit, match="duplicate queue names: compute"):
+            _validate_queue_set(config)
+
+    def test_no_queues(self):
+        config = _make_yaml().load(SAMPLE_CONFIG)
+        config["Scheduling"]["SlurmQueues"] = []
+        with pytest.raises(SystemExit, match="leave no queues"):
+            _validate_queue_set(config)
+
+
+class TestBatchMode:
+    """Every edit is staged in memory; the config is written and applied once."""
+
+    @pytest.fixture
+    def queue_mod(self, monkeypatch, tmp_path):
+        mod = load_entrypoint("manage_pcluster_queue.py")
+        config_path = tmp_path / "config.testcluster"
+        config_path.write_text(SAMPLE_CONFIG)
+        monkeypatch.setattr(
+            mod, "_load_cluster_config",
+            lambda name: (_make_yaml().load(config_path.read_text()), str(config_path)),
+        )
+        mod.applied = []
+        monkeypatch.setattr(mod, "_apply_with_wait", lambda *a, **k: mod.applied.append(a))
+        mod.config_path = config_path
+        return mod
+
+    def _run(self, mod, monkeypatch, tmp_path, lines, *extra):
+        edits = tmp_path / "edits"
+        edits.write_text("\n".join(lines) + "\n")
+        monkeypatch.setattr(sys, "argv", ["manage_pcluster_queue.py", "-N", "testcluster",
+                                          "-A", "batch", "--edits", str(edits), *extra])
+        mod.main()
+        return _make_yaml().load(mod.config_path.read_text())
+
+    def test_all_edits_land_with_one_update_cycle(self, queue_mod, monkeypatch, tmp_path):
+        config = self._run(queue_mod, monkeypatch, tmp_path, [
+            "add -T compute -Q big -E c8g.16xlarge -C ondemand -M 16",
+            "add -T compute -Q small -E c8g.large",
+            "remove -Q compute",
+        ], "-W")
+        names = [q["Name"] for q in config["Scheduling"]["SlurmQueues"]]
+        assert names == ["big", "small"]
+        assert config["Scheduling"]["SlurmQueues"][0]["CapacityType"] == "ONDEMAND"
+        assert len(queue_mod.applied) == 1
+        assert queue_mod.applied[0][0] == "testcluster"
+
+    def test_a_bad_edit_writes_nothing_and_names_its_line(self, queue_mod, monkeypatch, tmp_path):
+        with pytest.raises(SystemExit, match="edits line 2: .*GPU instance"):
+            self._run(queue_mod, monkeypatch, tmp_path, [
+                "add -T compute -Q fine -E c8g.large",
+                "add -T compute -Q gpu1 -E g5.2xlarge",
+            ], "-W")
+        assert queue_mod.config_path.read_text() == SAMPLE_CONFIG
+        assert queue_mod.applied == []
+
+    def test_the_last_queue_can_be_replaced_in_one_batch(self, queue_mod, monkeypatch, tmp_path):
+        """The add comes first: a new queue copies its subnets and settings
+        from the queues present when it is staged."""
+        config = self._run(queue_mod, monkeypatch, tmp_path, [
+            "add -T compute -Q replacement -E c8g.4xlarge",
+            "remove -Q compute",
+        ])
+        assert [q["Name"] for q in config["Scheduling"]["SlurmQueues"]] == ["replacement"]
+
+    def test_a_manual_update_forgets_the_last_applied_config(self, queue_mod, monkeypatch, tmp_path):
+        """Without -W the operator applies the config, so this script no longer knows what runs."""
+        applied = queue_mod.config_path.with_name("config.testcluster.applied")
+        applied.write_text(SAMPLE_CONFIG)
+        self._run(queue_mod, monkeypatch, tmp_path, ["add -T compute -Q small -E c8g.large"])
+        assert not applied.exists()
+
+    def test_a_dry_run_reports_the_diff_and_writes_nothing(self, queue_mod, monkeypatch, tmp_path, capsys):
+        queue_mod.config_path.with_name("config.testcluster.applied").write_text(SAMPLE_CONFIG)
+        self._run(queue_mod, monkeypatch, tmp_path, [
+            "add -T compute -Q small -E c8g.large",
+        ], "-W", "--live", "--dry_run")
+        out = capsys.readouterr().out
+        assert "  + queue small" in out
+        assert "--live would apply this without stopping the fleet" in out
+        assert "[dry-run] No changes made." in out
+        assert queue_mod.config_path.read_text() == SAMPLE_CONFIG
+        assert queue_mod.applied == []
+
+    def test_a_dry_run_without_a_last_applied_config_plans_a_stop(self, queue_mod, monkeypatch, tmp_path, capsys):
+        self._run(queue_mod, monkeypatch, tmp_path, [
+            "add -T compute -Q small -E c8g.large",
+        ], "-W", "--live", "--dry_run")
+        out = capsys.readouterr().out
+        assert "no last-applied config to compare with" in out
+        assert "--live would run the full stop/update/start cycle" in out
+
+    def test_a_batch_cannot_leave_no_queues(self, queue_mod, monkeypatch, tmp_path):
+        with pytest.raises(SystemExit, match="line 1: Cannot remove the last queue"):
+            self._run(queue_mod, monkeypatch, tmp_path, ["remove -Q compute"])
+        assert queue_mod.config_path.read_text() == SAMPLE_CONFIG
+
+    def test_edits_see_the_ones_staged_before_them(self, queue_mod, monkeypatch, tmp_path):
+        with pytest.raises(SystemExit, match="line 2: .*already exists"):
+            self._run(queue_mod, monkeypatch, tmp_path, [
+                "add -T compute -Q twice -E c8g.large",
+                "add -T compute -Q twice -E c8g.large",
+            ])
+
+    def test_an_add_in_a_batch_must_be_named(self, queue_mod, monkeypatch, tmp_path):
+        with pytest.raises(SystemExit, match="line 1: add needs -T/--type and -Q/--queue-name"):
+            self._run(queue_mod, monkeypatch, tmp_path, ["add -T compute -E c8g.large"])
+
+    def test_without_wait_the_manual_steps_are_printed(self, queue_mod, monkeypatch, tmp_path, capsys):
+        self._run(queue_mod, monkeypatch, tmp_path, ["add -T compute -Q extra -E c8g.large"])
+        out = capsys.readouterr().out
+        assert "+ extra" in out and "Queues extra changed in" in out
+        assert queue_mod.applied == []
+
+    def test_edits_flag_only_with_batch(self, queue_mod, monkeypatch):
+        monkeypatch.setattr(sys, "argv", ["manage_pcluster_queue.py", "-N", "testcluster",
+                                          "-A", "list", "--edits", "x"])
+        with pytest.raises(SystemExit) as exc:
+            queue_mod.main()
+        assert exc.value.code == 2
+
+
+class TestApplyWithWait:
+    """-W skips a no-op update, and --live skips the fleet stop when every
+    change applies to a running fleet."""
+
+    @pytest.fixture
+    def queue_mod(self, monkeypatch, tmp_path):
+        mod = load_entrypoint("manage_pcluster_queue.py")
+        mod.calls = []
+        monkeypatch.setattr(mod, "_check_pcluster", lambda: None)
+        monkeypatch.setattr(mod, "_validate_region", lambda region: None)
+        monkeypatch.setattr(mod, "_get_fleet_status", lambda name, region: "RUNNING")
+        monkeypatch.setattr(mod, "_run_pcluster", lambda args, region: mod.calls.append(args[0]) or {})
+        mod.histories = []
+        monkeypatch.setattr(mod, "_poll_fleet", lambda *a, **k: mod.calls.append("poll-" + a[2])
+                            or mod.histories.append(k.get("record", True)))
+        monkeypatch.setattr(mod, "_poll_cluster_update", lambda *a: mod.calls.append("poll-update"))
+        config_path = tmp_path / "config.testcluster"
+        config_path.with_name("config.testcluster.bak").write_text(SAMPLE_CONFIG)
+        config_path.with_name("config.testcluster.applied").write_text(SAMPLE_CONFIG)
+        mod.config_path = config_path
+        return mod
+
+    def _write(self, mod, edit):
+        config = _make_yaml().load(SAMPLE_CONFIG)
+        edit(config)
+        with open(mod.config_path, "w") as fh:
+            _make_yaml().dump(config, fh)
+
+    def test_an_added_queue_skips_the_fleet_stop(self, queue_mod, capsys):
+        self._write(queue_mod, lambda c: c["Scheduling"]["SlurmQueues"].append(
+            {"Name": "extra", "ComputeResources": []}))
+        queue_mod._apply_with_wait("testcluster", "us-east-2", str(queue_mod.config_path), live=True)
+        assert queue_mod.calls == ["update-cluster", "poll-update"]
+        assert "queue extra added" in capsys.readouterr().out
+
+    def test_a_removed_queue_runs_the_full_cycle(self, queue_mod, capsys):
+        self._write(queue_mod, lambda c: c["Scheduling"]["SlurmQueues"].__setitem__(
+            0, {"Name": "other", "ComputeResources": []}))
+        queue_mod._apply_with_wait("testcluster", "us-east-2", str(queue_mod.config_path), live=True)
+        assert queue_mod.calls == [
+            "update-compute-fleet", "poll-STOPPED", "update-cluster", "poll-update",
+            "update-compute-fleet", "poll-RUNNING",
+        ]
+        assert "running the full cycle" in capsys.readouterr().out
+        assert queue_mod.histories == [True, True]
+
+    def test_a_stop_already_under_way_is_not_recorded(self, queue_mod, monkeypatch):
+        monkeypatch.setattr(queue_mod, "_get_fleet_status", lambda name, region: "STOPPING")
+        self._write(queue_mod, lambda c: c["Scheduling"]["SlurmQueues"].__setitem__(
+            0, {"Name": "other", "ComputeResources": []}))
+        queue_mod._apply_with_wait("testcluster", "us-east-2", str(queue_mod.config_path), live=True)
+        assert queue_mod.calls[:2] == ["poll-STOPPED", "update-cluster"]
+        assert queue_mod.histories == [False, True]
+
+    def test_without_a_last_applied_config_the_bak_copy_is_not_trusted(self, queue_mod, capsys):
+        queue_mod.config_path.with_name("config.testcluster.applied").unlink()
+        self._write(queue_mod, lambda c: c["Scheduling"]["SlurmQueues"].append(
+            {"Name": "extra", "ComputeResources": []}))
+        queue_mod._apply_with_wait("testcluster", "us-east-2", str(queue_mod.config_path), live=True)
+        assert queue_mod.calls[0] == "update-compute-fleet"
+        assert "no last-applied config to compare with" in capsys.readouterr().out
+
+    def test_a_failed_live_update_prints_rollback_guidance(self, queue_mod, monkeypatch, capsys):
+        self._write(queue_mod, lambda c: c["Scheduling"]["SlurmQueues"].append(
+            {"Name": "extra", "ComputeResources": []}))
+
+        def fail(*a):
+            sys.exit("ERROR: cluster update ended in UPDATE_FAILED")
+
+        monkeypatch.setattr(queue_mod, "_poll_cluster_update", fail)
+        with pytest.raises(SystemExit):
+            queue_mod._apply_with_wait("testcluster", "us-east-2", str(queue_mod.config_path), live=True)
+        assert "LIVE UPDATE FAILED" in capsys.readouterr().out
+
+    def test_live_without_wait_is_rejected(self, queue_mod, monkeypatch):
+        monkeypatch.setattr(sys, "argv", ["manage_pcluster_queue.py", "-N", "testcluster",
+                                          "-A", "list", "--live"])
+        with pytest.raises(SystemExit) as exc:
+            queue_mod.main()
+        assert exc.value.code == 2
+
+    def test_a_config_matching_the_last_applied_one_is_not_updated(self, queue_mod, capsys):
+        self._write(queue_mod, lambda c: None)
+        queue_mod.config_path.with_name("config.testcluster.applied").write_text(SAMPLE_CONFIG)
+        queue_mod._apply_with_wait("testcluster", "us-east-2", str(queue_mod.config_path))
+        assert queue_mod.calls == []
+        assert "skipping the fleet stop and update-cluster" in capsys.readouterr().out
+
+    def test_a_completed_update_becomes_the_last_applied_config(self, queue_mod, capsys):
+        applied = queue_mod.config_path.with_name("config.testcluster.applied")
+        applied.write_text(SAMPLE_CONFIG)
+        self._write(queue_mod, lambda c: c["Scheduling"]["SlurmQueues"].append(
+            {"Name": "extra", "ComputeResources": []}))
+        queue_mod._apply_with_wait("testcluster", "us-east-2", str(queue_mod.config_path))
+        assert "update-cluster" in queue_mod.calls
+        assert "  + queue extra" in capsys.readouterr().out
+        assert applied.read_text() == queue_mod.config_path.read_text()
+
+    def test_a_failed_update_keeps_the_previous_last_applied_config(self, queue_mod, monkeypatch):
+        applied = queue_mod.config_path.with_name("config.testcluster.applied")
+        applied.write_text(SAMPLE_CONFIG)
+        self._write(queue_mod, lambda c: c["Scheduling"]["SlurmQueues"].append(
+            {"Name": "extra", "ComputeResources": []}))
+        monkeypatch.setattr(queue_mod, "_poll_cluster_update", lambda *a: sys.exit("ERROR: failed"))
+        with pytest.raises(SystemExit):
+            queue_mod._apply_with_wait("testcluster", "us-east-2", str(queue_mod.config_path))
+        assert applied.read_text() == SAMPLE_CONFIG
+
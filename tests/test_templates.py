@@ -3616,6 +3616,10 @@ def test_instance_profile_arns_are_pinned_to_this_cluster():
 #   EC2Keypair            Keypairs are named, not ARN-addressed, at create time.
 #   Route53ClusterHostedZone  Zone IDs are AWS-generated and random; see the
 #                         standing constraint in CLAUDE.md. Operator-only.
+#   CloudWatchLogsInsightsResults  StopQuery takes a query ID and has no
+#                         resource-level permissions in IAM. Operator-only;
+#                         diagnose_pcluster.py --scan_errors stops its own
+#                         query when polling gives up.
 _WILDCARD_MUTATION_ALLOWLIST = {
     ("HeadNode-Storage.json_src", "CloudFormationExtras"),
     ("HeadNode-Storage.json_src", "EFSDescribe"),
@@ -3624,6 +3628,7 @@ _WILDCARD_MUTATION_ALLOWLIST = {
     ("ComputeNode-Base.json_src", "AllowAccessToSSM"),
     ("OperatorPolicy.json_src", "EC2Keypair"),
     ("OperatorPolicy.json_src", "Route53ClusterHostedZone"),
+    ("OperatorPolicy.json_src", "CloudWatchLogsInsightsResults"),
 }
 
 _READ_ONLY_VERBS = (